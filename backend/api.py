@@ -1,12 +1,48 @@
+import asyncio
 import base64
+import errno
+import json
 import os
+import re
 import shutil
-
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-
+import stat
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Literal
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from backend import file_ops, trash, uploads
 from backend.auth import authenticate, change_password, create_token, get_current_user
+from backend.compress import compressed_cache
+from backend.dir_cache import listing_cache
+from backend.fast_json import FastJSONResponse, dumps
+from backend.file_response import CACHE_CONTROL, file_etag, file_response, not_modified
+from backend.fs_executor import fs_metrics, run_fs
+from backend.git_status import LIST_WAIT as GIT_LIST_WAIT
+from backend.git_status import git_statuses
+from backend.gitignore import compile_pattern
+from backend.ignore import (
+    HIDDEN_DIRS,
+    IGNORE_SETTING,
+    ignore_stack_for,
+    invalidate_project_ignore,
+)
+from backend.jobs import Job, job_manager
+from backend.line_index import line_reader
+from backend.loop_monitor import loop_monitor
+from backend.outline import MAX_OUTLINE_SIZE, outline_cache
+from backend.path_index import path_indexes
+from backend.profiler import MAX_SECONDS as MAX_PROFILE_SECONDS
+from backend.profiler import collapse, profiler
+from backend.route_stats import route_stats
+from backend.search_index import compile_query, search_indexes
 from backend.session_manager import (
     create_session,
     destroy_session,
@@ -17,10 +53,15 @@ from backend.store import (
     create_project,
     delete_project,
     get_project,
+    get_project_setting,
     load_projects,
     load_settings,
     save_settings,
+    set_project_setting,
 )
+from backend.text_patch import PatchError, apply_line_edits, content_hash, decode_text
+from backend.text_sniff import detect_encoding, sniff_cache
+from backend.zip_stream import iter_zip_entries, stream_zip
 
 router = APIRouter()
 
@@ -82,13 +123,13 @@ async def api_create_project(
 
 
 @router.get("/projects")
-async def api_list_projects(_user: dict = Depends(get_current_user)) -> list[dict]:
+async def api_list_projects(_user: dict = Depends(get_current_user)) -> FastJSONResponse:
     projects = load_projects()
     for p in projects:
         session = get_session_by_project(p["id"])
         p["has_session"] = session is not None
         p["session_id"] = session.session_id if session else None
-    return projects
+    return FastJSONResponse(projects)
 
 
 @router.delete("/projects/{project_id}")
@@ -96,11 +137,46 @@ async def api_delete_project(project_id: str, _user: dict = Depends(get_current_
     session = get_session_by_project(project_id)
     if session:
         await destroy_session(session.session_id)
+    project = get_project(project_id)
     if not delete_project(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
+    invalidate_project_ignore(project["path"])
+    await run_fs("delete", search_indexes.drop, project_id)
+    await run_fs("delete", path_indexes.drop, project_id)
+    await run_fs("delete", git_statuses.drop, project["path"])
     return {"status": "deleted"}
 
 
+class IgnoreSettingRequest(BaseModel):
+    patterns: list[str] = Field(max_length=1000)
+
+
+@router.get("/projects/{project_id}/ignore")
+async def api_get_project_ignore(project_id: str, _user: dict = Depends(get_current_user)) -> dict:
+    if not get_project(project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return {"patterns": get_project_setting(project_id, IGNORE_SETTING) or []}
+
+
+@router.put("/projects/{project_id}/ignore")
+async def api_put_project_ignore(
+    project_id: str, req: IgnoreSettingRequest, _user: dict = Depends(get_current_user)
+) -> dict:
+    """프로젝트별 추가 무시 패턴 (.gitignore 문법, .gitignore보다 우선)."""
+    for pattern in req.patterns:
+        try:
+            compile_pattern(pattern)
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid pattern {pattern!r}: {e}")
+    project = get_project(project_id)
+    if not project or not set_project_setting(project_id, IGNORE_SETTING, req.patterns):
+        raise HTTPException(status_code=404, detail="Project not found")
+    invalidate_project_ignore(project["path"])
+    search_indexes.refresh(project_id)
+    path_indexes.refresh(project_id)
+    return {"patterns": req.patterns}
+
+
 # --- Sessions ---
 
 
@@ -151,7 +227,6 @@ async def api_put_settings(settings: dict, _user: dict = Depends(get_current_use
 
 # --- Files ---
 
-HIDDEN_DIRS = {"node_modules", "__pycache__", ".git", ".venv", ".next", ".cache", "dist"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 TEXT_EXTENSIONS = {
     ".txt", ".md", ".py", ".js", ".ts", ".tsx", ".jsx", ".json", ".html", ".css",
@@ -163,24 +238,57 @@ TEXT_EXTENSIONS = {
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".bmp"}
 
 
-def _validate_file_path(requested_path: str) -> str:
+def _project_roots() -> list[str]:
+    return [os.path.normpath(os.path.abspath(p["path"])) for p in load_projects()]
+
+
+def _validate_file_path(requested_path: str, roots: list[str] | None = None) -> str:
+    """요청 경로가 등록된 프로젝트 안에 있는지 확인한다.
+
+    여러 경로를 검증할 때는 _project_roots()를 한 번 구해 roots로 넘긴다.
+    """
     normalized = os.path.normpath(os.path.abspath(requested_path))
-    projects = load_projects()
-    for p in projects:
-        project_root = os.path.normpath(os.path.abspath(p["path"]))
+    for project_root in roots if roots is not None else _project_roots():
         if normalized == project_root or normalized.startswith(project_root + os.sep):
             return normalized
     raise HTTPException(status_code=403, detail="Path is outside registered projects")
 
 
-@router.get("/files")
-async def api_list_files(
-    path: str = Query(...), _user: dict = Depends(get_current_user)
-) -> list[dict]:
-    validated = _validate_file_path(path)
+def _project_root_for(validated: str, roots: list[str]) -> str:
+    # 중첩된 프로젝트라면 가장 안쪽 루트 (휴지통, 무시 규칙의 기준)
+    return max(
+        (r for r in roots if validated == r or validated.startswith(r + os.sep)), key=len
+    )
+
+
+def _list_dir(validated: str, root: str) -> list[dict]:
     if not os.path.isdir(validated):
         raise HTTPException(status_code=400, detail="Not a directory")
+    return _visible_entries(validated, listing_cache.get(validated, _scan_dir), root)
+
+
+def _visible_entries(dir_path: str, entries: list[dict], root: str) -> list[dict]:
+    """.gitignore, .git/info/exclude, 프로젝트 설정 패턴에 걸리는 항목을 빼고 git 상태를 붙인다.
 
+    목록 캐시에는 걸러지기 전 목록이 있으므로 규칙이 바뀌어도 캐시를 비울 필요가 없다.
+    """
+    ignore = ignore_stack_for(root, dir_path)
+    if ignore:
+        entries = [
+            e for e in entries
+            if not ignore.is_ignored(os.path.join(dir_path, e["name"]), e["is_dir"])
+        ]
+    return _with_git_status(dir_path, entries, root)
+
+
+def _with_git_status(dir_path: str, entries: list[dict], root: str) -> list[dict]:
+    """변경된 항목에 "git" 표시(M/A/D/R/U/?)를 붙인다. 상태는 백그라운드에서 갱신된 캐시를 쓴다."""
+    git = git_statuses.get(root)
+    git.wait_ready(GIT_LIST_WAIT)  # 프로젝트를 처음 열 때만 잠깐 기다린다
+    return git.snapshot().annotate(dir_path, entries)
+
+
+def _scan_dir(validated: str) -> list[dict]:
     entries = []
     try:
         for entry in os.scandir(validated):
@@ -198,54 +306,352 @@ async def api_list_files(
     return entries
 
 
-@router.get("/files/content")
-async def api_read_file(
+@router.get("/files")
+async def api_list_files(
     path: str = Query(...), _user: dict = Depends(get_current_user)
-) -> dict:
-    validated = _validate_file_path(path)
-    if not os.path.isfile(validated):
+) -> FastJSONResponse:
+    roots = _project_roots()
+    validated = _validate_file_path(path, roots)
+    root = _project_root_for(validated, roots)
+    return FastJSONResponse(await run_fs("list", _list_dir, validated, root))
+
+
+# --- File Tree ---
+
+TREE_MAX_DEPTH = 8
+TREE_DEFAULT_LIMIT = 2000
+TREE_MAX_LIMIT = 20000
+
+
+class TreeRequest(BaseModel):
+    path: str | None = None  # root to walk
+    paths: list[str] = []  # or: several directories to expand at once
+    depth: int = Field(default=1, ge=1, le=TREE_MAX_DEPTH)
+    limit: int = Field(default=TREE_DEFAULT_LIMIT, ge=1, le=TREE_MAX_LIMIT)
+    cursor: str | None = None  # next_cursor from a previous response
+
+
+def _encode_tree_cursor(frontier: list[tuple[str, int]]) -> str:
+    raw = json.dumps(frontier, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_tree_cursor(cursor: str) -> list[tuple[str, int]]:
+    try:
+        frontier = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return [(str(d), min(int(n), TREE_MAX_DEPTH)) for d, n in frontier]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _walk_tree(frontier: list[tuple[str, int]], limit: int, roots: list[str]) -> dict:
+    """frontier의 (디렉터리, 남은 깊이)를 BFS로 펼친다.
+
+    디렉터리 하나의 목록은 쪼개지 않으므로 limit은 그 경계에서 적용된다.
+    남은 작업은 next_cursor로 돌려준다.
+    """
+    queue = deque(frontier)
+    dirs: dict[str, list[dict]] = {}
+    count = 0
+    while queue and count < limit:
+        dir_path, depth = queue.popleft()
+        if not os.path.isdir(dir_path):
+            continue
+        try:
+            entries = listing_cache.get(dir_path, _scan_dir)
+        except HTTPException:
+            continue  # 권한 없는 하위 디렉터리는 건너뜀
+        entries = _visible_entries(dir_path, entries, _project_root_for(dir_path, roots))
+        dirs[dir_path.replace("\\", "/")] = entries
+        count += len(entries)
+        if depth > 1:
+            queue.extend((e["path"], depth - 1) for e in entries if e["is_dir"])
+    return {
+        "dirs": dirs,
+        "next_cursor": _encode_tree_cursor(list(queue)) if queue else None,
+    }
+
+
+@router.post("/files/tree")
+async def api_files_tree(
+    req: TreeRequest, _user: dict = Depends(get_current_user)
+) -> FastJSONResponse:
+    """root+depth 또는 여러 디렉터리를 한 번에 펼쳐 {dir: entries} 형태로 반환한다."""
+    if req.cursor:
+        frontier = _decode_tree_cursor(req.cursor)
+    else:
+        dirs = ([req.path] if req.path else []) + req.paths
+        if not dirs:
+            raise HTTPException(status_code=400, detail="path or paths is required")
+        frontier = [(d, req.depth) for d in dirs]
+    roots = _project_roots()
+    frontier = [(_validate_file_path(d, roots), depth) for d, depth in frontier]
+    return FastJSONResponse(await run_fs("list", _walk_tree, frontier, req.limit, roots))
+
+
+def _stat_file(validated: str) -> os.stat_result:
+    try:
+        st = os.stat(validated)
+    except OSError:
         raise HTTPException(status_code=404, detail="File not found")
-    size = os.path.getsize(validated)
-    if size > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail="File too large (max 5MB)")
+    if not stat.S_ISREG(st.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+    return st
+
+
+def _read_file(validated: str, st: os.stat_result) -> dict:
+    if st.st_size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413, detail="File too large (max 5MB); use /api/files/lines"
+        )
 
     ext = os.path.splitext(validated)[1].lower()
     if ext in IMAGE_EXTENSIONS:
-        with open(validated, "rb") as f:
-            data = base64.b64encode(f.read()).decode()
-        return {"type": "image", "encoding": "base64", "content": data, "ext": ext}
+        # 이미지는 base64로 싣지 않고 /files/raw에서 ETag/Range로 받아가게 한다
+        raw_url = f"/api/files/raw?path={quote(validated.replace(os.sep, '/'))}"
+        return {"type": "image", "content": None, "ext": ext, "url": raw_url}
 
+    # 바이너리는 앞부분만 보고 판정한다 — 전체를 읽어 디코딩해 볼 필요가 없다
+    encoding = sniff_cache.sniff(validated, st)
+    if encoding is None:
+        return {"type": "binary", "content": None}
+    with open(validated, "rb") as f:
+        raw = f.read()
     try:
-        with open(validated, encoding="utf-8") as f:
-            content = f.read()
-        return {"type": "text", "content": content}
+        content = decode_text(raw, encoding)
     except UnicodeDecodeError:
-        return {"type": "binary", "content": None}
+        # 앞부분은 UTF-8이었지만 뒤에 다른 인코딩의 바이트가 있다
+        encoding = detect_encoding(raw)
+        sniff_cache.remember(validated, st, encoding)
+        if encoding is None:
+            return {"type": "binary", "content": None}
+        content = decode_text(raw, encoding)
+    # 저장할 때 base_hash로 돌려보내면 그 사이 디스크에서 바뀌었는지 확인할 수 있다
+    return {"type": "text", "content": content, "hash": content_hash(raw), "encoding": encoding}
+
+
+@router.get("/files/content")
+async def api_read_file(
+    request: Request, path: str = Query(...), _user: dict = Depends(get_current_user)
+):
+    validated = _validate_file_path(path)
+    st = await run_fs("stat", _stat_file, validated)
+    etag = file_etag(st)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    data = await run_fs("read", _read_file, validated, st)
+    return FastJSONResponse(data, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
 
 
 class FileSaveRequest(BaseModel):
     path: str
     content: str
+    base_hash: str | None = None  # 주면 디스크 내용이 이 해시일 때만 저장
+
+
+class LineEdit(BaseModel):
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    lines: list[str] = []
+
+
+class FilePatchRequest(BaseModel):
+    path: str
+    base_hash: str
+    edits: list[LineEdit]
+
+
+# 해시 확인과 쓰기 사이에 다른 저장이 끼어들지 않도록 저장은 한 번에 하나씩
+_save_lock = threading.Lock()
+
+
+def _read_for_save(validated: str) -> bytes:
+    if not os.path.isfile(validated):
+        raise HTTPException(status_code=404, detail="File not found")
+    with open(validated, "rb") as f:
+        return f.read()
+
+
+def _check_base(raw: bytes, base_hash: str):
+    current = content_hash(raw)
+    if current != base_hash:
+        raise HTTPException(
+            status_code=409,
+            detail="File changed since it was loaded",
+            headers={"X-Content-Hash": current},
+        )
+
+
+def _replace_contents(validated: str, content: str, encoding: str = "utf-8") -> str:
+    """임시 파일에 쓴 뒤 rename으로 교체한다. 새 내용의 해시를 반환한다."""
+    try:
+        data = content.encode(encoding)
+    except UnicodeEncodeError:
+        raise HTTPException(status_code=400, detail=f"Content cannot be saved as {encoding}")
+    target = os.path.realpath(validated)  # 심볼릭 링크는 링크가 아닌 대상 파일을 바꾼다
+    fd, tmp_path = tempfile.mkstemp(prefix=".save-", suffix=".tmp", dir=os.path.dirname(target))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    listing_cache.invalidate(os.path.dirname(validated))
+    return content_hash(data)
+
+
+def _write_file(validated: str, content: str, base_hash: str | None) -> str:
+    with _save_lock:
+        raw = _read_for_save(validated) if base_hash else None
+        if raw is not None:
+            _check_base(raw, base_hash)
+            encoding = detect_encoding(raw)
+        else:
+            encoding = sniff_cache.sniff(validated, _stat_file(validated))
+        # 원래 인코딩(CP949, BOM 등)을 유지한다. 바이너리를 덮어쓰면 UTF-8
+        return _replace_contents(validated, content, encoding or "utf-8")
+
+
+def _patch_file(validated: str, base_hash: str, edits: list[LineEdit]) -> str:
+    with _save_lock:
+        raw = _read_for_save(validated)
+        _check_base(raw, base_hash)
+        if len(raw) > MAX_FILE_SIZE:
+            raise HTTPException(status_code=413, detail="File too large (max 5MB)")
+        encoding = detect_encoding(raw)
+        if encoding is None:
+            raise HTTPException(status_code=400, detail="Not a text file")
+        try:
+            text = decode_text(raw, encoding)
+            patched = apply_line_edits(text, [(e.start, e.end, e.lines) for e in edits])
+        except PatchError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _replace_contents(validated, patched, encoding)
 
 
 @router.put("/files/content")
 async def api_write_file(req: FileSaveRequest, _user: dict = Depends(get_current_user)):
     validated = _validate_file_path(req.path)
-    if not os.path.isfile(validated):
-        raise HTTPException(status_code=404, detail="File not found")
-    with open(validated, "w", encoding="utf-8") as f:
-        f.write(req.content)
-    return {"status": "saved"}
+    new_hash = await run_fs("write", _write_file, validated, req.content, req.base_hash)
+    return {"status": "saved", "hash": new_hash}
+
+
+@router.patch("/files/content")
+async def api_patch_file(req: FilePatchRequest, _user: dict = Depends(get_current_user)):
+    """줄 단위 편집만 보내는 저장. base_hash가 디스크 내용과 다르면 409."""
+    validated = _validate_file_path(req.path)
+    new_hash = await run_fs("write", _patch_file, validated, req.base_hash, req.edits)
+    return {"status": "saved", "hash": new_hash}
 
 
 @router.get("/files/raw")
 async def api_raw_file(
-    path: str = Query(...), _user: dict = Depends(get_current_user)
+    request: Request, path: str = Query(...), _user: dict = Depends(get_current_user)
 ):
     validated = _validate_file_path(path)
-    if not os.path.isfile(validated):
-        raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(validated)
+    st = await run_fs("stat", _stat_file, validated)
+    return file_response(request, validated, st)
+
+
+# --- ZIP Download ---
+
+ZIP_MAX_PATHS = 1000
+
+
+class ZipRequest(BaseModel):
+    paths: list[str] = Field(..., min_length=1, max_length=ZIP_MAX_PATHS)
+
+
+def _prepare_zip(paths: list[str], roots: list[str]) -> tuple[str, str]:
+    """선택 항목을 검증하고 (프로젝트 루트, 내려받을 파일 이름)을 반환한다."""
+    projects = {_project_root_for(p, roots) for p in paths}
+    if len(projects) > 1:
+        raise HTTPException(status_code=400, detail="Selection spans several projects")
+    for p in paths:
+        if not os.path.exists(p):
+            raise HTTPException(status_code=404, detail=f"Not found: {p}")
+    root = projects.pop()
+    base = paths[0] if len(paths) == 1 else os.path.commonpath(paths)
+    return root, f"{os.path.basename(base) or 'download'}.zip"
+
+
+def _next_chunk(chunks) -> bytes:
+    return next(chunks, b"")
+
+
+@router.post("/files/zip")
+async def api_zip_files(req: ZipRequest, _user: dict = Depends(get_current_user)):
+    """디렉터리나 여러 항목을 ZIP으로 묶어 만드는 대로 내려보낸다. 디스크에 임시 파일을 두지 않는다."""
+    roots = _project_roots()
+    paths = list(dict.fromkeys(_validate_file_path(p, roots) for p in req.paths))
+    root, filename = await run_fs("stat", _prepare_zip, paths, roots)
+    chunks = stream_zip(iter_zip_entries(root, paths))
+
+    async def stream():
+        try:
+            while chunk := await run_fs("zip", _next_chunk, chunks):
+                yield chunk
+        finally:
+            chunks.close()  # 클라이언트가 끊으면 열린 파일을 바로 닫는다
+
+    headers = {"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"}
+    return StreamingResponse(stream(), media_type="application/zip", headers=headers)
+
+
+# --- Large File Paging ---
+
+MAX_LINES_PER_REQUEST = 5000
+
+
+@router.get("/files/lines")
+async def api_read_lines(
+    path: str = Query(...),
+    start: int = Query(0, ge=0),
+    count: int = Query(200, ge=1, le=MAX_LINES_PER_REQUEST),
+    total: bool = Query(False),
+    _user: dict = Depends(get_current_user),
+) -> dict:
+    """줄 범위 읽기. 크기 제한이 없으며 total=true면 전체 줄 수를 세어 준다."""
+    validated = _validate_file_path(path)
+    await run_fs("stat", _stat_file, validated)
+    return await run_fs("read", line_reader.read_lines, validated, start, count, total)
+
+
+@router.get("/files/tail")
+async def api_tail_file(
+    path: str = Query(...),
+    lines: int = Query(100, ge=1, le=MAX_LINES_PER_REQUEST),
+    since: int | None = Query(None, ge=0),
+    _user: dict = Depends(get_current_user),
+) -> dict:
+    """since 없이 호출하면 마지막 lines줄, since(이전 응답의 offset)를 주면 그 뒤로 덧붙은 줄."""
+    validated = _validate_file_path(path)
+    await run_fs("stat", _stat_file, validated)
+    if since is None:
+        return await run_fs("read", line_reader.tail, validated, lines)
+    return await run_fs("read", line_reader.follow, validated, since)
+
+
+# --- Outline ---
+
+
+def _outline_file(validated: str) -> dict:
+    st = _stat_file(validated)
+    if st.st_size > MAX_OUTLINE_SIZE:
+        raise HTTPException(status_code=413, detail="File too large for outline")
+    return outline_cache.get(validated, st)
+
+
+@router.get("/files/outline")
+async def api_file_outline(
+    path: str = Query(...), _user: dict = Depends(get_current_user)
+) -> FastJSONResponse:
+    """파일의 심볼 트리. 줄 번호는 1부터이며 /files/lines?start=line-1 로 그 부분만 읽으면 된다."""
+    validated = _validate_file_path(path)
+    return FastJSONResponse(await run_fs("read", _outline_file, validated))
 
 
 # --- File CRUD ---
@@ -261,48 +667,124 @@ class FileRenameRequest(BaseModel):
     new_name: str
 
 
-@router.post("/files")
-async def api_create_file(
-    req: FileCreateRequest, _user: dict = Depends(get_current_user)
-):
-    validated = _validate_file_path(os.path.dirname(req.path))
-    target = os.path.join(validated, os.path.basename(req.path))
+def _create_entry(target: str, entry_type: str):
     if os.path.exists(target):
         raise HTTPException(status_code=409, detail="Already exists")
-    if req.type == "directory":
+    if entry_type == "directory":
         os.makedirs(target)
     else:
         with open(target, "w", encoding="utf-8") as f:
             f.write("")
+    listing_cache.invalidate(os.path.dirname(target))
+
+
+@router.post("/files")
+async def api_create_file(
+    req: FileCreateRequest, _user: dict = Depends(get_current_user)
+):
+    validated = _validate_file_path(os.path.dirname(req.path))
+    target = os.path.join(validated, os.path.basename(req.path))
+    await run_fs("create", _create_entry, target, req.type)
     return {"status": "created", "path": target.replace("\\", "/")}
 
 
+def _delete_job(validated: str):
+    def run(job: Job):
+        if not os.path.lexists(validated):
+            raise HTTPException(status_code=404, detail="Not found")
+        job.set_totals(*file_ops.scan_tree(validated))
+        try:
+            file_ops.remove_tree(validated, job)
+        finally:
+            listing_cache.invalidate(validated, recursive=True)
+            listing_cache.invalidate(os.path.dirname(validated))
+    return run
+
+
+def _submit_delete(path: str) -> Job:
+    validated = _validate_file_path(path)
+    return job_manager.submit("delete", {"path": validated}, _delete_job(validated))
+
+
+def _trash_entry(validated: str, root: str) -> dict | None:
+    item = trash.move_to_trash(validated, root)
+    if item is not None:
+        listing_cache.invalidate(validated, recursive=True)
+        listing_cache.invalidate(os.path.dirname(validated))
+    return item
+
+
 @router.delete("/files")
 async def api_delete_file(
     path: str = Query(...), _user: dict = Depends(get_current_user)
 ):
-    validated = _validate_file_path(path)
-    if not os.path.exists(validated):
-        raise HTTPException(status_code=404, detail="Not found")
-    if os.path.isdir(validated):
-        shutil.rmtree(validated)
-    else:
-        os.remove(validated)
+    """휴지통으로 옮긴다. 옮길 수 없는 경로(프로젝트 루트, 다른 파일시스템)는 바로 지운다."""
+    roots = _project_roots()
+    validated = _validate_file_path(path, roots)
+    item = await run_fs("delete", _trash_entry, validated, _project_root_for(validated, roots))
+    if item is not None:
+        return {"status": "deleted", "trash_id": item["id"]}
+    job = await job_manager.wait(_submit_delete(path).id)
+    _raise_job_error(job)
     return {"status": "deleted"}
 
 
-@router.patch("/files")
-async def api_rename_file(
-    req: FileRenameRequest, _user: dict = Depends(get_current_user)
-):
-    validated = _validate_file_path(req.path)
+# --- Trash ---
+
+
+@router.get("/trash")
+async def api_list_trash(_user: dict = Depends(get_current_user)) -> list[dict]:
+    return await run_fs("list", trash.list_items, _project_roots())
+
+
+def _restore_trash_item(item_id: str, roots: list[str]) -> str:
+    item_dir, meta = trash.find_item(item_id, roots)
+    original = _validate_file_path(meta["path"], roots)
+    parent = os.path.dirname(original)
+    dest = _resolve_copy_name(parent, meta["name"], meta["is_dir"])
+    trash.restore_item(item_dir, meta, dest)
+    listing_cache.invalidate(parent)
+    return dest
+
+
+@router.post("/trash/{item_id}/restore")
+async def api_restore_trash(item_id: str, _user: dict = Depends(get_current_user)) -> dict:
+    """원래 위치로 되돌린다. 그 자리에 이미 다른 것이 있으면 "name (1)" 식으로 이름을 바꾼다."""
+    dest = await run_fs("rename", _restore_trash_item, item_id, _project_roots())
+    return {"status": "restored", "path": dest.replace("\\", "/")}
+
+
+@router.delete("/trash/{item_id}", status_code=202)
+async def api_purge_trash(item_id: str, _user: dict = Depends(get_current_user)) -> dict:
+    """보관 기간을 기다리지 않고 지운다. 큰 항목일 수 있으므로 작업으로 실행한다."""
+    item_dir, meta = await run_fs("stat", trash.find_item, item_id, _project_roots())
+
+    def run(job: Job):
+        job.set_totals(*file_ops.scan_tree(item_dir))
+        trash.purge_item(item_dir, job)
+
+    return job_manager.submit("purge", {"path": meta["path"]}, run).to_dict()
+
+
+def _rename_entry(validated: str, new_name: str) -> str:
     if not os.path.exists(validated):
         raise HTTPException(status_code=404, detail="Not found")
     parent = os.path.dirname(validated)
-    new_path = os.path.join(parent, req.new_name)
+    new_path = os.path.join(parent, new_name)
     if os.path.exists(new_path):
         raise HTTPException(status_code=409, detail="Name already exists")
     os.rename(validated, new_path)
+    listing_cache.invalidate(validated, recursive=True)
+    listing_cache.invalidate(parent)
+    return new_path
+
+
+@router.patch("/files")
+async def api_rename_file(
+    req: FileRenameRequest, _user: dict = Depends(get_current_user)
+):
+    validated = _validate_file_path(req.path)
+    new_path = await run_fs("rename", _rename_entry, validated, req.new_name)
     return {"status": "renamed", "path": new_path.replace("\\", "/")}
 
 
@@ -314,60 +796,263 @@ class FileCopyRequest(BaseModel):
     destination: str  # directory to paste into
 
 
-def _resolve_copy_name(dest_dir: str, name: str, is_dir: bool) -> str:
-    """Return a non-conflicting path inside dest_dir for the given name."""
-    candidate = os.path.join(dest_dir, name)
-    if not os.path.exists(candidate):
-        return candidate
+def _resolve_copy_name(
+    dest_dir: str, name: str, is_dir: bool, taken: set[str] | None = None
+) -> str:
+    """Return a non-conflicting path inside dest_dir for the given name.
 
+    taken이 있으면 파일시스템 대신 그 이름 집합(dest_dir의 scandir 스냅샷)과 비교하고,
+    고른 이름을 집합에 추가한다.
+    """
+    def exists(candidate_name: str) -> bool:
+        if taken is not None:
+            return candidate_name in taken
+        return os.path.exists(os.path.join(dest_dir, candidate_name))
+
+    new_name = name
     stem, ext = (name, "") if is_dir else os.path.splitext(name)
     counter = 1
-    while True:
+    while exists(new_name):
         new_name = f"{stem} ({counter}){ext}"
-        candidate = os.path.join(dest_dir, new_name)
-        if not os.path.exists(candidate):
-            return candidate
         counter += 1
+    if taken is not None:
+        taken.add(new_name)
+    return os.path.join(dest_dir, new_name)
+
+
+def _place_file(tmp_path: str, dest_dir: str, filename: str) -> str:
+    """tmp_path를 dest_dir 안의 겹치지 않는 이름으로 원자적으로 옮긴다.
+
+    하드링크는 대상이 이미 있으면 실패하므로 이름 확인과 배치 사이에 생긴 파일도 덮어쓰지 않는다.
+    실패하면 tmp_path는 그대로 둔다 — 이어받기 업로드는 받은 내용을 잃지 않고 다시 시도한다.
+    """
+    src = tmp_path
+    try:
+        if os.stat(tmp_path).st_dev != os.stat(dest_dir).st_dev:
+            # 다른 장치(업로드 스테이징 영역)면 먼저 같은 디렉터리로 복사
+            fd, src = tempfile.mkstemp(prefix=".upload-", suffix=".tmp", dir=dest_dir)
+            os.close(fd)
+            shutil.copyfile(tmp_path, src)
+
+        stem, ext = os.path.splitext(filename)
+        counter = 0
+        while True:
+            name = filename if counter == 0 else f"{stem} ({counter}){ext}"
+            target = os.path.join(dest_dir, name)
+            try:
+                os.link(src, target)
+                os.remove(src)
+                break
+            except FileExistsError:
+                counter += 1
+            except OSError:
+                # 하드링크를 지원하지 않는 파일시스템
+                target = _resolve_copy_name(dest_dir, filename, is_dir=False)
+                os.replace(src, target)
+                break
+    except BaseException:
+        if src != tmp_path and os.path.exists(src):
+            os.remove(src)
+        raise
+    finally:
+        listing_cache.invalidate(dest_dir)
+    # 복사본이 자리를 잡은 뒤에야 원본(받아 둔 업로드)을 지운다
+    if src != tmp_path:
+        os.remove(tmp_path)
+    return target
+
+
+class _StagedUpload:
+    """받는 중인 multipart 파일 하나. 업로드 staging 디렉터리에 UPLOAD_CHUNK_SIZE씩 모아 쓴다."""
+
+    def __init__(self, filename: str):
+        self.filename = os.path.basename(filename or "untitled") or "untitled"
+        self.file = None
+        self.path: str | None = None
+        self.size = 0
+        self.buffer = bytearray()
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        if self.size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413, detail=f"File too large: {self.filename} (max 5MB)"
+            )
+        self.buffer += data
+        if len(self.buffer) >= uploads.UPLOAD_CHUNK_SIZE:
+            await self._flush()
+
+    async def _flush(self):
+        if self.file is None:
+            self.file, self.path = await run_fs("upload", uploads.open_staging)
+        data, self.buffer = bytes(self.buffer), bytearray()
+        if data:
+            await run_fs("upload", self.file.write, data)
+
+    async def place(self, dest_dir: str) -> str:
+        await self._flush()
+        await run_fs("upload", self.file.close)
+        return await run_fs("upload", _place_file, self.path, dest_dir, self.filename)
+
+    def discard(self):
+        if self.file is not None:
+            self.file.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
 
 
 @router.post("/files/upload")
 async def api_upload_files(
+    request: Request,
     path: str = Query(...),
-    files: list[UploadFile] = File(default=[]),
     _user: dict = Depends(get_current_user),
 ):
+    """multipart의 파일들을 본문이 오는 대로 받아, 하나가 끝날 때마다 dest_dir에 배치한다.
+
+    크기는 바이트가 올 때마다 재므로 MAX_FILE_SIZE를 넘으면 나머지를 받지 않고 413을 돌려준다.
+    """
     dest_dir = _validate_file_path(path)
-    if not os.path.isdir(dest_dir):
+    if not await run_fs("stat", os.path.isdir, dest_dir):
         raise HTTPException(status_code=400, detail="Destination is not a directory")
 
-    if not files:
+    parts = uploads.MultipartFiles(request.headers.get("content-type", ""))
+    uploaded = []
+    current: _StagedUpload | None = None
+    try:
+        async for chunk in request.stream():
+            for event in parts.feed(chunk):
+                if event[0] == "file":
+                    current = _StagedUpload(event[1])
+                elif event[0] == "data":
+                    await current.write(event[1])
+                else:
+                    target = await current.place(dest_dir)
+                    current = None
+                    uploaded.append(target.replace("\\", "/"))
+        parts.finish()
+    except BaseException:
+        if current is not None:
+            await run_fs("upload", current.discard)
+        raise
+
+    if not uploaded:
         raise HTTPException(status_code=400, detail="No files provided")
+    return {"status": "uploaded", "paths": uploaded}
 
-    uploaded = []
-    for file in files:
-        content = await file.read()
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large: {file.filename} (max 5MB)",
-            )
-        filename = os.path.basename(file.filename or "untitled") or "untitled"
-        is_dir = False
-        target = _resolve_copy_name(dest_dir, filename, is_dir)
-        with open(target, "wb") as f:
-            f.write(content)
-        uploaded.append(target.replace("\\", "/"))
 
-    return {"status": "uploaded", "paths": uploaded}
+# --- Resumable Upload ---
+# 1) POST /uploads {path, filename, size} → {id, offset: 0, chunk_size}
+# 2) PUT /uploads/{id}?offset=N 본문에 이어질 바이트 (offset이 어긋나면 409 + 현재 offset)
+# 3) 끊기면 GET /uploads/{id} 로 offset을 확인하고 2)를 반복
+# 4) offset == size가 되면 파일이 대상 디렉터리에 배치되고 status가 "completed"가 된다
 
+_active_uploads: set[str] = set()
+
+
+class UploadCreateRequest(BaseModel):
+    path: str  # destination directory
+    filename: str
+    size: int = Field(ge=0)
 
-@router.post("/files/copy")
-async def api_copy_file(
-    req: FileCopyRequest, _user: dict = Depends(get_current_user)
-):
-    src = _validate_file_path(req.source)
-    dest_dir = _validate_file_path(req.destination)
 
+@router.post("/uploads")
+async def api_create_upload(
+    req: UploadCreateRequest, _user: dict = Depends(get_current_user)
+) -> dict:
+    dest_dir = _validate_file_path(req.path)
+    if not await run_fs("stat", os.path.isdir, dest_dir):
+        raise HTTPException(status_code=400, detail="Destination is not a directory")
+    filename = os.path.basename(req.filename) or "untitled"
+    meta = await run_fs("upload", uploads.create_upload, dest_dir, filename, req.size)
+    if req.size == 0:
+        return await _finish_upload(meta)
+    return {**meta, "status": "pending"}
+
+
+@router.get("/uploads/{upload_id}")
+async def api_get_upload(upload_id: str, _user: dict = Depends(get_current_user)) -> dict:
+    meta = await run_fs("upload", uploads.get_upload, upload_id)
+    return {**meta, "status": "pending"}
+
+
+@router.delete("/uploads/{upload_id}")
+async def api_cancel_upload(upload_id: str, _user: dict = Depends(get_current_user)):
+    if upload_id in _active_uploads:
+        raise HTTPException(status_code=409, detail="Upload in progress")
+    await run_fs("upload", uploads.get_upload, upload_id)
+    await run_fs("upload", uploads.discard_upload, upload_id)
+    return {"status": "cancelled"}
+
+
+async def _finish_upload(meta: dict) -> dict:
+    dest_dir = _validate_file_path(meta["dest_dir"])
+    part = uploads.part_path(meta["id"])
+    target = await run_fs("upload", _place_file, part, dest_dir, meta["filename"])
+    await run_fs("upload", uploads.discard_upload, meta["id"])
+    return {**meta, "offset": meta["size"], "status": "completed",
+            "path": target.replace("\\", "/")}
+
+
+@router.put("/uploads/{upload_id}")
+async def api_append_upload(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    _user: dict = Depends(get_current_user),
+) -> dict:
+    if upload_id in _active_uploads:
+        raise HTTPException(status_code=409, detail="Upload in progress")
+    _active_uploads.add(upload_id)
+    try:
+        meta = await run_fs("upload", uploads.get_upload, upload_id)
+        if offset != meta["offset"]:
+            raise HTTPException(
+                status_code=409,
+                detail="Offset mismatch",
+                headers={"Upload-Offset": str(meta["offset"])},
+            )
+        f = await run_fs("upload", uploads.open_part, upload_id, offset)
+        position = offset
+        buffer = bytearray()
+        try:
+            async for chunk in request.stream():
+                if position + len(buffer) + len(chunk) > meta["size"]:
+                    raise HTTPException(status_code=413, detail="More data than declared size")
+                buffer += chunk
+                if len(buffer) >= uploads.UPLOAD_CHUNK_SIZE:
+                    await run_fs("upload", f.write, bytes(buffer))
+                    position += len(buffer)
+                    buffer.clear()
+        finally:
+            # 연결이 끊겨도 받은 데이터는 남겨 두어 이어 올릴 수 있게 한다
+            if buffer:
+                await run_fs("upload", f.write, bytes(buffer))
+                position += len(buffer)
+            await run_fs("upload", f.close)
+
+        meta["offset"] = position
+        if position == meta["size"]:
+            return await _finish_upload(meta)
+        return {**meta, "status": "pending"}
+    finally:
+        _active_uploads.discard(upload_id)
+
+
+def _prepare_copy(src: str, dest_dir: str) -> str:
+    """검증 후 복사할 대상 경로를 정한다."""
+    _check_copy(src, dest_dir)
+    _check_copyable(src)
+    return _resolve_copy_name(dest_dir, os.path.basename(src), os.path.isdir(src))
+
+
+def _check_copyable(src: str):
+    # FIFO·소켓·장치 파일은 열면 막히거나 복사할 내용이 없다 (트리 안의 것은 copy_tree가 다룬다)
+    mode = os.lstat(src).st_mode
+    if not (stat.S_ISDIR(mode) or stat.S_ISREG(mode) or stat.S_ISLNK(mode)):
+        raise HTTPException(status_code=400, detail="Not a regular file")
+
+
+def _check_copy(src: str, dest_dir: str, verb: str = "copy"):
     if not os.path.exists(src):
         raise HTTPException(status_code=404, detail="Source not found")
     if not os.path.isdir(dest_dir):
@@ -379,17 +1064,427 @@ async def api_copy_file(
     if os.path.isdir(src) and (
         norm_dest == norm_src or norm_dest.startswith(norm_src + os.sep)
     ):
-        raise HTTPException(status_code=400, detail="Cannot copy directory into itself")
+        raise HTTPException(status_code=400, detail=f"Cannot {verb} directory into itself")
 
-    is_dir = os.path.isdir(src)
-    target = _resolve_copy_name(dest_dir, os.path.basename(src), is_dir)
 
+def _copy_into(job: Job, src: str, target: str, move: bool = False) -> dict:
+    """src를 target으로 복사한다. move면 다 복사한 뒤 src를 지운다 (rename이 EXDEV일 때).
+
+    건너뛴 소켓·장치 파일은 결과의 "skipped"에 담는다.
+    """
+    job.set_totals(*file_ops.scan_tree(src))
     try:
-        if is_dir:
-            shutil.copytree(src, target)
+        skipped = file_ops.copy_tree(src, target, job)
+        if move:
+            file_ops.remove_tree(src, None)
+    finally:
+        listing_cache.invalidate(os.path.dirname(target))
+        if move:
+            listing_cache.invalidate(src, recursive=True)
+            listing_cache.invalidate(os.path.dirname(src))
+    result = {"path": target.replace("\\", "/")}
+    if skipped:
+        result["skipped"] = [p.replace("\\", "/") for p in skipped]
+    return result
+
+
+def _copy_job(src: str, dest_dir: str):
+    def run(job: Job) -> dict:
+        return _copy_into(job, src, _prepare_copy(src, dest_dir))
+    return run
+
+
+def _submit_copy(req: FileCopyRequest) -> Job:
+    src = _validate_file_path(req.source)
+    dest_dir = _validate_file_path(req.destination)
+    params = {"source": src, "destination": dest_dir}
+    return job_manager.submit("copy", params, _copy_job(src, dest_dir))
+
+
+@router.post("/files/copy")
+async def api_copy_file(
+    req: FileCopyRequest, _user: dict = Depends(get_current_user)
+):
+    job = await job_manager.wait(_submit_copy(req).id)
+    _raise_job_error(job)
+    return {"status": "copied", "path": job.result["path"]}
+
+
+# --- Jobs ---
+# /files/copy와 DELETE /files는 작업이 끝날 때까지 기다린다. 큰 트리는 /jobs/*로 제출하고
+# GET /jobs/{id} 또는 /ws/jobs/{id}로 진행률을 받는다.
+
+
+def _raise_job_error(job: Job):
+    if job.status == "failed":
+        raise HTTPException(status_code=job.error_status or 500, detail=job.error)
+    if job.status == "cancelled":
+        raise HTTPException(status_code=409, detail="Operation cancelled")
+
+
+class DeleteJobRequest(BaseModel):
+    path: str
+
+
+@router.post("/jobs/copy", status_code=202)
+async def api_submit_copy(req: FileCopyRequest, _user: dict = Depends(get_current_user)):
+    return _submit_copy(req).to_dict()
+
+
+@router.post("/jobs/delete", status_code=202)
+async def api_submit_delete(req: DeleteJobRequest, _user: dict = Depends(get_current_user)):
+    return _submit_delete(req.path).to_dict()
+
+
+@router.get("/jobs")
+async def api_list_jobs(_user: dict = Depends(get_current_user)) -> list[dict]:
+    return job_manager.list_jobs()
+
+
+@router.get("/jobs/{job_id}")
+async def api_get_job(job_id: str, _user: dict = Depends(get_current_user)) -> dict:
+    return job_manager.get(job_id).to_dict()
+
+
+@router.delete("/jobs/{job_id}")
+async def api_cancel_job(job_id: str, _user: dict = Depends(get_current_user)) -> dict:
+    return job_manager.cancel(job_id).to_dict()
+
+
+# --- Batch ---
+
+BATCH_MAX_OPS = 1000
+
+
+class BatchOp(BaseModel):
+    op: Literal["copy", "move", "delete", "create"]
+    path: str | None = None  # delete / create
+    source: str | None = None  # copy / move
+    destination: str | None = None  # copy / move: directory to put it in
+    type: str = "file"  # create: "file" or "directory"
+
+
+class BatchRequest(BaseModel):
+    ops: list[BatchOp] = Field(min_length=1, max_length=BATCH_MAX_OPS)
+
+
+class _Batch:
+    """한 번의 배치 실행. 프로젝트 목록은 한 번만 읽고, 이름 충돌은 디렉터리별 scandir
+    스냅샷 하나로 판단한다. 항목마다 worker 스레드에서 실행된다.
+
+    트리 복사(copy, 장치가 다른 move)는 여기서 하지 않고 대상 이름만 정해 job으로 넘긴다 —
+    pending에 (종류, 매개변수, 작업 함수)가 남는다.
+    """
+
+    def __init__(self, roots: list[str]):
+        self.roots = roots
+        self._names: dict[str, set[str]] = {}
+        self.touched: set[str] = set()
+        self.removed: set[str] = set()
+        self.pending: tuple[str, dict, Callable[[Job], dict]] | None = None
+
+    def names(self, d: str) -> set[str]:
+        if d not in self._names:
+            with os.scandir(d) as it:
+                self._names[d] = {e.name for e in it}
+        return self._names[d]
+
+    def _forget(self, path: str):
+        parent = os.path.dirname(path)
+        self._names.get(parent, set()).discard(os.path.basename(path))
+        prefix = path + os.sep
+        for d in [d for d in self._names if d == path or d.startswith(prefix)]:
+            del self._names[d]
+        self.touched.add(parent)
+        self.removed.add(path)
+
+    def _require(self, value: str | None, field: str) -> str:
+        if not value:
+            raise HTTPException(status_code=400, detail=f"{field} is required")
+        return _validate_file_path(value, self.roots)
+
+    def run(self, op: BatchOp) -> dict:
+        if op.op == "create":
+            return self.create(op)
+        if op.op == "delete":
+            return self.delete(self._require(op.path, "path"))
+        src = self._require(op.source, "source")
+        dest_dir = self._require(op.destination, "destination")
+        return self.copy(src, dest_dir) if op.op == "copy" else self.move(src, dest_dir)
+
+    def create(self, op: BatchOp) -> dict:
+        if not op.path:
+            raise HTTPException(status_code=400, detail="path is required")
+        parent = _validate_file_path(os.path.dirname(op.path), self.roots)
+        name = os.path.basename(op.path)
+        names = self.names(parent)
+        if name in names:
+            raise HTTPException(status_code=409, detail="Already exists")
+        target = os.path.join(parent, name)
+        if op.type == "directory":
+            os.mkdir(target)
         else:
-            shutil.copy2(src, target)
+            with open(target, "x", encoding="utf-8"):
+                pass
+        names.add(name)
+        self.touched.add(parent)
+        return {"path": target}
+
+    def copy(self, src: str, dest_dir: str) -> dict:
+        _check_copy(src, dest_dir)
+        _check_copyable(src)
+        is_dir = os.path.isdir(src)
+        target = _resolve_copy_name(dest_dir, os.path.basename(src), is_dir, self.names(dest_dir))
+        self.touched.add(dest_dir)
+        params = {"source": src, "destination": dest_dir}
+        self.pending = ("copy", params, lambda job: _copy_into(job, src, target))
+        return {"path": target}
+
+    def move(self, src: str, dest_dir: str) -> dict:
+        _check_copy(src, dest_dir, verb="move")
+        if os.path.dirname(src) == dest_dir:
+            return {"path": src}
+        is_dir = os.path.isdir(src)
+        target = _resolve_copy_name(dest_dir, os.path.basename(src), is_dir, self.names(dest_dir))
+        try:
+            os.rename(src, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            params = {"source": src, "destination": dest_dir}
+            self.pending = ("move", params, lambda job: _copy_into(job, src, target, move=True))
+        self._forget(src)
+        self.touched.add(dest_dir)
+        return {"path": target}
+
+    def delete(self, validated: str) -> dict:
+        if not os.path.lexists(validated):
+            raise HTTPException(status_code=404, detail="Not found")
+        item = trash.move_to_trash(validated, _project_root_for(validated, self.roots))
+        if item is None:
+            file_ops.remove_tree(validated, None)
+        self._forget(validated)
+        return {"path": validated, "trash_id": item["id"] if item else None}
+
+
+def _run_batch_op(batch: _Batch, op: BatchOp) -> dict:
+    batch.pending = None
+    try:
+        result = batch.run(op)
+    except HTTPException as e:
+        batch.pending = None
+        return {"ok": False, "status": e.status_code, "error": e.detail}
     except PermissionError:
-        raise HTTPException(status_code=403, detail="Permission denied")
+        batch.pending = None
+        return {"ok": False, "status": 403, "error": "Permission denied"}
+    except OSError as e:
+        batch.pending = None
+        return {"ok": False, "status": 500, "error": str(e)}
+    result["path"] = result["path"].replace("\\", "/")
+    return {"ok": True, **result}
+
+
+def _invalidate_batch(batch: _Batch):
+    for path in batch.removed:
+        listing_cache.invalidate(path, recursive=True)
+    for d in batch.touched:
+        listing_cache.invalidate(d)
+
+
+async def _run_batch_job(result: dict, kind: str, params: dict, func) -> dict:
+    """트리 복사를 job으로 실행하고 끝날 때까지 기다린다. 기다리는 동안 fs worker를 잡지 않는다."""
+    job = await job_manager.wait(job_manager.submit(kind, params, func).id)
+    if job.status == "completed":
+        return {**result, "job_id": job.id}
+    if job.status == "cancelled":
+        return {"ok": False, "status": 409, "error": "Operation cancelled", "job_id": job.id}
+    return {"ok": False, "status": job.error_status or 500, "error": job.error, "job_id": job.id}
+
+
+@router.post("/files/batch")
+async def api_batch_files(req: BatchRequest, _user: dict = Depends(get_current_user)) -> dict:
+    """여러 copy/move/delete/create를 순서대로 실행하고 항목별 결과를 돌려준다.
+
+    한 항목이 실패해도 나머지는 계속 실행한다. delete는 DELETE /files처럼 휴지통으로 옮긴다.
+    copy와 장치가 다른 move는 /files/copy처럼 job으로 실행하며 결과에 job_id가 붙는다 —
+    그동안 GET /jobs/{id}로 진행률을 보거나 취소할 수 있다.
+    """
+    batch = _Batch(_project_roots())
+    results = []
+    try:
+        for op in req.ops:
+            result = await run_fs("batch", _run_batch_op, batch, op)
+            if batch.pending is not None:
+                result = await _run_batch_job(result, *batch.pending)
+            results.append(result)
+    finally:
+        await run_fs("batch", _invalidate_batch, batch)
+    return {"results": results}
+
+
+# --- Search ---
+
+SEARCH_CHUNK = 20  # executor 호출 한 번에 가져오는 결과 수
+MAX_SEARCH_MATCHES = 5000
+
+
+def _project_dir(project_id: str) -> str:
+    project = get_project(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not os.path.isdir(project["path"]):
+        raise HTTPException(status_code=400, detail=f"Directory not found: {project['path']}")
+    return project["path"]
+
+
+def _search_index_for(project_id: str):
+    return search_indexes.get(project_id, _project_dir(project_id))
+
+
+def _next_results(results, n: int) -> list[dict]:
+    chunk = []
+    for item in results:
+        chunk.append(item)
+        if len(chunk) >= n:
+            break
+    return chunk
+
 
-    return {"status": "copied", "path": target.replace("\\", "/")}
+@router.get("/search")
+async def api_search(
+    project_id: str = Query(...),
+    q: str = Query(..., min_length=1),
+    regex: bool = Query(False),
+    case: bool = Query(False),
+    context: int = Query(2, ge=0, le=10),
+    glob: str | None = Query(None),
+    limit: int = Query(500, ge=1, le=MAX_SEARCH_MATCHES),
+    _user: dict = Depends(get_current_user),
+):
+    """프로젝트 전문 검색. 파일별 결과를 한 줄에 하나씩(NDJSON) 찾는 대로 내보낸다."""
+    try:
+        compile_query(q, regex, case)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid regex: {e}")
+    index = await run_fs("search", _search_index_for, project_id)
+    results = index.search(
+        q, regex=regex, case_sensitive=case, context=context, glob=glob, max_matches=limit
+    )
+
+    async def stream():
+        try:
+            while chunk := await run_fs("search", _next_results, results, SEARCH_CHUNK):
+                yield b"".join(dumps(item) + b"\n" for item in chunk)
+        finally:
+            results.close()  # 클라이언트가 끊으면 DB 연결을 바로 닫는다
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/search/status")
+async def api_search_status(
+    project_id: str = Query(...), _user: dict = Depends(get_current_user)
+) -> dict:
+    index = await run_fs("search", _search_index_for, project_id)
+    return await run_fs("search", index.status)
+
+
+@router.get("/files/find")
+async def api_find_files(
+    project_id: str = Query(...),
+    q: str = Query(""),
+    limit: int = Query(50, ge=1, le=500),
+    _user: dict = Depends(get_current_user),
+) -> dict:
+    """빠른 파일 열기. 경로에 쿼리 글자가 순서대로 나오는 파일을 점수순으로 반환한다.
+
+    첫 색인이 끝나기 전에는 빈 결과와 state="building"을 바로 돌려준다 — 잠시 뒤 다시 묻는다.
+    """
+    root = await run_fs("stat", _project_dir, project_id)
+    # 루트가 바뀌었으면 예전 색인을 닫는다 (감시·빌드 스레드 join)
+    index = await run_fs("search", path_indexes.get, project_id, root)
+    return await run_fs("search", index.find, q, limit)
+
+
+# --- Git ---
+
+
+@router.get("/git/status")
+async def api_git_status(
+    request: Request, project_id: str = Query(...), _user: dict = Depends(get_current_user)
+):
+    """프로젝트의 변경 파일 전체 ({경로: 표시}). version이 같으면 304로 끝난다."""
+    root = await run_fs("stat", _project_dir, project_id)
+    git = await run_fs("git", git_statuses.get, root)
+    data = await run_fs("git", git.status)
+    etag = f'"git-{id(git):x}-{data["version"]}"'
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return FastJSONResponse(data, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+@router.get("/git/diff")
+async def api_git_diff(path: str = Query(...), _user: dict = Depends(get_current_user)) -> dict:
+    """파일 하나의 HEAD 대비 diff hunk. 요청할 때만 계산하고 파일·index가 같으면 캐시를 쓴다."""
+    roots = _project_roots()
+    validated = _validate_file_path(path, roots)
+    git = await run_fs("git", git_statuses.get, _project_root_for(validated, roots))
+    return await run_fs("git", git.diff, validated)
+
+
+# --- Health ---
+
+
+@router.get("/health")
+async def api_health() -> dict:
+    """인증 없이 호출하는 상태 확인. 루프 지연 p99가 임계값을 넘으면 degraded."""
+    return {
+        "status": "ok" if loop_monitor.healthy() else "degraded",
+        "uptime_s": round(time.time() - loop_monitor.started_at, 1),
+        "loop": {
+            "running": loop_monitor.running,
+            **loop_monitor.lag(),
+            "stalls": loop_monitor.stall_count,
+        },
+    }
+
+
+# --- Metrics ---
+
+
+@router.get("/metrics")
+async def api_metrics(_user: dict = Depends(get_current_user)) -> dict:
+    return {
+        "fs": fs_metrics(),
+        "dir_cache": listing_cache.stats(),
+        "jobs": job_manager.stats(),
+        "search": search_indexes.stats(),
+        "path_index": path_indexes.stats(),
+        "sniff": sniff_cache.stats(),
+        "compression": compressed_cache.stats(),
+        "git": git_statuses.stats(),
+        "outline": outline_cache.stats(),
+        "loop": loop_monitor.stats(),
+        "routes": route_stats.stats(),
+    }
+
+
+@router.get("/profile")
+async def api_profile(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    idle: bool = Query(False),
+    _user: dict = Depends(get_current_user),
+) -> PlainTextResponse:
+    """seconds 동안 서버 전체 스레드를 샘플링해 collapsed-stack 텍스트로 돌려준다.
+
+    curl -H "Authorization: Bearer $T" ".../api/profile?seconds=30" | flamegraph.pl > out.svg
+    """
+    if profiler.busy:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        counts = await asyncio.to_thread(profiler.sample, seconds, interval_ms / 1000, idle)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(collapse(counts))
@@ -5,18 +5,44 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from backend.api import router as api_router
 from backend.auth import ensure_users_file
-from backend.ws import router as ws_router
+from backend.compress import CompressionMiddleware
+from backend.dir_cache import listing_cache
+from backend.fast_json import FastJSONResponse
+from backend.fs_events import fs_events
+from backend.fs_executor import ClientScopeMiddleware, shutdown_fs_executor
+from backend.git_status import git_statuses
+from backend.jobs import job_manager
+from backend.loop_monitor import LoopMonitorMiddleware, loop_monitor
+from backend.path_index import path_indexes
+from backend.route_stats import RouteTimingMiddleware
+from backend.search_index import search_indexes
 from backend.session_manager import shutdown_all_sessions
+from backend.static_site import StaticSite, serve_frontend_enabled
+from backend.store import close_storage, load_projects
+from backend.trash import trash_purger
+from backend.ws import router as ws_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     ensure_users_file()
+    trash_purger.start(lambda: [p["path"] for p in load_projects()])
+    await loop_monitor.start()
     yield
+    await loop_monitor.stop()
+    trash_purger.stop()
     await shutdown_all_sessions()
+    fs_events.shutdown()
+    job_manager.shutdown()
+    search_indexes.close()
+    path_indexes.close()
+    git_statuses.close()
+    listing_cache.close()
+    shutdown_fs_executor()
+    close_storage()
 
 
-app = FastAPI(title="keep_vibing", lifespan=lifespan)
+app = FastAPI(title="keep_vibing", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +51,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 요청마다 클라이언트를 정해 run_fs가 기기별 동시 실행 상한을 적용한다
+app.add_middleware(ClientScopeMiddleware)
+app.add_middleware(CompressionMiddleware)
+# 압축 바깥에서 재므로 응답 크기는 실제로 보낸 바이트다
+app.add_middleware(RouteTimingMiddleware)
+# 가장 바깥에 두어 요청이 끝날 때까지(압축 포함) 처리 중으로 본다
+app.add_middleware(LoopMonitorMiddleware)
 
 app.include_router(api_router, prefix="/api")
 app.include_router(ws_router)
+
+# 운영 모드: 빌드된 프런트엔드를 같은 포트에서 서빙한다. 라우터 뒤에 두어야 API가 먼저 매칭된다
+if serve_frontend_enabled():
+    app.mount("/", StaticSite(), name="frontend")
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 import os
 import secrets
@@ -10,11 +9,11 @@ import bcrypt
 import jwt
 from fastapi import HTTPException, Request
 
+from backend import store
 from backend.store import DATA_DIR, _ensure_data_dir
 
 logger = logging.getLogger(__name__)
 
-USERS_FILE = DATA_DIR / "users.json"
 SECRET_KEY_FILE = DATA_DIR / "secret.key"
 ALGORITHM = "HS256"
 TOKEN_EXPIRE_HOURS = 72
@@ -39,18 +38,15 @@ def verify_password(password: str, password_hash: str) -> bool:
 
 
 def _load_users() -> list[dict]:
-    if not USERS_FILE.exists():
-        return []
-    return json.loads(USERS_FILE.read_text(encoding="utf-8"))
+    return store.get_storage().load_users()
 
 
 def _save_users(users: list[dict]):
-    _ensure_data_dir()
-    USERS_FILE.write_text(json.dumps(users, ensure_ascii=False, indent=2), encoding="utf-8")
+    store.get_storage().save_users(users)
 
 
 def ensure_users_file():
-    """users.json이 없거나 비어있으면 기본 계정(admin/admin) 생성."""
+    """저장된 계정이 없으면 기본 계정(admin/admin) 생성."""
     users = _load_users()
     if users:
         return
@@ -68,41 +64,42 @@ def _shutdown_server():
 
 
 async def authenticate(username: str, password: str) -> dict | None:
-    users = _load_users()
-    for u in users:
-        if u["username"] == username:
-            if u.get("locked"):
-                raise HTTPException(status_code=423, detail="Account locked")
-
-            is_valid = await asyncio.to_thread(verify_password, password, u["password_hash"])
-            if is_valid:
-                u["failed_attempts"] = 0
-                _save_users(users)
-                return {"username": u["username"]}
-
-            # 실패 횟수 증가
-            u["failed_attempts"] = u.get("failed_attempts", 0) + 1
-            if u["failed_attempts"] >= MAX_FAILED_ATTEMPTS:
-                u["locked"] = True
-                _save_users(users)
-                _shutdown_server()
-                raise HTTPException(status_code=423, detail="Account locked")
-            _save_users(users)
-            return None
+    storage = store.get_storage()
+    user = storage.get_user(username)
+    if not user:
+        return None
+    if user.get("locked"):
+        raise HTTPException(status_code=423, detail="Account locked")
+
+    is_valid = await asyncio.to_thread(verify_password, password, user["password_hash"])
+    if is_valid:
+        storage.update_user(username, lambda u: u.update(failed_attempts=0))
+        return {"username": user["username"]}
+
+    # 실패 횟수 증가 — 읽기/수정/쓰기를 한 트랜잭션에서 처리해 동시 요청의 증가분이 유실되지 않게 함
+    def _record_failure(u: dict):
+        u["failed_attempts"] = u.get("failed_attempts", 0) + 1
+        if u["failed_attempts"] >= MAX_FAILED_ATTEMPTS:
+            u["locked"] = True
+
+    updated = storage.update_user(username, _record_failure)
+    if updated and updated.get("locked"):
+        _shutdown_server()
+        raise HTTPException(status_code=423, detail="Account locked")
     return None
 
 
 async def change_password(username: str, old_password: str, new_password: str) -> bool:
-    users = _load_users()
-    for u in users:
-        if u["username"] == username:
-            is_valid = await asyncio.to_thread(verify_password, old_password, u["password_hash"])
-            if not is_valid:
-                return False
-            u["password_hash"] = await asyncio.to_thread(hash_password, new_password)
-            _save_users(users)
-            return True
-    return False
+    storage = store.get_storage()
+    user = storage.get_user(username)
+    if not user:
+        return False
+    is_valid = await asyncio.to_thread(verify_password, old_password, user["password_hash"])
+    if not is_valid:
+        return False
+    new_hash = await asyncio.to_thread(hash_password, new_password)
+    storage.update_user(username, lambda u: u.update(password_hash=new_hash))
+    return True
 
 
 def create_token(username: str) -> str:
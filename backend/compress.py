@@ -0,0 +1,324 @@
+"""Accept-Encoding에 맞춰 응답을 zstd/brotli/gzip으로 압축하는 ASGI 미들웨어.
+
+gzip은 표준 라이브러리라 항상 쓸 수 있고, brotli와 zstd는 모듈이 있을 때만 협상 대상이 된다.
+- MINIMUM_SIZE보다 작은 본문, 이미 인코딩된 응답, 부분 응답(206), 압축해도 줄지 않는 형식은
+  그대로 보낸다.
+- 한 번에 끝나는 본문 중 ETag가 있는 것(파일 내용 등)은 압축 결과를 캐시한다 — 같은 ETag면
+  내용도 같으므로 다시 압축할 필요가 없고, 그래서 더 높은 압축 수준을 쓴다.
+- 스트리밍 응답(검색 NDJSON 등)은 조각마다 flush해서 압축해도 스트리밍이 유지된다.
+  지금까지 흘려보낸 양이 OFFLOAD_SIZE를 넘으면(큰 파일 다운로드) 조각 압축도 스레드에서 한다.
+"""
+
+import asyncio
+import threading
+import zlib
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+MINIMUM_SIZE = 1024
+OFFLOAD_SIZE = 256 * 1024  # 이보다 큰 본문은 스레드에서 압축해 이벤트 루프를 막지 않는다
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# 응답마다 압축하는 경우 / 캐시해 두고 재사용하는 경우의 수준
+LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+CACHED_LEVELS = {"zstd": 12, "br": 9, "gzip": 9}
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/wasm",
+    "image/svg+xml",
+}
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._c = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        if zstd is not None:
+            self._c = zstd.ZstdCompressor(level)
+            self._flush_block, self._flush_frame = (
+                zstd.ZstdCompressor.FLUSH_BLOCK, zstd.ZstdCompressor.FLUSH_FRAME
+            )
+        else:
+            self._c = zstandard.ZstdCompressor(level=level).compressobj()
+            self._flush_block, self._flush_frame = zstandard.COMPRESSOBJ_FLUSH_BLOCK, None
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._c.flush() if self._flush_frame is None else self._c.flush(self._flush_frame)
+
+
+# 같은 q 값이면 앞의 것을 고른다 (압축률과 속도 모두 zstd > br > gzip)
+ENCODERS = {"zstd": _Zstd, "br": _Brotli, "gzip": _Gzip}
+AVAILABLE = tuple(
+    name for name in ENCODERS
+    if name == "gzip" or (name == "br" and brotli) or (name == "zstd" and (zstd or zstandard))
+)
+
+
+def negotiate(accept_encoding: str, available: tuple[str, ...] = AVAILABLE) -> str | None:
+    """Accept-Encoding에서 q 값이 가장 높은 사용 가능한 인코딩. 없으면 None(identity)."""
+    q_values: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        q_values[name] = q
+    best, best_q = None, 0.0
+    for name in available:
+        q = q_values.get(name, q_values.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress_bytes(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    c = ENCODERS[encoding](LEVELS[encoding] if level is None else level)
+    return c.compress(data) + c.finish()
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+class CompressedCache:
+    """(URL, ETag, 인코딩) → 압축된 본문. 총 바이트 수 기준 LRU."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str, str]) -> bytes | None:
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: tuple[str, str, str], data: bytes):
+        if len(data) > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, dropped = self._items.popitem(last=False)
+                self._bytes -= len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+compressed_cache = CompressedCache()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = MINIMUM_SIZE,
+        cache: CompressedCache = compressed_cache,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _Responder(scope, send, encoding, self.minimum_size, self.cache)
+        await self.app(scope, receive, responder.send)
+
+
+def _compress_chunk(c, body: bytes, more_body: bool) -> bytes:
+    return c.compress(body) + (c.flush() if more_body else c.finish())
+
+
+class _Responder:
+    def __init__(
+        self, scope: Scope, send: Send, encoding: str, minimum_size: int, cache: CompressedCache
+    ):
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.start: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+        self.streamed = 0
+
+    def _cache_key(self, etag: str) -> tuple[str, str, str]:
+        query = self.scope.get("query_string", b"").decode("latin-1")
+        return f"{self.scope['path']}?{query}", etag, self.encoding
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            if not is_compressible(headers.get("content-type", "")):
+                self.passthrough = True
+            else:
+                mutable = MutableHeaders(raw=message["headers"])
+                if "accept-encoding" not in mutable.get("vary", "").lower():
+                    mutable.add_vary_header("Accept-Encoding")
+                self.passthrough = (
+                    "content-encoding" in headers
+                    or "content-range" in headers
+                    or message["status"] in (204, 206, 304)
+                )
+            if self.passthrough:
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            length = headers.get("content-length")
+            small = len(body) < self.minimum_size if not more_body else (
+                length is not None and int(length) < self.minimum_size
+            )
+            if small:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            etag = headers.get("etag")
+            self._set_encoded_headers(headers)
+            if not more_body:
+                # 강한 ETag만 바이트가 같음을 보장하므로 그때만 캐시한다
+                strong = etag if etag and not etag.startswith("W/") else None
+                data = await self._compress_whole(body, strong)
+                headers["Content-Length"] = str(len(data))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": data})
+                return
+            del headers["Content-Length"]
+            self.compressor = ENCODERS[self.encoding](LEVELS[self.encoding])
+            await self._send(start)
+
+        self.streamed += len(body)
+        if self.streamed > OFFLOAD_SIZE:
+            data = await asyncio.to_thread(_compress_chunk, self.compressor, body, more_body)
+        else:
+            data = _compress_chunk(self.compressor, body, more_body)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _set_encoded_headers(self, headers: MutableHeaders):
+        headers["Content-Encoding"] = self.encoding
+        # 압축된 표현은 바이트가 다르므로 ETag는 약한 비교용으로, Range는 지원하지 않는다
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        if "accept-ranges" in headers:
+            del headers["Accept-Ranges"]
+
+    async def _compress_whole(self, body: bytes, etag: str | None) -> bytes:
+        if etag is None:
+            level = LEVELS[self.encoding]
+        else:
+            key = self._cache_key(etag)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            level = CACHED_LEVELS[self.encoding]
+        if len(body) > OFFLOAD_SIZE:
+            data = await asyncio.to_thread(compress_bytes, body, self.encoding, level)
+        else:
+            data = compress_bytes(body, self.encoding, level)
+        if etag is not None:
+            self.cache.put(key, data)
+        return data
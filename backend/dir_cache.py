@@ -0,0 +1,228 @@
+"""디렉터리 목록 캐시.
+
+경로별로 정렬된 목록을 LRU로 보관한다. Linux에서는 캐시된 디렉터리마다 inotify watch를 걸어
+변경 이벤트로 무효화하고, inotify를 쓸 수 없으면 디렉터리 mtime 비교로 대체한다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from backend import inotify
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES = 200_000  # 모든 디렉터리의 항목 수 합계 상한
+# 캐시 시점과 mtime이 이 범위 안이면 같은 타임스탬프 안에서 또 바뀌었을 수 있으므로 믿지 않는다
+RACY_WINDOW_NS = 1_000_000_000
+
+
+@dataclass
+class _CachedListing:
+    entries: list[dict]
+    mtime_ns: int
+    cached_at_ns: int
+    wd: int | None = None
+
+
+class DirListingCache:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, use_inotify: bool | None = None):
+        self.max_entries = max_entries
+        self._use_inotify = inotify.is_available() if use_inotify is None else use_inotify
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, _CachedListing] = OrderedDict()
+        # 읽는 중인 경로별 stale 플래그 — 읽는 사이 무효화되면 결과를 저장하지 않는다
+        self._loading: dict[str, list[list[bool]]] = {}
+        self._total_entries = 0
+        self._wd_to_path: dict[int, str] = {}
+        self._inotify: inotify.Inotify | None = None
+        self._watch_thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    # --- Public API ---
+
+    def get(self, path: str, loader: Callable[[str], list[dict]]) -> list[dict]:
+        """캐시된 목록을 반환하고, 없거나 낡았으면 loader(path)로 다시 읽어 저장한다.
+
+        반환된 목록은 캐시와 공유되므로 호출 측에서 수정하면 안 된다.
+        """
+        path = os.path.normpath(path)
+        watched = self._use_inotify and self._ensure_watcher()
+        with self._lock:
+            item = self._items.get(path)
+            if item is not None and item.wd is not None:
+                self._items.move_to_end(path)
+                self.hits += 1
+                return item.entries
+
+        st = os.stat(path)
+        if item is not None and item.wd is None and self._mtime_still_valid(item, st):
+            with self._lock:
+                if self._items.get(path) is item:
+                    self._items.move_to_end(path)
+                    self.hits += 1
+                    return item.entries
+
+        stale = [False]
+        with self._lock:
+            self.misses += 1
+            self._loading.setdefault(path, []).append(stale)
+        # watch를 먼저 걸고 읽어야 읽는 도중의 변경도 이벤트로 잡힌다
+        wd = self._add_watch(path) if watched else None
+        try:
+            entries = loader(path)
+        finally:
+            with self._lock:
+                cells = self._loading[path]
+                cells.remove(stale)
+                if not cells:
+                    del self._loading[path]
+        with self._lock:
+            if not stale[0]:
+                self._store(path, _CachedListing(entries, st.st_mtime_ns, time.time_ns(), wd))
+            elif wd is not None and wd not in self._wd_to_path:
+                self._rm_watch(wd)
+        return entries
+
+    def invalidate(self, path: str, recursive: bool = False):
+        path = os.path.normpath(path)
+        prefix = path + os.sep
+        with self._lock:
+            targets = [path]
+            if recursive:
+                targets += [p for p in self._items if p.startswith(prefix)]
+                targets += [p for p in self._loading if p.startswith(prefix)]
+            for p in targets:
+                for stale in self._loading.get(p, ()):
+                    stale[0] = True
+                if self._drop(p):
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            for p in list(self._items):
+                self._drop(p)
+            for cells in self._loading.values():
+                for stale in cells:
+                    stale[0] = True
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "inotify" if self._use_inotify else "mtime",
+                "dirs": len(self._items),
+                "entries": self._total_entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        self._stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=2)
+            self._watch_thread = None
+        self.clear()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._stop.clear()
+
+    # --- Internals (호출 측이 잠금을 잡고 있어야 하는 것은 _store/_drop) ---
+
+    @staticmethod
+    def _mtime_still_valid(item: _CachedListing, st: os.stat_result) -> bool:
+        if st.st_mtime_ns != item.mtime_ns:
+            return False
+        return item.cached_at_ns - item.mtime_ns > RACY_WINDOW_NS
+
+    def _store(self, path: str, item: _CachedListing):
+        self._drop(path)
+        self._items[path] = item
+        self._total_entries += len(item.entries)
+        if item.wd is not None:
+            self._wd_to_path[item.wd] = path
+        while self._total_entries > self.max_entries and len(self._items) > 1:
+            oldest = next(iter(self._items))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, path: str) -> bool:
+        item = self._items.pop(path, None)
+        if item is None:
+            return False
+        self._total_entries -= len(item.entries)
+        if item.wd is not None and self._wd_to_path.get(item.wd) == path:
+            del self._wd_to_path[item.wd]
+            self._rm_watch(item.wd)
+        return True
+
+    def _rm_watch(self, wd: int):
+        if self._inotify is not None:
+            try:
+                self._inotify.rm_watch(wd)
+            except OSError:
+                pass
+
+    def _ensure_watcher(self) -> bool:
+        if self._watch_thread is not None:
+            return True
+        with self._lock:
+            if self._watch_thread is not None:
+                return True
+            try:
+                self._inotify = inotify.Inotify()
+            except OSError as e:
+                logger.warning("inotify unavailable, falling back to mtime checks: %s", e)
+                self._use_inotify = False
+                return False
+            self._watch_thread = threading.Thread(
+                target=self._watch_loop, name="dir-cache-watch", daemon=True
+            )
+            self._watch_thread.start()
+            return True
+
+    def _add_watch(self, path: str) -> int | None:
+        ino = self._inotify
+        if ino is None:
+            return None
+        try:
+            return ino.add_watch(path, inotify.DIR_CHANGE_MASK | inotify.IN_ONLYDIR)
+        except OSError:
+            return None  # watch 한도 초과 등 — 이 디렉터리는 mtime으로 검증
+
+    def _watch_loop(self):
+        while not self._stop.is_set():
+            ino = self._inotify
+            if ino is None:
+                break
+            for wd, mask, _cookie, _name in ino.read_events(timeout=0.5):
+                if mask & inotify.IN_Q_OVERFLOW:
+                    self.clear()
+                    continue
+                with self._lock:
+                    path = self._wd_to_path.get(wd)
+                if path is None:
+                    continue
+                if mask & inotify.IN_IGNORED:
+                    with self._lock:
+                        self._wd_to_path.pop(wd, None)
+                        item = self._items.get(path)
+                        if item is not None and item.wd == wd:
+                            item.wd = None
+                self.invalidate(path)
+
+
+listing_cache = DirListingCache()
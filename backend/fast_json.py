@@ -0,0 +1,35 @@
+"""빠른 JSON 직렬화.
+
+orjson이 설치돼 있으면 쓰고, 없으면 표준 json으로 같은 형식(공백 없는 UTF-8)을 만든다.
+자주 불리는 엔드포인트는 FastJSONResponse를 직접 반환해 FastAPI의 jsonable_encoder 단계도 건너뛴다.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def _dumps_std(content: Any) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except TypeError:
+            pass  # orjson이 모르는 타입(문자열이 아닌 키 등)은 표준 json에 맡긴다
+    return _dumps_std(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,193 @@
+"""진행률 보고와 취소를 지원하는 복사/삭제.
+
+모두 블로킹 함수이며 작업(job) 스레드에서 호출한다. progress는 Job처럼
+advance(files, nbytes)와 check_cancelled()를 가진 객체다.
+
+파일 내용 복사는 가능한 가장 빠른 방법부터 시도한다:
+reflink(FICLONE, btrfs/xfs 등) → os.copy_file_range(커널 내 복사) → 읽기/쓰기 루프.
+
+일반 파일이 아닌 것은 열지 않는다 — FIFO를 열면 쓰는 쪽이 나타날 때까지 영원히 막힌다.
+트리 안의 FIFO는 새로 만들고, 소켓·장치 파일은 건너뛴다.
+"""
+
+import os
+import shutil
+import stat
+from typing import Protocol
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FICLONE = 0x40049409  # linux/fs.h _IOW(0x94, 9, int)
+COPY_CHUNK_SIZE = 8 * 1024 * 1024  # 이 단위마다 진행률을 올리고 취소를 확인한다
+
+
+class Progress(Protocol):
+    def advance(self, files: int = 0, nbytes: int = 0): ...
+
+    def check_cancelled(self): ...
+
+
+def scan_tree(path: str) -> tuple[int, int]:
+    """path 아래 파일 수와 바이트 합계. 심볼릭 링크는 따라가지 않고 파일 하나로 센다."""
+    if os.path.islink(path) or not os.path.isdir(path):
+        return 1, os.lstat(path).st_size
+    files = total = 0
+    stack = [path]
+    while stack:
+        d = stack.pop()
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files += 1
+                    total += entry.stat(follow_symlinks=False).st_size
+    return files, total
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+
+def _copy_range(src_fd: int, dst_fd: int, size: int, progress: Progress) -> int:
+    """copy_file_range로 복사한 바이트 수. 지원되지 않으면 그 지점에서 멈춘다."""
+    if not hasattr(os, "copy_file_range"):
+        return 0
+    pos = 0
+    while pos < size:
+        progress.check_cancelled()
+        try:
+            n = os.copy_file_range(
+                src_fd, dst_fd, min(COPY_CHUNK_SIZE, size - pos), pos, pos
+            )
+        except OSError:
+            break  # EXDEV, ENOSYS, EINVAL 등 — 나머지는 일반 복사로
+        if n == 0:
+            break
+        pos += n
+        progress.advance(nbytes=n)
+    return pos
+
+
+def _open_regular(src: str):
+    # O_NONBLOCK: 확인하기 전에 FIFO로 바뀌었어도 open에서 막히지 않는다 (일반 파일에는 영향 없음)
+    fd = os.open(src, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0))
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        os.close(fd)
+        raise shutil.SpecialFileError(f"Not a regular file: {src}")
+    return os.fdopen(fd, "rb")
+
+
+def copy_file(src: str, dst: str, progress: Progress):
+    """일반 파일 하나를 복사한다. 아니면 shutil.SpecialFileError."""
+    with _open_regular(src) as fsrc, open(dst, "xb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        if size and _reflink(src_fd, dst_fd):
+            progress.advance(nbytes=size)
+        else:
+            pos = _copy_range(src_fd, dst_fd, size, progress)
+            fsrc.seek(pos)
+            fdst.seek(pos)
+            while True:
+                progress.check_cancelled()
+                chunk = fsrc.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                fdst.write(chunk)
+                progress.advance(nbytes=len(chunk))
+    shutil.copystat(src, dst)
+    progress.advance(files=1)
+
+
+def _copy_entry(src: str, dst: str, progress: Progress, skipped: list[str]):
+    mode = os.lstat(src).st_mode
+    if stat.S_ISLNK(mode):
+        os.symlink(os.readlink(src), dst)
+    elif stat.S_ISFIFO(mode):
+        os.mkfifo(dst, stat.S_IMODE(mode))
+    elif not stat.S_ISREG(mode):
+        skipped.append(src)  # 소켓, 장치 파일
+    else:
+        copy_file(src, dst, progress)
+        return
+    progress.advance(files=1)
+
+
+def copy_tree(src: str, dst: str, progress: Progress) -> list[str]:
+    """src(파일 또는 디렉터리)를 새 경로 dst로 복사한다. 취소되거나 실패하면 만든 것을 지운다.
+
+    건너뛴 소켓·장치 파일의 경로 목록을 반환한다. src 자체가 그런 파일이면 SpecialFileError.
+    """
+    skipped: list[str] = []
+    if os.path.islink(src) or not os.path.isdir(src):
+        try:
+            _copy_entry(src, dst, progress, skipped)
+        except FileExistsError:
+            raise  # dst는 남이 만든 것
+        except BaseException:
+            remove_tree(dst, None)
+            raise
+        if skipped:
+            raise shutil.SpecialFileError(f"Not a regular file: {src}")
+        return skipped
+
+    os.mkdir(dst)
+    try:
+        stack = [(src, dst)]
+        dirs = []
+        while stack:
+            s, d = stack.pop()
+            if d != dst:
+                os.mkdir(d)
+            dirs.append((s, d))
+            with os.scandir(s) as it:
+                for entry in it:
+                    target = os.path.join(d, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, target))
+                    else:
+                        _copy_entry(entry.path, target, progress, skipped)
+        # 디렉터리 시간은 안의 내용을 다 만든 뒤에 맞춰야 유지된다
+        for s, d in reversed(dirs):
+            shutil.copystat(s, d)
+    except BaseException:
+        remove_tree(dst, None)
+        raise
+    return skipped
+
+
+def remove_tree(path: str, progress: Progress | None):
+    """path를 지운다. 디렉터리 안의 심볼릭 링크는 링크만 지운다."""
+    if not os.path.lexists(path):
+        return
+    if os.path.islink(path) or not os.path.isdir(path):
+        os.remove(path)
+        if progress is not None:
+            progress.advance(files=1)
+        return
+    for root, dirnames, filenames in os.walk(path, topdown=False):
+        for name in filenames:
+            if progress is not None:
+                progress.check_cancelled()
+            os.remove(os.path.join(root, name))
+            if progress is not None:
+                progress.advance(files=1)
+        for name in dirnames:
+            p = os.path.join(root, name)
+            if os.path.islink(p):
+                os.remove(p)
+                if progress is not None:
+                    progress.advance(files=1)
+            else:
+                os.rmdir(p)
+    os.rmdir(path)
@@ -0,0 +1,128 @@
+"""조건부 요청(ETag)과 Range를 지원하는 파일 응답 헬퍼."""
+
+import mimetypes
+import os
+from collections.abc import AsyncIterator
+from email.utils import formatdate
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+from backend.fs_executor import run_fs
+
+CHUNK_SIZE = 256 * 1024
+# ETag로 재검증하는 한 브라우저 캐시를 써도 된다 — 바뀌지 않았으면 304로 끝난다
+CACHE_CONTROL = "private, no-cache"
+
+
+def file_etag(st: os.stat_result) -> str:
+    """inode·크기·mtime으로 만든 강한 ETag. 내용을 읽지 않고 계산한다."""
+    return f'"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # If-None-Match는 약한 비교 — W/ 접두사는 무시
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def parse_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """단일 "bytes=" 범위를 (start, end_inclusive)로. 없거나 다중 범위면 None(전체 응답).
+
+    만족할 수 없는 범위는 416을 던진다.
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        return None
+    start_s, _, end_s = spec.partition("-")
+    try:
+        if start_s == "":
+            length = int(end_s)
+            if length <= 0:
+                raise ValueError
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+def _read_chunk(f, size: int) -> bytes:
+    return f.read(size)
+
+
+async def iter_file(path: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+    """파일을 CHUNK_SIZE 단위로 읽어 내보낸다. 읽기는 파일시스템 executor에서 한다."""
+    f = await run_fs("read", open, path, "rb")
+    try:
+        if start:
+            await run_fs("read", f.seek, start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            n = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+            chunk = await run_fs("read", _read_chunk, f, n)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        await run_fs("read", f.close)
+
+
+def file_response(
+    request: Request, path: str, st: os.stat_result, media_type: str | None = None
+) -> Response:
+    """If-None-Match → 304, Range → 206, 그 외에는 전체를 스트리밍한다."""
+    etag = file_etag(st)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": CACHE_CONTROL,
+    }
+    media_type = media_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        byte_range = parse_range(request.headers.get("range"), st.st_size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(st.st_size)
+        # stat 이후 파일이 자라도(로그 추가 등) 선언한 길이만큼만 보낸다
+        return StreamingResponse(
+            iter_file(path, 0, st.st_size - 1), media_type=media_type, headers=headers
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file(path, start, end), status_code=206, media_type=media_type, headers=headers
+    )
@@ -0,0 +1,390 @@
+"""프로젝트별 파일시스템 변경 감시 및 구독자 전달.
+
+구독자(/ws/fs 연결, git 상태 같은 리스너)가 있는 프로젝트 루트마다 감시 스레드 하나를
+띄운다. Linux에서는 프로젝트 트리 전체에 inotify watch를 걸고, 그 외 환경에서는 주기적으로
+트리를 스캔해 비교한다.
+이벤트는 DEBOUNCE_SECONDS 동안 모아 경로별로 병합한 뒤 한 번에 내보낸다.
+
+배치 형식: {"type": "changes", "project_id": ..., "changes": [[kind, path, is_dir], ...]}
+kind는 "c"(생성) / "m"(수정) / "d"(삭제). 이벤트를 놓쳤을 수 있으면
+{"type": "overflow", "project_id": ...}를 보내며, 클라이언트는 전체를 다시 읽어야 한다.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+from backend import inotify
+from backend.ignore import HIDDEN_DIRS, is_ignored_file
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_SECONDS = 0.2
+MAX_BATCH_DELAY = 1.0  # 이벤트가 계속 들어와도 이 시간 안에는 한 번 내보낸다
+POLL_INTERVAL = 2.0
+SUBSCRIBER_QUEUE_MAX = 256
+
+CREATED, MODIFIED, DELETED = "c", "m", "d"
+
+_WATCH_MASK = (
+    inotify.IN_CREATE | inotify.IN_DELETE | inotify.IN_MOVED_FROM | inotify.IN_MOVED_TO
+    | inotify.IN_CLOSE_WRITE | inotify.IN_MODIFY | inotify.IN_DELETE_SELF
+    | inotify.IN_MOVE_SELF | inotify.IN_ONLYDIR
+)
+
+
+def merge_change(pending: dict[str, list], path: str, kind: str, is_dir: bool):
+    """같은 경로의 연속 이벤트를 하나로 합친다 (생성 후 삭제 → 없음, 삭제 후 생성 → 수정 등)."""
+    prev = pending.get(path)
+    if prev is None:
+        pending[path] = [kind, is_dir]
+        return
+    prev_kind = prev[0]
+    if prev_kind == CREATED and kind == DELETED:
+        del pending[path]
+    elif prev_kind == CREATED:
+        prev[1] = is_dir  # 생성 후 수정은 여전히 생성
+    elif prev_kind == DELETED and kind == CREATED:
+        pending[path] = [MODIFIED, is_dir]
+    else:
+        pending[path] = [kind, is_dir]
+
+
+def _should_skip(root: str, path: str) -> bool:
+    rel = os.path.relpath(path, root)
+    parts = rel.split(os.sep)
+    return any(p in HIDDEN_DIRS for p in parts) or is_ignored_file(parts[-1])
+
+
+class _Debouncer:
+    def __init__(self, emit: Callable[[list[list]], None]):
+        self._emit = emit
+        self._pending: dict[str, list] = {}
+        self._first = 0.0
+        self._last = 0.0
+
+    def add(self, path: str, kind: str, is_dir: bool):
+        now = time.monotonic()
+        if not self._pending:
+            self._first = now
+        self._last = now
+        merge_change(self._pending, path, kind, is_dir)
+
+    def flush_due(self):
+        if not self._pending:
+            return
+        now = time.monotonic()
+        if now - self._last >= DEBOUNCE_SECONDS or now - self._first >= MAX_BATCH_DELAY:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        changes = [
+            [kind, path.replace("\\", "/"), is_dir]
+            for path, (kind, is_dir) in self._pending.items()
+        ]
+        self._pending = {}
+        self._emit(changes)
+
+
+class ProjectWatcher:
+    """프로젝트 하나의 감시 스레드. on_batch는 감시 스레드에서 호출된다."""
+
+    def __init__(
+        self,
+        root: str,
+        on_batch: Callable[[list[list]], None],
+        on_overflow: Callable[[], None],
+        use_inotify: bool | None = None,
+    ):
+        self.root = os.path.normpath(root)
+        self._on_overflow = on_overflow
+        self._debouncer = _Debouncer(on_batch)
+        self._use_inotify = inotify.is_available() if use_inotify is None else use_inotify
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        target = self._run_inotify if self._use_inotify else self._run_poll
+        self._thread = threading.Thread(target=target, name="fs-events", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """wait=False면 멈추라고 알리기만 한다 — 이벤트 루프에서 부를 때. 스레드는 다음
+        inotify 읽기 타임아웃이나 폴링 주기에 남은 변경을 내보내고 끝난다."""
+        self._stop.set()
+        if self._thread is not None:
+            if wait:
+                self._thread.join(timeout=2)
+            self._thread = None
+
+    # --- inotify ---
+
+    def _run_inotify(self):
+        try:
+            ino = inotify.Inotify()
+        except OSError as e:
+            logger.warning("inotify unavailable, polling %s instead: %s", self.root, e)
+            self._run_poll()
+            return
+        wd_to_path: dict[int, str] = {}
+        try:
+            self._watch_tree(ino, self.root, wd_to_path)
+            while not self._stop.is_set():
+                for wd, mask, _cookie, name in ino.read_events(timeout=DEBOUNCE_SECONDS / 2):
+                    self._handle_event(ino, wd_to_path, wd, mask, name)
+                self._debouncer.flush_due()
+            self._debouncer.flush()
+        finally:
+            ino.close()
+
+    def _watch_tree(self, ino: inotify.Inotify, top: str, wd_to_path: dict[int, str]):
+        stack = [top]
+        while stack:
+            d = stack.pop()
+            try:
+                wd_to_path[ino.add_watch(d, _WATCH_MASK)] = d
+            except OSError as e:
+                if e.errno == 28:  # ENOSPC: max_user_watches 초과
+                    logger.warning("inotify watch limit reached under %s", self.root)
+                    self._on_overflow()
+                    return
+                continue
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.name not in HIDDEN_DIRS and entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def _handle_event(self, ino, wd_to_path: dict[int, str], wd: int, mask: int, name: str):
+        if mask & inotify.IN_Q_OVERFLOW:
+            self._debouncer.flush()
+            self._on_overflow()
+            return
+        base = wd_to_path.get(wd)
+        if base is None:
+            return
+        if mask & inotify.IN_IGNORED:
+            wd_to_path.pop(wd, None)
+            return
+        if mask & (inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF):
+            # 하위 watch의 경로도 더 이상 유효하지 않음
+            prefix = base + os.sep
+            for other_wd, p in list(wd_to_path.items()):
+                if p == base or p.startswith(prefix):
+                    wd_to_path.pop(other_wd, None)
+                    try:
+                        ino.rm_watch(other_wd)
+                    except OSError:
+                        pass
+            return
+        if not name:
+            return
+        path = os.path.join(base, name)
+        if _should_skip(self.root, path):
+            return
+        is_dir = bool(mask & inotify.IN_ISDIR)
+        if mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+            self._debouncer.add(path, CREATED, is_dir)
+            if is_dir:
+                self._watch_tree(ino, path, wd_to_path)
+        elif mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+            self._debouncer.add(path, DELETED, is_dir)
+        elif mask & (inotify.IN_CLOSE_WRITE | inotify.IN_MODIFY):
+            self._debouncer.add(path, MODIFIED, is_dir)
+
+    # --- polling fallback ---
+
+    def _snapshot(self) -> dict[str, tuple[int, int, bool]]:
+        snap: dict[str, tuple[int, int, bool]] = {}
+        stack = [self.root]
+        while stack:
+            d = stack.pop()
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.name in HIDDEN_DIRS or is_ignored_file(entry.name):
+                            continue
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        snap[entry.path] = (st.st_mtime_ns, st.st_size, is_dir)
+                        if is_dir:
+                            stack.append(entry.path)
+            except OSError:
+                continue
+        return snap
+
+    def _run_poll(self):
+        before = self._snapshot()
+        while not self._stop.wait(POLL_INTERVAL):
+            after = self._snapshot()
+            for path, (mtime, size, is_dir) in after.items():
+                prev = before.get(path)
+                if prev is None:
+                    self._debouncer.add(path, CREATED, is_dir)
+                elif not is_dir and (prev[0] != mtime or prev[1] != size):
+                    self._debouncer.add(path, MODIFIED, is_dir)
+            for path, (_, _, is_dir) in before.items():
+                if path not in after:
+                    self._debouncer.add(path, DELETED, is_dir)
+            self._debouncer.flush()
+            before = after
+
+
+class _Subscriber:
+    """/ws/fs 연결 하나. 배치는 그 연결의 이벤트 루프에서 큐에 들어간다."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, project_id: str):
+        self.loop = loop
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_MAX)
+
+    def push(self, message: dict | None):
+        """이벤트 루프 스레드에서 실행된다. 큐가 가득 차면 비우고 overflow를 알린다."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "overflow", "project_id": self.project_id})
+
+    def deliver(self, changes: list[list] | None):
+        if changes is None:
+            message = {"type": "overflow", "project_id": self.project_id}
+        else:
+            message = {"type": "changes", "project_id": self.project_id, "changes": changes}
+        self._send(message)
+
+    def close(self):
+        self._send(None)
+
+    def _send(self, message: dict | None):
+        try:
+            self.loop.call_soon_threadsafe(self.push, message)
+        except RuntimeError:
+            pass  # 루프가 이미 닫힘
+
+
+class _Listener:
+    """감시 스레드에서 바로 호출되는 구독자 (git 상태처럼 같은 프로세스 안의 소비자)."""
+
+    def __init__(self, on_batch: Callable[[list[list]], None], on_overflow: Callable[[], None]):
+        self.on_batch = on_batch
+        self.on_overflow = on_overflow
+
+    def deliver(self, changes: list[list] | None):
+        try:
+            if changes is None:
+                self.on_overflow()
+            else:
+                self.on_batch(changes)
+        except Exception:
+            logger.exception("fs event listener failed")
+
+    def close(self):
+        pass
+
+
+class FsEventHub:
+    """프로젝트 루트마다 감시 스레드 하나를 모든 구독자(/ws/fs 연결, 리스너)가 나눠 쓴다."""
+
+    def __init__(self, use_inotify: bool | None = None):
+        self._use_inotify = use_inotify
+        self._lock = threading.Lock()
+        self._watchers: dict[str, ProjectWatcher] = {}
+        self._subscribers: dict[str, list[_Subscriber | _Listener]] = {}
+
+    def subscribe(self, project_id: str, root: str) -> asyncio.Queue:
+        sub = _Subscriber(asyncio.get_running_loop(), project_id)
+        self._add(root, sub)
+        return sub.queue
+
+    def unsubscribe(self, project_id: str, queue: asyncio.Queue):
+        with self._lock:
+            sub = next(
+                (
+                    s for subs in self._subscribers.values() for s in subs
+                    if isinstance(s, _Subscriber) and s.queue is queue
+                ),
+                None,
+            )
+        if sub is not None:
+            self._remove(sub)
+
+    def listen(
+        self, root: str, on_batch: Callable[[list[list]], None], on_overflow: Callable[[], None]
+    ) -> _Listener:
+        """on_batch / on_overflow를 감시 스레드에서 호출한다. 돌려받은 값을 unlisten()에 넘긴다."""
+        listener = _Listener(on_batch, on_overflow)
+        self._add(root, listener)
+        return listener
+
+    def unlisten(self, listener: _Listener):
+        self._remove(listener)
+
+    def subscriber_count(self, project_id: str) -> int:
+        with self._lock:
+            return sum(
+                1 for subs in self._subscribers.values() for s in subs
+                if isinstance(s, _Subscriber) and s.project_id == project_id
+            )
+
+    def watcher_count(self) -> int:
+        with self._lock:
+            return len(self._watchers)
+
+    def _add(self, root: str, sub: _Subscriber | _Listener):
+        root = os.path.normpath(root)
+        with self._lock:
+            self._subscribers.setdefault(root, []).append(sub)
+            if root not in self._watchers:
+                watcher = ProjectWatcher(
+                    root,
+                    on_batch=lambda changes: self._publish(root, changes),
+                    on_overflow=lambda: self._publish(root, None),
+                    use_inotify=self._use_inotify,
+                )
+                self._watchers[root] = watcher
+                watcher.start()
+
+    def _remove(self, sub: _Subscriber | _Listener):
+        watcher = None
+        with self._lock:
+            for root, subs in self._subscribers.items():
+                if sub in subs:
+                    subs.remove(sub)
+                    if not subs:
+                        del self._subscribers[root]
+                        watcher = self._watchers.pop(root, None)
+                    break
+        if watcher is not None:
+            watcher.stop(wait=False)
+
+    def _publish(self, root: str, changes: list[list] | None):
+        with self._lock:
+            subs = list(self._subscribers.get(root, []))
+        for sub in subs:
+            sub.deliver(changes)
+
+    def shutdown(self):
+        with self._lock:
+            watchers = list(self._watchers.values())
+            self._watchers.clear()
+            subs = [s for lst in self._subscribers.values() for s in lst]
+            self._subscribers.clear()
+        for w in watchers:
+            w.stop(wait=False)
+        for sub in subs:
+            sub.close()
+
+
+fs_events = FsEventHub()
@@ -0,0 +1,324 @@
+"""블로킹 작업을 우선순위 등급별 스레드 풀에서 실행한다.
+
+os.scandir, 파일 읽기/쓰기, 업로드, ZIP, PTY 쓰기 같은 블로킹 호출을 이벤트 루프 밖에서 실행한다.
+작업 종류(op)마다 등급이 정해져 있고 등급마다 풀이 따로다:
+
+- interactive: 터미널 입력을 PTY에 쓰기. 다른 작업이 아무리 밀려도 바로 실행된다.
+- metadata: 목록, stat, 파일 읽기/쓰기, 검색 — 화면을 그리는 데 필요한 짧은 호출.
+- bulk: 업로드, ZIP, 일괄 작업처럼 오래 걸리는 전송. 워커 스레드의 nice 값을 올린다.
+
+등급마다 한 클라이언트(로그인 토큰, 없으면 접속 주소)가 동시에 쓸 수 있는 워커 수에 상한이 있어,
+한 기기의 큰 업로드가 다른 기기의 목록 조회나 타이핑을 기다리게 하지 않는다. 상한을 넘은 호출은
+이벤트 루프에서 자기 차례를 기다린다 (기다린 시간도 타임아웃에 포함된다).
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    workers: int
+    per_client: int | None  # None이면 클라이언트별 상한 없음
+    nice: int = 0  # 워커 스레드의 nice 증가분 (리눅스)
+
+
+PRIORITY_CLASSES: dict[str, PriorityClass] = {
+    "interactive": PriorityClass(workers=2, per_client=None),
+    "metadata": PriorityClass(workers=4, per_client=3),
+    "bulk": PriorityClass(workers=2, per_client=1, nice=10),
+}
+DEFAULT_CLASS = "metadata"
+
+OP_CLASSES: dict[str, str] = {
+    "pty": "interactive",
+    "list": "metadata",
+    "stat": "metadata",
+    "read": "metadata",
+    "write": "metadata",
+    "create": "metadata",
+    "rename": "metadata",
+    "search": "metadata",
+    "git": "metadata",
+    "upload": "bulk",
+    "copy": "bulk",
+    "delete": "bulk",
+    "batch": "bulk",
+    "zip": "bulk",
+}
+
+# 작업 종류별 기본 타임아웃(초)
+OP_TIMEOUTS: dict[str, float] = {
+    "pty": 10.0,
+    "list": 10.0,
+    "stat": 10.0,
+    "read": 30.0,
+    "write": 30.0,
+    "create": 10.0,
+    "rename": 10.0,
+    "upload": 120.0,
+    "copy": 600.0,
+    "delete": 600.0,
+    "batch": 600.0,
+    "search": 30.0,
+    "zip": 60.0,  # 조각 하나 — 큰 파일 한 블록을 읽고 압축하는 시간
+    "git": 60.0,
+}
+DEFAULT_TIMEOUT = 30.0
+
+
+@dataclass
+class OpStats:
+    count: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    in_flight: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_executor_lock = threading.Lock()
+_stats: dict[str, OpStats] = {}
+_stats_lock = threading.Lock()
+
+# 요청을 보낸 클라이언트. ClientScopeMiddleware가 요청마다 정한다
+current_client: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_client", default="local"
+)
+
+
+def _lower_priority(nice: int):
+    """워커 스레드 시작 시 호출된다. 리눅스에서는 스레드마다 nice 값이 따로다."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+    except (AttributeError, OSError):
+        pass
+
+
+def _get_executor(name: str) -> ThreadPoolExecutor:
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                cls = PRIORITY_CLASSES[name]
+                initializer, initargs = (_lower_priority, (cls.nice,)) if cls.nice else (None, ())
+                executor = _executors[name] = ThreadPoolExecutor(
+                    max_workers=cls.workers,
+                    thread_name_prefix=f"fs-{name}",
+                    initializer=initializer,
+                    initargs=initargs,
+                )
+    return executor
+
+
+class _ClientSlots:
+    """(등급, 클라이언트)별 동시 실행 수 제한. 이벤트 루프 스레드에서만 쓴다.
+
+    슬롯이 비면 기다리던 호출에 도착 순서대로 넘겨준다.
+    """
+
+    def __init__(self):
+        self._active: dict[tuple[str, str], int] = {}
+        self._waiters: dict[tuple[str, str], deque[asyncio.Future]] = {}
+
+    async def acquire(self, key: tuple[str, str], limit: int):
+        waiters = self._waiters.get(key)
+        if self._active.get(key, 0) < limit and not waiters:
+            self._active[key] = self._active.get(key, 0) + 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 넘겨받은 직후 취소됐다 — 다음 대기자에게 넘긴다
+                self.release(key)
+            else:
+                self._remove_waiter(key, future)
+            raise
+
+    def _remove_waiter(self, key: tuple[str, str], future: asyncio.Future):
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiters[key]
+
+    def release(self, key: tuple[str, str]):
+        waiters = self._waiters.get(key)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                if not waiters:
+                    del self._waiters[key]
+                future.set_result(None)  # 실행 수는 그대로 — 슬롯을 넘긴다
+                return
+        self._waiters.pop(key, None)
+        self._active[key] -= 1
+        if not self._active[key]:
+            del self._active[key]
+
+    def snapshot(self) -> dict[str, dict]:
+        classes: dict[str, dict] = {}
+        for (name, _), n in self._active.items():
+            c = classes.setdefault(name, {"running": 0, "queued": 0, "clients": 0})
+            c["running"] += n
+            c["clients"] += 1
+        for (name, _), waiters in self._waiters.items():
+            c = classes.setdefault(name, {"running": 0, "queued": 0, "clients": 0})
+            c["queued"] += len(waiters)
+        return classes
+
+
+_slots = _ClientSlots()
+
+
+def _timed[T](op: str, func: Callable[..., T], args: tuple) -> T:
+    """worker 스레드에서 실행되며 실제 소요 시간을 기록한다."""
+    # 실행이 시작될 때 센다 — 큐에서 기다리다 취소된 호출은 여기까지 오지 않는다
+    with _stats_lock:
+        _stats.setdefault(op, OpStats()).in_flight += 1
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    except HTTPException:
+        raise
+    except Exception:
+        with _stats_lock:
+            _stats[op].errors += 1
+        raise
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        with _stats_lock:
+            s = _stats[op]
+            s.count += 1
+            s.in_flight -= 1
+            s.total_ms += elapsed
+            s.max_ms = max(s.max_ms, elapsed)
+
+
+async def run_fs[T](
+    op: str, func: Callable[..., T], *args: Any, timeout: float | None = None
+) -> T:
+    """func(*args)를 op의 등급에 맞는 executor에서 실행한다.
+
+    timeout을 주지 않으면 OP_TIMEOUTS[op]를 쓴다. 타임아웃이 지나면 504를 반환하며,
+    이미 시작된 스레드 작업은 끝까지 실행된다.
+    """
+    if timeout is None:
+        timeout = OP_TIMEOUTS.get(op, DEFAULT_TIMEOUT)
+    try:
+        return await asyncio.wait_for(_run(op, func, args), timeout)
+    except TimeoutError:
+        with _stats_lock:
+            _stats.setdefault(op, OpStats()).timeouts += 1
+        raise HTTPException(status_code=504, detail=f"File operation timed out: {op}")
+
+
+async def _run[T](op: str, func: Callable[..., T], args: tuple) -> T:
+    name = OP_CLASSES.get(op, DEFAULT_CLASS)
+    limit = PRIORITY_CLASSES[name].per_client
+    key = (name, current_client.get())
+    if limit is not None:
+        await _slots.acquire(key, limit)
+    try:
+        future = _get_executor(name).submit(_timed, op, func, args)
+    except BaseException:
+        if limit is not None:
+            _slots.release(key)
+        raise
+    if limit is not None:
+        # 타임아웃으로 기다리기를 그만둬도 스레드 작업이 끝날 때까지 슬롯을 잡고 있는다
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: _release_threadsafe(loop, key))
+    return await asyncio.wrap_future(future)
+
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop, key: tuple[str, str]):
+    try:
+        loop.call_soon_threadsafe(_slots.release, key)
+    except RuntimeError:
+        pass  # 루프가 이미 닫혔다
+
+
+def fs_metrics() -> dict:
+    with _stats_lock:
+        ops = {op: asdict(s) for op, s in _stats.items()}
+    for s in ops.values():
+        s["avg_ms"] = round(s["total_ms"] / s["count"], 3) if s["count"] else 0.0
+        s["total_ms"] = round(s["total_ms"], 3)
+        s["max_ms"] = round(s["max_ms"], 3)
+    usage = _slots.snapshot()
+    classes = {
+        name: {
+            "workers": cls.workers,
+            "per_client": cls.per_client,
+            **usage.get(name, {"running": 0, "queued": 0, "clients": 0}),
+        }
+        for name, cls in PRIORITY_CLASSES.items()
+    }
+    max_workers = sum(cls.workers for cls in PRIORITY_CLASSES.values())
+    return {"max_workers": max_workers, "classes": classes, "ops": ops}
+
+
+def shutdown_fs_executor():
+    with _executor_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def client_key(scope: Scope) -> str:
+    """요청을 보낸 기기를 구분하는 키. 로그인마다 토큰이 다르므로 토큰을 우선한다 —
+    ngrok 너머에서는 모든 기기의 접속 주소가 같다."""
+    token = None
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            token = value
+            break
+    if token is None and scope.get("query_string"):
+        for part in scope["query_string"].split(b"&"):
+            if part.startswith(b"token="):
+                token = part[6:]
+                break
+    if token:
+        return hashlib.blake2b(token, digest_size=8).hexdigest()
+    client = scope.get("client")
+    return client[0] if client else "local"
+
+
+class ClientScopeMiddleware:
+    """요청마다 current_client를 정해 run_fs가 클라이언트별 상한을 적용하게 한다."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        reset = current_client.set(client_key(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_client.reset(reset)
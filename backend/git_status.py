@@ -0,0 +1,478 @@
+"""프로젝트별 git 상태 캐시 — 파일 트리에 변경 표시를 붙이고, 요청하면 diff hunk를 준다.
+
+`git status --porcelain=v2`는 백그라운드 스레드에서만 실행하고 결과를 스냅샷으로 들고 있다.
+- 작업 트리 변경은 fs_events 허브의 리스너로 알게 된다 (/ws/fs와 같은 감시 스레드를 쓴다).
+  변경을 REFRESH_DEBOUNCE 동안 모아, 몇 개 안 되면 그 경로만 pathspec으로 다시 묻고(증분)
+  많으면 전체를 다시 읽는다.
+- .git 안은 감시하지 않으므로 커밋·스테이징·브랜치 전환은 .git/index, HEAD, 현재 브랜치 ref의
+  stat으로 알아챈다. 이 확인도 요청이 올 때 INDEX_CHECK_INTERVAL마다 한 번만 한다.
+- git이 없거나 저장소가 아니면 상태는 "none"/"unavailable"이고 표시를 붙이지 않는다.
+
+상태 표시는 한 글자: M(수정) A(추가) D(삭제) R(이름 변경) U(충돌) ?(추적 안 함).
+디렉터리는 아래에 변경이 있으면 M, 추적 안 하는 파일만 있으면 ?.
+"""
+
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from backend.fs_events import FsEventHub, fs_events
+
+logger = logging.getLogger(__name__)
+
+GIT_TIMEOUT = 30.0
+REFRESH_DEBOUNCE = 0.3
+INCREMENTAL_MAX_PATHS = 100  # 이보다 많이 바뀌면 전체를 다시 읽는 편이 싸다
+INDEX_CHECK_INTERVAL = 1.0
+LIST_WAIT = 0.5  # 첫 목록 요청이 첫 상태를 기다리는 최대 시간
+DETECT_WAIT = 2.0  # diff가 저장소 확인(rev-parse 한 번)을 기다리는 최대 시간
+MAX_DIFF_BYTES = 1024 * 1024
+DIFF_CACHE_MAX_ENTRIES = 64
+
+_XY_FLAGS = {"M": "M", "T": "M", "A": "A", "D": "D", "R": "R", "C": "A"}
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+
+
+def _run_git(cwd: str, args: list[str], check: bool = True) -> subprocess.CompletedProcess:
+    # GIT_OPTIONAL_LOCKS=0: status가 index를 고쳐 쓰며 잠그지 않게 한다 (사용자의 git과 충돌 방지)
+    env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "LC_ALL": "C"}
+    return subprocess.run(
+        ["git", *args], cwd=cwd, env=env, capture_output=True, timeout=GIT_TIMEOUT, check=check
+    )
+
+
+def _literal(rel: str) -> str:
+    return ":(literal)" + rel.replace(os.sep, "/")
+
+
+def _xy_flag(xy: str) -> str:
+    x, y = xy[0], xy[1]
+    return _XY_FLAGS.get(y if y != "." else x, "M")
+
+
+def parse_porcelain_v2(out: bytes) -> tuple[str | None, dict[str, str]]:
+    """`git status --porcelain=v2 --branch -z` 출력 → (브랜치, {저장소 기준 경로: 표시}).
+
+    추적 안 하는 디렉터리는 경로가 "/"로 끝난다.
+    """
+    branch = None
+    files: dict[str, str] = {}
+    records = out.split(b"\0")
+    i = 0
+    while i < len(records):
+        rec = records[i]
+        i += 1
+        kind = rec[:1]
+        if kind == b"#":
+            if rec.startswith(b"# branch.head "):
+                head = rec[len(b"# branch.head "):].decode("utf-8", "replace")
+                branch = None if head == "(detached)" else head
+        elif kind == b"1":
+            parts = rec.split(b" ", 8)
+            files[os.fsdecode(parts[8])] = _xy_flag(parts[1].decode())
+        elif kind == b"2":
+            parts = rec.split(b" ", 9)
+            files[os.fsdecode(parts[9])] = _xy_flag(parts[1].decode())
+            i += 1  # 원래 경로
+        elif kind == b"u":
+            files[os.fsdecode(rec.split(b" ", 10)[10])] = "U"
+        elif kind == b"?":
+            files[os.fsdecode(rec[2:])] = "?"
+    return branch, files
+
+
+def parse_diff_hunks(text: str) -> list[dict]:
+    """unified diff에서 hunk만 뽑는다. 파일 헤더(diff --git, ---, +++)는 버린다."""
+    hunks: list[dict] = []
+    current = None
+    for line in text.split("\n"):
+        m = _HUNK_RE.match(line)
+        if m:
+            current = {
+                "old_start": int(m.group(1)),
+                "old_lines": int(m.group(2) or 1),
+                "new_start": int(m.group(3)),
+                "new_lines": int(m.group(4) or 1),
+                "header": m.group(5).strip(),
+                "lines": [],
+            }
+            hunks.append(current)
+        elif current is not None and line[:1] in (" ", "+", "-", "\\"):
+            current["lines"].append(line)
+    return hunks
+
+
+@dataclass(frozen=True)
+class GitSnapshot:
+    branch: str | None = None
+    files: dict[str, str] = field(default_factory=dict)  # 절대 경로 → 표시
+    dirs: dict[str, str] = field(default_factory=dict)  # 변경을 품은 디렉터리 → M / ?
+    untracked_dirs: frozenset[str] = frozenset()
+
+    def _in_untracked_dir(self, dir_path: str) -> bool:
+        if not self.untracked_dirs:
+            return False
+        cur = dir_path
+        while True:
+            if cur in self.untracked_dirs:
+                return True
+            parent = os.path.dirname(cur)
+            if parent == cur:
+                return False
+            cur = parent
+
+    def flag(self, path: str, is_dir: bool) -> str | None:
+        flag = self.files.get(path) or (self.dirs.get(path) if is_dir else None)
+        if flag is None and self._in_untracked_dir(os.path.dirname(path)):
+            return "?"
+        return flag
+
+    def annotate(self, dir_path: str, entries: list[dict]) -> list[dict]:
+        """entries에 "git" 표시를 붙인 새 목록. 원래 dict(목록 캐시의 것)는 고치지 않는다."""
+        if not self.files:
+            return entries
+        untracked = self._in_untracked_dir(dir_path)
+        out = []
+        for e in entries:
+            path = os.path.join(dir_path, e["name"])
+            flag = "?" if untracked else self.flag(path, e["is_dir"])
+            out.append({**e, "git": flag} if flag else e)
+        return out
+
+
+class GitStatus:
+    """프로젝트 하나의 git 상태. 갱신은 작업 스레드에서, 조회는 아무 스레드에서."""
+
+    def __init__(self, root: str, events: FsEventHub | None = None):
+        self.root = os.path.normpath(root)
+        self.state = "idle"
+        self.version = 0
+        self.toplevel: str | None = None
+        self.git_dir: str | None = None
+        self.last_refresh_ms: float | None = None
+        self.full_refreshes = 0
+        self.incremental_refreshes = 0
+        self._events = events or fs_events
+        self._snapshot = GitSnapshot()
+        self._cond = threading.Condition()
+        self._full = True
+        self._changes: set[str] = set()
+        self._ready = threading.Event()
+        self._detected = threading.Event()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._listener = None
+        self._signature: tuple | None = None
+        self._checked_at = 0.0
+        self._diff_cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._diff_lock = threading.Lock()
+
+    def start(self):
+        self._worker = threading.Thread(target=self._run, name="git-status", daemon=True)
+        self._worker.start()
+
+    def close(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._listener is not None:
+            self._events.unlisten(self._listener)
+            self._listener = None
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+            self._worker = None
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def refresh(self):
+        self._schedule(full=True)
+
+    def snapshot(self) -> GitSnapshot:
+        """현재 스냅샷. .git 쪽이 바뀌었으면 전체 갱신을 예약하고 (그 사이엔) 이전 것을 준다."""
+        now = time.monotonic()
+        if self.git_dir is not None and now - self._checked_at >= INDEX_CHECK_INTERVAL:
+            self._checked_at = now
+            if self._git_signature() != self._signature:
+                self._schedule(full=True)
+        return self._snapshot
+
+    def status(self) -> dict:
+        snap = self.snapshot()
+        return {
+            "state": self.state,
+            "version": self.version,
+            "branch": snap.branch,
+            "files": snap.files,
+            "dirs": snap.dirs,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "files": len(self._snapshot.files),
+            "full_refreshes": self.full_refreshes,
+            "incremental_refreshes": self.incremental_refreshes,
+            "last_refresh_ms": self.last_refresh_ms,
+        }
+
+    # --- refresh ---
+
+    def _schedule(self, full: bool = False, paths: list[str] = ()):
+        with self._cond:
+            if full:
+                self._full = True
+            else:
+                self._changes.update(paths)
+            self._cond.notify()
+
+    def _on_changes(self, changes: list[list]):
+        # 디렉터리 생성·삭제는 그 아래 전체가 바뀐 것이므로 전체를 다시 읽는다
+        if any(is_dir for _, _, is_dir in changes):
+            self._schedule(full=True)
+        else:
+            self._schedule(paths=[os.path.normpath(path) for _, path, _ in changes])
+
+    def _run(self):
+        found = self._detect_repo()
+        self._detected.set()
+        if not found:
+            self._ready.set()
+            return
+        # 첫 전체 읽기 중 들어온 변경을 놓치지 않도록 감시를 먼저 시작한다
+        self._listener = self._events.listen(self.root, self._on_changes, self.refresh)
+        if self._stop.is_set():  # 리스너를 거는 사이에 close()됐다
+            self._events.unlisten(self._listener)
+            return
+        while not self._stop.is_set():
+            with self._cond:
+                while not (self._full or self._changes or self._stop.is_set()):
+                    self._cond.wait()
+            if self._stop.is_set():
+                return
+            if self._ready.is_set():
+                self._stop.wait(REFRESH_DEBOUNCE)  # 잇따르는 변경을 한 번에 처리한다
+            with self._cond:
+                full, changes = self._full, self._changes
+                self._full, self._changes = False, set()
+            start = time.perf_counter()
+            try:
+                if full or len(changes) > INCREMENTAL_MAX_PATHS:
+                    self._refresh_full()
+                else:
+                    self._refresh_paths(changes)
+                self.state = "ready"
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning("git status failed for %s: %s", self.root, e)
+                self.state = "error"
+            self.last_refresh_ms = round((time.perf_counter() - start) * 1000, 1)
+            self._ready.set()
+
+    def _detect_repo(self) -> bool:
+        try:
+            out = _run_git(self.root, ["rev-parse", "--show-toplevel", "--absolute-git-dir"])
+        except FileNotFoundError:
+            self.state = "unavailable"  # git이 설치돼 있지 않다
+            return False
+        except (OSError, subprocess.SubprocessError):
+            self.state = "none"
+            return False
+        toplevel, git_dir = out.stdout.decode().splitlines()[:2]
+        self.toplevel, self.git_dir = os.path.normpath(toplevel), os.path.normpath(git_dir)
+        self.state = "building"
+        return True
+
+    def _status_args(self, pathspecs: list[str]) -> list[str]:
+        return [
+            "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=normal",
+            "--ignore-submodules=dirty", "--", *pathspecs,
+        ]
+
+    def _project_pathspec(self) -> list[str]:
+        rel = os.path.relpath(self.root, self.toplevel)
+        return [] if rel == "." else [_literal(rel)]
+
+    def _to_abs(self, files: dict[str, str]) -> tuple[dict[str, str], set[str]]:
+        out: dict[str, str] = {}
+        untracked_dirs = set()
+        for rel, flag in files.items():
+            path = os.path.normpath(os.path.join(self.toplevel, rel))
+            if rel.endswith("/"):
+                untracked_dirs.add(path)
+            out[path] = flag
+        return out, untracked_dirs
+
+    def _git_signature(self) -> tuple:
+        paths = ["index", "HEAD", "packed-refs"]
+        try:
+            with open(os.path.join(self.git_dir, "HEAD"), "rb") as f:
+                head = f.read(1024).decode("utf-8", "replace").strip()
+        except OSError:
+            head = ""
+        if head.startswith("ref: "):
+            paths.append(head[len("ref: "):])  # 커밋하면 바뀌는 현재 브랜치 ref
+        sig = []
+        for p in paths:
+            try:
+                st = os.stat(os.path.join(self.git_dir, p))
+                sig.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                sig.append(None)
+        return tuple(sig)
+
+    def _publish(self, branch: str | None, files: dict[str, str], untracked: set[str]):
+        dirs = _aggregate_dirs(files, self.root)
+        self._snapshot = GitSnapshot(branch, files, dirs, frozenset(untracked))
+        self.version += 1
+
+    def _refresh_full(self):
+        signature = self._git_signature()
+        out = _run_git(self.toplevel, self._status_args(self._project_pathspec()))
+        branch, rel_files = parse_porcelain_v2(out.stdout)
+        files, untracked = self._to_abs(rel_files)
+        self._signature = signature
+        self._publish(branch, files, untracked)
+        self.full_refreshes += 1
+
+    def _refresh_paths(self, changes: set[str]):
+        snap = self._snapshot
+        paths = [
+            p for p in changes
+            if p == self.root or p.startswith(self.root + os.sep)
+        ]
+        # 추적 안 하는 디렉터리 안의 변경은 그 디렉터리 표시가 바뀔 수 있으므로 전체를 다시 읽는다
+        if any(snap._in_untracked_dir(os.path.dirname(p)) for p in paths):
+            self._refresh_full()
+            return
+        if not paths:
+            return
+        pathspecs = [_literal(os.path.relpath(p, self.toplevel)) for p in paths]
+        out = _run_git(self.toplevel, self._status_args(pathspecs))
+        _, rel_files = parse_porcelain_v2(out.stdout)
+        found, untracked = self._to_abs(rel_files)
+        files = {p: f for p, f in snap.files.items() if p not in changes}
+        files.update(found)
+        self._publish(snap.branch, files, set(snap.untracked_dirs) | untracked)
+        self.incremental_refreshes += 1
+
+    # --- diff ---
+
+    def diff(self, path: str) -> dict:
+        """path의 HEAD 대비 변경(스테이징 포함)을 hunk 목록으로. 추적 안 하는 파일은 전체가 추가."""
+        # 첫 전체 읽기는 기다리지 않는다 — 큰 저장소에선 수십 초가 걸려 워커를 붙잡는다
+        self._detected.wait(DETECT_WAIT)
+        if self.toplevel is None:
+            return {"path": path, "status": None, "hunks": [], "binary": False, "truncated": False}
+        try:
+            st = os.stat(path)
+            file_sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            file_sig = None
+        key = (path, file_sig, self._signature)
+        with self._diff_lock:
+            cached = self._diff_cache.get(key)
+            if cached is not None:
+                self._diff_cache.move_to_end(key)
+                return cached
+        rel = os.path.relpath(path, self.toplevel)
+        if self._ready.is_set():
+            flag = self.snapshot().flag(path, False)
+        else:
+            flag = self._path_flag(rel)
+        common = ["diff", "--no-color", "--no-ext-diff", "--no-prefix"]
+        if flag == "?":
+            proc = _run_git(
+                self.toplevel, [*common, "--no-index", "--", os.devnull, rel], check=False
+            )
+        else:
+            proc = _run_git(self.toplevel, [*common, "HEAD", "--", _literal(rel)], check=False)
+            if proc.returncode not in (0, 1):  # HEAD가 없는 새 저장소
+                proc = _run_git(
+                    self.toplevel, [*common, "--cached", "--", _literal(rel)], check=False
+                )
+        raw = proc.stdout
+        truncated = len(raw) > MAX_DIFF_BYTES
+        text = raw[:MAX_DIFF_BYTES].decode("utf-8", "replace")
+        result = {
+            "path": path,
+            "status": flag,
+            "binary": "\nBinary files " in "\n" + text,
+            "hunks": parse_diff_hunks(text),
+            "truncated": truncated,
+        }
+        with self._diff_lock:
+            self._diff_cache[key] = result
+            while len(self._diff_cache) > DIFF_CACHE_MAX_ENTRIES:
+                self._diff_cache.popitem(last=False)
+        return result
+
+    def _path_flag(self, rel: str) -> str | None:
+        """스냅샷이 아직 없을 때 그 파일 하나만 git status로 묻는다."""
+        out = _run_git(self.toplevel, self._status_args([_literal(rel)]), check=False)
+        _, files = parse_porcelain_v2(out.stdout)
+        rel = rel.replace(os.sep, "/")
+        flag = files.get(rel)
+        if flag is None and any(rel.startswith(d) for d in files if d.endswith("/")):
+            return "?"
+        return flag
+
+
+def _aggregate_dirs(files: dict[str, str], root: str) -> dict[str, str]:
+    """변경된 경로의 조상 디렉터리(root까지)에 M / ? 표시를 올린다."""
+    dirs: dict[str, str] = {}
+    for path, flag in files.items():
+        parent = os.path.dirname(path)
+        while parent == root or parent.startswith(root + os.sep):
+            prev = dirs.get(parent)
+            merged = "?" if flag == "?" and prev in (None, "?") else "M"
+            if prev == merged:
+                break  # 위쪽도 이미 같은 표시
+            dirs[parent] = merged
+            if parent == root:
+                break
+            parent = os.path.dirname(parent)
+    return dirs
+
+
+class GitStatusManager:
+    """프로젝트 루트별 git 상태. 처음 요청될 때 만든다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statuses: dict[str, GitStatus] = {}
+
+    def get(self, root: str) -> GitStatus:
+        root = os.path.normpath(root)
+        with self._lock:
+            status = self._statuses.get(root)
+            if status is None:
+                status = GitStatus(root)
+                status.start()
+                self._statuses[root] = status
+            return status
+
+    def drop(self, root: str):
+        with self._lock:
+            status = self._statuses.pop(os.path.normpath(root), None)
+        if status is not None:
+            status.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = dict(self._statuses)
+        return {root: s.stats() for root, s in statuses.items()}
+
+    def close(self):
+        with self._lock:
+            statuses = list(self._statuses.values())
+            self._statuses.clear()
+        for status in statuses:
+            status.close()
+
+
+git_statuses = GitStatusManager()
@@ -0,0 +1,234 @@
+""".gitignore 패턴 매칭.
+
+패턴은 파일 하나를 읽을 때 정규식으로 한 번만 컴파일한다. 하위 디렉터리의 .gitignore가
+상위 규칙을 덮어쓰도록 IgnoreStack이 (기준 경로, 규칙) 목록을 쌓아 가장 가까운 것부터 검사한다.
+지원하는 문법: 주석(#), 부정(!), 디렉터리 전용(끝의 /), 앵커(중간/앞의 /), *, ?, [...], **.
+
+컴파일된 규칙은 rules_cache가 파일 경로별로 보관하고, RULES_TTL마다 stat으로 파일이 바뀌었는지
+확인해 바뀐 것만 다시 컴파일한다.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+GITIGNORE = ".gitignore"
+RULES_CACHE_MAX_ENTRIES = 50_000  # 없는 .gitignore도 빈 규칙으로 기억한다
+RULES_TTL = 1.0
+
+
+@dataclass(frozen=True)
+class _Rule:
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+def _translate(pattern: str) -> str:
+    """glob 패턴 하나를 "/"로 구분된 상대 경로 전체에 맞는 정규식으로 바꾼다."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                # "**/" → 0개 이상의 디렉터리, 끝의 "/**" → 그 아래 전부
+                if i + 2 < n and pattern[i + 2] == "/":
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "]") else i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def compile_pattern(line: str) -> _Rule | None:
+    """한 줄을 규칙으로 컴파일한다. 빈 줄과 주석은 None. 잘못된 패턴("[z-a]")이면 re.error."""
+    line = line.rstrip("\n").rstrip("\r")
+    if not line or line.startswith("#"):
+        return None
+    # 끝 공백은 "\ "로 이스케이프하지 않았으면 무시
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    negate = line.startswith("!")
+    if negate or line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    body = _translate(line)
+    prefix = "" if anchored else "(?:.*/)?"
+    # 디렉터리에 맞으면 그 아래 모든 경로도 무시된다
+    return _Rule(re.compile(f"{prefix}{body}"), negate, dir_only)
+
+
+def _compile_line(line: str) -> _Rule | None:
+    try:
+        return compile_pattern(line)
+    except re.error as e:
+        # 잘못된 줄 하나 때문에 목록·색인 전체가 깨지지 않도록 그 규칙만 버린다
+        logger.warning("ignoring invalid ignore pattern %r: %s", line.rstrip("\r\n"), e)
+        return None
+
+
+class IgnoreRules:
+    """.gitignore 파일 하나의 규칙. 경로는 그 파일이 있는 디렉터리 기준, "/" 구분."""
+
+    def __init__(self, lines: list[str]):
+        self.rules = [r for r in map(_compile_line, lines) if r is not None]
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, rel_path: str, is_dir: bool) -> bool | None:
+        """무시하면 True, 부정 패턴에 맞으면 False, 해당 규칙이 없으면 None."""
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(rel_path):
+                return not rule.negate
+        return None
+
+    @classmethod
+    def from_file(cls, path: str) -> "IgnoreRules":
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return cls(f.readlines())
+        except OSError:
+            return cls([])
+
+
+_NO_RULES = IgnoreRules([])
+
+
+def _signature(path: str) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+@dataclass
+class _CachedRules:
+    rules: IgnoreRules
+    signature: tuple[int, int, int] | None
+    checked_at: float
+
+
+class IgnoreRulesCache:
+    """무시 파일 경로 → 컴파일된 규칙 (LRU)."""
+
+    def __init__(self, max_entries: int = RULES_CACHE_MAX_ENTRIES, ttl: float = RULES_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, _CachedRules] = OrderedDict()
+        self.hits = 0
+        self.compiles = 0
+
+    def get(self, path: str) -> IgnoreRules:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(path)
+            if item is not None and now - item.checked_at < self.ttl:
+                self._items.move_to_end(path)
+                self.hits += 1
+                return item.rules
+        signature = _signature(path)
+        if item is not None and item.signature == signature:
+            item.checked_at = now
+            with self._lock:
+                self.hits += 1
+            return item.rules
+        rules = IgnoreRules.from_file(path) if signature is not None else _NO_RULES
+        with self._lock:
+            if signature is not None:
+                self.compiles += 1
+            self._items[path] = _CachedRules(rules, signature, now)
+            self._items.move_to_end(path)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return rules
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._items), "hits": self.hits, "compiles": self.compiles}
+
+
+rules_cache = IgnoreRulesCache()
+
+
+class IgnoreStack:
+    """디렉터리를 내려가며 쌓은 규칙들. 불변이며 child()가 새 스택을 만든다.
+
+    overrides는 root 기준 규칙으로, 모든 층보다 먼저 검사한다.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        layers: tuple[tuple[str, IgnoreRules], ...] = (),
+        overrides: IgnoreRules = _NO_RULES,
+    ):
+        self.root = root
+        self.layers = layers
+        self.overrides = overrides
+
+    def __bool__(self) -> bool:
+        return bool(self.layers or self.overrides)
+
+    def child(self, dir_path: str) -> "IgnoreStack":
+        """dir_path의 .gitignore가 있으면 그 규칙을 얹은 스택을 반환한다."""
+        rules = rules_cache.get(os.path.join(dir_path, GITIGNORE))
+        if not rules:
+            return self
+        return IgnoreStack(self.root, self.layers + ((dir_path, rules),), self.overrides)
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        layers = self.layers
+        if self.overrides:
+            layers = layers + ((self.root, self.overrides),)
+        for base, rules in reversed(layers):
+            # 경로는 정규화돼 있으므로 relpath(cwd를 읽는다) 대신 잘라 쓴다
+            if path.startswith(base) and path[len(base):len(base) + 1] == os.sep:
+                rel = path[len(base) + 1:]
+            else:
+                rel = os.path.relpath(path, base)
+            result = rules.match(rel.replace(os.sep, "/"), is_dir)
+            if result is not None:
+                return result
+        return False
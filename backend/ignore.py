@@ -0,0 +1,101 @@
+"""파일 목록·감시·색인에서 제외할 경로 규칙."""
+
+import fnmatch
+import os
+import re
+import threading
+
+from backend import store
+from backend.gitignore import IgnoreRules, IgnoreStack, rules_cache
+
+HIDDEN_DIRS = {
+    "node_modules", "__pycache__", ".git", ".venv", ".next", ".cache", "dist",
+    ".keep_vibing_trash",  # backend.trash.TRASH_DIR_NAME
+}
+
+# 에디터 임시/스왑 파일 — 변경 이벤트로 내보낼 가치가 없다
+IGNORED_FILE_PATTERNS = ("*.swp", "*.swx", "*~", ".#*", "4913", "*.tmp", ".DS_Store")
+_IGNORED_FILE_RE = re.compile("|".join(fnmatch.translate(p) for p in IGNORED_FILE_PATTERNS))
+
+
+def is_hidden_path(rel_parts: list[str] | tuple[str, ...]) -> bool:
+    """프로젝트 루트 기준 경로 조각 중 하나라도 HIDDEN_DIRS면 True."""
+    return any(part in HIDDEN_DIRS for part in rel_parts)
+
+
+def is_ignored_file(name: str) -> bool:
+    return _IGNORED_FILE_RE.match(name) is not None
+
+
+# --- .gitignore / .git/info/exclude / 프로젝트 설정 ---
+
+IGNORE_SETTING = "ignore_patterns"  # 프로젝트 설정: .gitignore 문법의 패턴 목록
+GIT_EXCLUDE = os.path.join(".git", "info", "exclude")
+
+_setting_lock = threading.Lock()
+_setting_rules: dict[str, IgnoreRules] = {}  # 프로젝트 루트 → 설정 패턴 규칙
+
+
+def _project_setting_rules(root: str) -> IgnoreRules:
+    with _setting_lock:
+        rules = _setting_rules.get(root)
+    if rules is None:
+        patterns = []
+        for p in store.load_projects():
+            if os.path.normpath(p["path"]) == root:
+                patterns = store.get_project_setting(p["id"], IGNORE_SETTING) or []
+                break
+        rules = IgnoreRules(patterns)
+        with _setting_lock:
+            _setting_rules[root] = rules
+    return rules
+
+
+def invalidate_project_ignore(root: str | None = None):
+    """프로젝트 설정 패턴이 바뀌었을 때 호출한다. root가 없으면 전부."""
+    with _setting_lock:
+        if root is None:
+            _setting_rules.clear()
+        else:
+            _setting_rules.pop(os.path.normpath(root), None)
+
+
+def project_ignore_stack(root: str) -> IgnoreStack:
+    """root의 .gitignore를 얹기 전 기본 스택.
+
+    .git/info/exclude가 가장 밑에 깔리고 .gitignore들이 그 위를 덮는다. 프로젝트 설정 패턴은
+    그 모두보다 우선하므로 "!.env"처럼 .gitignore된 경로를 다시 보이게 할 수도 있다.
+    """
+    root = os.path.normpath(root)
+    exclude = rules_cache.get(os.path.join(root, GIT_EXCLUDE))
+    return IgnoreStack(root, ((root, exclude),) if exclude else (), _project_setting_rules(root))
+
+
+def ignore_stack_for(root: str, directory: str) -> IgnoreStack:
+    """root부터 directory까지의 .gitignore를 모두 얹은 스택 — directory 바로 아래 항목을 판정한다."""
+    stack = project_ignore_stack(root).child(root)
+    rel = os.path.relpath(directory, root)
+    if rel != ".":
+        cur = root
+        for part in rel.split(os.sep):
+            cur = os.path.join(cur, part)
+            stack = stack.child(cur)
+    return stack
+
+
+def is_path_ignored(root: str, path: str, is_dir: bool) -> bool:
+    """root 밖이거나, HIDDEN_DIRS 아래거나, 자신 또는 조상 디렉터리가 무시되면 True."""
+    rel = os.path.relpath(path, root)
+    parts = rel.split(os.sep)
+    if rel == ".." or rel.startswith(".." + os.sep) or is_hidden_path(parts):
+        return True
+    stack = project_ignore_stack(root).child(root)
+    cur = root
+    for i, part in enumerate(parts):
+        cur = os.path.join(cur, part)
+        last = i == len(parts) - 1
+        if stack.is_ignored(cur, is_dir if last else True):
+            return True
+        if not last:
+            stack = stack.child(cur)
+    return False
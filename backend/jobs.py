@@ -0,0 +1,225 @@
+"""오래 걸리는 파일 작업(복사/삭제)을 위한 백그라운드 작업 관리.
+
+작업은 제출 즉시 id를 받고 전용 스레드 풀(JOB_MAX_WORKERS)에서 실행된다. 진행률(파일 수/바이트)은
+PROGRESS_INTERVAL마다 구독자에게 전달되며, 취소하면 작업 함수가 다음 check_cancelled()에서 멈춘다.
+끝난 작업은 JOB_RETENTION_SECONDS 동안 조회할 수 있다.
+"""
+
+import asyncio
+import secrets
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from fastapi import HTTPException
+
+JOB_MAX_WORKERS = 2
+PROGRESS_INTERVAL = 0.25
+JOB_RETENTION_SECONDS = 3600
+MAX_FINISHED_JOBS = 200
+SUBSCRIBER_QUEUE_MAX = 64
+
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = (
+    "queued", "running", "completed", "failed", "cancelled"
+)
+FINISHED = {COMPLETED, FAILED, CANCELLED}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind: str, params: dict, manager: "JobManager"):
+        self.id = secrets.token_hex(8)
+        self.kind = kind
+        self.params = params
+        self.status = QUEUED
+        self.files_total = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.bytes_done = 0
+        self.result: Any = None
+        self.error: str | None = None
+        self.error_status: int | None = None
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self._manager = manager
+        self._cancel = threading.Event()
+        self._last_publish = 0.0
+
+    # --- 작업 함수에서 호출 ---
+
+    def set_totals(self, files: int, nbytes: int):
+        self.files_total = files
+        self.bytes_total = nbytes
+        self._manager._publish(self)
+
+    def advance(self, files: int = 0, nbytes: int = 0):
+        self.files_done += files
+        self.bytes_done += nbytes
+        now = time.monotonic()
+        if now - self._last_publish >= PROGRESS_INTERVAL:
+            self._last_publish = now
+            self._manager._publish(self)
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "files_total": self.files_total,
+            "bytes_total": self.bytes_total,
+            "files_done": self.files_done,
+            "bytes_done": self.bytes_done,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    def __init__(self, max_workers: int = JOB_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._jobs: dict[str, Job] = {}
+        self._subscribers: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def submit(self, kind: str, params: dict, func: Callable[[Job], Any]) -> Job:
+        """func(job)을 작업 스레드에서 실행한다. 반환값은 job.result가 된다."""
+        job = Job(kind, params, self)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="job"
+                )
+            self._executor.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    def list_jobs(self) -> list[dict]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [j.to_dict() for j in sorted(jobs, key=lambda j: j.created_at, reverse=True)]
+
+    def cancel(self, job_id: str) -> Job:
+        job = self.get(job_id)
+        job._cancel.set()
+        return job
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """job 상태 dict를 받는 큐. 현재 상태가 먼저 들어가며, 끝나면 최종 상태 뒤에 None이 온다."""
+        job = self.get(job_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_MAX)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append((asyncio.get_running_loop(), queue))
+            snapshot = job.to_dict()
+        _push(queue, snapshot)
+        if snapshot["status"] in FINISHED:
+            _push(queue, None)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subs = [s for s in self._subscribers.get(job_id, []) if s[1] is not queue]
+            if subs:
+                self._subscribers[job_id] = subs
+            else:
+                self._subscribers.pop(job_id, None)
+
+    async def wait(self, job_id: str) -> Job:
+        queue = self.subscribe(job_id)
+        try:
+            while await queue.get() is not None:
+                pass
+        finally:
+            self.unsubscribe(job_id, queue)
+        return self.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts: dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"max_workers": self.max_workers, "jobs": counts}
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._jobs.values():
+                job._cancel.set()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Internals ---
+
+    def _run(self, job: Job, func: Callable[[Job], Any]):
+        if not job._cancel.is_set():
+            job.status = RUNNING
+            self._publish(job)
+            try:
+                job.result = func(job)
+                job.status = COMPLETED
+            except JobCancelled:
+                pass
+            except HTTPException as e:
+                job.status, job.error, job.error_status = FAILED, e.detail, e.status_code
+            except PermissionError:
+                job.status, job.error, job.error_status = FAILED, "Permission denied", 403
+            except Exception as e:
+                job.status, job.error, job.error_status = FAILED, str(e), 500
+        if job.status in (QUEUED, RUNNING):
+            job.status = CANCELLED
+        job.finished_at = time.time()
+        self._publish(job, final=True)
+
+    def _publish(self, job: Job, final: bool = False):
+        with self._lock:
+            subs = list(self._subscribers.get(job.id, []))
+            snapshot = job.to_dict()
+        for loop, queue in subs:
+            try:
+                loop.call_soon_threadsafe(_push, queue, snapshot)
+                if final:
+                    loop.call_soon_threadsafe(_push, queue, None)
+            except RuntimeError:
+                pass  # 루프가 이미 닫힘
+
+    def _prune(self):
+        """잠금을 잡은 상태에서 호출한다."""
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        finished = sorted(
+            (j for j in self._jobs.values() if j.finished_at is not None),
+            key=lambda j: j.finished_at,
+        )
+        excess = len(finished) - MAX_FINISHED_JOBS
+        for i, job in enumerate(finished):
+            if i < excess or job.finished_at < cutoff:
+                del self._jobs[job.id]
+
+
+def _push(queue: asyncio.Queue, message: dict | None):
+    """진행 상황은 최신 것만 중요하므로 큐가 가득 차면 가장 오래된 것을 버린다."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+job_manager = JobManager()
@@ -0,0 +1,223 @@
+"""대용량 파일 줄 단위 읽기 (pread + 블록 단위 줄 수 색인).
+
+파일 전체를 메모리에 올리지 않는다. 색인은 BLOCK_SIZE마다 "그 앞까지의 줄바꿈 수" 하나만
+저장하므로 수 GB 파일도 수천 개 정수면 된다. 필요한 곳까지만 지연 생성하고, 뒤에 덧붙여지는
+로그는 늘어난 부분만 이어서 색인한다.
+"""
+
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+BLOCK_SIZE = 1024 * 1024
+MAX_LINE_BYTES = 64 * 1024  # 한 줄이 이보다 길면 잘라서 보낸다
+MAX_FOLLOW_BYTES = 1024 * 1024
+INDEX_CACHE_MAX = 32
+SCAN_CHUNK = 64 * 1024
+HEAD_FINGERPRINT_BYTES = 256  # 잘린 뒤 다시 커진 파일(copytruncate 로테이션)을 알아보는 데 쓴다
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="replace")
+
+
+def _pread(fd: int, start: int, end: int) -> bytes:
+    """[start, end) 구간. 그 사이 파일이 잘렸으면 짧게(또는 빈 값으로) 돌려준다.
+
+    mmap은 읽는 도중 파일이 잘리면 SIGBUS로 프로세스 전체가 죽으므로 pread만 쓴다.
+    """
+    if end <= start:
+        return b""
+    return os.pread(fd, end - start, start)
+
+
+def _find_newline(fd: int, start: int, end: int) -> int:
+    """[start, end)에서 첫 줄바꿈의 위치. 없으면 -1."""
+    pos = start
+    while pos < end:
+        raw = _pread(fd, pos, min(end, pos + SCAN_CHUNK))
+        nl = raw.find(b"\n")
+        if nl != -1:
+            return pos + nl
+        if not raw:
+            break
+        pos += len(raw)
+    return -1
+
+
+class LineIndex:
+    def __init__(self, st: os.stat_result):
+        self.ino = st.st_ino
+        self.dev = st.st_dev
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.block_newlines = array("Q", [0])  # [i] = BLOCK_SIZE*i 앞의 줄바꿈 수
+        self.indexed_bytes = 0
+        self.newlines = 0  # [0, indexed_bytes) 안의 줄바꿈 수
+        self.head = b""
+
+    def same_file(self, st: os.stat_result) -> bool:
+        return (st.st_ino, st.st_dev) == (self.ino, self.dev)
+
+    def sync(self, fd: int, size: int):
+        """파일이 잘렸거나 앞부분이 바뀌었으면 색인을 버린다. 덧붙은 경우는 그대로 이어 쓴다."""
+        if size < self.indexed_bytes or _pread(fd, 0, len(self.head)) != self.head:
+            self._reset()
+        if not self.head:
+            self.head = _pread(fd, 0, HEAD_FINGERPRINT_BYTES)
+
+    def extend(self, fd: int, target_bytes: int, until_newlines: int | None = None):
+        """target_bytes까지, 또는 줄바꿈이 until_newlines개를 넘을 때까지 색인한다."""
+        pos = self.indexed_bytes
+        while pos < target_bytes:
+            if until_newlines is not None and self.newlines > until_newlines:
+                break
+            boundary = (pos // BLOCK_SIZE + 1) * BLOCK_SIZE
+            end = min(boundary, target_bytes)
+            raw = _pread(fd, pos, end)
+            self.newlines += raw.count(b"\n")
+            if len(raw) < end - pos:
+                # 색인 도중 잘렸다 — 읽은 데까지만 기록하고 다음 sync에서 다시 만든다
+                pos += len(raw)
+                break
+            if end == boundary:
+                self.block_newlines.append(self.newlines)
+            pos = end
+        self.indexed_bytes = pos
+
+    def line_offset(self, fd: int, line: int) -> int | None:
+        """0부터 센 line번째 줄의 시작 바이트. 색인 범위 밖이면 None."""
+        if line == 0:
+            return 0
+        if line > self.newlines:
+            return None
+        block = bisect_left(self.block_newlines, line) - 1
+        base = block * BLOCK_SIZE
+        # 찾는 줄바꿈은 이 블록 안에 있으므로 블록 하나만 읽는다
+        raw = _pread(fd, base, min(base + BLOCK_SIZE, self.indexed_bytes))
+        pos = 0
+        for _ in range(line - self.block_newlines[block]):
+            nl = raw.find(b"\n", pos)
+            if nl == -1:
+                return None  # 그 사이 잘렸다
+            pos = nl + 1
+        return base + pos
+
+
+def _read_lines(fd: int, offset: int, count: int, size: int) -> list[str]:
+    lines = []
+    pos = offset
+    while len(lines) < count and pos < size:
+        raw = _pread(fd, pos, min(size, pos + MAX_LINE_BYTES + 1))
+        if not raw:
+            break  # 그 사이 잘렸다
+        nl = raw.find(b"\n")
+        if nl == -1:
+            lines.append(_decode(raw[:MAX_LINE_BYTES]).rstrip("\r"))
+            # 잘린 긴 줄은 다음 줄바꿈까지 건너뛴다
+            nl = _find_newline(fd, pos + len(raw), size)
+            pos = size if nl == -1 else nl + 1
+        else:
+            lines.append(_decode(raw[:nl]).rstrip("\r"))
+            pos += nl + 1
+    return lines
+
+
+class LineReader:
+    """경로별 LineIndex를 LRU로 보관한다. 메서드는 파일시스템 executor에서 호출한다."""
+
+    def __init__(self, max_indexes: int = INDEX_CACHE_MAX):
+        self.max_indexes = max_indexes
+        self._lock = threading.Lock()
+        self._indexes: OrderedDict[str, LineIndex] = OrderedDict()
+
+    def _index_for(self, path: str, st: os.stat_result) -> LineIndex:
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is not None and index.same_file(st):
+                self._indexes.move_to_end(path)
+                return index
+            index = LineIndex(st)
+            self._indexes[path] = index
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+            return index
+
+    def read_lines(self, path: str, start: int, count: int, with_total: bool = False) -> dict:
+        with open(path, "rb") as f:
+            fd = f.fileno()
+            st = os.fstat(fd)
+            size = st.st_size
+            result = {"start": start, "lines": [], "size": size}
+            if size == 0:
+                return {**result, "total_lines": 0, "complete": True}
+            index = self._index_for(path, st)
+            with index.lock:
+                index.sync(fd, size)
+                if with_total:
+                    index.extend(fd, size)
+                else:
+                    index.extend(fd, size, until_newlines=start + count)
+                offset = index.line_offset(fd, start)
+                complete = index.indexed_bytes >= size
+                total = None
+                if complete:
+                    total = index.newlines + (0 if _pread(fd, size - 1, size) == b"\n" else 1)
+            if offset is not None and offset < size:
+                result["lines"] = _read_lines(fd, offset, count, size)
+            return {**result, "total_lines": total, "complete": complete}
+
+    def tail(self, path: str, lines: int) -> dict:
+        """마지막 lines줄과 이어 읽기(follow)에 쓸 offset을 반환한다."""
+        with open(path, "rb") as f:
+            fd = f.fileno()
+            size = os.fstat(fd).st_size
+            if size == 0:
+                return {"lines": [], "offset": 0}
+            # 마지막 줄바꿈은 빈 줄로 치지 않는다
+            end = size - 1 if _pread(fd, size - 1, size) == b"\n" else size
+            start, found, pos = 0, 0, end
+            while found < lines and pos > 0:
+                lo = max(0, pos - SCAN_CHUNK)
+                raw = _pread(fd, lo, pos)
+                cut = len(raw)
+                while found < lines:
+                    nl = raw.rfind(b"\n", 0, cut)
+                    if nl == -1:
+                        break
+                    found, cut, start = found + 1, nl, lo + nl + 1
+                pos = lo
+            if found < lines:
+                start = 0
+            return {"lines": _read_lines(fd, start, lines, end), "offset": size}
+
+    def follow(self, path: str, since: int) -> dict:
+        """since 이후 덧붙은 완전한 줄들. 파일이 줄었으면 reset=True와 함께 처음부터 읽는다."""
+        with open(path, "rb") as f:
+            fd = f.fileno()
+            size = os.fstat(fd).st_size
+            reset = since > size
+            if reset:
+                since = 0
+            if since == size:
+                return {"lines": [], "offset": size, "reset": reset}
+            raw = _pread(fd, since, min(size, since + MAX_FOLLOW_BYTES))
+            last_nl = raw.rfind(b"\n")
+            if last_nl == -1:
+                if len(raw) < MAX_FOLLOW_BYTES:
+                    # 아직 끝나지 않은 줄 — 다음 요청까지 기다린다
+                    return {"lines": [], "offset": since, "reset": reset}
+                last_nl = len(raw) - 1  # 줄바꿈 없는 거대한 줄은 잘라서 보낸다
+            chunk = _decode(raw[:last_nl + 1])
+            end = since + last_nl + 1
+            lines = chunk.split("\n")
+            if lines and lines[-1] == "":
+                lines.pop()
+            return {"lines": [ln.rstrip("\r") for ln in lines], "offset": end, "reset": reset}
+
+
+line_reader = LineReader()
@@ -0,0 +1,208 @@
+"""이벤트 루프 지연 감시와 루프를 막는 호출 탐지.
+
+루프 안의 태스크가 SAMPLE_INTERVAL마다 깨어나, 예정보다 늦게 깨어난 만큼(스케줄링 지연)을
+기록한다. 별도 감시 스레드는 그 태스크의 마지막 기록이 LAG_THRESHOLD 이상 밀리면 루프가
+막힌 것으로 보고 루프 스레드의 스택을 떠 둔다 — 루프가 다시 돌 때는 이미 늦기 때문이다.
+그때 처리 중이던 요청도 오래된 순으로 함께 남기고 로그에 쓴다.
+"""
+
+import asyncio
+import itertools
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 0.05
+LAG_THRESHOLD = 0.1
+SAMPLE_WINDOW = 1200  # SAMPLE_INTERVAL마다 하나 — 최근 1분
+STALL_HISTORY = 20
+STACK_LIMIT = 40
+STALL_REQUESTS = 5
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL,
+        threshold: float = LAG_THRESHOLD,
+        window: int = SAMPLE_WINDOW,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=window)
+        self._stalls: deque[dict] = deque(maxlen=STALL_HISTORY)
+        self._current_stall: dict | None = None
+        self._inflight: dict[int, tuple[str, str, float]] = {}
+        self._request_ids = itertools.count()
+        self._beat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.started_at = time.time()
+        self.stall_count = 0
+        self.max_lag = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self):
+        """실행 중인 루프에서 호출한다."""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self.started_at = time.time()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join(timeout=1)
+        self._watchdog = None
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._record(max(now - expected, 0.0), now)
+
+    def _record(self, lag: float, now: float):
+        with self._lock:
+            self._samples.append(lag)
+            self._beat = now
+            self.max_lag = max(self.max_lag, lag)
+            stall, self._current_stall = self._current_stall, None
+        if stall is not None:
+            # 감시 스레드가 본 시점이 아니라 루프가 실제로 멈춰 있던 전체 시간
+            stall["lag_ms"] = round(lag * 1000, 1)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                beat = self._beat
+                blocked = time.monotonic() - beat - self.interval
+                if blocked < self.threshold or self._current_stall is not None:
+                    continue
+            self._capture(beat, blocked)
+
+    def _capture(self, beat: float, blocked: float):
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = traceback.format_stack(frame, limit=STACK_LIMIT) if frame is not None else []
+        requests = self.inflight()[:STALL_REQUESTS]
+        stall = {
+            "at": time.time(),
+            "lag_ms": round(blocked * 1000, 1),
+            "stack": [line.rstrip() for line in stack],
+            "requests": requests,
+        }
+        with self._lock:
+            if self._beat != beat:
+                # 스택을 뜨는 사이 루프가 다시 돌았다 — 이 스택은 막고 있던 코드가 아닐 수 있다
+                return
+            self._current_stall = stall
+            self._stalls.append(stall)
+            self.stall_count += 1
+        logger.warning(
+            "event loop blocked for %.0f ms; in-flight: %s\n%s",
+            blocked * 1000,
+            ", ".join(f"{r['method']} {r['path']} ({r['elapsed_ms']:.0f} ms)" for r in requests)
+            or "none",
+            "".join(stack[-10:]),
+        )
+
+    def request_started(self, method: str, path: str) -> int:
+        request_id = next(self._request_ids)
+        with self._lock:
+            self._inflight[request_id] = (method, path, time.monotonic())
+        return request_id
+
+    def request_finished(self, request_id: int):
+        with self._lock:
+            self._inflight.pop(request_id, None)
+
+    def inflight(self) -> list[dict]:
+        """처리 중인 요청, 가장 오래된 것부터."""
+        now = time.monotonic()
+        with self._lock:
+            items = sorted(self._inflight.values(), key=lambda item: item[2])
+        return [
+            {"method": method, "path": path, "elapsed_ms": round((now - start) * 1000, 1)}
+            for method, path, start in items
+        ]
+
+    def lag(self) -> dict:
+        with self._lock:
+            ordered = sorted(self._samples)
+        return {
+            "samples": len(ordered),
+            "p50_ms": round(_percentile(ordered, 0.5) * 1000, 2),
+            "p90_ms": round(_percentile(ordered, 0.9) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 2),
+            "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 2),
+        }
+
+    def healthy(self) -> bool:
+        return self.lag()["p99_ms"] < self.threshold * 1000
+
+    def stats(self) -> dict:
+        with self._lock:
+            stalls = list(self._stalls)
+            stall_count = self.stall_count
+            max_lag = self.max_lag
+        return {
+            "running": self.running,
+            "threshold_ms": self.threshold * 1000,
+            "lag": self.lag(),
+            "max_lag_ms": round(max_lag * 1000, 2),
+            "stalls": stall_count,
+            "recent_stalls": stalls,
+            "inflight": self.inflight(),
+        }
+
+
+class LoopMonitorMiddleware:
+    """처리 중인 HTTP 요청을 기록해 루프가 막혔을 때 함께 보여 준다."""
+
+    def __init__(self, app: ASGIApp, monitor: LoopMonitor | None = None):
+        self.app = app
+        self.monitor = monitor or loop_monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = self.monitor.request_started(scope["method"], scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.request_finished(request_id)
+
+
+loop_monitor = LoopMonitor()
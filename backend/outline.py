@@ -0,0 +1,419 @@
+"""파일 하나의 심볼 개요(클래스·함수·제목 등과 그 줄 범위)를 만든다.
+
+Python은 ast로, TS/JS·Go·Rust는 문자열/주석을 지운 뒤 선언 정규식과 중괄호 짝으로,
+Markdown은 제목 줄로 뽑는다. 줄 번호는 1부터 세며 end_line까지 포함한다 — 클라이언트는
+/api/files/lines?start=line-1&count=end_line-line+1 로 심볼 부분만 받아 가면 된다.
+결과는 (mtime, 크기, inode)가 같은 동안 LRU에 캐시한다.
+"""
+
+import ast
+import bisect
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from backend.text_patch import decode_text
+from backend.text_sniff import detect_encoding, sniff_cache
+
+MAX_OUTLINE_SIZE = 32 * 1024 * 1024
+OUTLINE_CACHE_MAX_ENTRIES = 512
+# 선언 뒤에서 본문을 여는 { 를 찾을 때 이 글자 수 안에서만 본다
+MAX_HEADER_CHARS = 2000
+
+LANGUAGES = {
+    ".py": "python",
+    ".pyi": "python",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".mts": "typescript",
+    ".cts": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".go": "go",
+    ".rs": "rust",
+    ".md": "markdown",
+    ".markdown": "markdown",
+}
+
+
+def language_for(path: str) -> str | None:
+    return LANGUAGES.get(os.path.splitext(path)[1].lower())
+
+
+def _symbol(name: str, kind: str, line: int, end_line: int) -> dict:
+    return {"name": name, "kind": kind, "line": line, "end_line": end_line, "children": []}
+
+
+# --- Python ---
+
+_PY_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+_PY_DEF = re.compile(r"[ \t]*(?:async[ \t]+)?(def|class)[ \t]+(\w+)")
+
+
+def _python_nodes(node: ast.AST, in_class: bool) -> list[dict]:
+    symbols = []
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, ast.ClassDef):
+            item = _symbol(child.name, "class", child.lineno, child.end_lineno)
+            item["children"] = _python_nodes(child, True)
+            symbols.append(item)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            kind = "method" if in_class else "function"
+            item = _symbol(child.name, kind, child.lineno, child.end_lineno)
+            item["children"] = _python_nodes(child, False)
+            symbols.append(item)
+        elif isinstance(child, _PY_CONTAINERS):
+            # if TYPE_CHECKING:, try/except 임포트 안의 정의도 같은 단계로 올린다
+            symbols.extend(_python_nodes(child, in_class))
+    return symbols
+
+
+def _python_by_indent(text: str) -> list[dict]:
+    """편집 중이라 문법 오류가 있는 파일: def/class 줄과 들여쓰기로 범위를 어림한다."""
+    roots: list[dict] = []
+    stack: list[tuple[int, dict]] = []
+    last_code = 0
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.lstrip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line.expandtabs()) - len(stripped.expandtabs())
+        # 정의보다 깊지 않은 코드 줄이 나오면 그 정의의 본문은 바로 앞 코드 줄에서 끝났다
+        while stack and indent <= stack[-1][0]:
+            stack.pop()[1]["end_line"] = last_code
+        m = _PY_DEF.match(line)
+        if m:
+            in_class = bool(stack) and stack[-1][1]["kind"] == "class"
+            kind = "class" if m.group(1) == "class" else "method" if in_class else "function"
+            item = _symbol(m.group(2), kind, number, number)
+            (stack[-1][1]["children"] if stack else roots).append(item)
+            stack.append((indent, item))
+        last_code = number
+    for _, item in stack:
+        item["end_line"] = last_code
+    return roots
+
+
+def python_outline(text: str) -> list[dict]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return _python_by_indent(text)
+    return _python_nodes(tree, False)
+
+
+# --- 중괄호 언어 (TS/JS, Go, Rust) ---
+
+_JS_COMMENTS = r"//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)"
+_MASKS = {
+    # 문자열은 줄 끝에서 끊는다 — 닫히지 않은 따옴표가 파일 나머지를 삼키지 않게
+    "js": re.compile(
+        _JS_COMMENTS + r"""|"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?|`(?:\\[\s\S]|[^`\\])*`?"""
+    ),
+    "go": re.compile(_JS_COMMENTS + r"""|"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?|`[^`]*`?"""),
+    # Rust의 'a 는 라이프타임이라 닫는 따옴표가 바로 붙은 문자 리터럴만 지운다
+    "rust": re.compile(
+        _JS_COMMENTS + r"""|r(#*)"[\s\S]*?"\1|"(?:\\[\s\S]|[^"\\])*"?|'(?:\\.[^']*|[^'\\\n])'"""
+    ),
+}
+
+_NAME = r"[A-Za-z_$][\w$]*"
+_EXPORT = r"^[ \t]*(?:export[ \t]+(?:default[ \t]+)?)?(?:declare[ \t]+)?"
+_MODIFIERS = (
+    r"(?:(?:public|private|protected|static|readonly|abstract|override|async|get|set)[ \t]+)*"
+)
+_ARROW = rf"(?:async[ \t]+)?(?:\([^)]*\)|{_NAME})[ \t]*(?::[^=\n]+)?=>"
+
+# (정규식, 종류, 줄바꿈에서 끝나는지, 클래스 본문 안에서만 받는지)
+# 종류가 None이면 정규식의 kind 그룹을 쓴다
+_JS_DECLS = [
+    (rf"{_EXPORT}(?:abstract[ \t]+)?class[ \t]+(?P<name>{_NAME})", "class", False, False),
+    (
+        rf"{_EXPORT}(?:async[ \t]+)?function\b[ \t]*\*?[ \t]*(?P<name>{_NAME})",
+        "function",
+        False,
+        False,
+    ),
+    (rf"{_EXPORT}interface[ \t]+(?P<name>{_NAME})", "interface", False, False),
+    (rf"{_EXPORT}type[ \t]+(?P<name>{_NAME})[^=\n;]*=", "type", True, False),
+    (rf"{_EXPORT}(?:const[ \t]+)?enum[ \t]+(?P<name>{_NAME})", "enum", False, False),
+    (rf"{_EXPORT}namespace[ \t]+(?P<name>{_NAME})", "namespace", False, False),
+    (
+        (
+            rf"{_EXPORT}(?:const|let|var)[ \t]+(?P<name>{_NAME})[ \t]*(?::[^=\n]+)?="
+            rf"[ \t]*(?:async[ \t]+function\b|function\b|{_ARROW})"
+        ),
+        "function",
+        True,
+        False,
+    ),
+    (
+        (
+            rf"^[ \t]*{_MODIFIERS}\*?[ \t]*(?P<name>#?{_NAME})[ \t]*\??[ \t]*"
+            r"(?:<[^>\n]*>)?[ \t]*(?=\()"
+        ),
+        "method",
+        False,
+        True,
+    ),
+    (
+        rf"^[ \t]*{_MODIFIERS}(?P<name>#?{_NAME})[ \t]*(?::[^=\n]+)?=[ \t]*{_ARROW}",
+        "method",
+        True,
+        True,
+    ),
+]
+_GO_DECLS = [
+    (r"^func[ \t]*(?P<recv>\([^)]*\))?[ \t]*(?P<name>\w+)", "function", False, False),
+    (r"^type[ \t]+(?P<name>\w+)[ \t]+(?:\[[^\]\n]*\][ \t]*)?(?P<kind>struct|interface)\b",
+     None, False, False),
+    (r"^type[ \t]+(?P<name>\w+)[ \t]+(?!struct\b|interface\b)", "type", True, False),
+]
+_RUST_VIS = r"^[ \t]*(?:pub(?:\([^)]*\))?[ \t]+)?"
+_RUST_DECLS = [
+    (
+        rf"{_RUST_VIS}(?:(?:const|async|unsafe|extern)[ \t]+)*fn[ \t]+(?P<name>\w+)",
+        "function",
+        False,
+        False,
+    ),
+    (rf"{_RUST_VIS}(?P<kind>struct|enum|trait|mod|union)[ \t]+(?P<name>\w+)", None, False, False),
+    (r"^[ \t]*(?:unsafe[ \t]+)?impl\b(?:[ \t]*<[^>\n]*>)?[ \t]*(?P<name>[^{;\n]+?)[ \t]*(?=\{|\n)",
+     "impl", False, False),
+    (rf"{_RUST_VIS}type[ \t]+(?P<name>\w+)", "type", True, False),
+]
+_KEYWORDS = frozenset({
+    "if", "for", "while", "switch", "catch", "return", "function", "with", "do", "else", "new",
+    "typeof", "await", "yield",
+})
+_BRACE_LANGUAGES = {
+    "typescript": ("js", [(re.compile(p, re.MULTILINE), *rest) for p, *rest in _JS_DECLS]),
+    "javascript": ("js", [(re.compile(p, re.MULTILINE), *rest) for p, *rest in _JS_DECLS]),
+    "go": ("go", [(re.compile(p, re.MULTILINE), *rest) for p, *rest in _GO_DECLS]),
+    "rust": ("rust", [(re.compile(p, re.MULTILINE), *rest) for p, *rest in _RUST_DECLS]),
+}
+_CONTAINER_KINDS = {"class", "impl", "trait"}
+
+
+def mask_code(text: str, style: str) -> str:
+    """주석과 문자열 리터럴을 공백으로 바꾼다. 길이와 줄바꿈 위치는 그대로 둔다."""
+
+    def blank(m: re.Match) -> str:
+        return re.sub(r"[^\n]", " ", m.group())
+
+    return _MASKS[style].sub(blank, text)
+
+
+def _body_end(code: str, pos: int, limit: int, newline_ends: bool) -> tuple[str, int]:
+    """pos부터 괄호 밖의 첫 { 또는 ; (newline_ends면 줄바꿈도)를 찾는다. 없으면 ("", pos)."""
+    while pos < limit and code[pos] in " \t\n":
+        pos += 1
+    depth = 0
+    for i in range(pos, limit):
+        ch = code[i]
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and (ch == "{" or ch == ";" or (newline_ends and ch == "\n")):
+            return ch, i
+    return "", pos
+
+
+def _brace_pairs(code: str, offsets: list[int]) -> tuple[dict[int, int], list[int]]:
+    """{ 위치 → 짝 } 위치, 그리고 offsets 각각을 감싸는 가장 안쪽 { 위치(-1은 최상위)."""
+    closes: dict[int, int] = {}
+    stack: list[int] = []
+    pending = iter(sorted(range(len(offsets)), key=offsets.__getitem__))
+    index = next(pending, None)
+    results = [-1] * len(offsets)
+    for m in re.finditer(r"[{}]", code):
+        while index is not None and offsets[index] < m.start():
+            results[index] = stack[-1] if stack else -1
+            index = next(pending, None)
+        if m.group() == "{":
+            stack.append(m.start())
+        elif stack:
+            closes[stack.pop()] = m.start()
+    while index is not None:
+        results[index] = stack[-1] if stack else -1
+        index = next(pending, None)
+    for open_pos in stack:
+        closes[open_pos] = len(code)
+    return closes, results
+
+
+def brace_outline(text: str, language: str) -> list[dict]:
+    style, decls = _BRACE_LANGUAGES[language]
+    code = mask_code(text, style)
+    newlines = [m.start() for m in re.finditer("\n", code)]
+
+    def line_of(offset: int) -> int:
+        return bisect.bisect_left(newlines, offset) + 1
+
+    found: dict[int, tuple] = {}
+    for pattern, kind, newline_ends, member in decls:
+        for m in pattern.finditer(code):
+            name = m.group("name").strip()
+            if name in _KEYWORDS:
+                continue
+            start = m.start("name")
+            if start not in found:
+                sym_kind = kind or m.group("kind")
+                if "recv" in pattern.groupindex and m.group("recv"):
+                    sym_kind = "method"
+                found[start] = (name, sym_kind, newline_ends, member, m.end())
+    starts = sorted(found)
+
+    # 본문 범위: 다음 선언 앞까지에서 본문을 여는 { 나 문장을 끝내는 ; 를 찾는다
+    items = []
+    for i, start in enumerate(starts):
+        name, kind, newline_ends, member, header_end = found[start]
+        limit = min(header_end + MAX_HEADER_CHARS, len(code))
+        if i + 1 < len(starts):
+            limit = min(limit, starts[i + 1])
+        ch, pos = _body_end(code, header_end, limit, newline_ends)
+        items.append([start, name, kind, member, ch, pos])
+
+    closes, enclosing = _brace_pairs(code, starts)
+    containers = {pos for _, _, kind, _, ch, pos in items if ch == "{" and kind in _CONTAINER_KINDS}
+
+    nodes = []
+    for (start, name, kind, member, ch, pos), parent_open in zip(items, enclosing):
+        if member and parent_open not in containers:
+            continue
+        end = closes.get(pos, pos) if ch == "{" else pos if ch else start
+        nodes.append((start, end, _symbol(name, kind, line_of(start), line_of(end))))
+
+    roots: list[dict] = []
+    stack: list[tuple[int, dict]] = []
+    for start, end, item in nodes:
+        while stack and stack[-1][0] < start:
+            stack.pop()
+        if stack:
+            parent = stack[-1][1]
+            if item["kind"] == "function" and parent["kind"] in ("impl", "trait"):
+                item["kind"] = "method"
+            parent["children"].append(item)
+        else:
+            roots.append(item)
+        stack.append((end, item))
+    return roots
+
+
+# --- Markdown ---
+
+_HEADING = re.compile(r"(#{1,6})[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$")
+_FENCE = re.compile(r"[ \t]{0,3}(```|~~~)")
+
+
+def markdown_outline(text: str) -> list[dict]:
+    roots: list[dict] = []
+    stack: list[tuple[int, dict]] = []
+    fence = None
+    lines = text.splitlines()
+    for number, line in enumerate(lines, 1):
+        m = _FENCE.match(line)
+        if m:
+            if fence is None:
+                fence = m.group(1)
+            elif m.group(1) == fence:
+                fence = None
+            continue
+        m = _HEADING.match(line) if fence is None else None
+        if not m:
+            continue
+        level = len(m.group(1))
+        while stack and stack[-1][0] >= level:
+            stack.pop()[1]["end_line"] = number - 1
+        item = _symbol(m.group(2), "heading", number, number)
+        (stack[-1][1]["children"] if stack else roots).append(item)
+        stack.append((level, item))
+    for _, item in stack:
+        item["end_line"] = len(lines)
+    return roots
+
+
+def outline(text: str, language: str | None) -> list[dict]:
+    """텍스트의 심볼 트리. 지원하지 않는 언어는 빈 목록."""
+    if language == "python":
+        return python_outline(text)
+    if language == "markdown":
+        return markdown_outline(text)
+    if language in _BRACE_LANGUAGES:
+        return brace_outline(text, language)
+    return []
+
+
+# --- 캐시 ---
+
+
+def _signature(st: os.stat_result) -> tuple[int, int, int]:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class OutlineCache:
+    """파일 경로 → 개요 (LRU). stat이 바뀌면 다시 만든다."""
+
+    def __init__(self, max_entries: int = OUTLINE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[tuple[int, int, int], dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, st: os.stat_result) -> dict:
+        signature = _signature(st)
+        with self._lock:
+            item = self._items.get(path)
+            if item is not None and item[0] == signature:
+                self._items.move_to_end(path)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+        result = self._build(path, st)
+        with self._lock:
+            self._items[path] = (signature, result)
+            self._items.move_to_end(path)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return result
+
+    def _build(self, path: str, st: os.stat_result) -> dict:
+        language = language_for(path)
+        result = {"language": language, "symbols": []}
+        if language is None:
+            return result
+        encoding = sniff_cache.sniff(path, st)
+        if encoding is None:
+            return result
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            text = decode_text(raw, encoding)
+        except UnicodeDecodeError:
+            encoding = detect_encoding(raw)
+            sniff_cache.remember(path, st, encoding)
+            if encoding is None:
+                return result
+            text = decode_text(raw, encoding)
+        result["symbols"] = outline(text, language)
+        return result
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._items.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+outline_cache = OutlineCache()
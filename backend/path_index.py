@@ -0,0 +1,515 @@
+"""빠른 파일 열기(quick open)용 메모리 경로 색인.
+
+프로젝트 파일 경로를 문자열 객체 수십만 개로 들고 있지 않도록 경로 조각(segment)을 intern하고
+디렉터리/파일을 array 열(column)로 저장한다:
+
+    dir_parent[d], dir_name[d]    부모 디렉터리 번호, 이름 segment 번호 (루트는 0)
+    file_dir[f], file_name[f]     파일이 있는 디렉터리 번호, 이름 segment 번호 (-1 = 빈 칸)
+
+검색할 때는 소문자 상대 경로를 줄바꿈으로 이은 문자열(blob) 하나를 만들어 두고, 쿼리 글자들이
+순서대로 나오는 줄을 정규식으로 한 번에 찾은 뒤(C 속도) 후보만 점수를 매겨 상위 k개를 고른다.
+blob은 색인이 바뀐 뒤 첫 검색에서 다시 만든다.
+"""
+
+import bisect
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+
+from backend.fs_events import DELETED, FsEventHub, fs_events
+from backend.gitignore import GITIGNORE, IgnoreStack
+from backend.ignore import HIDDEN_DIRS, ignore_stack_for, is_path_ignored, project_ignore_stack
+
+logger = logging.getLogger(__name__)
+
+WALK_WORKERS = 8
+MAX_SCORED_CANDIDATES = 5000  # 이보다 많으면 앞쪽 후보만 점수를 매긴다 (한두 글자 쿼리)
+
+_BOUNDARY_CHARS = "/_-. "
+
+
+def _scan_dir(item: tuple[int, str, IgnoreStack]) -> tuple[IgnoreStack, list[tuple[str, bool]]]:
+    """디렉터리 하나를 읽어 무시되지 않는 (이름, 디렉터리 여부) 목록을 반환한다 (작업 스레드)."""
+    _, path, parent_stack = item
+    stack = parent_stack.child(path)
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name in HIDDEN_DIRS or entry.is_symlink():
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if not stack.is_ignored(entry.path, is_dir):
+                    entries.append((entry.name, is_dir))
+    except OSError:
+        pass
+    return stack, entries
+
+
+class _PathTable:
+    """interned segment와 array 열로 저장한 디렉터리/파일 목록."""
+
+    def __init__(self):
+        self.segments: list[str] = []
+        self._seg_ids: dict[str, int] = {}
+        self.dir_parent = array("i", [-1])
+        self.dir_name = array("i", [-1])
+        self._dir_ids: dict[int, int] = {}  # (부모 << 32 | segment) → 디렉터리 번호
+        self.file_dir = array("i")
+        self.file_name = array("i")
+        self._file_ids: dict[int, int] = {}
+        self._free: list[int] = []
+        self.file_count = 0
+
+    def _seg(self, name: str) -> int:
+        seg = self._seg_ids.get(name)
+        if seg is None:
+            seg = self._seg_ids[name] = len(self.segments)
+            self.segments.append(name)
+        return seg
+
+    def add_dir(self, parent: int, name: str) -> int:
+        key = parent << 32 | self._seg(name)
+        d = self._dir_ids.get(key)
+        if d is None:
+            d = self._dir_ids[key] = len(self.dir_parent)
+            self.dir_parent.append(parent)
+            self.dir_name.append(key & 0xFFFFFFFF)
+        return d
+
+    def add_file(self, d: int, name: str):
+        key = d << 32 | self._seg(name)
+        if key in self._file_ids:
+            return
+        if self._free:
+            f = self._free.pop()
+            self.file_dir[f] = d
+            self.file_name[f] = key & 0xFFFFFFFF
+        else:
+            f = len(self.file_dir)
+            self.file_dir.append(d)
+            self.file_name.append(key & 0xFFFFFFFF)
+        self._file_ids[key] = f
+        self.file_count += 1
+
+    def find_dir(self, rel_parts: list[str]) -> int | None:
+        d = 0
+        for part in rel_parts:
+            seg = self._seg_ids.get(part)
+            d = None if seg is None else self._dir_ids.get(d << 32 | seg)
+            if d is None:
+                return None
+        return d
+
+    def remove_file(self, d: int, name: str):
+        seg = self._seg_ids.get(name)
+        f = None if seg is None else self._file_ids.pop(d << 32 | seg, None)
+        if f is not None:
+            self.file_dir[f] = -1
+            self.file_name[f] = -1
+            self._free.append(f)
+            self.file_count -= 1
+
+    def merge(self, top: int, other: "_PathTable"):
+        """other(따로 훑은 하위 트리, 루트 = top)의 디렉터리와 파일을 top 아래에 더한다."""
+        ids = [top] * len(other.dir_parent)
+        for od in range(1, len(other.dir_parent)):
+            ids[od] = self.add_dir(ids[other.dir_parent[od]], other.segments[other.dir_name[od]])
+        for od, name in zip(other.file_dir, other.file_name):
+            if od >= 0:
+                self.add_file(ids[od], other.segments[name])
+
+    def remove_dir(self, d: int):
+        self.remove_dirs({d})
+
+    def remove_dirs(self, dirs: set[int]):
+        """dirs와 그 아래 디렉터리, 파일을 모두 지운다. 디렉터리 번호는 재사용하지 않는다.
+
+        파일 칸 전체를 한 번 훑으므로, 한꺼번에 지워진 디렉터리(rm -rf)는 모아서 부른다.
+        """
+        if not dirs:
+            return
+        dead = set(dirs)
+        # 자식은 항상 부모보다 나중에 추가되므로 한 번 훑으면 된다
+        for child in range(min(dirs) + 1, len(self.dir_parent)):
+            if self.dir_parent[child] in dead:
+                dead.add(child)
+        for child in dead:
+            key = self.dir_parent[child] << 32 | self.dir_name[child]
+            self._dir_ids.pop(key, None)
+            self.dir_parent[child] = -2
+        for f, fd in enumerate(self.file_dir):
+            if fd in dead:
+                self._file_ids.pop(fd << 32 | self.file_name[f], None)
+                self.file_dir[f] = -1
+                self.file_name[f] = -1
+                self._free.append(f)
+                self.file_count -= 1
+
+    def snapshot(self) -> "_Snapshot":
+        dir_paths = [""] * len(self.dir_parent)
+        for d in range(1, len(self.dir_parent)):
+            parent = self.dir_parent[d]
+            if parent >= 0:
+                name = self.segments[self.dir_name[d]]
+                dir_paths[d] = f"{dir_paths[parent]}{name}/"
+        lines = [
+            dir_paths[d] + self.segments[self.file_name[f]] if d >= 0 else ""
+            for f, d in enumerate(self.file_dir)
+        ]
+        return _Snapshot(lines)
+
+
+class _Snapshot:
+    """검색용 blob. 줄 번호가 파일 번호와 같다 (빈 칸은 빈 줄)."""
+
+    def __init__(self, lines: list[str]):
+        self.blob = "\n".join(lines)
+        lower = self.blob.lower()
+        if len(lower) != len(self.blob):
+            # 길이가 바뀌는 소문자 변환(드문 유니코드)은 오프셋이 어긋나므로 그 줄만 원래대로 둔다
+            lower = "\n".join(
+                low if len(low) == len(ln) else ln for ln, low in ((ln, ln.lower()) for ln in lines)
+            )
+        # 맨 앞에도 줄바꿈을 둬서 모든 줄이 "\n"으로 시작하게 한다 (검색 패턴의 고정 접두어)
+        self.lower = "\n" + lower
+        self.starts = array("q", accumulate(map((1).__add__, map(len, lines)), initial=0))
+
+    def line(self, f: int) -> str:
+        start = self.starts[f]
+        end = self.starts[f + 1] - 1 if f + 1 < len(self.starts) else len(self.blob)
+        return self.blob[start:end]
+
+
+def _is_boundary(path: str, pos: int) -> bool:
+    if pos == 0 or path[pos - 1] in _BOUNDARY_CHARS:
+        return True
+    return path[pos].isupper() and path[pos - 1].islower()
+
+
+def fuzzy_score(path: str, query: str) -> tuple[int, list[int]] | None:
+    """query(소문자)의 글자가 path에 순서대로 나오면 (점수, 위치) 아니면 None.
+
+    연속된 글자와 단어 경계(/ _ - . camelCase)에 가산점을 주고, 파일 이름 안의 매치와 짧은 경로를
+    조금 더 높게 친다.
+    """
+    lower = path.lower()
+    # 뒤에서부터 맞춘 위치가 각 글자가 갈 수 있는 가장 오른쪽이다
+    hi = []
+    j = len(lower)
+    for ch in reversed(query):
+        j = lower.rfind(ch, 0, j)
+        if j < 0:
+            return None
+        hi.append(j)
+    hi.reverse()
+    # 앞에서부터 그 범위 안에서 연속 > 가장 가까운 경계 > 가장 오른쪽 순으로 고른다
+    positions = []
+    prev = -1
+    for ch, limit in zip(query, hi):
+        pos = prev + 1
+        if not (prev >= 0 and lower[pos] == ch):
+            pos = limit
+            k = lower.find(ch, prev + 1, limit + 1)
+            while k != -1:
+                if _is_boundary(path, k):
+                    pos = k
+                    break
+                k = lower.find(ch, k + 1, limit + 1)
+        positions.append(pos)
+        prev = pos
+
+    base_start = lower.rfind("/") + 1
+    score = 0
+    prev = -2
+    for pos in positions:
+        score += 1
+        if pos == prev + 1:
+            score += 5
+        if _is_boundary(path, pos):
+            score += 8
+        if pos >= base_start:
+            score += 2
+        prev = pos
+    base = lower[base_start:]
+    if base == query:
+        score += 30
+    elif base.startswith(query):
+        score += 15
+    return score * 100 - len(path), positions
+
+
+class PathIndex:
+    """프로젝트 하나의 경로 색인. 빌드·갱신은 감시 콜백과 빌드 스레드, 검색은 아무 스레드에서."""
+
+    def __init__(self, root: str, events: FsEventHub | None = None):
+        self.root = os.path.normpath(root)
+        self.state = "idle"
+        self.last_build_ms: float | None = None
+        self._events = events or fs_events
+        self._lock = threading.Lock()
+        self._table = _PathTable()
+        self._snapshot: _Snapshot | None = None
+        # 빌드 중 들어온 변경 (변경 배치, 미리 훑은 새 디렉터리) — 빌드가 끝나면 새 표에 적용한다
+        self._pending: list[tuple[list[list], dict[int, _PathTable]]] = []
+        self._rebuild_again = False  # 빌드 중 무시 규칙이 바뀌었다 — 끝나면 한 번 더 빌드한다
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._builder: threading.Thread | None = None
+        self._listener = None
+
+    def start(self):
+        # 빌드 중 들어온 변경을 놓치지 않도록 감시를 먼저 시작한다
+        self._listener = self._events.listen(self.root, self._apply_changes, self._rebuild)
+        self._rebuild()
+
+    def close(self):
+        self._stop.set()
+        if self._listener is not None:
+            self._events.unlisten(self._listener)
+            self._listener = None
+        with self._lock:
+            builder = self._builder
+        if builder is not None:
+            builder.join(timeout=5)
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def refresh(self):
+        self._rebuild()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "files": self._table.file_count,
+                "dirs": len(self._table._dir_ids) + 1,
+                "segments": len(self._table.segments),
+                "last_build_ms": self.last_build_ms,
+            }
+
+    # --- build / update ---
+
+    def _rebuild(self):
+        with self._lock:
+            self.state = "building"
+            if self._builder is not None:
+                self._rebuild_again = True
+                return
+            self._builder = threading.Thread(target=self._build, name="path-index", daemon=True)
+            self._builder.start()
+
+    def _build(self):
+        while True:
+            start = time.perf_counter()
+            with self._lock:
+                self._rebuild_again = False
+                self._pending = []
+            table = _PathTable()
+            try:
+                self._walk(table, 0, self.root, project_ignore_stack(self.root))
+            except Exception:
+                logger.exception("path index build failed for %s", self.root)
+            with self._lock:
+                if self._stop.is_set():
+                    self._builder = None
+                    return
+                if self._rebuild_again:
+                    continue  # 옛 무시 규칙으로 만든 표는 버린다
+                self._table = table
+                for changes, subtrees in self._pending:
+                    self._apply_locked(changes, subtrees)
+                self._pending = []
+                self._snapshot = None
+                self.state = "ready"
+                self._builder = None
+            self.last_build_ms = round((time.perf_counter() - start) * 1000, 1)
+            self._ready.set()
+            return
+
+    def _walk(self, table: _PathTable, top: int, top_path: str, parent_stack: IgnoreStack):
+        """디렉터리 한 단계씩 병렬로 scandir 한다 (scandir은 GIL을 놓는다)."""
+        frontier = [(top, top_path, parent_stack)]
+        with ThreadPoolExecutor(WALK_WORKERS, thread_name_prefix="path-walk") as pool:
+            while frontier and not self._stop.is_set():
+                next_frontier = []
+                for (d, path, _), (stack, entries) in zip(frontier, pool.map(_scan_dir, frontier)):
+                    for name, is_dir in entries:
+                        if is_dir:
+                            child = table.add_dir(d, name)
+                            next_frontier.append((child, os.path.join(path, name), stack))
+                        else:
+                            table.add_file(d, name)
+                frontier = next_frontier
+
+    def _apply_changes(self, changes: list[list]):
+        for kind, path, is_dir in changes:
+            path = os.path.normpath(path)
+            if os.path.basename(path) == GITIGNORE:
+                self._rebuild()
+                return
+        # 새 디렉터리 아래는 잠금 밖에서 미리 훑는다 — 큰 트리가 생겨도 find()가 기다리지 않는다
+        subtrees: dict[int, _PathTable] = {}
+        for i, (kind, path, is_dir) in enumerate(changes):
+            if is_dir and kind != DELETED and self._indexable(path, is_dir):
+                sub = _PathTable()
+                parent_dir = os.path.dirname(os.path.normpath(path))
+                self._walk(sub, 0, path, ignore_stack_for(self.root, parent_dir))
+                subtrees[i] = sub
+        with self._lock:
+            if self.state == "building":
+                self._pending.append((changes, subtrees))
+            else:
+                self._apply_locked(changes, subtrees)
+                self._snapshot = None
+
+    def _indexable(self, path: str, is_dir: bool) -> bool:
+        rel = os.path.relpath(os.path.normpath(path), self.root)
+        if rel.startswith("..") or any(p in HIDDEN_DIRS for p in rel.split(os.sep)):
+            return False
+        return not is_path_ignored(self.root, path, is_dir)
+
+    def _apply_locked(self, changes: list[list], subtrees: dict[int, _PathTable]):
+        table = self._table
+        # 연달아 지워진 디렉터리는 모아서 한 번에 지운다. 다른 변경이 오기 전에 반영해야
+        # 지웠다 다시 만든 디렉터리가 뒤늦게 지워지지 않는다
+        dead_dirs: set[int] = set()
+        for i, (kind, path, is_dir) in enumerate(changes):
+            rel = os.path.relpath(os.path.normpath(path), self.root)
+            parts = rel.split(os.sep)
+            if rel.startswith("..") or any(p in HIDDEN_DIRS for p in parts):
+                continue
+            if kind == DELETED and is_dir:
+                d = table.find_dir(parts)
+                if d is not None:
+                    dead_dirs.add(d)
+                continue
+            if kind == DELETED:
+                parent = table.find_dir(parts[:-1])
+                if parent is not None:
+                    table.remove_file(parent, parts[-1])
+                continue
+            table.remove_dirs(dead_dirs)
+            dead_dirs.clear()
+            parent = table.find_dir(parts[:-1])
+            if parent is None:
+                continue  # 무시된 디렉터리 아래
+            if is_dir:
+                sub = subtrees.get(i)
+                if sub is not None:
+                    table.merge(table.add_dir(parent, parts[-1]), sub)
+            elif not is_path_ignored(self.root, path, is_dir):
+                table.add_file(parent, parts[-1])
+        table.remove_dirs(dead_dirs)
+
+    # --- query ---
+
+    def find(self, query: str, limit: int = 50) -> dict:
+        """첫 빌드가 끝나기 전에는 기다리지 않고 빈 결과와 state="building"을 돌려준다."""
+        start = time.perf_counter()
+        q = "".join(query.lower().split())
+        if not self._ready.is_set():
+            return {
+                "results": [],
+                "candidates": 0,
+                "truncated": False,
+                "state": "building",
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._table.snapshot()
+            snap = self._snapshot
+        results: list[tuple[int, str, list[int]]] = []
+        candidates = 0
+        truncated = False
+        if q:
+            # 각 글자 앞을 "그 글자가 아닌 것"으로 소유적으로 건너뛴다. 가장 왼쪽 매치가 곧
+            # 부분열 판정이므로 되돌아갈 필요가 없고, 비용은 줄 길이에 비례한다.
+            # "\n"부터 맞추므로 줄마다 한 번만 시도하고, 시작 위치는 빠른 문자 검색으로 찾는다
+            parts = [f"[^\\n{re.escape(c)}]*+{re.escape(c)}" for c in q]
+            pattern = re.compile("\n" + "".join(parts) + "[^\n]*+")
+            scored = []
+            for m in pattern.finditer(snap.lower):
+                f = bisect.bisect_right(snap.starts, m.start()) - 1
+                path = snap.line(f)
+                hit = fuzzy_score(path, q)
+                if hit is not None:
+                    scored.append((hit[0], path, hit[1]))
+                candidates += 1
+                if candidates >= MAX_SCORED_CANDIDATES:
+                    truncated = True
+                    break
+            results = heapq.nlargest(limit, scored, key=lambda r: r[0])
+        return {
+            "results": [
+                {
+                    "path": f"{self.root}/{rel}".replace(os.sep, "/"),
+                    "rel": rel,
+                    "score": score,
+                    "positions": positions,
+                }
+                for score, rel, positions in results
+            ],
+            "candidates": candidates,
+            "truncated": truncated,
+            "state": self.state,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+
+class PathIndexManager:
+    """등록된 프로젝트별 경로 색인. 처음 요청될 때 만든다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes: dict[str, PathIndex] = {}
+
+    def get(self, project_id: str, root: str) -> PathIndex:
+        with self._lock:
+            index = self._indexes.get(project_id)
+            if index is not None and index.root == os.path.normpath(root):
+                return index
+            if index is not None:
+                index.close()
+            index = PathIndex(root)
+            index.start()
+            self._indexes[project_id] = index
+            return index
+
+    def refresh(self, project_id: str):
+        with self._lock:
+            index = self._indexes.get(project_id)
+        if index is not None:
+            index.refresh()
+
+    def drop(self, project_id: str):
+        with self._lock:
+            index = self._indexes.pop(project_id, None)
+        if index is not None:
+            index.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            indexes = dict(self._indexes)
+        return {pid: idx.stats() for pid, idx in indexes.items()}
+
+    def close(self):
+        with self._lock:
+            indexes = list(self._indexes.values())
+            self._indexes.clear()
+        for index in indexes:
+            index.close()
+
+
+path_indexes = PathIndexManager()
@@ -0,0 +1,97 @@
+"""실행 중인 서버를 재시작 없이 프로파일링하는 샘플링 프로파일러.
+
+정해진 시간 동안 INTERVAL마다 모든 스레드(이벤트 루프, 파일시스템 executor, PTY 읽기 등)의
+스택을 떠서 같은 스택이 몇 번 나왔는지 센다. 결과는 flamegraph.pl, speedscope, inferno가
+읽는 collapsed 형식("스레드;바깥 프레임;...;안쪽 프레임 횟수")이다.
+기본적으로 큐·셀렉터에서 기다리기만 하는 스택은 뺀다.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_INTERVAL = 0.01
+MAX_SECONDS = 60
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 가장 안쪽 프레임이 이 (파일, 함수)면 일을 하는 게 아니라 기다리는 중이다
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("inotify.py", "read_events"),
+}
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(ROOT + os.sep):
+        return os.path.relpath(filename, ROOT).replace(os.sep, "/")
+    return os.path.basename(filename)
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels: dict = {}
+        self.busy = False
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # 줄 번호는 함수 첫 줄로 — 같은 함수의 샘플이 한 프레임으로 모인다
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _stack(self, frame) -> list[str]:
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        # collapsed 형식에서 ; 와 공백 뒤 숫자는 구분자다
+        return [label.replace(";", ":") for label in stack]
+
+    def sample(
+        self, seconds: float, interval: float = DEFAULT_INTERVAL, include_idle: bool = False
+    ) -> Counter:
+        """seconds 동안 샘플을 모은다. 다른 샘플링이 진행 중이면 RuntimeError."""
+        with self._lock:
+            if self.busy:
+                raise RuntimeError("A profile is already running")
+            self.busy = True
+        try:
+            return self._sample(min(seconds, MAX_SECONDS), interval, include_idle)
+        finally:
+            self.busy = False
+
+    def _sample(self, seconds: float, interval: float, include_idle: bool) -> Counter:
+        me = threading.get_ident()
+        counts: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                code = frame.f_code
+                if not include_idle and (
+                    (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+                ):
+                    continue
+                thread = names.get(ident, f"thread-{ident}").replace(" ", "_")
+                counts[";".join([thread, *self._stack(frame)])] += 1
+            time.sleep(interval)
+        return counts
+
+
+def collapse(counts: Counter) -> str:
+    """collapsed 형식 텍스트. 많이 나온 스택부터."""
+    return "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,127 @@
+"""라우트별 응답 시간 히스토그램과 응답 크기.
+
+키는 "GET /api/files/content"처럼 메서드와 경로 템플릿이다 — 경로 매개변수마다 따로 세지 않는다.
+라우터에 매칭되지 않은 요청(정적 파일, 404)은 "GET (other)"로 모인다. 시간은 첫 바이트가 아니라
+마지막 바이트를 보낼 때까지이므로 스트리밍 응답(검색, ZIP)은 전체 전송 시간이 잡힌다.
+"""
+
+import bisect
+import threading
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 버킷 상한(ms). 마지막 버킷은 그보다 느린 전부
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _Route:
+    __slots__ = ("buckets", "bytes", "count", "errors", "max", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def quantile_ms(self, q: float) -> float:
+        """히스토그램으로 어림한 분위수 — 해당 버킷의 상한(마지막 버킷은 최댓값)."""
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else round(self.max, 1)
+        return 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max, 2),
+            "p50_ms": self.quantile_ms(0.5),
+            "p90_ms": self.quantile_ms(0.9),
+            "p99_ms": self.quantile_ms(0.99),
+            "bytes_total": self.bytes,
+            "bytes_mean": self.bytes // self.count if self.count else 0,
+            "buckets": dict(zip([*map(str, BUCKETS_MS), "inf"], self.buckets)),
+        }
+
+
+class RouteStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[str, _Route] = {}
+
+    def record(self, key: str, elapsed_ms: float, status: int, size: int):
+        with self._lock:
+            route = self._routes.get(key)
+            if route is None:
+                route = self._routes[key] = _Route()
+            route.count += 1
+            route.errors += status >= 500
+            route.total += elapsed_ms
+            route.max = max(route.max, elapsed_ms)
+            route.bytes += size
+            route.buckets[bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def stats(self) -> dict:
+        """총 소요 시간이 큰 라우트부터."""
+        with self._lock:
+            items = sorted(self._routes.items(), key=lambda kv: kv[1].total, reverse=True)
+            return {key: route.to_dict() for key, route in items}
+
+
+def route_key(scope: Scope) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return f"{scope['method']} (other)"
+    # FastAPI 버전에 따라 include_router의 prefix가 route.path에 들어 있지 않다 —
+    # 라우트가 매칭한 뒷부분을 찾아 그 앞을 prefix로 붙인다
+    path = scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is not None and not regex.match(path):
+        for i in range(1, len(path)):
+            if path[i] == "/" and regex.match(path[i:]):
+                template = path[:i] + template
+                break
+    return f"{scope['method']} {template}"
+
+
+class RouteTimingMiddleware:
+    def __init__(self, app: ASGIApp, stats: RouteStats | None = None):
+        self.app = app
+        self.stats = stats or route_stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stats.record(route_key(scope), elapsed_ms, status, size)
+
+
+route_stats = RouteStats()
@@ -0,0 +1,129 @@
+"""uvicorn 실행 프로필과 우아한 종료.
+
+    python -m backend.runtime --profile performance --host 0.0.0.0 --port 11000
+
+- default: uvicorn 기본값 그대로 (비교 기준).
+- performance: uvloop 이벤트 루프와 httptools 파서(설치돼 있으면), 휴대폰이 ngrok 너머에서
+  연결을 재사용하도록 긴 keep-alive, 터미널 입력만 오가는 웹소켓에 맞춘 최대 메시지 크기,
+  동시 연결 상한(넘으면 503)과 종료 유예 시간.
+선택한 구현이 설치돼 있지 않으면 다음 후보로 내려가고 그 사실을 출력한다.
+
+종료 신호를 받으면 먼저 새 연결을 받지 않고, 열린 웹소켓마다 큐에 쌓인 출력을 마저 보낸 뒤
+1012(서비스 재시작)로 닫은 다음 uvicorn의 종료 절차(HTTP 요청 마무리 → lifespan 종료)로 넘어간다.
+"""
+
+import argparse
+import importlib.util
+import sys
+from dataclasses import asdict, dataclass, replace
+
+DRAIN_TIMEOUT = 5.0
+
+
+@dataclass(frozen=True)
+class RuntimeProfile:
+    # 필드 이름은 uvicorn.Config 인자와 같다 (drain_timeout 제외)
+    loop: str = "auto"
+    http: str = "auto"
+    ws: str = "auto"
+    ws_max_size: int = 16 * 1024 * 1024
+    ws_ping_interval: float | None = 20.0
+    ws_ping_timeout: float | None = 20.0
+    ws_per_message_deflate: bool = True
+    timeout_keep_alive: int = 5
+    backlog: int = 2048
+    limit_concurrency: int | None = None
+    timeout_graceful_shutdown: int | None = None
+    drain_timeout: float = 0.0
+
+    def uvicorn_options(self) -> dict:
+        options = asdict(self)
+        del options["drain_timeout"]
+        return options
+
+
+PROFILES = {
+    "default": RuntimeProfile(),
+    "performance": RuntimeProfile(
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        # 터미널 입력과 resize만 받는다 — 업로드는 HTTP로 온다
+        ws_max_size=1024 * 1024,
+        ws_ping_interval=20.0,
+        ws_ping_timeout=20.0,
+        timeout_keep_alive=30,
+        backlog=2048,
+        limit_concurrency=256,
+        timeout_graceful_shutdown=10,
+        drain_timeout=DRAIN_TIMEOUT,
+    ),
+}
+
+# 구현 → (필요한 모듈, 없을 때 대신 쓸 구현)
+_FALLBACKS = {
+    "loop": {"uvloop": ("uvloop", "asyncio")},
+    "http": {"httptools": ("httptools", "h11")},
+    "ws": {"websockets": ("websockets", "wsproto"), "wsproto": ("wsproto", "none")},
+}
+
+
+def _available(module: str) -> bool:
+    if module == "uvloop" and sys.platform == "win32":
+        return False
+    return importlib.util.find_spec(module) is not None
+
+
+def resolve(profile: RuntimeProfile) -> tuple[RuntimeProfile, list[str]]:
+    """설치되지 않은 구현을 대체 구현으로 바꾼 프로필과 바꾼 내역."""
+    changes = {}
+    notes = []
+    for name, chain in _FALLBACKS.items():
+        choice = getattr(profile, name)
+        while choice in chain and not _available(chain[choice][0]):
+            fallback = chain[choice][1]
+            notes.append(f"{name}: {choice} is not installed, using {fallback}")
+            choice = fallback
+        changes[name] = choice
+    return replace(profile, **changes), notes
+
+
+def serve(app: str, profile: RuntimeProfile, host: str, port: int):
+    import uvicorn
+
+    from backend.ws import drain_websockets
+
+    class Server(uvicorn.Server):
+        async def shutdown(self, sockets=None):
+            if profile.drain_timeout > 0:
+                # 새 연결을 먼저 막고 웹소켓을 비운다. uvicorn은 이후 서버를 다시 닫아도 괜찮다
+                for server in self.servers:
+                    server.close()
+                left = await drain_websockets(profile.drain_timeout)
+                if left:
+                    print(f"[runtime] {left} WebSocket(s) still open after drain")
+            await super().shutdown(sockets=sockets)
+
+    config = uvicorn.Config(app, host=host, port=port, **profile.uvicorn_options())
+    Server(config).run()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run the keep_vibing backend")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="performance")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8500)
+    parser.add_argument("--app", default="backend.app:app")
+    args = parser.parse_args(argv)
+
+    profile, notes = resolve(PROFILES[args.profile])
+    for note in notes:
+        print(f"[runtime] {note}")
+    print(
+        f"[runtime] profile={args.profile} loop={profile.loop} http={profile.http} ws={profile.ws}"
+    )
+    serve(args.app, profile, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,554 @@
+"""프로젝트 전문 검색.
+
+프로젝트마다 data/search/<project_id>.db 에 SQLite FTS5 trigram 색인을 둔다. 색인은 파일을
+3글자 조각 단위로만 기억하므로(detail=none, content 없음) 작고, 검색은 두 단계로 한다:
+
+1. 쿼리에서 반드시 나와야 하는 리터럴을 뽑아 그 trigram을 모두 가진 파일만 후보로 고른다.
+2. 후보 파일을 디스크에서 다시 읽어 실제 정규식/문자열로 확인한다 (색인이 조금 늦어도 결과는 정확).
+
+색인은 백그라운드 스레드에서 만들고, fs_events 허브의 변경 배치로 바뀐 파일만 다시 색인한다.
+HIDDEN_DIRS와 무시 규칙(backend.ignore)에 걸리는 경로, 바이너리, MAX_INDEXED_FILE_SIZE를
+넘는 파일은 제외한다.
+"""
+
+import fnmatch
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+
+from backend import store
+from backend.fs_events import DELETED, FsEventHub, fs_events
+from backend.gitignore import GITIGNORE
+from backend.ignore import HIDDEN_DIRS, ignore_stack_for, is_path_ignored
+from backend.text_patch import decode_text
+from backend.text_sniff import detect_encoding, sniff_cache
+
+logger = logging.getLogger(__name__)
+
+MAX_INDEXED_FILE_SIZE = 1024 * 1024
+INDEX_BATCH = 500  # 트랜잭션 하나에 색인하는 파일 수
+MAX_QUERY_TRIGRAMS = 24  # 긴 리터럴은 골고루 골라 쓴다 — 후보를 줄이는 효과는 금방 포화된다
+MAX_CONTEXT_LINES = 10
+MAX_LINE_CHARS = 500
+MAX_MATCHES_PER_FILE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS grams USING fts5(
+    body, tokenize='trigram', content='', detail=none
+);
+"""
+# files.path: 프로젝트 루트 기준 "/" 경로
+# files.body: zlib 압축 본문 (NULL = 색인 제외).
+#   content 없는 FTS 테이블에서 지우려면 원문이 필요하다
+
+
+def search_db_path(project_id: str) -> str:
+    return str(store.DATA_DIR / "search" / f"{project_id}.db")
+
+
+def iter_project_files(root: str, top: str | None = None) -> Iterator[tuple[str, os.stat_result]]:
+    """root 아래(또는 그 안의 top 아래) 무시되지 않는 일반 파일의 (상대 경로, stat)."""
+    stack = ignore_stack_for(root, top or root)
+    pending = [(top or root, stack)]
+    while pending:
+        d, ignore = pending.pop()
+        try:
+            entries = list(os.scandir(d))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name in HIDDEN_DIRS or entry.is_symlink():
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if ignore.is_ignored(entry.path, is_dir):
+                continue
+            if is_dir:
+                pending.append((entry.path, ignore.child(entry.path)))
+            else:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                yield os.path.relpath(entry.path, root).replace(os.sep, "/"), st
+
+
+def _read_text(path: str) -> tuple[os.stat_result, str | None] | None:
+    """(stat, 텍스트). 없으면 None, 바이너리이거나 너무 크면 텍스트가 None.
+
+    인코딩은 편집기와 같은 판별(sniff_cache)을 따른다 — CP949·Latin-1 파일도 제대로 색인된다.
+    """
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size > MAX_INDEXED_FILE_SIZE:
+                return st, None
+            encoding = sniff_cache.sniff(path, st)
+            if encoding is None:
+                return st, None
+            raw = f.read(MAX_INDEXED_FILE_SIZE + 1)
+    except OSError:
+        return None
+    try:
+        return st, decode_text(raw, encoding)
+    except UnicodeDecodeError:
+        # 앞부분만 본 판별이 틀렸다 — 전체로 다시 판별해 고쳐 둔다
+        encoding = detect_encoding(raw)
+        sniff_cache.remember(path, st, encoding)
+        return st, None if encoding is None else decode_text(raw, encoding)
+
+
+# --- Query planning ---
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+_ESCAPE_DIGITS = {"x": 2, "u": 4, "U": 8}
+_OCTAL = "01234567"
+
+
+def _escape_length(pattern: str, i: int) -> int:
+    """pattern[i]의 역슬래시부터 시작하는 이스케이프 시퀀스 전체의 길이."""
+    nxt = pattern[i + 1:i + 2]
+    if nxt in _ESCAPE_DIGITS:
+        return 2 + _ESCAPE_DIGITS[nxt]
+    if nxt == "N" and pattern[i + 2:i + 3] == "{":
+        close = pattern.find("}", i + 3)
+        return len(pattern) - i if close == -1 else close - i + 1
+    if nxt == "0":
+        # \0 다음 최대 두 자리 8진수
+        j = i + 2
+        while j < i + 4 and pattern[j:j + 1] and pattern[j] in _OCTAL:
+            j += 1
+        return j - i
+    if nxt.isdigit():
+        digits = pattern[i + 1:i + 4]
+        if len(digits) == 3 and all(d in _OCTAL for d in digits):
+            return 4  # \101 같은 8진수
+        # 역참조 \1 ~ \99
+        return 3 if pattern[i + 2:i + 3].isdigit() else 2
+    return 2
+
+
+def required_literals(pattern: str) -> list[str] | None:
+    """정규식에 맞는 모든 문자열이 반드시 포함하는 리터럴 조각들.
+
+    보수적으로 최상위 수준의 연속된 일반 문자만 모은다. 최상위 "|"가 있으면 None(제약 없음).
+    """
+    runs: list[str] = []
+    cur: list[str] = []
+    depth = 0
+    i, n = 0, len(pattern)
+
+    def flush():
+        if cur:
+            runs.append("".join(cur))
+            cur.clear()
+
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if depth == 0 and nxt and not nxt.isalnum():
+                cur.append(nxt)
+            else:
+                flush()  # \d \w \b \n \x41 \1 ... 는 리터럴이 아님
+            i += _escape_length(pattern, i)
+            continue
+        if c == "[":
+            flush()
+            j = i + 1
+            if pattern[j:j + 1] == "^":
+                j += 1
+            if pattern[j:j + 1] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 2 if pattern[j] == "\\" else 1
+            i = j + 1
+            continue
+        if c == "|":
+            if depth == 0:
+                return None
+        elif c == "(":
+            depth += 1
+            flush()
+        elif c == ")":
+            depth = max(depth - 1, 0)
+            flush()
+        elif c in "*?{":
+            if cur:
+                cur.pop()  # 앞 글자가 없어도 되므로
+            flush()
+            if c == "{":
+                close = pattern.find("}", i)
+                i = n if close == -1 else close
+        elif c in _REGEX_META:
+            flush()
+        elif depth == 0:
+            cur.append(c)
+        else:
+            flush()
+        i += 1
+    flush()
+    return runs
+
+
+def _match_expression(literals: list[str]) -> str | None:
+    grams: list[str] = []
+    for lit in literals:
+        grams.extend(lit[i:i + 3] for i in range(len(lit) - 2))
+    grams = list(dict.fromkeys(grams))
+    if not grams:
+        return None
+    if len(grams) > MAX_QUERY_TRIGRAMS:
+        step = len(grams) / MAX_QUERY_TRIGRAMS
+        grams = [grams[int(i * step)] for i in range(MAX_QUERY_TRIGRAMS)]
+    return " AND ".join('"' + g.replace('"', '""') + '"' for g in grams)
+
+
+def compile_query(query: str, regex: bool, case_sensitive: bool) -> tuple[re.Pattern, str | None]:
+    """(검증용 정규식, FTS MATCH 식). MATCH 식이 None이면 색인된 모든 파일이 후보다."""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if regex:
+        pattern = re.compile(query, flags)
+        literals = required_literals(query) or []
+    else:
+        pattern = re.compile(re.escape(query), flags)
+        literals = [query]
+    return pattern, _match_expression(literals)
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS]
+
+
+def match_file(text: str, pattern: re.Pattern, context: int, limit: int) -> list[dict]:
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    matches = []
+    for no, line in enumerate(lines):
+        ranges = [[m.start(), m.end()] for m in pattern.finditer(line) if m.end() > m.start()]
+        if not ranges:
+            continue
+        matches.append({
+            "line": no + 1,
+            "text": _clip(line.rstrip("\r")),
+            "ranges": ranges,
+            "before": [_clip(ln.rstrip("\r")) for ln in lines[max(0, no - context):no]],
+            "after": [_clip(ln.rstrip("\r")) for ln in lines[no + 1:no + 1 + context]],
+        })
+        if len(matches) >= limit:
+            break
+    return matches
+
+
+class SearchIndex:
+    """프로젝트 하나의 색인. 쓰기는 전용 worker 스레드 하나가 모두 맡는다."""
+
+    def __init__(self, root: str, db_path: str, events: FsEventHub | None = None):
+        self.root = os.path.normpath(root)
+        self.db_path = db_path
+        self.state = "idle"  # idle → building → ready
+        self.error: str | None = None
+        self.last_build_ms: float | None = None
+        self._events = events or fs_events
+        self._tasks: queue.Queue = queue.Queue()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._listener = None
+
+    # --- lifecycle ---
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self._worker = threading.Thread(target=self._run, name="search-index", daemon=True)
+        self._worker.start()
+        self._tasks.put(("build", None))
+        self._listener = self._events.listen(
+            self.root,
+            on_batch=lambda changes: self._tasks.put(("update", changes)),
+            on_overflow=lambda: self._tasks.put(("build", None)),
+        )
+
+    def close(self):
+        self._stop.set()
+        if self._listener is not None:
+            self._events.unlisten(self._listener)
+            self._listener = None
+        self._tasks.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+            self._worker = None
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def refresh(self):
+        """무시 규칙이 바뀌었을 때 — 디스크와 다시 맞춘다."""
+        self._tasks.put(("build", None))
+
+    def status(self) -> dict:
+        with self._connect() as conn:
+            files, indexed = conn.execute(
+                "SELECT COUNT(*), COUNT(body) FROM files"
+            ).fetchone()
+        return {
+            "state": self.state,
+            "files": files,
+            "indexed_files": indexed,
+            "pending_updates": self._tasks.qsize(),
+            "last_build_ms": self.last_build_ms,
+            "error": self.error,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        # 검색 결과는 executor의 여러 스레드에서 나눠 가져가므로 스레드 검사를 끈다
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- writer thread ---
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None or self._stop.is_set():
+                    break
+                kind, changes = task
+                try:
+                    if kind == "build":
+                        self._build(conn)
+                    else:
+                        self._apply_changes(conn, changes)
+                except Exception as e:
+                    logger.exception("search index task failed for %s", self.root)
+                    self.error = str(e)
+        finally:
+            conn.close()
+
+    def _build(self, conn: sqlite3.Connection):
+        """디스크와 색인을 맞춘다. mtime/크기가 같은 파일은 다시 읽지 않는다."""
+        self.state = "building"
+        start = time.perf_counter()
+        known = {
+            path: (mtime, size)
+            for path, mtime, size in conn.execute("SELECT path, mtime_ns, size FROM files")
+        }
+        seen: set[str] = set()
+        batch: list[str] = []
+        for rel, st in iter_project_files(self.root):
+            if self._stop.is_set():
+                return
+            seen.add(rel)
+            if known.get(rel) != (st.st_mtime_ns, st.st_size):
+                batch.append(rel)
+                if len(batch) >= INDEX_BATCH:
+                    self._index(conn, batch)
+                    batch = []
+        self._index(conn, batch)
+        gone = [p for p in known if p not in seen]  # 사라졌거나 새로 무시된 파일
+        for i in range(0, len(gone), INDEX_BATCH):
+            self._index(conn, gone[i:i + INDEX_BATCH], drop=True)
+        self.last_build_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.state = "ready"
+        self.error = None
+        self._ready.set()
+
+    def _apply_changes(self, conn: sqlite3.Connection, changes: list[list]):
+        paths: list[str] = []
+        for kind, path, is_dir in changes:
+            path = os.path.normpath(path)
+            if os.path.basename(path) == GITIGNORE:
+                self._tasks.put(("build", None))  # 무시 규칙이 바뀌면 전체를 다시 맞춘다
+                continue
+            rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+            if is_dir:
+                if kind == DELETED:
+                    rows = conn.execute(
+                        "SELECT path FROM files WHERE path >= ? AND path < ?",
+                        (rel + "/", rel + "0"),  # "0"은 "/" 다음 문자
+                    ).fetchall()
+                    paths.extend(r[0] for r in rows)
+                elif not is_path_ignored(self.root, path, True):
+                    paths.extend(p for p, _ in iter_project_files(self.root, path))
+            else:
+                paths.append(rel)
+        paths = list(dict.fromkeys(paths))
+        for i in range(0, len(paths), INDEX_BATCH):
+            self._index(conn, paths[i:i + INDEX_BATCH], check_excluded=True)
+
+    def _index(
+        self,
+        conn: sqlite3.Connection,
+        rels: list[str],
+        drop: bool = False,
+        check_excluded: bool = False,
+    ):
+        """rels의 현재 상태를 색인에 반영한다. 없거나 제외 대상이거나 drop이면 색인에서 뺀다."""
+        with conn:
+            for rel in rels:
+                path = os.path.join(self.root, rel)
+                excluded = drop or (check_excluded and is_path_ignored(self.root, path, False))
+                loaded = None if excluded else _read_text(path)
+                row = conn.execute("SELECT id, body FROM files WHERE path = ?", (rel,)).fetchone()
+                if row is not None and row[1] is not None:
+                    conn.execute(
+                        "INSERT INTO grams(grams, rowid, body) VALUES('delete', ?, ?)",
+                        (row[0], zlib.decompress(row[1]).decode("utf-8")),
+                    )
+                if loaded is None:
+                    if row is not None:
+                        conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+                    continue
+                st, text = loaded
+                body = None if text is None else zlib.compress(text.encode("utf-8"), 1)
+                if row is None:
+                    file_id = conn.execute(
+                        "INSERT INTO files(path, mtime_ns, size, body) VALUES (?, ?, ?, ?)",
+                        (rel, st.st_mtime_ns, st.st_size, body),
+                    ).lastrowid
+                else:
+                    file_id = row[0]
+                    conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ?, body = ? WHERE id = ?",
+                        (st.st_mtime_ns, st.st_size, body, file_id),
+                    )
+                if text is not None:
+                    conn.execute("INSERT INTO grams(rowid, body) VALUES (?, ?)", (file_id, text))
+
+    # --- search (any thread) ---
+
+    def search(
+        self,
+        query: str,
+        regex: bool = False,
+        case_sensitive: bool = False,
+        context: int = 2,
+        glob: str | None = None,
+        max_matches: int = 500,
+    ) -> Iterator[dict]:
+        """파일별 결과 dict를 차례로 내보내고 마지막에 {"type": "done", ...}을 내보낸다."""
+        start = time.perf_counter()
+        pattern, expr = compile_query(query, regex, case_sensitive)
+        context = max(0, min(context, MAX_CONTEXT_LINES))
+        conn = self._connect()
+        try:
+            if expr is None:
+                rows = conn.execute(
+                    "SELECT path FROM files WHERE body IS NOT NULL ORDER BY path"
+                )
+            else:
+                rows = conn.execute(
+                    "SELECT f.path FROM grams JOIN files f ON f.id = grams.rowid"
+                    " WHERE grams MATCH ? ORDER BY f.path",
+                    (expr,),
+                )
+            candidates = files = total = 0
+            truncated = False
+            for (rel,) in rows:
+                if glob and not fnmatch.fnmatch(rel, glob):
+                    continue
+                candidates += 1
+                loaded = _read_text(os.path.join(self.root, rel))
+                if loaded is None or loaded[1] is None:
+                    continue
+                limit = min(MAX_MATCHES_PER_FILE, max_matches - total)
+                matches = match_file(loaded[1], pattern, context, limit)
+                if not matches:
+                    continue
+                files += 1
+                total += len(matches)
+                yield {
+                    "type": "file",
+                    "path": (self.root + os.sep + rel).replace(os.sep, "/"),
+                    "matches": matches,
+                }
+                if total >= max_matches:
+                    truncated = True
+                    break
+        finally:
+            conn.close()
+        yield {
+            "type": "done",
+            "files": files,
+            "matches": total,
+            "candidates": candidates,
+            "truncated": truncated,
+            "indexed": expr is not None,
+            "state": self.state,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+
+class SearchManager:
+    """등록된 프로젝트별 색인. 처음 요청될 때 만들고 색인을 시작한다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes: dict[str, SearchIndex] = {}
+
+    def get(self, project_id: str, root: str) -> SearchIndex:
+        with self._lock:
+            index = self._indexes.get(project_id)
+            if index is not None and index.root == os.path.normpath(root):
+                return index
+            if index is not None:
+                index.close()
+            index = SearchIndex(root, search_db_path(project_id))
+            index.start()
+            self._indexes[project_id] = index
+            return index
+
+    def refresh(self, project_id: str):
+        with self._lock:
+            index = self._indexes.get(project_id)
+        if index is not None:
+            index.refresh()
+
+    def drop(self, project_id: str):
+        """프로젝트가 삭제되면 색인도 지운다."""
+        with self._lock:
+            index = self._indexes.pop(project_id, None)
+        if index is not None:
+            index.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(search_db_path(project_id) + suffix)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {pid: idx.state for pid, idx in self._indexes.items()}
+
+    def close(self):
+        with self._lock:
+            indexes = list(self._indexes.values())
+            self._indexes.clear()
+        for index in indexes:
+            index.close()
+
+
+search_indexes = SearchManager()
@@ -5,6 +5,7 @@ import uuid
 from dataclasses import dataclass, field
 from threading import Thread
 
+from backend.fs_executor import run_fs
 from backend.pty_wrapper import PtyWrapper
 
 OUTPUT_BUFFER_MAX = 100 * 1024  # 100KB
@@ -140,7 +141,8 @@ async def write_to_session(session_id: str, data: str):
     session = sessions.get(session_id)
     if not session or not session.is_alive:
         return
-    await asyncio.to_thread(session.pty_process.write, data)
+    # interactive 등급 — 큰 업로드나 ZIP이 워커를 차지하고 있어도 기다리지 않는다
+    await run_fs("pty", session.pty_process.write, data)
 
 
 def resize_session(session_id: str, rows: int, cols: int):
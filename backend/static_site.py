@@ -0,0 +1,163 @@
+"""빌드된 프런트엔드(frontend/dist)를 백엔드가 직접 서빙한다 — 운영 모드에서 Vite 개발 서버 대신.
+
+- /assets/ 아래 파일은 이름에 내용 해시가 들어 있으므로 1년짜리 immutable로 캐시하게 한다.
+  index.html 등 나머지는 매번 ETag로 재검증한다.
+- 빌드 후 precompress()가 만들어 둔 .zst/.br/.gz 가 있으면 Accept-Encoding에 맞춰 그 파일을
+  그대로 보낸다 — 요청마다 압축하지 않는다.
+- 확장자 없는 모르는 경로(/projects/1 등)는 index.html로 돌려 클라이언트 라우팅에 맡긴다.
+  /api, /ws 아래와 확장자가 있는 경로는 404.
+
+    uv run python -m backend.static_site   # frontend/dist를 미리 압축
+"""
+
+import mimetypes
+import os
+import sys
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import Receive, Scope, Send
+
+from backend.compress import AVAILABLE, compress_bytes, is_compressible, negotiate
+from backend.file_response import CACHE_CONTROL, file_response
+from backend.fs_executor import run_fs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIST_DIR = os.path.join(ROOT, "frontend", "dist")
+# start.py --prod가 설정한다. uvicorn을 직접 띄울 때도 이 값을 주면 dist를 서빙한다
+SERVE_ENV = "KEEP_VIBING_SERVE_FRONTEND"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+HASHED_DIR = "assets"
+INDEX_FILE = "index.html"
+# 서버가 직접 처리하는 경로 — SPA fallback으로 index.html을 돌려주면 안 된다
+BACKEND_PREFIXES = ("/api", "/ws")
+
+# 인코딩 → 미리 압축한 파일의 접미사. 한 번만 압축하므로 가장 높은 수준을 쓴다
+SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+PRECOMPRESS_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+PRECOMPRESS_MIN_SIZE = 1024
+
+
+def _media_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def _precompress_file(path: str, encodings: tuple[str, ...]) -> int:
+    st = os.stat(path)
+    written = 0
+    data = None
+    for encoding in encodings:
+        target = path + SUFFIXES[encoding]
+        try:
+            if os.stat(target).st_mtime_ns >= st.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        compressed = compress_bytes(data, encoding, PRECOMPRESS_LEVELS[encoding])
+        if len(compressed) >= len(data):
+            # 줄지 않으면 원본을 보내는 편이 낫다 — 예전 변형이 남아 있으면 지운다
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        tmp = target + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp, target)
+        written += 1
+    return written
+
+
+def precompress(directory: str = DIST_DIR, encodings: tuple[str, ...] = AVAILABLE) -> int:
+    """directory 아래 압축할 만한 파일마다 인코딩별 변형을 만든다. 새로 쓴 파일 수를 반환한다.
+
+    원본보다 새 변형이 이미 있으면 건너뛰므로 다시 실행해도 바뀐 파일만 압축한다.
+    """
+    suffixes = tuple(SUFFIXES.values())
+    written = 0
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            if name.endswith(suffixes) or name.endswith(".tmp"):
+                continue
+            path = os.path.join(dirpath, name)
+            if not is_compressible(_media_type(path)):
+                continue
+            if os.path.getsize(path) < PRECOMPRESS_MIN_SIZE:
+                continue
+            written += _precompress_file(path, encodings)
+    return written
+
+
+class StaticSite:
+    """dist 디렉터리를 서빙하는 ASGI 앱. API 라우터 뒤에 "/"로 마운트한다."""
+
+    def __init__(self, directory: str = DIST_DIR):
+        self.directory = os.path.realpath(directory)
+
+    def _resolve(self, url_path: str) -> str | None:
+        rel = url_path.lstrip("/") or INDEX_FILE
+        path = os.path.realpath(os.path.join(self.directory, rel))
+        if os.path.commonpath([path, self.directory]) != self.directory:
+            return None
+        if os.path.isfile(path):
+            return path
+        if any(url_path == p or url_path.startswith(p + "/") for p in BACKEND_PREFIXES):
+            return None
+        if "." in os.path.basename(url_path):
+            return None
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _lookup(self, url_path: str, accept_encoding: str) -> tuple | None:
+        """(보낼 파일, stat, 원본 media type, Content-Encoding, Cache-Control). 없으면 None."""
+        path = self._resolve(url_path)
+        if path is None or not os.path.isfile(path):
+            return None
+        media_type = _media_type(path)
+        rel = os.path.relpath(path, self.directory).replace(os.sep, "/")
+        cache_control = (
+            IMMUTABLE_CACHE_CONTROL if rel.startswith(HASHED_DIR + "/") else CACHE_CONTROL
+        )
+        encoding = None
+        if is_compressible(media_type):
+            variants = tuple(e for e in SUFFIXES if os.path.isfile(path + SUFFIXES[e]))
+            encoding = negotiate(accept_encoding, variants) if variants else None
+        if encoding is not None:
+            path += SUFFIXES[encoding]
+        return path, os.stat(path), media_type, encoding, cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "websocket":
+            # 일치하는 /ws 라우트가 없는 웹소켓
+            await send({"type": "websocket.close", "code": 1000})
+            return
+        if scope["method"] not in ("GET", "HEAD"):
+            response = JSONResponse({"detail": "Method Not Allowed"}, status_code=405)
+            await response(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        found = await run_fs("stat", self._lookup, scope["path"], accept_encoding)
+        if found is None:
+            await JSONResponse({"detail": "Not Found"}, status_code=404)(scope, receive, send)
+            return
+        path, st, media_type, encoding, cache_control = found
+        response = file_response(Request(scope, receive), path, st, media_type)
+        response.headers["Cache-Control"] = cache_control
+        if is_compressible(media_type):
+            response.headers["Vary"] = "Accept-Encoding"
+        if encoding is not None and response.status_code != 304:
+            response.headers["Content-Encoding"] = encoding
+        await response(scope, receive, send)
+
+
+def serve_frontend_enabled() -> bool:
+    return os.environ.get(SERVE_ENV, "") not in ("", "0")
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else DIST_DIR
+    count = precompress(directory)
+    print(f"Precompressed {count} file(s) in {directory} ({', '.join(AVAILABLE)})")
@@ -1,11 +1,25 @@
+"""프로젝트·설정·계정 저장소.
+
+기본은 SQLite(WAL) 백엔드이며, KEEP_VIBING_STORAGE=json 으로 기존 JSON 파일 백엔드를 쓸 수 있다.
+SQLite 백엔드는 첫 기동 시 기존 JSON 파일을 자동으로 가져온다(원본 파일은 그대로 둔다).
+"""
+
 import json
 import os
 import secrets
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
 from pathlib import Path
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 PROJECTS_FILE = DATA_DIR / "projects.json"
 SETTINGS_FILE = DATA_DIR / "settings.json"
+USERS_FILE = DATA_DIR / "users.json"
+DB_FILE = DATA_DIR / "keep_vibing.db"
+
+STORAGE_BACKEND = os.environ.get("KEEP_VIBING_STORAGE", "sqlite")
 
 
 def _ensure_data_dir():
@@ -14,54 +28,458 @@ def _ensure_data_dir():
 
 def _read_json(path: Path) -> dict | list:
     if not path.exists():
-        return [] if "projects" in path.name else {}
+        return [] if path.name in ("projects.json", "users.json") else {}
     return json.loads(path.read_text(encoding="utf-8"))
 
 
 def _write_json(path: Path, data: dict | list):
+    """임시 파일에 쓴 뒤 os.replace로 교체 — 중간에 죽어도 파일이 깨지지 않는다."""
     _ensure_data_dir()
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _new_project_id() -> str:
+    return f"proj_{secrets.token_hex(4)}"
+
+
+class Storage(ABC):
+    """저장소 인터페이스. 모든 메서드는 스레드 안전해야 한다."""
+
+    @abstractmethod
+    def load_projects(self) -> list[dict]:
+        ...
+
+    @abstractmethod
+    def get_project(self, project_id: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def create_project(self, name: str, path: str) -> dict:
+        """같은 경로의 프로젝트가 이미 있으면 그것을 반환한다."""
+
+    @abstractmethod
+    def delete_project(self, project_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def load_settings(self) -> dict:
+        ...
+
+    @abstractmethod
+    def save_settings(self, settings: dict):
+        ...
+
+    @abstractmethod
+    def get_project_setting(self, project_id: str, key: str, default=None):
+        ...
+
+    @abstractmethod
+    def set_project_setting(self, project_id: str, key: str, value) -> bool:
+        """프로젝트가 없으면 False. 프로젝트를 지우면 설정도 함께 지워진다."""
+
+    @abstractmethod
+    def load_users(self) -> list[dict]:
+        ...
+
+    @abstractmethod
+    def save_users(self, users: list[dict]):
+        ...
+
+    @abstractmethod
+    def get_user(self, username: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def update_user(self, username: str, updater: Callable[[dict], None]) -> dict | None:
+        """username 레코드를 updater로 제자리 수정하고 저장한다 (하나의 트랜잭션).
+
+        사용자가 없으면 None을 반환한다.
+        """
+
+    def close(self):
+        pass
+
+
+class JsonStorage(Storage):
+    """data/*.json 파일 백엔드. 프로세스 내 잠금 + 원자적 교체로 갱신 유실과 깨진 파일을 막는다."""
+
+    def __init__(self, projects_file: Path, settings_file: Path, users_file: Path):
+        self.projects_file = projects_file
+        self.settings_file = settings_file
+        self.users_file = users_file
+        self._lock = threading.RLock()
+
+    def load_projects(self) -> list[dict]:
+        with self._lock:
+            return _read_json(self.projects_file)
+
+    def get_project(self, project_id: str) -> dict | None:
+        for p in self.load_projects():
+            if p["id"] == project_id:
+                return p
+        return None
+
+    def create_project(self, name: str, path: str) -> dict:
+        normalized = os.path.normpath(path)
+        with self._lock:
+            projects = _read_json(self.projects_file)
+            for p in projects:
+                if os.path.normpath(p["path"]) == normalized:
+                    return p
+            project = {"id": _new_project_id(), "name": name, "path": normalized}
+            projects.append(project)
+            _write_json(self.projects_file, projects)
+            return project
+
+    def delete_project(self, project_id: str) -> bool:
+        with self._lock:
+            projects = _read_json(self.projects_file)
+            filtered = [p for p in projects if p["id"] != project_id]
+            if len(filtered) == len(projects):
+                return False
+            _write_json(self.projects_file, filtered)
+            return True
+
+    def load_settings(self) -> dict:
+        with self._lock:
+            return _read_json(self.settings_file)
+
+    def save_settings(self, settings: dict):
+        with self._lock:
+            _write_json(self.settings_file, settings)
+
+    def get_project_setting(self, project_id: str, key: str, default=None):
+        project = self.get_project(project_id)
+        return (project or {}).get("settings", {}).get(key, default)
+
+    def set_project_setting(self, project_id: str, key: str, value) -> bool:
+        with self._lock:
+            projects = _read_json(self.projects_file)
+            for p in projects:
+                if p["id"] == project_id:
+                    p.setdefault("settings", {})[key] = value
+                    _write_json(self.projects_file, projects)
+                    return True
+            return False
+
+    def load_users(self) -> list[dict]:
+        with self._lock:
+            return _read_json(self.users_file)
+
+    def save_users(self, users: list[dict]):
+        with self._lock:
+            _write_json(self.users_file, users)
+
+    def get_user(self, username: str) -> dict | None:
+        for u in self.load_users():
+            if u["username"] == username:
+                return u
+        return None
+
+    def update_user(self, username: str, updater: Callable[[dict], None]) -> dict | None:
+        with self._lock:
+            users = _read_json(self.users_file)
+            for u in users:
+                if u["username"] == username:
+                    updater(u)
+                    _write_json(self.users_file, users)
+                    return u
+            return None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_projects_path ON projects(path);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_settings (
+    project_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (project_id, key)
+);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    failed_attempts INTEGER NOT NULL DEFAULT 0,
+    locked INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_SQL_LIST_PROJECTS = "SELECT id, name, path FROM projects ORDER BY seq"
+_SQL_GET_PROJECT = "SELECT id, name, path FROM projects WHERE id = ?"
+_SQL_PROJECT_BY_PATH = "SELECT id, name, path FROM projects WHERE path = ?"
+_SQL_INSERT_PROJECT = "INSERT INTO projects (id, name, path) VALUES (?, ?, ?)"
+_SQL_DELETE_PROJECT = "DELETE FROM projects WHERE id = ?"
+_SQL_LIST_SETTINGS = "SELECT key, value FROM settings"
+_SQL_INSERT_SETTING = "INSERT INTO settings (key, value) VALUES (?, ?)"
+_SQL_GET_PROJECT_SETTING = "SELECT value FROM project_settings WHERE project_id = ? AND key = ?"
+_SQL_UPSERT_PROJECT_SETTING = (
+    "INSERT INTO project_settings (project_id, key, value) VALUES (?, ?, ?) "
+    "ON CONFLICT(project_id, key) DO UPDATE SET value = excluded.value"
+)
+_SQL_DELETE_PROJECT_SETTINGS = "DELETE FROM project_settings WHERE project_id = ?"
+_SQL_LIST_USERS = (
+    "SELECT username, password_hash, failed_attempts, locked FROM users ORDER BY rowid"
+)
+_SQL_GET_USER = (
+    "SELECT username, password_hash, failed_attempts, locked FROM users WHERE username = ?"
+)
+_SQL_UPSERT_USER = (
+    "INSERT INTO users (username, password_hash, failed_attempts, locked) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(username) DO UPDATE SET password_hash = excluded.password_hash, "
+    "failed_attempts = excluded.failed_attempts, locked = excluded.locked"
+)
+
+
+def _user_row_to_dict(row: sqlite3.Row) -> dict:
+    return {
+        "username": row["username"],
+        "password_hash": row["password_hash"],
+        "failed_attempts": row["failed_attempts"],
+        "locked": bool(row["locked"]),
+    }
+
+
+def _user_params(u: dict) -> tuple:
+    return (
+        u["username"],
+        u["password_hash"],
+        int(u.get("failed_attempts", 0)),
+        1 if u.get("locked") else 0,
+    )
+
+
+class SqliteStorage(Storage):
+    """SQLite(WAL) 백엔드.
+
+    연결 하나를 잠금으로 직렬화해 공유한다. 쿼리는 모두 파라미터 바인딩이라 sqlite3의
+    statement 캐시가 재사용되며, 쓰기는 BEGIN IMMEDIATE 트랜잭션으로 묶인다.
+    """
+
+    def __init__(self, db_file: Path):
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.db_file = db_file
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_file, check_same_thread=False, isolation_level=None, cached_statements=64
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    def _transaction(self):
+        return _SqliteTransaction(self._conn, self._lock)
+
+    # --- Projects ---
+
+    def load_projects(self) -> list[dict]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(_SQL_LIST_PROJECTS)]
+
+    def get_project(self, project_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(_SQL_GET_PROJECT, (project_id,)).fetchone()
+        return dict(row) if row else None
+
+    def create_project(self, name: str, path: str) -> dict:
+        normalized = os.path.normpath(path)
+        with self._transaction() as conn:
+            row = conn.execute(_SQL_PROJECT_BY_PATH, (normalized,)).fetchone()
+            if row:
+                return dict(row)
+            project = {"id": _new_project_id(), "name": name, "path": normalized}
+            conn.execute(_SQL_INSERT_PROJECT, (project["id"], name, normalized))
+            return project
+
+    def delete_project(self, project_id: str) -> bool:
+        with self._transaction() as conn:
+            conn.execute(_SQL_DELETE_PROJECT_SETTINGS, (project_id,))
+            return conn.execute(_SQL_DELETE_PROJECT, (project_id,)).rowcount > 0
+
+    # --- Settings ---
+
+    def load_settings(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(_SQL_LIST_SETTINGS).fetchall()
+        return {r["key"]: json.loads(r["value"]) for r in rows}
+
+    def save_settings(self, settings: dict):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM settings")
+            conn.executemany(
+                _SQL_INSERT_SETTING,
+                [(k, json.dumps(v, ensure_ascii=False)) for k, v in settings.items()],
+            )
+
+    def get_project_setting(self, project_id: str, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(_SQL_GET_PROJECT_SETTING, (project_id, key)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_project_setting(self, project_id: str, key: str, value) -> bool:
+        with self._transaction() as conn:
+            if conn.execute(_SQL_GET_PROJECT, (project_id,)).fetchone() is None:
+                return False
+            conn.execute(
+                _SQL_UPSERT_PROJECT_SETTING,
+                (project_id, key, json.dumps(value, ensure_ascii=False)),
+            )
+            return True
+
+    # --- Users ---
+
+    def load_users(self) -> list[dict]:
+        with self._lock:
+            return [_user_row_to_dict(r) for r in self._conn.execute(_SQL_LIST_USERS)]
+
+    def save_users(self, users: list[dict]):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM users")
+            conn.executemany(_SQL_UPSERT_USER, [_user_params(u) for u in users])
+
+    def get_user(self, username: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(_SQL_GET_USER, (username,)).fetchone()
+        return _user_row_to_dict(row) if row else None
+
+    def update_user(self, username: str, updater: Callable[[dict], None]) -> dict | None:
+        with self._transaction() as conn:
+            row = conn.execute(_SQL_GET_USER, (username,)).fetchone()
+            if not row:
+                return None
+            user = _user_row_to_dict(row)
+            updater(user)
+            conn.execute(_SQL_UPSERT_USER, _user_params(user))
+            return user
+
+    # --- Migration ---
+
+    def migrate_from_json(self, projects_file: Path, settings_file: Path, users_file: Path):
+        """기존 JSON 파일을 한 번만 가져온다. 이미 가져왔으면 아무것도 하지 않는다."""
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return
+            for p in _read_json(projects_file) if projects_file.exists() else []:
+                conn.execute(
+                    "INSERT OR IGNORE INTO projects (id, name, path) VALUES (?, ?, ?)",
+                    (p["id"], p["name"], os.path.normpath(p["path"])),
+                )
+            settings = _read_json(settings_file) if settings_file.exists() else {}
+            for k, v in settings.items():
+                conn.execute(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                    (k, json.dumps(v, ensure_ascii=False)),
+                )
+            for u in _read_json(users_file) if users_file.exists() else []:
+                conn.execute(_SQL_UPSERT_USER, _user_params(u))
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _SqliteTransaction:
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
+
+
+_storage: Storage | None = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> Storage:
+    global _storage
+    if _storage is not None:
+        return _storage
+    with _storage_lock:
+        if _storage is None:
+            if STORAGE_BACKEND == "json":
+                _storage = JsonStorage(PROJECTS_FILE, SETTINGS_FILE, USERS_FILE)
+            elif STORAGE_BACKEND == "sqlite":
+                sqlite_storage = SqliteStorage(DB_FILE)
+                sqlite_storage.migrate_from_json(PROJECTS_FILE, SETTINGS_FILE, USERS_FILE)
+                _storage = sqlite_storage
+            else:
+                raise RuntimeError(f"Unknown storage backend: {STORAGE_BACKEND}")
+        return _storage
+
+
+def close_storage():
+    global _storage
+    with _storage_lock:
+        if _storage is not None:
+            _storage.close()
+            _storage = None
 
 
 def load_projects() -> list[dict]:
-    return _read_json(PROJECTS_FILE)
+    return get_storage().load_projects()
 
 
 def get_project(project_id: str) -> dict | None:
-    for p in load_projects():
-        if p["id"] == project_id:
-            return p
-    return None
+    return get_storage().get_project(project_id)
 
 
 def create_project(name: str, path: str) -> dict:
-    projects = load_projects()
-    normalized = os.path.normpath(path)
-    for p in projects:
-        if os.path.normpath(p["path"]) == normalized:
-            return p
-    project = {
-        "id": f"proj_{secrets.token_hex(4)}",
-        "name": name,
-        "path": normalized,
-    }
-    projects.append(project)
-    _write_json(PROJECTS_FILE, projects)
-    return project
+    return get_storage().create_project(name, path)
 
 
 def delete_project(project_id: str) -> bool:
-    projects = load_projects()
-    filtered = [p for p in projects if p["id"] != project_id]
-    if len(filtered) == len(projects):
-        return False
-    _write_json(PROJECTS_FILE, filtered)
-    return True
+    return get_storage().delete_project(project_id)
 
 
 def load_settings() -> dict:
-    return _read_json(SETTINGS_FILE)
+    return get_storage().load_settings()
 
 
 def save_settings(settings: dict):
-    _write_json(SETTINGS_FILE, settings)
+    get_storage().save_settings(settings)
+
+
+def get_project_setting(project_id: str, key: str, default=None):
+    return get_storage().get_project_setting(project_id, key, default)
+
+
+def set_project_setting(project_id: str, key: str, value) -> bool:
+    return get_storage().set_project_setting(project_id, key, value)
@@ -0,0 +1,16 @@
+import pytest
+
+from backend import store
+
+
+@pytest.fixture
+def temp_data_dir(tmp_path, monkeypatch):
+    """data/ 대신 tmp_path를 쓴다. 저장소, 검색 색인, 업로드가 모두 DATA_DIR 아래에 생긴다."""
+    monkeypatch.setattr(store, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(store, "DB_FILE", tmp_path / "keep_vibing.db")
+    monkeypatch.setattr(store, "PROJECTS_FILE", tmp_path / "projects.json")
+    monkeypatch.setattr(store, "SETTINGS_FILE", tmp_path / "settings.json")
+    monkeypatch.setattr(store, "USERS_FILE", tmp_path / "users.json")
+    monkeypatch.setattr(store, "_storage", None)
+    yield tmp_path
+    store.close_storage()
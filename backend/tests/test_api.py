@@ -1,22 +1,36 @@
+import asyncio
+import base64
+import errno
+import io
+import json
 import os
+import queue
+import subprocess
+import threading
+import time
+import zipfile
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from starlette.requests import Request
 
-from backend import auth, store
+from backend import api, auth, session_manager
 from backend.app import app
+from backend.file_response import file_response
+from backend.git_status import git_statuses
+from backend.path_index import path_indexes
+from backend.search_index import search_indexes
 
 
 @pytest.fixture(autouse=True)
-def temp_data_dir(tmp_path, monkeypatch):
-    monkeypatch.setattr(store, "DATA_DIR", tmp_path)
-    monkeypatch.setattr(store, "PROJECTS_FILE", tmp_path / "projects.json")
-    monkeypatch.setattr(store, "SETTINGS_FILE", tmp_path / "settings.json")
-    monkeypatch.setattr(auth, "USERS_FILE", tmp_path / "users.json")
-    monkeypatch.setattr(auth, "SECRET_KEY_FILE", tmp_path / "secret.key")
+def api_state(temp_data_dir, monkeypatch):
+    monkeypatch.setattr(auth, "SECRET_KEY_FILE", temp_data_dir / "secret.key")
     # 테스트에서 서버 종료 방지
     monkeypatch.setattr(auth, "_shutdown_server", lambda: None)
-    return tmp_path
+    yield
+    search_indexes.close()
+    path_indexes.close()
+    git_statuses.close()
 
 
 @pytest.fixture
@@ -33,6 +47,14 @@ async def client():
         yield c
 
 
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
 # --- Auth ---
 
 
@@ -322,6 +344,76 @@ async def test_read_file(client, auth_headers, tmp_path):
     assert data["content"] == "hello world"
 
 
+async def test_read_file_is_compressed_when_accepted(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "big.py").write_text("x = 1\n" * 2000)
+    url = f"/api/files/content?path={project_dir / 'big.py'}"
+
+    res = await client.get(url, headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.json()["content"] == "x = 1\n" * 2000
+    etag = res.headers["etag"]
+    assert etag.startswith("W/")
+
+    res = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert res.status_code == 304
+
+
+async def test_read_file_detects_binary_and_encoding(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "blob.dat").write_bytes(b"\0" * 4096 + b"x" * 100_000)
+    (project_dir / "legacy.py").write_bytes("# 한글 주석\r\nx = 1\r\n".encode("cp949"))
+    # 앞부분만 UTF-8이고 뒤에 CP949가 섞인 파일
+    (project_dir / "late.txt").write_bytes(b"a" * 10_000 + "끝".encode("cp949"))
+
+    async def read(name):
+        res = await client.get(
+            f"/api/files/content?path={project_dir / name}", headers=auth_headers
+        )
+        assert res.status_code == 200
+        return res.json()
+
+    assert (await read("blob.dat"))["type"] == "binary"
+    data = await read("legacy.py")
+    assert data["type"] == "text"
+    assert data["encoding"] == "cp949"
+    assert data["content"] == "# 한글 주석\nx = 1\n"
+    data = await read("late.txt")
+    assert data["encoding"] == "cp949"
+    assert data["content"].endswith("끝")
+
+
+async def test_save_keeps_file_encoding(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    file_path = project_dir / "legacy.py"
+    file_path.write_bytes("a = '가'\nb = 2\n".encode("cp949"))
+    loaded = await _load(client, auth_headers, file_path)
+
+    res = await client.patch(
+        "/api/files/content",
+        json={"path": str(file_path), "base_hash": loaded["hash"],
+              "edits": [{"start": 1, "end": 2, "lines": ["b = '나'"]}]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    assert file_path.read_bytes() == "a = '가'\nb = '나'\n".encode("cp949")
+
+    res = await client.put(
+        "/api/files/content",
+        json={"path": str(file_path), "content": "c = '다'\n"},
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    assert file_path.read_bytes() == "c = '다'\n".encode("cp949")
+
+    res = await client.put(
+        "/api/files/content",
+        json={"path": str(file_path), "content": "emoji = '🙂'\n"},
+        headers=auth_headers,
+    )
+    assert res.status_code == 400
+
+
 async def test_read_file_not_found(client, auth_headers, tmp_path):
     project_dir = await _create_project(client, auth_headers, tmp_path)
     res = await client.get(
@@ -345,6 +437,106 @@ async def test_write_file(client, auth_headers, tmp_path):
     assert file_path.read_text() == "new content"
 
 
+async def _load(client, auth_headers, path):
+    res = await client.get(f"/api/files/content?path={path}", headers=auth_headers)
+    assert res.status_code == 200
+    return res.json()
+
+
+async def test_write_file_with_stale_base_hash(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    file_path = project_dir / "test.txt"
+    file_path.write_text("v1")
+    loaded = await _load(client, auth_headers, file_path)
+
+    file_path.write_text("changed elsewhere")
+    res = await client.put(
+        "/api/files/content",
+        json={"path": str(file_path), "content": "mine", "base_hash": loaded["hash"]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 409
+    assert file_path.read_text() == "changed elsewhere"
+
+
+async def test_patch_file(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    file_path = project_dir / "code.py"
+    file_path.write_text("a\nb\nc\nd\n")
+    file_path.chmod(0o755)
+    loaded = await _load(client, auth_headers, file_path)
+
+    res = await client.patch(
+        "/api/files/content",
+        json={
+            "path": str(file_path),
+            "base_hash": loaded["hash"],
+            "edits": [
+                {"start": 1, "end": 2, "lines": ["B", "B2"]},
+                {"start": 3, "end": 4},
+            ],
+        },
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    assert file_path.read_text() == "a\nB\nB2\nc\n"
+    assert file_path.stat().st_mode & 0o777 == 0o755
+    assert res.json()["hash"] == (await _load(client, auth_headers, file_path))["hash"]
+    assert [p.name for p in project_dir.iterdir()] == ["code.py"]
+
+
+async def test_patch_file_conflict(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    file_path = project_dir / "a.txt"
+    file_path.write_text("one\n")
+    loaded = await _load(client, auth_headers, file_path)
+    file_path.write_text("two\n")
+
+    res = await client.patch(
+        "/api/files/content",
+        json={"path": str(file_path), "base_hash": loaded["hash"],
+              "edits": [{"start": 0, "end": 1, "lines": ["three"]}]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 409
+    assert res.headers["x-content-hash"] == (await _load(client, auth_headers, file_path))["hash"]
+    assert file_path.read_text() == "two\n"
+
+
+async def test_patch_file_bad_range(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    file_path = project_dir / "a.txt"
+    file_path.write_text("one")
+    loaded = await _load(client, auth_headers, file_path)
+
+    res = await client.patch(
+        "/api/files/content",
+        json={"path": str(file_path), "base_hash": loaded["hash"],
+              "edits": [{"start": 0, "end": 5, "lines": []}]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 400
+    assert file_path.read_text() == "one"
+
+
+async def test_patch_file_through_symlink(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "real.txt").write_text("x\n")
+    link = project_dir / "link.txt"
+    link.symlink_to(project_dir / "real.txt")
+    loaded = await _load(client, auth_headers, link)
+
+    res = await client.patch(
+        "/api/files/content",
+        json={"path": str(link), "base_hash": loaded["hash"],
+              "edits": [{"start": 0, "end": 1, "lines": ["y"]}]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    assert link.is_symlink()
+    assert (project_dir / "real.txt").read_text() == "y\n"
+
+
 # --- File CRUD ---
 
 
@@ -458,6 +650,29 @@ async def test_copy_file(client, auth_headers, tmp_path):
     assert (dest / "src.txt").read_text() == "hello"
 
 
+async def test_copy_fifo_is_rejected(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    os.mkfifo(project_dir / "pipe")
+    (project_dir / "dir").mkdir()
+    os.mkfifo(project_dir / "dir" / "pipe")
+    dest = project_dir / "sub"
+    dest.mkdir()
+
+    res = await client.post(
+        "/api/files/copy",
+        json={"source": str(project_dir / "pipe"), "destination": str(dest)},
+        headers=auth_headers,
+    )
+    assert res.status_code == 400
+    res = await client.post(
+        "/api/files/copy",
+        json={"source": str(project_dir / "dir"), "destination": str(dest)},
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    assert os.listdir(dest / "dir") == ["pipe"]
+
+
 async def test_copy_directory(client, auth_headers, tmp_path):
     project_dir = await _create_project(client, auth_headers, tmp_path)
     src = project_dir / "mydir"
@@ -547,6 +762,261 @@ async def test_copy_dir_into_itself(client, auth_headers, tmp_path):
     assert res.status_code == 400
 
 
+# --- Jobs API ---
+
+
+async def _wait_job(client, auth_headers, job_id):
+    for _ in range(100):
+        res = await client.get(f"/api/jobs/{job_id}", headers=auth_headers)
+        if res.json()["status"] not in ("queued", "running"):
+            return res.json()
+        await asyncio.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+async def test_copy_job(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    src = project_dir / "src"
+    (src / "nested").mkdir(parents=True)
+    (src / "nested" / "f.txt").write_text("data")
+    (project_dir / "dest").mkdir()
+
+    res = await client.post(
+        "/api/jobs/copy",
+        json={"source": str(src), "destination": str(project_dir / "dest")},
+        headers=auth_headers,
+    )
+    assert res.status_code == 202
+    job = await _wait_job(client, auth_headers, res.json()["id"])
+    assert job["status"] == "completed"
+    assert (job["files_total"], job["files_done"]) == (1, 1)
+    assert job["result"]["path"].endswith("/dest/src")
+    assert (project_dir / "dest" / "src" / "nested" / "f.txt").read_text() == "data"
+
+    res = await client.get("/api/jobs", headers=auth_headers)
+    assert res.json()[0]["id"] == job["id"]
+
+
+async def test_delete_job(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "gone" / "x").mkdir(parents=True)
+    (project_dir / "gone" / "x" / "f.txt").write_text("")
+
+    res = await client.post(
+        "/api/jobs/delete", json={"path": str(project_dir / "gone")}, headers=auth_headers
+    )
+    job = await _wait_job(client, auth_headers, res.json()["id"])
+    assert job["status"] == "completed"
+    assert not (project_dir / "gone").exists()
+
+
+async def test_copy_job_failure(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    res = await client.post(
+        "/api/jobs/copy",
+        json={"source": str(project_dir / "missing"), "destination": str(project_dir)},
+        headers=auth_headers,
+    )
+    job = await _wait_job(client, auth_headers, res.json()["id"])
+    assert (job["status"], job["error"]) == ("failed", "Source not found")
+
+
+async def test_cancel_copy_job(client, auth_headers, tmp_path, monkeypatch):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "src").mkdir()
+    (project_dir / "src" / "f.txt").write_text("x")
+    started = threading.Event()
+
+    def stuck_copy_tree(src, dst, job):
+        os.mkdir(dst)
+        started.set()
+        try:
+            while True:
+                job.check_cancelled()
+                time.sleep(0.01)
+        finally:
+            os.rmdir(dst)
+
+    monkeypatch.setattr(api.file_ops, "copy_tree", stuck_copy_tree)
+    res = await client.post(
+        "/api/jobs/copy",
+        json={"source": str(project_dir / "src"), "destination": str(project_dir)},
+        headers=auth_headers,
+    )
+    job_id = res.json()["id"]
+    await asyncio.to_thread(started.wait, 5)
+
+    res = await client.delete(f"/api/jobs/{job_id}", headers=auth_headers)
+    assert res.status_code == 200
+    job = await _wait_job(client, auth_headers, job_id)
+    assert job["status"] == "cancelled"
+    assert not (project_dir / "src (1)").exists()
+
+
+async def test_job_not_found(client, auth_headers):
+    res = await client.get("/api/jobs/deadbeef", headers=auth_headers)
+    assert res.status_code == 404
+
+
+# --- Batch API ---
+
+
+async def test_batch_mixed_ops(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "dest").mkdir()
+    (project_dir / "dest" / "a.txt").write_text("old")
+    (project_dir / "a.txt").write_text("a")
+    (project_dir / "b.txt").write_text("b")
+    (project_dir / "junk").mkdir()
+    dest = project_dir / "dest"
+
+    res = await client.post(
+        "/api/files/batch",
+        json={"ops": [
+            {"op": "copy", "source": str(project_dir / "a.txt"), "destination": str(dest)},
+            {"op": "copy", "source": str(project_dir / "a.txt"), "destination": str(dest)},
+            {"op": "move", "source": str(project_dir / "b.txt"), "destination": str(dest)},
+            {"op": "delete", "path": str(project_dir / "junk")},
+            {"op": "create", "path": str(dest / "new"), "type": "directory"},
+            {"op": "create", "path": str(dest / "new")},
+            {"op": "delete", "path": str(project_dir / "missing")},
+        ]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert [r["ok"] for r in results] == [True, True, True, True, True, False, False]
+    assert results[0]["path"].endswith("/dest/a (1).txt")
+    assert results[0]["job_id"] != results[1]["job_id"]
+    assert "job_id" not in results[2]  # 같은 장치 안의 move는 rename 한 번
+    assert results[1]["path"].endswith("/dest/a (2).txt")
+    assert results[2]["path"].endswith("/dest/b.txt")
+    assert results[3]["trash_id"]
+    assert results[5]["status"] == 409
+    assert results[6]["status"] == 404
+
+    assert sorted(os.listdir(dest)) == ["a (1).txt", "a (2).txt", "a.txt", "b.txt", "new"]
+    assert (dest / "a.txt").read_text() == "old"
+    assert not (project_dir / "b.txt").exists()
+    assert not (project_dir / "junk").exists()
+
+    res = await client.get(f"/api/files?path={dest}", headers=auth_headers)
+    assert len(res.json()) == 5
+
+
+async def test_batch_tree_copy_and_cross_device_move_run_as_jobs(
+    client, auth_headers, tmp_path, monkeypatch
+):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "src" / "pkg").mkdir(parents=True)
+    (project_dir / "src" / "pkg" / "m.py").write_text("x = 1\n")
+    (project_dir / "dest").mkdir()
+    dest = project_dir / "dest"
+    real_rename = os.rename
+
+    def rename(src, dst, *args, **kwargs):
+        if os.path.basename(src) == "src":
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return real_rename(src, dst, *args, **kwargs)
+
+    monkeypatch.setattr(os, "rename", rename)
+    res = await client.post(
+        "/api/files/batch",
+        json={"ops": [
+            {"op": "copy", "source": str(project_dir / "src"), "destination": str(project_dir)},
+            {"op": "move", "source": str(project_dir / "src"), "destination": str(dest)},
+        ]},
+        headers=auth_headers,
+    )
+    copied, moved = res.json()["results"]
+    assert copied["ok"] and copied["path"].endswith("/src (1)")
+    assert moved["ok"] and moved["path"].endswith("/dest/src")
+    assert (project_dir / "src (1)" / "pkg" / "m.py").read_text() == "x = 1\n"
+    assert (dest / "src" / "pkg" / "m.py").read_text() == "x = 1\n"
+    assert not (project_dir / "src").exists()
+
+    for result, kind in [(copied, "copy"), (moved, "move")]:
+        job = (await client.get(f"/api/jobs/{result['job_id']}", headers=auth_headers)).json()
+        assert (job["kind"], job["status"], job["files_done"]) == (kind, "completed", 1)
+
+
+async def test_batch_validates_paths(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "d").mkdir()
+    res = await client.post(
+        "/api/files/batch",
+        json={"ops": [
+            {"op": "delete", "path": str(tmp_path)},
+            {"op": "move", "source": str(project_dir / "d"), "destination": str(project_dir / "d")},
+            {"op": "copy", "source": str(project_dir / "d")},
+        ]},
+        headers=auth_headers,
+    )
+    results = res.json()["results"]
+    assert [r["status"] for r in results] == [403, 400, 400]
+    assert (project_dir / "d").is_dir()
+
+
+async def test_batch_rejects_unknown_op(client, auth_headers, tmp_path):
+    await _create_project(client, auth_headers, tmp_path)
+    res = await client.post(
+        "/api/files/batch", json={"ops": [{"op": "chmod", "path": "x"}]}, headers=auth_headers
+    )
+    assert res.status_code == 422
+
+
+# --- Trash API ---
+
+
+async def test_delete_moves_to_trash_and_restores(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "big" / "deep").mkdir(parents=True)
+    (project_dir / "big" / "deep" / "f.txt").write_text("keep me")
+
+    res = await client.delete(f"/api/files?path={project_dir / 'big'}", headers=auth_headers)
+    assert res.status_code == 200
+    trash_id = res.json()["trash_id"]
+    assert not (project_dir / "big").exists()
+
+    res = await client.get(f"/api/files?path={project_dir}", headers=auth_headers)
+    assert res.json() == []
+
+    res = await client.get("/api/trash", headers=auth_headers)
+    assert [i["id"] for i in res.json()] == [trash_id]
+
+    (project_dir / "big").mkdir()  # 그 사이 같은 이름이 다시 생김
+    res = await client.post(f"/api/trash/{trash_id}/restore", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.json()["path"].endswith("/big (1)")
+    assert (project_dir / "big (1)" / "deep" / "f.txt").read_text() == "keep me"
+
+    res = await client.post(f"/api/trash/{trash_id}/restore", headers=auth_headers)
+    assert res.status_code == 404
+
+
+async def test_purge_trash_item(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "f.txt").write_text("x")
+    res = await client.delete(f"/api/files?path={project_dir / 'f.txt'}", headers=auth_headers)
+    trash_id = res.json()["trash_id"]
+
+    res = await client.delete(f"/api/trash/{trash_id}", headers=auth_headers)
+    assert res.status_code == 202
+    job = await _wait_job(client, auth_headers, res.json()["id"])
+    assert job["status"] == "completed"
+    res = await client.get("/api/trash", headers=auth_headers)
+    assert res.json() == []
+
+
+async def test_delete_project_root_is_permanent(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "f.txt").write_text("x")
+    res = await client.delete(f"/api/files?path={project_dir}", headers=auth_headers)
+    assert res.status_code == 200
+    assert "trash_id" not in res.json()
+    assert not project_dir.exists()
+
+
 # --- File Upload API ---
 
 
@@ -604,6 +1074,58 @@ async def test_upload_too_large(client, auth_headers, tmp_path):
     assert res.status_code == 413
 
 
+async def test_upload_too_large_stops_reading_the_body(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    boundary = "testboundary"
+    sent = []
+
+    async def body():
+        yield (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; "
+            f"filename=\"big.bin\"\r\nContent-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        for _ in range(20):  # 20MB — 5MB를 넘은 뒤로는 더 읽지 않아야 한다
+            sent.append(1)
+            yield b"x" * (1024 * 1024)
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    res = await client.post(
+        f"/api/files/upload?path={project_dir}",
+        headers={**auth_headers, "Content-Type": f"multipart/form-data; boundary={boundary}"},
+        content=body(),
+    )
+    assert res.status_code == 413
+    assert len(sent) < 10
+    assert os.listdir(project_dir) == []
+    assert os.listdir(tmp_path / "uploads") == []
+
+
+async def test_upload_is_staged_outside_the_project(
+    client, auth_headers, tmp_path, monkeypatch
+):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    staged = []
+    open_staging = api.uploads.open_staging
+
+    def recording():
+        f, path = open_staging()
+        staged.append((path, sorted(os.listdir(project_dir))))
+        return f, path
+
+    monkeypatch.setattr(api.uploads, "open_staging", recording)
+    res = await client.post(
+        f"/api/files/upload?path={project_dir}",
+        headers=auth_headers,
+        files=[("files", ("a.txt", b"hello", "text/plain"))],
+    )
+    assert res.status_code == 200
+    [(path, listing)] = staged
+    assert os.path.dirname(path) == str(tmp_path / "uploads")
+    assert listing == []
+    assert sorted(os.listdir(project_dir)) == ["a.txt"]
+    assert os.listdir(tmp_path / "uploads") == []
+
+
 async def test_upload_no_files(client, auth_headers, tmp_path):
     project_dir = await _create_project(client, auth_headers, tmp_path)
     res = await client.post(
@@ -623,3 +1145,751 @@ async def test_upload_path_traversal(client, auth_headers, tmp_path):
     assert res.status_code == 200
     assert not os.path.exists(os.path.join(str(tmp_path), "evil.txt"))
     assert os.path.exists(os.path.join(project_dir, "evil.txt"))
+
+
+async def test_upload_leaves_no_temp_files(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    res = await client.post(
+        f"/api/files/upload?path={project_dir}",
+        headers=auth_headers,
+        files=[
+            ("files", ("a.bin", os.urandom(3 * 1024 * 1024), "application/octet-stream")),
+            ("files", ("big.bin", b"x" * (5 * 1024 * 1024 + 1), "application/octet-stream")),
+        ],
+    )
+    assert res.status_code == 413
+    assert sorted(os.listdir(project_dir)) == ["a.bin"]
+
+
+def test_place_file_keeps_upload_when_cross_device_copy_fails(tmp_path, monkeypatch):
+    staging = tmp_path / "staging"
+    dest = tmp_path / "dest"
+    staging.mkdir()
+    dest.mkdir()
+    part = staging / "part"
+    part.write_bytes(b"data")
+    real_stat = os.stat
+
+    def other_device(path, *args, **kwargs):
+        st = real_stat(path, *args, **kwargs)
+        if os.fspath(path) != str(part):
+            return st
+        fields = list(st)
+        fields[2] += 1  # st_dev
+        return os.stat_result(fields)
+
+    def disk_full(src, dst):
+        with open(dst, "wb") as f:
+            f.write(b"da")
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(api.os, "stat", other_device)
+    with monkeypatch.context() as m:
+        m.setattr(api.shutil, "copyfile", disk_full)
+        with pytest.raises(OSError):
+            api._place_file(str(part), str(dest), "a.bin")
+    # 받아 둔 업로드는 남고, 반쯤 쓴 복사본은 지워진다
+    assert part.read_bytes() == b"data"
+    assert os.listdir(dest) == []
+
+    target = api._place_file(str(part), str(dest), "a.bin")
+    assert target == str(dest / "a.bin")
+    assert (dest / "a.bin").read_bytes() == b"data"
+    assert not part.exists()
+    assert os.listdir(dest) == ["a.bin"]
+
+
+# --- Resumable Upload API ---
+
+
+async def _start_upload(client, auth_headers, dest, filename, size):
+    res = await client.post(
+        "/api/uploads",
+        headers=auth_headers,
+        json={"path": str(dest), "filename": filename, "size": size},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+async def test_resumable_upload_in_parts(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    payload = os.urandom(3 * 1024 * 1024 + 17)
+    upload = await _start_upload(client, auth_headers, project_dir, "data.bin", len(payload))
+    assert upload["offset"] == 0
+
+    half = len(payload) // 2
+    res = await client.put(
+        f"/api/uploads/{upload['id']}?offset=0", headers=auth_headers, content=payload[:half]
+    )
+    assert res.json() == {**upload, "offset": half, "status": "pending"}
+
+    res = await client.get(f"/api/uploads/{upload['id']}", headers=auth_headers)
+    assert res.json()["offset"] == half
+
+    res = await client.put(
+        f"/api/uploads/{upload['id']}?offset={half}", headers=auth_headers,
+        content=payload[half:],
+    )
+    data = res.json()
+    assert data["status"] == "completed"
+    assert data["path"].endswith("/data.bin")
+    assert (project_dir / "data.bin").read_bytes() == payload
+
+    res = await client.get(f"/api/uploads/{upload['id']}", headers=auth_headers)
+    assert res.status_code == 404
+
+
+async def test_resumable_upload_offset_mismatch(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    upload = await _start_upload(client, auth_headers, project_dir, "a.txt", 10)
+    await client.put(f"/api/uploads/{upload['id']}?offset=0", headers=auth_headers, content=b"abcd")
+
+    res = await client.put(
+        f"/api/uploads/{upload['id']}?offset=0", headers=auth_headers, content=b"abcd"
+    )
+    assert res.status_code == 409
+    assert res.headers["upload-offset"] == "4"
+
+
+async def test_resumable_upload_exceeds_declared_size(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    upload = await _start_upload(client, auth_headers, project_dir, "a.txt", 4)
+    res = await client.put(
+        f"/api/uploads/{upload['id']}?offset=0", headers=auth_headers, content=b"too long"
+    )
+    assert res.status_code == 413
+    res = await client.get(f"/api/uploads/{upload['id']}", headers=auth_headers)
+    assert res.json()["offset"] == 0
+    assert not (project_dir / "a.txt").exists()
+
+
+async def test_resumable_upload_name_conflict(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "dup.txt").write_text("existing")
+    upload = await _start_upload(client, auth_headers, project_dir, "dup.txt", 3)
+    res = await client.put(
+        f"/api/uploads/{upload['id']}?offset=0", headers=auth_headers, content=b"new"
+    )
+    assert res.json()["path"].endswith("/dup (1).txt")
+    assert (project_dir / "dup.txt").read_text() == "existing"
+    assert (project_dir / "dup (1).txt").read_text() == "new"
+
+
+async def test_resumable_upload_empty_file(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    upload = await _start_upload(client, auth_headers, project_dir, "empty.txt", 0)
+    assert upload["status"] == "completed"
+    assert (project_dir / "empty.txt").read_bytes() == b""
+
+
+async def test_resumable_upload_cancel(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    upload = await _start_upload(client, auth_headers, project_dir, "a.txt", 10)
+    res = await client.delete(f"/api/uploads/{upload['id']}", headers=auth_headers)
+    assert res.json() == {"status": "cancelled"}
+    res = await client.get(f"/api/uploads/{upload['id']}", headers=auth_headers)
+    assert res.status_code == 404
+    assert os.listdir(tmp_path / "uploads") == []
+
+
+async def test_resumable_upload_forbidden_path(client, auth_headers, tmp_path):
+    await _create_project(client, auth_headers, tmp_path)
+    res = await client.post(
+        "/api/uploads",
+        headers=auth_headers,
+        json={"path": str(tmp_path), "filename": "a.txt", "size": 1},
+    )
+    assert res.status_code == 403
+
+
+async def test_resumable_upload_bad_id(client, auth_headers):
+    res = await client.get("/api/uploads/..%2F..%2Fusers", headers=auth_headers)
+    assert res.status_code == 404
+
+
+# --- Event loop responsiveness ---
+
+
+class _EchoPty:
+    """write한 데이터를 그대로 read로 돌려주는 가짜 PTY."""
+
+    def __init__(self):
+        self._q = queue.Queue()
+
+    def read(self):
+        data = self._q.get()
+        if data is None:
+            raise EOFError
+        return data
+
+    def write(self, data):
+        self._q.put(data)
+
+    def setwinsize(self, rows, cols):
+        pass
+
+    def terminate(self, force=False):
+        self._q.put(None)
+
+
+async def test_terminal_echo_not_blocked_by_large_copy(
+    client, auth_headers, tmp_path, monkeypatch
+):
+    """대용량 복사 중에도 터미널 에코 지연이 작게 유지되어야 한다."""
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    src = project_dir / "node_modules_copy_src"
+    src.mkdir()
+    (src / "a.txt").write_text("a")
+
+    # 수 GB 복사를 흉내: 복사가 작업 스레드를 2초간 점유
+    real_copy_tree = api.file_ops.copy_tree
+
+    def slow_copy_tree(s, d, *args, **kwargs):
+        time.sleep(2)
+        return real_copy_tree(s, d, *args, **kwargs)
+
+    monkeypatch.setattr(api.file_ops, "copy_tree", slow_copy_tree)
+
+    session = session_manager.Session(
+        session_id="echo", project_id="proj_echo", directory=str(project_dir),
+        pty_process=_EchoPty(),
+    )
+    session_manager.sessions[session.session_id] = session
+    loop = asyncio.get_running_loop()
+    threading.Thread(
+        target=session_manager._pty_reader, args=(session, loop), daemon=True
+    ).start()
+    client_queue = session_manager.register_client(session.session_id)
+
+    try:
+        copy_task = asyncio.create_task(client.post(
+            "/api/files/copy",
+            json={"source": str(src), "destination": str(project_dir)},
+            headers=auth_headers,
+        ))
+        await asyncio.sleep(0.2)
+        assert not copy_task.done()
+
+        latencies = []
+        for i in range(5):
+            start = time.perf_counter()
+            await session_manager.write_to_session(session.session_id, f"k{i}")
+            assert await asyncio.wait_for(client_queue.get(), timeout=1) == f"k{i}"
+            latencies.append(time.perf_counter() - start)
+        assert not copy_task.done()
+        assert max(latencies) < 0.2
+
+        res = await copy_task
+        assert res.status_code == 200
+    finally:
+        await session_manager.destroy_session(session.session_id)
+
+
+# --- Ignore rules ---
+
+
+async def test_listing_honors_ignore_rules(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    for name in ["build", "src", "data", ".git/info"]:
+        (project_dir / name).mkdir(parents=True)
+    (project_dir / ".gitignore").write_text("build/\n*.log\n.env\n")
+    (project_dir / ".git" / "info" / "exclude").write_text("secret.txt\n")
+    for name in ["app.log", ".env", "secret.txt", "main.py", "src/x.log", "src/ok.py"]:
+        (project_dir / name).write_text("")
+    project_id = (await client.get("/api/projects", headers=auth_headers)).json()[0]["id"]
+
+    async def names(path):
+        res = await client.get(f"/api/files?path={path}", headers=auth_headers)
+        assert res.status_code == 200
+        return {e["name"] for e in res.json()}
+
+    assert await names(project_dir) == {".gitignore", "src", "data", "main.py"}
+    assert await names(project_dir / "src") == {"ok.py"}
+
+    res = await client.put(
+        f"/api/projects/{project_id}/ignore",
+        json={"patterns": ["data/", "!.env"]},
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    res = await client.get(f"/api/projects/{project_id}/ignore", headers=auth_headers)
+    assert res.json() == {"patterns": ["data/", "!.env"]}
+    assert await names(project_dir) == {".gitignore", "src", ".env", "main.py"}
+
+    res = await client.post(
+        "/api/files/tree", json={"path": str(project_dir), "depth": 2}, headers=auth_headers
+    )
+    dirs = res.json()["dirs"]
+    assert str(project_dir / "build") not in dirs
+    assert [e["name"] for e in dirs[str(project_dir / "src")]] == ["ok.py"]
+
+    res = await client.put(
+        "/api/projects/nope/ignore", json={"patterns": []}, headers=auth_headers
+    )
+    assert res.status_code == 404
+
+
+async def test_invalid_ignore_patterns(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / ".gitignore").write_text("[z-a]\n*.log\n")
+    (project_dir / "a.log").write_text("")
+    (project_dir / "main.py").write_text("")
+    project_id = (await client.get("/api/projects", headers=auth_headers)).json()[0]["id"]
+
+    for bad in ["[z-a]", "**/[!]"]:
+        res = await client.put(
+            f"/api/projects/{project_id}/ignore", json={"patterns": [bad]}, headers=auth_headers
+        )
+        assert res.status_code == 400
+    res = await client.get(f"/api/projects/{project_id}/ignore", headers=auth_headers)
+    assert res.json() == {"patterns": []}
+
+    # 체크인된 .gitignore의 잘못된 줄은 그 규칙만 버린다
+    res = await client.get(f"/api/files?path={project_dir}", headers=auth_headers)
+    assert res.status_code == 200
+    assert {e["name"] for e in res.json()} == {".gitignore", "main.py"}
+
+
+async def test_git_status_and_diff(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "src").mkdir()
+    (project_dir / "src" / "a.py").write_text("a = 1\n")
+    (project_dir / "keep.txt").write_text("keep\n")
+    _git(project_dir, "init", "-q")
+    _git(project_dir, "add", ".")
+    _git(project_dir, "commit", "-qm", "init")
+    (project_dir / "src" / "a.py").write_text("a = 2\n")
+    (project_dir / "new.txt").write_text("new\n")
+    project_id = (await client.get("/api/projects", headers=auth_headers)).json()[0]["id"]
+
+    res = await client.get(f"/api/files?path={project_dir}", headers=auth_headers)
+    flags = {e["name"]: e.get("git") for e in res.json()}
+    assert flags == {"src": "M", "keep.txt": None, "new.txt": "?"}
+
+    res = await client.get(f"/api/git/status?project_id={project_id}", headers=auth_headers)
+    data = res.json()
+    assert data["state"] == "ready"
+    assert data["files"] == {
+        str(project_dir / "src" / "a.py"): "M",
+        str(project_dir / "new.txt"): "?",
+    }
+    res = await client.get(
+        f"/api/git/status?project_id={project_id}",
+        headers={**auth_headers, "If-None-Match": res.headers["etag"]},
+    )
+    assert res.status_code == 304
+
+    res = await client.get(
+        f"/api/git/diff?path={project_dir / 'src' / 'a.py'}", headers=auth_headers
+    )
+    hunks = res.json()["hunks"]
+    assert [h["lines"] for h in hunks] == [["-a = 1", "+a = 2"]]
+
+
+async def test_git_status_runs_off_the_loop(client, auth_headers, tmp_path, monkeypatch):
+    # 첫 요청은 git status가 끝날 때까지 기다리므로 이벤트 루프에서 돌면 서버 전체가 멈춘다
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    _git(project_dir, "init", "-q")
+    project_id = (await client.get("/api/projects", headers=auth_headers)).json()[0]["id"]
+    threads = []
+    real_get = git_statuses.get
+
+    def recording_get(root):
+        threads.append(threading.current_thread())
+        return real_get(root)
+
+    monkeypatch.setattr(git_statuses, "get", recording_get)
+    await client.get(f"/api/git/status?project_id={project_id}", headers=auth_headers)
+    (project_dir / "a.txt").write_text("")
+    await client.get(f"/api/git/diff?path={project_dir / 'a.txt'}", headers=auth_headers)
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+async def test_git_status_outside_repo(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "a.txt").write_text("")
+    res = await client.get(f"/api/files?path={project_dir}", headers=auth_headers)
+    assert "git" not in res.json()[0]
+    res = await client.get(f"/api/git/diff?path={project_dir / 'a.txt'}", headers=auth_headers)
+    assert res.json()["hunks"] == []
+
+
+async def test_zip_download(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "src").mkdir()
+    (project_dir / "node_modules").mkdir()
+    (project_dir / ".gitignore").write_text("*.log\n")
+    (project_dir / "src" / "a.py").write_text("a = 1\n")
+    (project_dir / "src" / "run.log").write_text("")
+    (project_dir / "node_modules" / "x.js").write_text("")
+    (project_dir / "notes.md").write_text("# notes\n")
+
+    res = await client.post(
+        "/api/files/zip", json={"paths": [str(project_dir / "src")]}, headers=auth_headers
+    )
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/zip"
+    assert "filename*=UTF-8''src.zip" in res.headers["content-disposition"]
+    zf = zipfile.ZipFile(io.BytesIO(res.content))
+    assert sorted(zf.namelist()) == ["src/", "src/a.py"]
+
+    res = await client.post(
+        "/api/files/zip",
+        json={"paths": [str(project_dir / "notes.md"), str(project_dir / "src" / "a.py")]},
+        headers=auth_headers,
+    )
+    assert sorted(zipfile.ZipFile(io.BytesIO(res.content)).namelist()) == ["a.py", "notes.md"]
+
+    res = await client.post(
+        "/api/files/zip", json={"paths": [str(project_dir / "missing")]}, headers=auth_headers
+    )
+    assert res.status_code == 404
+    res = await client.post("/api/files/zip", json={"paths": ["/etc"]}, headers=auth_headers)
+    assert res.status_code == 403
+
+
+# --- File Tree API ---
+
+
+async def test_files_tree_depth(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "a" / "b" / "c").mkdir(parents=True)
+    (project_dir / "a" / "b" / "deep.txt").write_text("")
+    (project_dir / "node_modules" / "x").mkdir(parents=True)
+    (project_dir / "top.txt").write_text("")
+
+    res = await client.post(
+        "/api/files/tree", json={"path": str(project_dir), "depth": 2}, headers=auth_headers
+    )
+    assert res.status_code == 200
+    data = res.json()
+    root = str(project_dir).replace("\\", "/")
+    assert set(data["dirs"]) == {root, f"{root}/a"}
+    assert [e["name"] for e in data["dirs"][root]] == ["a", "top.txt"]
+    assert [e["name"] for e in data["dirs"][f"{root}/a"]] == ["b"]
+    assert data["next_cursor"] is None
+
+
+async def test_files_tree_batch_expand(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "x").mkdir()
+    (project_dir / "y").mkdir()
+    (project_dir / "y" / "f.txt").write_text("")
+
+    res = await client.post(
+        "/api/files/tree",
+        json={"paths": [str(project_dir / "x"), str(project_dir / "y")]},
+        headers=auth_headers,
+    )
+    dirs = res.json()["dirs"]
+    assert len(dirs) == 2
+    assert [e["name"] for e in dirs[str(project_dir / "y").replace("\\", "/")]] == ["f.txt"]
+
+
+async def test_files_tree_limit_and_cursor(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    for name in ("d1", "d2", "d3"):
+        (project_dir / name).mkdir()
+        (project_dir / name / "f.txt").write_text("")
+
+    seen = {}
+    body = {"path": str(project_dir), "depth": 2, "limit": 3}
+    while True:
+        res = await client.post("/api/files/tree", json=body, headers=auth_headers)
+        assert res.status_code == 200
+        data = res.json()
+        seen.update(data["dirs"])
+        if not data["next_cursor"]:
+            break
+        body = {"cursor": data["next_cursor"], "limit": 3}
+    assert len(seen) == 4
+
+
+async def test_files_tree_forbidden(client, auth_headers, tmp_path):
+    await _create_project(client, auth_headers, tmp_path)
+    res = await client.post("/api/files/tree", json={"path": str(tmp_path)}, headers=auth_headers)
+    assert res.status_code == 403
+
+
+async def test_files_tree_cursor_is_revalidated(client, auth_headers, tmp_path):
+    await _create_project(client, auth_headers, tmp_path)
+    cursor = base64.urlsafe_b64encode(json.dumps([[str(tmp_path), 1]]).encode()).decode()
+    res = await client.post("/api/files/tree", json={"cursor": cursor}, headers=auth_headers)
+    assert res.status_code == 403
+
+
+# --- Search API ---
+
+
+async def _search(client, auth_headers, params):
+    res = await client.get("/api/search", params=params, headers=auth_headers)
+    assert res.status_code == 200, res.text
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+async def test_search_api(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "main.py").write_text("import os\nprint('needle here')\n")
+    (project_dir / "other.py").write_text("nothing\n")
+    project_id = (await client.get("/api/projects", headers=auth_headers)).json()[0]["id"]
+
+    res = await client.get(f"/api/search/status?project_id={project_id}", headers=auth_headers)
+    assert res.status_code == 200
+    search_indexes.get(project_id, str(project_dir)).wait_ready(5)
+
+    items = await _search(client, auth_headers, {"project_id": project_id, "q": "NEEDLE"})
+    assert items[0]["path"] == str(project_dir / "main.py")
+    assert items[0]["matches"][0]["line"] == 2
+    assert items[0]["matches"][0]["before"] == ["import os"]
+    assert items[-1]["type"] == "done" and items[-1]["files"] == 1
+
+    params = {"project_id": project_id, "q": "NEEDLE", "case": "true"}
+    items = await _search(client, auth_headers, params)
+    assert items == [items[-1]] and items[0]["files"] == 0
+
+    res = await client.get(
+        "/api/search",
+        params={"project_id": project_id, "q": "(", "regex": "true"},
+        headers=auth_headers,
+    )
+    assert res.status_code == 400
+
+
+async def test_search_api_unknown_project(client, auth_headers):
+    res = await client.get("/api/search?project_id=nope&q=x", headers=auth_headers)
+    assert res.status_code == 404
+
+
+async def test_find_files_api(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "src").mkdir()
+    (project_dir / "src" / "SessionHeader.tsx").write_text("")
+    (project_dir / "README.md").write_text("")
+    project_id = (await client.get("/api/projects", headers=auth_headers)).json()[0]["id"]
+
+    url = f"/api/files/find?project_id={project_id}&q=sesshead"
+    for _ in range(100):
+        res = await client.get(url, headers=auth_headers)
+        assert res.status_code == 200
+        data = res.json()
+        if data["state"] != "building":
+            break
+        await asyncio.sleep(0.05)
+    assert [r["path"] for r in data["results"]] == [str(project_dir / "src" / "SessionHeader.tsx")]
+    assert data["results"][0]["rel"] == "src/SessionHeader.tsx"
+
+    res = await client.get("/api/files/find?project_id=nope&q=x", headers=auth_headers)
+    assert res.status_code == 404
+
+
+# --- Metrics ---
+
+
+async def test_metrics(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    await client.get(f"/api/files?path={project_dir}", headers=auth_headers)
+
+    res = await client.get("/api/metrics", headers=auth_headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["fs"]["ops"]["list"]["count"] >= 1
+    assert data["fs"]["classes"]["bulk"]["per_client"] == 1
+    assert data["dir_cache"]["misses"] >= 1
+    assert "hit_rate" in data["dir_cache"]
+    assert "p99_ms" in data["loop"]["lag"]
+    assert data["routes"]["GET /api/files"]["count"] >= 1
+
+
+async def test_profile_returns_collapsed_stacks(client, auth_headers):
+    res = await client.get("/api/profile?seconds=0.1&interval_ms=5&idle=true", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    line = res.text.splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert ";" in stack and int(count) >= 1
+
+    res = await client.get("/api/profile?seconds=0.1")
+    assert res.status_code == 401
+
+
+async def test_health_needs_no_auth(client):
+    res = await client.get("/api/health")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["status"] == "ok"
+    assert {"p50_ms", "p99_ms", "max_ms", "stalls"} <= data["loop"].keys()
+
+
+async def test_list_files_sees_api_changes(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    await client.get(f"/api/files?path={project_dir}", headers=auth_headers)
+    await client.post(
+        "/api/files",
+        json={"path": str(project_dir / "fresh.txt"), "type": "file"},
+        headers=auth_headers,
+    )
+    res = await client.get(f"/api/files?path={project_dir}", headers=auth_headers)
+    assert [e["name"] for e in res.json()] == ["fresh.txt"]
+
+
+# --- Raw / conditional file responses ---
+
+
+async def test_raw_file_etag_and_304(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "pic.png").write_bytes(b"\x89PNG" + b"x" * 100)
+
+    res = await client.get(f"/api/files/raw?path={project_dir / 'pic.png'}", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "image/png"
+    assert res.headers["accept-ranges"] == "bytes"
+    assert res.content == b"\x89PNG" + b"x" * 100
+    etag = res.headers["etag"]
+
+    res = await client.get(
+        f"/api/files/raw?path={project_dir / 'pic.png'}",
+        headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert res.status_code == 304
+    assert res.content == b""
+
+
+async def test_raw_file_range(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "data.bin").write_bytes(bytes(range(256)))
+    url = f"/api/files/raw?path={project_dir / 'data.bin'}"
+
+    res = await client.get(url, headers={**auth_headers, "Range": "bytes=10-19"})
+    assert res.status_code == 206
+    assert res.content == bytes(range(10, 20))
+    assert res.headers["content-range"] == "bytes 10-19/256"
+
+    res = await client.get(url, headers={**auth_headers, "Range": "bytes=-6"})
+    assert res.status_code == 206
+    assert res.content == bytes(range(250, 256))
+
+    res = await client.get(url, headers={**auth_headers, "Range": "bytes=999-"})
+    assert res.status_code == 416
+
+
+async def test_raw_file_if_range_mismatch_returns_full(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "data.bin").write_bytes(b"0123456789")
+    res = await client.get(
+        f"/api/files/raw?path={project_dir / 'data.bin'}",
+        headers={**auth_headers, "Range": "bytes=0-1", "If-Range": '"stale"'},
+    )
+    assert res.status_code == 200
+    assert res.content == b"0123456789"
+
+
+async def test_raw_file_body_matches_content_length_when_file_grows(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"first line\n")
+    request = Request({"type": "http", "method": "GET", "headers": [], "query_string": b""})
+    res = file_response(request, str(path), os.stat(path))
+    with open(path, "ab") as f:
+        f.write(b"appended after stat\n")
+    body = b"".join([chunk async for chunk in res.body_iterator])
+    assert res.headers["content-length"] == str(len(body))
+    assert body == b"first line\n"
+
+
+async def test_read_file_etag_304(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "a.txt").write_text("hello")
+    url = f"/api/files/content?path={project_dir / 'a.txt'}"
+
+    res = await client.get(url, headers=auth_headers)
+    etag = res.headers["etag"]
+    res = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert res.status_code == 304
+
+    (project_dir / "a.txt").write_text("changed!")
+    res = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["content"] == "changed!"
+
+
+async def test_read_image_returns_raw_url(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "pic.png").write_bytes(b"\x89PNG")
+    res = await client.get(
+        f"/api/files/content?path={project_dir / 'pic.png'}", headers=auth_headers
+    )
+    data = res.json()
+    assert data["type"] == "image"
+    assert data["content"] is None
+    assert data["url"].startswith("/api/files/raw?path=")
+
+
+# --- Large File Paging API ---
+
+
+async def test_read_lines_beyond_max_file_size(client, auth_headers, tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "MAX_FILE_SIZE", 10)
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    (project_dir / "big.log").write_text("".join(f"row {i}\n" for i in range(1000)))
+
+    res = await client.get(
+        f"/api/files/content?path={project_dir / 'big.log'}", headers=auth_headers
+    )
+    assert res.status_code == 413
+
+    res = await client.get(
+        f"/api/files/lines?path={project_dir / 'big.log'}&start=500&count=2&total=true",
+        headers=auth_headers,
+    )
+    assert res.status_code == 200
+    data = res.json()
+    assert data["lines"] == ["row 500", "row 501"]
+    assert data["total_lines"] == 1000
+
+
+async def test_tail_follow_api(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    log = project_dir / "app.log"
+    log.write_text("a\nb\nc\n")
+
+    res = await client.get(f"/api/files/tail?path={log}&lines=2", headers=auth_headers)
+    data = res.json()
+    assert data["lines"] == ["b", "c"]
+
+    with open(log, "a") as fh:
+        fh.write("d\n")
+    res = await client.get(
+        f"/api/files/tail?path={log}&since={data['offset']}", headers=auth_headers
+    )
+    assert res.json()["lines"] == ["d"]
+
+
+async def test_file_outline_api(client, auth_headers, tmp_path):
+    project_dir = await _create_project(client, auth_headers, tmp_path)
+    module = project_dir / "mod.py"
+    module.write_text("class A:\n    def b(self):\n        pass\n\n\ndef c():\n    pass\n")
+
+    res = await client.get(f"/api/files/outline?path={module}", headers=auth_headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["language"] == "python"
+    assert [(s["name"], s["line"], s["end_line"]) for s in data["symbols"]] == [
+        ("A", 1, 3),
+        ("c", 6, 7),
+    ]
+    assert data["symbols"][0]["children"][0]["kind"] == "method"
+
+    symbol = data["symbols"][1]
+    res = await client.get(
+        f"/api/files/lines?path={module}&start={symbol['line'] - 1}"
+        f"&count={symbol['end_line'] - symbol['line'] + 1}",
+        headers=auth_headers,
+    )
+    assert res.json()["lines"] == ["def c():", "    pass"]
+
+    res = await client.get(
+        f"/api/files/outline?path={project_dir / 'missing.py'}", headers=auth_headers
+    )
+    assert res.status_code == 404
@@ -0,0 +1,155 @@
+import gzip
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from backend import compress
+from backend.compress import (
+    CompressedCache,
+    CompressionMiddleware,
+    compress_bytes,
+    is_compressible,
+    negotiate,
+)
+
+BIG = "hello world " * 500
+
+
+def test_negotiate():
+    available = ("zstd", "br", "gzip")
+    assert negotiate("gzip, deflate, br, zstd", available) == "zstd"
+    assert negotiate("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert negotiate("br;q=0, gzip;q=0.1", available) == "gzip"
+    assert negotiate("identity", available) is None
+    assert negotiate("", available) is None
+    assert negotiate("*", ("gzip",)) == "gzip"
+    assert negotiate("zstd", ("gzip",)) is None
+
+
+def test_is_compressible():
+    assert is_compressible("application/json")
+    assert is_compressible("text/html; charset=utf-8")
+    assert not is_compressible("image/png")
+    assert not is_compressible("application/zip")
+
+
+def test_compress_bytes_gzip_roundtrip():
+    assert gzip.decompress(compress_bytes(BIG.encode(), "gzip")) == BIG.encode()
+
+
+@pytest.fixture
+def cache():
+    return CompressedCache()
+
+
+@pytest.fixture
+async def client(cache):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, cache=cache)
+
+    @app.get("/big")
+    async def big():
+        return PlainTextResponse(BIG)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/etag")
+    async def etag():
+        return PlainTextResponse(BIG, headers={"ETag": '"v1"', "Accept-Ranges": "bytes"})
+
+    @app.get("/png")
+    async def png():
+        return Response(b"\x89PNG" * 100, media_type="image/png")
+
+    @app.get("/partial")
+    async def partial():
+        return PlainTextResponse(BIG, status_code=206, headers={"Content-Range": "bytes 0-1/2"})
+
+    @app.get("/stream")
+    async def stream():
+        async def gen():
+            for i in range(3):
+                yield f"line {i} ".encode() * 100
+
+        return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def _get(client, path, encoding="gzip"):
+    return await client.get(path, headers={"Accept-Encoding": encoding})
+
+
+async def test_compresses_large_bodies(client):
+    res = await _get(client, "/big")
+    assert res.headers["content-encoding"] == "gzip"
+    assert int(res.headers["content-length"]) < len(BIG)
+    assert res.headers["vary"] == "Accept-Encoding"
+    assert res.text == BIG
+
+
+async def test_skips_small_uncompressible_and_partial(client):
+    for path in ["/small", "/png", "/partial"]:
+        res = await _get(client, path)
+        assert "content-encoding" not in res.headers, path
+
+
+async def test_identity_when_not_accepted(client):
+    res = await _get(client, "/big", "identity")
+    assert "content-encoding" not in res.headers
+    assert res.text == BIG
+
+
+async def test_etag_responses_are_cached(client, cache):
+    first = await _get(client, "/etag")
+    assert first.headers["etag"] == 'W/"v1"'
+    assert "accept-ranges" not in first.headers
+    second = await _get(client, "/etag")
+    assert second.text == first.text == BIG
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+async def test_streaming_responses_are_compressed_per_chunk(client):
+    res = await _get(client, "/stream")
+    assert res.headers["content-encoding"] == "gzip"
+    assert "content-length" not in res.headers
+    assert res.text == "".join(f"line {i} " * 100 for i in range(3))
+
+
+async def test_large_streams_compress_chunks_off_the_loop(client, monkeypatch):
+    monkeypatch.setattr(compress, "OFFLOAD_SIZE", 1000)
+    threads = []
+    chunk = compress._compress_chunk
+
+    def recording(c, body, more_body):
+        threads.append(threading.get_ident())
+        return chunk(c, body, more_body)
+
+    monkeypatch.setattr(compress, "_compress_chunk", recording)
+    res = await _get(client, "/stream")
+    assert res.text == "".join(f"line {i} " * 100 for i in range(3))
+    loop_thread = threading.get_ident()
+    # 첫 조각(700바이트)은 바로, 쌓인 양이 1000을 넘은 뒤로는 스레드에서 압축한다
+    assert threads[0] == loop_thread
+    assert all(t != loop_thread for t in threads[1:])
+    assert len(threads) == 4  # 세 조각 + 끝을 알리는 빈 조각
+
+
+def test_cache_evicts_by_size():
+    cache = CompressedCache(max_bytes=100)
+    cache.put(("a", "1", "gzip"), b"x" * 20)
+    cache.put(("b", "1", "gzip"), b"x" * 20)
+    for i in range(5):
+        cache.put((f"c{i}", "1", "gzip"), b"x" * 20)
+    assert cache.get(("a", "1", "gzip")) is None
+    assert cache.stats()["bytes"] <= 100
+    cache.put(("huge", "1", "gzip"), b"x" * 60)  # 전체의 1/4를 넘으면 담지 않는다
+    assert cache.get(("huge", "1", "gzip")) is None
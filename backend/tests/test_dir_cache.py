@@ -0,0 +1,105 @@
+import os
+import time
+
+import pytest
+
+from backend import inotify
+from backend.dir_cache import DirListingCache
+
+
+def _loader(calls):
+    def load(path):
+        calls.append(path)
+        return [{"name": n} for n in sorted(os.listdir(path))]
+
+    return load
+
+
+def _age(path, seconds=10):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def mtime_cache():
+    cache = DirListingCache(use_inotify=False)
+    yield cache
+    cache.close()
+
+
+def test_mtime_cache_hit(mtime_cache, tmp_path):
+    (tmp_path / "a.txt").write_text("")
+    _age(tmp_path)
+    calls = []
+    first = mtime_cache.get(str(tmp_path), _loader(calls))
+    second = mtime_cache.get(str(tmp_path), _loader(calls))
+    assert first == second == [{"name": "a.txt"}]
+    assert len(calls) == 1
+    stats = mtime_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_mtime_cache_detects_change(mtime_cache, tmp_path):
+    _age(tmp_path)
+    calls = []
+    mtime_cache.get(str(tmp_path), _loader(calls))
+    (tmp_path / "new.txt").write_text("")
+    assert mtime_cache.get(str(tmp_path), _loader(calls)) == [{"name": "new.txt"}]
+    assert len(calls) == 2
+
+
+def test_recently_modified_dir_is_not_trusted(mtime_cache, tmp_path):
+    calls = []
+    mtime_cache.get(str(tmp_path), _loader(calls))
+    mtime_cache.get(str(tmp_path), _loader(calls))
+    assert len(calls) == 2
+
+
+def test_invalidate_recursive(mtime_cache, tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    _age(sub)
+    _age(tmp_path)
+    calls = []
+    mtime_cache.get(str(tmp_path), _loader(calls))
+    mtime_cache.get(str(sub), _loader(calls))
+    mtime_cache.invalidate(str(tmp_path), recursive=True)
+    assert mtime_cache.stats()["dirs"] == 0
+
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    cache = DirListingCache(max_entries=3, use_inotify=False)
+    dirs = []
+    for name in ("a", "b", "c"):
+        d = tmp_path / name
+        d.mkdir()
+        (d / "f1").write_text("")
+        (d / "f2").write_text("")
+        dirs.append(str(d))
+    for d in dirs:
+        cache.get(d, _loader([]))
+    stats = cache.stats()
+    assert stats["entries"] <= 3
+    assert stats["evictions"] == 2
+
+
+@pytest.mark.skipif(not inotify.is_available(), reason="inotify not available")
+def test_inotify_cache_invalidation(tmp_path):
+    cache = DirListingCache(use_inotify=True)
+    try:
+        calls = []
+        cache.get(str(tmp_path), _loader(calls))
+        cache.get(str(tmp_path), _loader(calls))
+        assert len(calls) == 1  # watch가 있으면 최근 변경된 디렉터리도 신뢰
+
+        (tmp_path / "created.txt").write_text("")
+        for _ in range(50):
+            if cache.stats()["invalidations"]:
+                break
+            time.sleep(0.02)
+        assert cache.get(str(tmp_path), _loader(calls)) == [{"name": "created.txt"}]
+        assert len(calls) == 2
+    finally:
+        cache.close()
@@ -0,0 +1,25 @@
+import json
+
+from backend import fast_json
+from backend.fast_json import FastJSONResponse, dumps
+
+
+def test_dumps_matches_compact_json():
+    data = {"name": "한글", "items": [1, 2.5, None, True], "nested": {"a": "b"}}
+    assert json.loads(dumps(data)) == data
+    assert dumps(data) == json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def test_dumps_without_orjson(monkeypatch):
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'.encode()
+
+
+def test_non_string_keys_fall_back():
+    assert json.loads(dumps({1: "a"})) == {"1": "a"}
+
+
+def test_response_renders_bytes():
+    res = FastJSONResponse({"ok": True})
+    assert res.body == b'{"ok":true}'
+    assert res.media_type == "application/json"
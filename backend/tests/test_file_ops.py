@@ -0,0 +1,126 @@
+import os
+import shutil
+import socket
+import stat
+
+import pytest
+
+from backend import file_ops
+
+
+class _Progress:
+    def __init__(self, cancel_after_files=None):
+        self.files = 0
+        self.bytes = 0
+        self.cancel_after_files = cancel_after_files
+
+    def advance(self, files=0, nbytes=0):
+        self.files += files
+        self.bytes += nbytes
+
+    def check_cancelled(self):
+        if self.cancel_after_files is not None and self.files >= self.cancel_after_files:
+            raise RuntimeError("cancelled")
+
+
+def _make_tree(root):
+    (root / "sub" / "deep").mkdir(parents=True)
+    (root / "a.txt").write_text("hello")
+    (root / "sub" / "b.bin").write_bytes(os.urandom(3 * file_ops.COPY_CHUNK_SIZE // 2))
+    (root / "sub" / "deep" / "c.txt").write_text("c")
+    (root / "link").symlink_to("a.txt")
+
+
+def test_scan_tree(tmp_path):
+    _make_tree(tmp_path / "src")
+    files, nbytes = file_ops.scan_tree(str(tmp_path / "src"))
+    assert files == 4
+    assert nbytes >= 5 + 1 + 3 * file_ops.COPY_CHUNK_SIZE // 2
+
+
+def test_copy_tree(tmp_path):
+    src = tmp_path / "src"
+    _make_tree(src)
+    os.chmod(src / "a.txt", 0o600)
+    progress = _Progress()
+
+    file_ops.copy_tree(str(src), str(tmp_path / "dst"), progress)
+
+    dst = tmp_path / "dst"
+    assert (dst / "a.txt").read_text() == "hello"
+    assert (dst / "sub" / "b.bin").read_bytes() == (src / "sub" / "b.bin").read_bytes()
+    assert (dst / "sub" / "deep" / "c.txt").read_text() == "c"
+    assert os.readlink(dst / "link") == "a.txt"
+    assert (dst / "a.txt").stat().st_mode & 0o777 == 0o600
+    assert progress.files == 4
+    assert progress.bytes == file_ops.scan_tree(str(src))[1] - len("a.txt")
+
+
+def test_copy_tree_recreates_fifos_and_skips_sockets(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("a")
+    os.mkfifo(src / "pipe", 0o640)
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(str(src / "sock"))
+    try:
+        progress = _Progress()
+        skipped = file_ops.copy_tree(str(src), str(tmp_path / "dst"), progress)
+    finally:
+        sock.close()
+    dst = tmp_path / "dst"
+    assert skipped == [str(src / "sock")]
+    assert sorted(os.listdir(dst)) == ["a.txt", "pipe"]
+    assert stat.S_ISFIFO(os.lstat(dst / "pipe").st_mode)
+    assert progress.files == 3
+
+
+def test_copy_single_fifo_is_refused_without_blocking(tmp_path):
+    os.mkfifo(tmp_path / "pipe")
+    with pytest.raises(shutil.SpecialFileError):
+        file_ops.copy_file(str(tmp_path / "pipe"), str(tmp_path / "copy"), _Progress())
+    assert not (tmp_path / "copy").exists()
+
+
+def test_copy_single_file_without_copy_file_range(tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "copy_file_range", raising=False)
+    monkeypatch.setattr(file_ops, "_reflink", lambda *a: False)
+    data = os.urandom(file_ops.COPY_CHUNK_SIZE + 10)
+    (tmp_path / "f").write_bytes(data)
+    progress = _Progress()
+
+    file_ops.copy_tree(str(tmp_path / "f"), str(tmp_path / "g"), progress)
+
+    assert (tmp_path / "g").read_bytes() == data
+    assert (progress.files, progress.bytes) == (1, len(data))
+
+
+def test_copy_does_not_overwrite(tmp_path):
+    (tmp_path / "f").write_text("new")
+    (tmp_path / "g").write_text("old")
+    with pytest.raises(FileExistsError):
+        file_ops.copy_tree(str(tmp_path / "f"), str(tmp_path / "g"), _Progress())
+    assert (tmp_path / "g").read_text() == "old"
+
+
+def test_cancelled_copy_removes_partial_target(tmp_path):
+    _make_tree(tmp_path / "src")
+    with pytest.raises(RuntimeError):
+        file_ops.copy_tree(str(tmp_path / "src"), str(tmp_path / "dst"), _Progress(1))
+    assert not (tmp_path / "dst").exists()
+
+
+def test_remove_tree_keeps_symlink_targets(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    victim = tmp_path / "victim"
+    _make_tree(victim)
+    (victim / "dirlink").symlink_to(outside)
+    progress = _Progress()
+
+    file_ops.remove_tree(str(victim), progress)
+
+    assert not victim.exists()
+    assert (outside / "keep.txt").read_text() == "keep"
+    assert progress.files == 5
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from backend import fs_events, inotify
+from backend.fs_events import CREATED, DELETED, MODIFIED, FsEventHub, ProjectWatcher, merge_change
+
+DEBOUNCE_WAIT = fs_events.DEBOUNCE_SECONDS * 3
+
+
+def test_merge_create_then_modify_stays_created():
+    pending = {}
+    merge_change(pending, "/p/a", CREATED, False)
+    merge_change(pending, "/p/a", MODIFIED, False)
+    assert pending == {"/p/a": [CREATED, False]}
+
+
+def test_merge_create_then_delete_cancels():
+    pending = {}
+    merge_change(pending, "/p/a", CREATED, False)
+    merge_change(pending, "/p/a", DELETED, False)
+    assert pending == {}
+
+
+def test_merge_delete_then_create_is_modify():
+    pending = {}
+    merge_change(pending, "/p/a", DELETED, False)
+    merge_change(pending, "/p/a", CREATED, False)
+    assert pending == {"/p/a": [MODIFIED, False]}
+
+
+def _collect(root, use_inotify):
+    batches = []
+    got = threading.Event()
+
+    def on_batch(changes):
+        batches.append(changes)
+        got.set()
+
+    watcher = ProjectWatcher(str(root), on_batch, lambda: None, use_inotify=use_inotify)
+    return watcher, batches, got
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.mark.skipif(not inotify.is_available(), reason="inotify not available")
+def test_inotify_watcher_batches_and_filters(tmp_path):
+    (tmp_path / "sub").mkdir()
+    watcher, batches, _ = _collect(tmp_path, use_inotify=True)
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        (tmp_path / "sub" / "a.txt").write_text("1")
+        (tmp_path / "sub" / "a.txt").write_text("2")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "b.swp").write_text("")
+
+        def seen():
+            return {c[1] for b in batches for c in b}
+
+        assert _wait_for(lambda: str(tmp_path / "sub" / "a.txt") in seen())
+        time.sleep(DEBOUNCE_WAIT)
+        all_changes = [c for b in batches for c in b]
+        paths = [c[1] for c in all_changes]
+        assert paths.count(str(tmp_path / "sub" / "a.txt")) == 1
+        assert str(tmp_path / "node_modules") not in paths
+        assert str(tmp_path / "b.swp") not in paths
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(not inotify.is_available(), reason="inotify not available")
+def test_inotify_watcher_follows_new_directories(tmp_path):
+    watcher, batches, _ = _collect(tmp_path, use_inotify=True)
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        (tmp_path / "newdir").mkdir()
+        time.sleep(0.1)
+        (tmp_path / "newdir" / "inner.txt").write_text("x")
+        assert _wait_for(
+            lambda: any(c[1] == str(tmp_path / "newdir" / "inner.txt") for b in batches for c in b)
+        )
+    finally:
+        watcher.stop()
+
+
+def test_poll_watcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(fs_events, "POLL_INTERVAL", 0.1)
+    (tmp_path / "old.txt").write_text("")
+    watcher, batches, _ = _collect(tmp_path, use_inotify=False)
+    watcher.start()
+    try:
+        time.sleep(0.2)
+        (tmp_path / "new.txt").write_text("")
+        (tmp_path / "old.txt").unlink()
+        assert _wait_for(lambda: len({c[1] for b in batches for c in b}) >= 2)
+        changes = {c[1]: c[0] for b in batches for c in b}
+        assert changes[str(tmp_path / "new.txt")] == CREATED
+        assert changes[str(tmp_path / "old.txt")] == DELETED
+    finally:
+        watcher.stop()
+
+
+async def test_hub_delivers_to_subscribers(tmp_path, monkeypatch):
+    monkeypatch.setattr(fs_events, "POLL_INTERVAL", 0.1)
+    monkeypatch.setattr(fs_events.inotify, "is_available", lambda: False)
+    hub = FsEventHub()
+    q1 = hub.subscribe("proj_1", str(tmp_path))
+    q2 = hub.subscribe("proj_1", str(tmp_path))
+    try:
+        await asyncio.sleep(0.2)
+        (tmp_path / "x.txt").write_text("")
+        m1 = await asyncio.wait_for(q1.get(), timeout=5)
+        m2 = await asyncio.wait_for(q2.get(), timeout=5)
+        assert m1 == m2
+        assert m1["type"] == "changes"
+        assert m1["changes"] == [[CREATED, str(tmp_path / "x.txt"), False]]
+    finally:
+        hub.unsubscribe("proj_1", q1)
+        assert hub.subscriber_count("proj_1") == 1
+        hub.unsubscribe("proj_1", q2)
+        assert hub.subscriber_count("proj_1") == 0
+        hub.shutdown()
+
+
+async def test_last_unsubscribe_does_not_block_the_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(fs_events.inotify, "is_available", lambda: False)
+    hub = FsEventHub()
+    queue = hub.subscribe("proj_1", str(tmp_path))
+    thread = hub._watchers[os.path.normpath(str(tmp_path))]._thread
+    await asyncio.sleep(0.1)
+
+    start = time.perf_counter()
+    hub.unsubscribe("proj_1", queue)
+    assert time.perf_counter() - start < 0.05
+    # 감시 스레드는 멈추라는 신호만 받고 스스로 끝난다
+    assert await asyncio.to_thread(_wait_for, lambda: not thread.is_alive())
+    hub.shutdown()
+
+
+async def test_listener_shares_the_subscribers_watcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(fs_events, "POLL_INTERVAL", 0.1)
+    hub = FsEventHub(use_inotify=False)
+    queue = hub.subscribe("proj_1", str(tmp_path))
+    batches = []
+    listener = hub.listen(str(tmp_path), batches.append, lambda: None)
+    try:
+        assert hub.watcher_count() == 1
+        await asyncio.sleep(0.2)
+        (tmp_path / "x.txt").write_text("")
+        message = await asyncio.wait_for(queue.get(), timeout=5)
+        assert await asyncio.to_thread(_wait_for, lambda: batches)
+        assert batches[0] == message["changes"]
+    finally:
+        hub.unlisten(listener)
+        assert hub.watcher_count() == 1
+        hub.unsubscribe("proj_1", queue)
+        assert hub.watcher_count() == 0
+        hub.shutdown()
+
+
+async def test_full_queue_collapses_to_overflow(monkeypatch):
+    monkeypatch.setattr(fs_events, "SUBSCRIBER_QUEUE_MAX", 2)
+    sub = fs_events._Subscriber(asyncio.get_running_loop(), "proj_1")
+    for i in range(3):
+        sub.push({"type": "changes", "project_id": "proj_1", "changes": [[CREATED, str(i), False]]})
+    assert sub.queue.qsize() == 1
+    assert sub.queue.get_nowait() == {"type": "overflow", "project_id": "proj_1"}
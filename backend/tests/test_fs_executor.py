@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend import fs_executor
+from backend.fs_executor import client_key, current_client, fs_metrics, run_fs
+
+
+@pytest.fixture(autouse=True)
+def reset_stats(monkeypatch):
+    monkeypatch.setattr(fs_executor, "_stats", {})
+    monkeypatch.setattr(fs_executor, "_slots", fs_executor._ClientSlots())
+    yield
+    fs_executor.shutdown_fs_executor()
+
+
+async def test_run_fs_runs_off_loop_thread():
+    loop_thread = threading.get_ident()
+    worker_thread = await run_fs("stat", threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+async def test_run_fs_records_metrics():
+    await run_fs("read", lambda: None)
+    with pytest.raises(ValueError):
+        await run_fs("read", lambda: (_ for _ in ()).throw(ValueError("boom")))
+
+    ops = fs_metrics()["ops"]
+    assert ops["read"]["count"] == 2
+    assert ops["read"]["errors"] == 1
+    assert ops["read"]["in_flight"] == 0
+
+
+async def test_queued_call_that_times_out_does_not_leak_in_flight(monkeypatch):
+    monkeypatch.setitem(
+        fs_executor.PRIORITY_CLASSES, "metadata",
+        fs_executor.PriorityClass(workers=1, per_client=None),
+    )
+    fs_executor.shutdown_fs_executor()
+    release = threading.Event()
+    blocker = asyncio.create_task(run_fs("stat", release.wait, 5))
+    await asyncio.sleep(0.05)
+    # 유일한 워커가 막혀 있으니 큐에서 기다리다 취소된다 — _timed는 불리지 않는다
+    with pytest.raises(HTTPException):
+        await run_fs("stat", lambda: None, timeout=0.05)
+    release.set()
+    await blocker
+    assert fs_metrics()["ops"]["stat"]["in_flight"] == 0
+
+
+async def test_run_fs_http_exception_is_not_an_error():
+    def not_found():
+        raise HTTPException(status_code=404, detail="nope")
+
+    with pytest.raises(HTTPException):
+        await run_fs("stat", not_found)
+    assert fs_metrics()["ops"]["stat"]["errors"] == 0
+
+
+async def test_run_fs_timeout():
+    with pytest.raises(HTTPException) as exc:
+        await run_fs("copy", time.sleep, 0.5, timeout=0.05)
+    assert exc.value.status_code == 504
+    assert fs_metrics()["ops"]["copy"]["timeouts"] == 1
+
+
+async def test_loop_stays_responsive_during_slow_fs_work():
+    """블로킹 파일 작업이 도는 동안에도 이벤트 루프가 계속 스케줄링되어야 한다."""
+    task = asyncio.create_task(run_fs("copy", time.sleep, 0.5))
+    worst = 0.0
+    while not task.done():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - start)
+    await task
+    assert worst < 0.2
+
+
+async def _run_as(client: str, op: str, func, *args, **kwargs):
+    current_client.set(client)
+    return await run_fs(op, func, *args, **kwargs)
+
+
+async def test_ops_run_in_their_priority_class_pool():
+    def name():
+        return threading.current_thread().name
+
+    assert (await run_fs("pty", name)).startswith("fs-interactive")
+    assert (await run_fs("list", name)).startswith("fs-metadata")
+    assert (await run_fs("upload", name)).startswith("fs-bulk")
+    assert (await run_fs("unknown-op", name)).startswith("fs-metadata")
+
+
+async def test_interactive_is_not_queued_behind_saturated_pools():
+    release = threading.Event()
+    busy = [
+        asyncio.create_task(_run_as(f"c{i}", op, release.wait, 5))
+        for i in range(6)
+        for op in ("upload", "list")
+    ]
+    await asyncio.sleep(0.05)
+    try:
+        start = time.perf_counter()
+        await run_fs("pty", lambda: None)
+        assert time.perf_counter() - start < 0.1
+    finally:
+        release.set()
+        await asyncio.gather(*busy)
+
+
+async def test_per_client_limit_keeps_other_clients_moving():
+    release = threading.Event()
+    hog = [asyncio.create_task(_run_as("phone", "upload", release.wait, 5)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    bulk = fs_metrics()["classes"]["bulk"]
+    assert (bulk["running"], bulk["queued"], bulk["clients"]) == (1, 2, 1)
+    try:
+        # phone가 bulk 워커를 하나만 쓰므로 laptop은 남은 워커에서 바로 실행된다
+        start = time.perf_counter()
+        await _run_as("laptop", "upload", lambda: None)
+        assert time.perf_counter() - start < 0.1
+    finally:
+        release.set()
+        await asyncio.gather(*hog)
+    assert fs_metrics()["classes"]["bulk"]["running"] == 0
+
+
+async def test_timed_out_waiter_gives_up_its_place():
+    release = threading.Event()
+    holder = asyncio.create_task(_run_as("phone", "upload", release.wait, 5))
+    await asyncio.sleep(0.05)
+    with pytest.raises(HTTPException) as exc:
+        await _run_as("phone", "upload", lambda: None, timeout=0.05)
+    assert exc.value.status_code == 504
+    assert fs_metrics()["classes"]["bulk"]["queued"] == 0
+    release.set()
+    await holder
+    assert await _run_as("phone", "upload", lambda: "ok") == "ok"
+    assert fs_metrics()["classes"]["bulk"]["running"] == 0
+
+
+async def test_slot_is_held_until_timed_out_work_finishes():
+    task = asyncio.create_task(_run_as("phone", "upload", time.sleep, 0.3, timeout=0.05))
+    with pytest.raises(HTTPException):
+        await task
+    # 스레드는 아직 자고 있다 — 같은 클라이언트의 다음 bulk 작업은 그 뒤에 실행된다
+    assert fs_metrics()["classes"]["bulk"]["running"] == 1
+    start = time.perf_counter()
+    await _run_as("phone", "upload", lambda: None)
+    assert time.perf_counter() - start > 0.15
+
+
+def test_client_key_prefers_token_over_address():
+    def scope(headers=(), query=b"", host="10.0.0.1"):
+        return {"headers": list(headers), "query_string": query, "client": (host, 1234)}
+
+    a = client_key(scope([(b"authorization", b"Bearer aaa")]))
+    b = client_key(scope([(b"authorization", b"Bearer bbb")]))
+    assert a != b
+    assert a == client_key(scope([(b"authorization", b"Bearer aaa")], host="10.0.0.2"))
+    assert client_key(scope(query=b"x=1&token=aaa")) != client_key(scope(query=b"token=bbb"))
+    assert client_key(scope()) == "10.0.0.1"
@@ -0,0 +1,215 @@
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+from backend import git_status
+from backend.fs_events import FsEventHub
+from backend.git_status import GitSnapshot, GitStatus, parse_diff_hunks, parse_porcelain_v2
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_parse_porcelain_v2():
+    out = b"\0".join([
+        b"# branch.oid 0123",
+        b"# branch.head main",
+        b"1 .M N... 100644 100644 100644 aaa bbb src/a file.py",
+        b"1 A. N... 000000 100644 100644 000 ccc added.py",
+        b"2 R. N... 100644 100644 100644 ddd ddd R100 new name.py",
+        b"old name.py",
+        b"u UU N... 100644 100644 100644 100644 e f g conflict.py",
+        b"? notes/",
+        b"? loose.txt",
+        b"",
+    ])
+    branch, files = parse_porcelain_v2(out)
+    assert branch == "main"
+    assert files == {
+        "src/a file.py": "M",
+        "added.py": "A",
+        "new name.py": "R",
+        "conflict.py": "U",
+        "notes/": "?",
+        "loose.txt": "?",
+    }
+    assert parse_porcelain_v2(b"# branch.head (detached)\0")[0] is None
+
+
+def test_parse_diff_hunks():
+    text = "\n".join([
+        "diff --git a.py a.py",
+        "--- a.py",
+        "+++ a.py",
+        "@@ -1,2 +1,3 @@ def f():",
+        " x",
+        "-y",
+        "+y2",
+        "+z",
+        "@@ -10 +11 @@",
+        "-old",
+        "+new",
+        "\\ No newline at end of file",
+    ])
+    hunks = parse_diff_hunks(text)
+    assert [(h["old_start"], h["old_lines"], h["new_start"], h["new_lines"]) for h in hunks] == [
+        (1, 2, 1, 3),
+        (10, 1, 11, 1),
+    ]
+    assert hunks[0]["header"] == "def f():"
+    assert hunks[0]["lines"] == [" x", "-y", "+y2", "+z"]
+    assert hunks[1]["lines"][-1].startswith("\\")
+
+
+def test_snapshot_annotates_without_mutating(tmp_path):
+    root = str(tmp_path)
+    files = {
+        os.path.join(root, "src", "pkg", "a.py"): "M",
+        os.path.join(root, "docs", "new.md"): "?",
+        os.path.join(root, "scratch"): "?",
+    }
+    snap = GitSnapshot(
+        "main", files, git_status._aggregate_dirs(files, root),
+        frozenset({os.path.join(root, "scratch")}),
+    )
+    entries = [
+        {"name": "src", "is_dir": True},
+        {"name": "docs", "is_dir": True},
+        {"name": "scratch", "is_dir": True},
+        {"name": "README.md", "is_dir": False},
+    ]
+    annotated = snap.annotate(root, entries)
+    assert [e.get("git") for e in annotated] == ["M", "?", "?", None]
+    assert "git" not in entries[0]
+    inner = snap.annotate(os.path.join(root, "scratch"), [{"name": "x", "is_dir": False}])
+    assert inner[0]["git"] == "?"
+    assert snap.dirs[root] == "M"
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.py").write_text("a = 1\n")
+    (root / "b.py").write_text("b = 1\n")
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "add", ".")
+    _git(root, "commit", "-qm", "init")
+    return root
+
+
+@pytest.fixture
+def status(repo, monkeypatch):
+    monkeypatch.setattr(git_status, "REFRESH_DEBOUNCE", 0.05)
+    monkeypatch.setattr(git_status, "INDEX_CHECK_INTERVAL", 0.0)
+    hub = FsEventHub(use_inotify=False)
+    s = GitStatus(str(repo), hub)
+    s.start()
+    assert s.wait_ready(10)
+    yield s
+    s.close()
+    hub.shutdown()
+
+
+def test_clean_repo(status):
+    data = status.status()
+    assert data["state"] == "ready"
+    assert data["branch"] == "main"
+    assert data["files"] == {}
+
+
+def test_worktree_change_is_applied_incrementally(repo, status):
+    (repo / "src" / "a.py").write_text("a = 2\n")
+    path = str(repo / "src" / "a.py")
+    assert _wait_for(lambda: status.snapshot().files.get(path) == "M")
+    assert status.stats()["incremental_refreshes"] >= 1
+    assert status.snapshot().dirs[str(repo / "src")] == "M"
+
+
+def test_commit_is_noticed_from_index(repo, status):
+    (repo / "b.py").write_text("b = 2\n")
+    assert _wait_for(lambda: status.snapshot().files)
+    _git(repo, "commit", "-qam", "second")
+    assert _wait_for(lambda: not status.snapshot().files)
+
+
+def test_diff_for_tracked_and_untracked(repo, status):
+    (repo / "b.py").write_text("b = 2\n")
+    (repo / "new.txt").write_text("hello\n")
+    assert _wait_for(lambda: len(status.snapshot().files) == 2)
+    diff = status.diff(str(repo / "b.py"))
+    assert diff["status"] == "M"
+    assert diff["hunks"][0]["lines"] == ["-b = 1", "+b = 2"]
+    diff = status.diff(str(repo / "new.txt"))
+    assert diff["status"] == "?"
+    assert diff["hunks"][0]["lines"] == ["+hello"]
+
+
+def test_watches_through_the_shared_hub(repo):
+    hub = FsEventHub(use_inotify=False)
+    s = GitStatus(str(repo), hub)
+    s.start()
+    try:
+        assert s.wait_ready(10)
+        assert hub.watcher_count() == 1
+    finally:
+        s.close()
+    assert hub.watcher_count() == 0
+    hub.shutdown()
+
+
+def test_diff_does_not_wait_for_first_status(repo, monkeypatch):
+    (repo / "b.py").write_text("b = 2\n")
+    (repo / "new.txt").write_text("hello\n")
+    release = threading.Event()
+    refresh_full = GitStatus._refresh_full
+
+    def slow_refresh_full(self):
+        release.wait(10)
+        refresh_full(self)
+
+    monkeypatch.setattr(GitStatus, "_refresh_full", slow_refresh_full)
+    hub = FsEventHub(use_inotify=False)
+    s = GitStatus(str(repo), hub)
+    s.start()
+    try:
+        start = time.monotonic()
+        assert s.diff(str(repo / "b.py"))["status"] == "M"
+        diff = s.diff(str(repo / "new.txt"))
+        assert time.monotonic() - start < 5
+        assert not s.wait_ready(0)
+        assert diff["status"] == "?"
+        assert diff["hunks"][0]["lines"] == ["+hello"]
+    finally:
+        release.set()
+        s.close()
+        hub.shutdown()
+
+
+def test_not_a_repo(tmp_path):
+    hub = FsEventHub(use_inotify=False)
+    s = GitStatus(str(tmp_path), hub)
+    s.start()
+    assert s.wait_ready(10)
+    assert s.state == "none"
+    assert s.snapshot().annotate(str(tmp_path), [{"name": "a", "is_dir": False}]) == [
+        {"name": "a", "is_dir": False}
+    ]
+    assert hub.watcher_count() == 0
+    s.close()
@@ -0,0 +1,71 @@
+import re
+
+import pytest
+
+from backend.gitignore import IgnoreRules, IgnoreRulesCache, IgnoreStack, compile_pattern
+
+
+def test_basic_patterns():
+    rules = IgnoreRules(
+        ["# comment", "*.log", "!keep.log", "build/", "/top.txt", "docs/**/*.md", "[!a]b.py"]
+    )
+    assert rules.match("x.log", False) is True
+    assert rules.match("sub/x.log", False) is True
+    assert rules.match("sub/keep.log", False) is False
+    assert rules.match("build", True) is True
+    assert rules.match("build", False) is None  # 디렉터리 전용
+    assert rules.match("top.txt", False) is True
+    assert rules.match("sub/top.txt", False) is None
+    assert rules.match("docs/a/b/c.md", False) is True
+    assert rules.match("docs/c.md", False) is True
+    assert rules.match("cb.py", False) is True
+    assert rules.match("ab.py", False) is None
+
+
+def test_invalid_patterns_are_dropped():
+    for bad in ["[z-a]", "**/[!]"]:
+        with pytest.raises(re.error):
+            compile_pattern(bad)
+    rules = IgnoreRules(["[z-a]", "*.log", "**/[!]"])
+    assert len(rules.rules) == 1
+    assert rules.match("x.log", False) is True
+    assert rules.match("z", False) is None
+
+
+def test_stack_nested_overrides(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.tmp\n")
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / ".gitignore").write_text("!important.tmp\n")
+
+    stack = IgnoreStack(str(tmp_path)).child(str(tmp_path))
+    assert stack.is_ignored(str(tmp_path / "a.tmp"), False)
+    sub_stack = stack.child(str(sub))
+    assert sub_stack.is_ignored(str(sub / "other.tmp"), False)
+    assert not sub_stack.is_ignored(str(sub / "important.tmp"), False)
+    assert not sub_stack.is_ignored(str(sub / "a.py"), False)
+
+
+def test_rules_cache_recompiles_on_change(tmp_path):
+    cache = IgnoreRulesCache(ttl=0)
+    path = str(tmp_path / ".gitignore")
+    assert not cache.get(path)  # 없는 파일은 빈 규칙
+
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    rules = cache.get(path)
+    assert rules.match("a.log", False) is True
+    assert cache.get(path) is rules  # 바뀌지 않았으면 다시 컴파일하지 않는다
+    assert cache.stats()["compiles"] == 1
+
+    (tmp_path / ".gitignore").write_text("*.tmp\n*.bak\n")
+    rules = cache.get(path)
+    assert rules.match("a.log", False) is None
+    assert rules.match("a.bak", False) is True
+
+
+def test_overrides_win_over_layers(tmp_path):
+    (tmp_path / ".gitignore").write_text(".env\n")
+    overrides = IgnoreRules(["!.env", "data/"])
+    stack = IgnoreStack(str(tmp_path), overrides=overrides).child(str(tmp_path))
+    assert not stack.is_ignored(str(tmp_path / ".env"), False)
+    assert stack.is_ignored(str(tmp_path / "data"), True)
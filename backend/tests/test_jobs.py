@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from backend.jobs import JobManager
+
+
+@pytest.fixture
+def manager():
+    m = JobManager(max_workers=1)
+    yield m
+    m.shutdown()
+
+
+async def test_job_completes_with_result(manager):
+    def work(job):
+        job.set_totals(2, 20)
+        job.advance(files=1, nbytes=10)
+        job.advance(files=1, nbytes=10)
+        return {"ok": True}
+
+    job = await manager.wait(manager.submit("copy", {}, work).id)
+    data = job.to_dict()
+    assert data["status"] == "completed"
+    assert data["result"] == {"ok": True}
+    assert (data["files_done"], data["bytes_done"]) == (2, 20)
+    assert data["finished_at"] is not None
+
+
+async def test_job_progress_is_streamed(manager, monkeypatch):
+    monkeypatch.setattr("backend.jobs.PROGRESS_INTERVAL", 0)
+    release = threading.Event()
+
+    def work(job):
+        release.wait(5)
+        for _ in range(3):
+            job.advance(files=1)
+
+    job = manager.submit("copy", {}, work)
+    queue = manager.subscribe(job.id)
+    release.set()
+    messages = []
+    while (msg := await queue.get()) is not None:
+        messages.append(msg)
+    manager.unsubscribe(job.id, queue)
+    assert [m["files_done"] for m in messages if m["status"] == "running"][-1] == 3
+    assert messages[-1]["status"] == "completed"
+
+
+async def test_cancel_running_job(manager):
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+
+    job = manager.submit("delete", {}, work)
+    started.wait(5)
+    manager.cancel(job.id)
+    assert (await manager.wait(job.id)).status == "cancelled"
+
+
+async def test_cancel_queued_job_never_runs(manager):
+    release = threading.Event()
+    ran = []
+    blocker = manager.submit("copy", {}, lambda job: release.wait(5))
+    queued = manager.submit("copy", {}, lambda job: ran.append(1))
+    manager.cancel(queued.id)
+    release.set()
+    await manager.wait(blocker.id)
+    assert (await manager.wait(queued.id)).status == "cancelled"
+    assert ran == []
+
+
+async def test_failed_job_records_status(manager):
+    def missing(job):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    def denied(job):
+        raise PermissionError
+
+    job = await manager.wait(manager.submit("copy", {}, missing).id)
+    assert (job.status, job.error, job.error_status) == ("failed", "Not found", 404)
+    job = await manager.wait(manager.submit("copy", {}, denied).id)
+    assert (job.status, job.error_status) == ("failed", 403)
+    assert manager.stats()["jobs"] == {"failed": 2}
+
+
+def test_unknown_job(manager):
+    with pytest.raises(HTTPException) as exc:
+        manager.get("nope")
+    assert exc.value.status_code == 404
@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+from backend import line_index
+from backend.line_index import LineReader
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # 여러 블록에 걸치는 경우를 작은 파일로 재현
+    monkeypatch.setattr(line_index, "BLOCK_SIZE", 16)
+
+
+def _write_lines(path, n):
+    path.write_text("".join(f"line {i}\n" for i in range(n)))
+
+
+def test_read_lines_range(tmp_path, small_blocks):
+    f = tmp_path / "log.txt"
+    _write_lines(f, 100)
+    reader = LineReader()
+    res = reader.read_lines(str(f), 42, 3)
+    assert res["lines"] == ["line 42", "line 43", "line 44"]
+    assert res["complete"] is False
+    assert res["total_lines"] is None
+
+
+def test_read_lines_total(tmp_path, small_blocks):
+    f = tmp_path / "log.txt"
+    _write_lines(f, 100)
+    res = LineReader().read_lines(str(f), 98, 10, with_total=True)
+    assert res["lines"] == ["line 98", "line 99"]
+    assert res["total_lines"] == 100
+    assert res["complete"] is True
+
+
+def test_read_lines_without_trailing_newline(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("a\nb\nc")
+    res = LineReader().read_lines(str(f), 0, 10, with_total=True)
+    assert res["lines"] == ["a", "b", "c"]
+    assert res["total_lines"] == 3
+
+
+def test_read_lines_past_end(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("a\n")
+    assert LineReader().read_lines(str(f), 5, 10)["lines"] == []
+
+
+def test_index_extends_when_file_grows(tmp_path, small_blocks):
+    f = tmp_path / "log.txt"
+    _write_lines(f, 10)
+    reader = LineReader()
+    assert reader.read_lines(str(f), 0, 1, with_total=True)["total_lines"] == 10
+    with open(f, "a") as fh:
+        fh.write("line 10\nline 11\n")
+    res = reader.read_lines(str(f), 11, 1, with_total=True)
+    assert res["lines"] == ["line 11"]
+    assert res["total_lines"] == 12
+
+
+def test_index_resets_when_file_rewritten(tmp_path, small_blocks):
+    f = tmp_path / "log.txt"
+    _write_lines(f, 50)
+    reader = LineReader()
+    reader.read_lines(str(f), 0, 1, with_total=True)
+    with open(f, "w") as fh:  # 같은 inode로 잘라서 다시 씀
+        fh.write("".join(f"new {i}\n" for i in range(60)))
+    res = reader.read_lines(str(f), 55, 1, with_total=True)
+    assert res["lines"] == ["new 55"]
+    assert res["total_lines"] == 60
+
+
+def test_long_line_is_truncated(tmp_path, monkeypatch):
+    monkeypatch.setattr(line_index, "MAX_LINE_BYTES", 8)
+    f = tmp_path / "a.txt"
+    f.write_text("x" * 100 + "\nshort\n")
+    assert LineReader().read_lines(str(f), 0, 2)["lines"] == ["x" * 8, "short"]
+
+
+def test_tail_and_follow(tmp_path):
+    f = tmp_path / "app.log"
+    _write_lines(f, 20)
+    reader = LineReader()
+    res = reader.tail(str(f), 3)
+    assert res["lines"] == ["line 17", "line 18", "line 19"]
+
+    with open(f, "a") as fh:
+        fh.write("line 20\npartial")
+    res = reader.follow(str(f), res["offset"])
+    assert res["lines"] == ["line 20"]
+    assert res["reset"] is False
+
+    with open(f, "a") as fh:
+        fh.write(" done\n")
+    res = reader.follow(str(f), res["offset"])
+    assert res["lines"] == ["partial done"]
+
+
+def test_follow_after_truncate(tmp_path):
+    f = tmp_path / "app.log"
+    _write_lines(f, 20)
+    offset = LineReader().tail(str(f), 1)["offset"]
+    f.write_text("fresh\n")
+    res = LineReader().follow(str(f), offset)
+    assert res["reset"] is True
+    assert res["lines"] == ["fresh"]
+
+
+def test_tail_fewer_lines_than_requested(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("one\ntwo\n")
+    assert LineReader().tail(str(f), 10)["lines"] == ["one", "two"]
+
+
+@pytest.mark.parametrize("method, args", [
+    ("read_lines", (0, 10, True)),
+    ("read_lines", (40, 5)),
+    ("tail", (5,)),
+    ("follow", (0,)),
+])
+def test_truncate_while_reading(tmp_path, small_blocks, monkeypatch, method, args):
+    # fstat 직후 copytruncate로 잘린 경우 — 프로세스가 죽지 않고 읽은 만큼만 돌려준다
+    f = tmp_path / "app.log"
+    _write_lines(f, 50)
+    real_pread = line_index._pread
+
+    def truncating_pread(fd, start, end):
+        os.truncate(f, 0)
+        return real_pread(fd, start, end)
+
+    monkeypatch.setattr(line_index, "_pread", truncating_pread)
+    res = getattr(LineReader(), method)(str(f), *args)
+    assert res["lines"] == []
+
+
+def test_tail_spans_scan_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(line_index, "SCAN_CHUNK", 7)
+    f = tmp_path / "app.log"
+    _write_lines(f, 30)
+    assert LineReader().tail(str(f), 3)["lines"] == ["line 27", "line 28", "line 29"]
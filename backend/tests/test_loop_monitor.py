@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from backend.loop_monitor import LoopMonitor, LoopMonitorMiddleware
+
+
+def block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+async def test_records_lag_percentiles():
+    monitor = LoopMonitor(interval=0.01, threshold=1.0)
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+    lag = monitor.lag()
+    assert lag["samples"] > 0
+    assert lag["p50_ms"] <= lag["p99_ms"] <= lag["max_ms"]
+    assert monitor.healthy()
+    assert not monitor.running
+
+
+async def test_captures_stack_of_blocking_call():
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    await monitor.start()
+    request_id = monitor.request_started("GET", "/api/slow")
+    try:
+        await asyncio.sleep(0.03)
+        block_the_loop(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.request_finished(request_id)
+        await monitor.stop()
+
+    stats = monitor.stats()
+    assert stats["stalls"] == 1
+    stall = stats["recent_stalls"][0]
+    assert any("block_the_loop" in line for line in stall["stack"])
+    assert stall["requests"][0]["path"] == "/api/slow"
+    # 루프가 다시 돈 뒤 실제로 멈춰 있던 시간으로 갱신된다
+    assert stall["lag_ms"] >= 250
+    assert stats["max_lag_ms"] >= 250
+    assert stats["inflight"] == []
+
+
+async def test_middleware_tracks_inflight_requests():
+    monitor = LoopMonitor()
+    app = FastAPI()
+    app.add_middleware(LoopMonitorMiddleware, monitor=monitor)
+    seen = []
+
+    @app.get("/work")
+    async def work():
+        seen.extend(monitor.inflight())
+        return {}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/work")
+    assert [(r["method"], r["path"]) for r in seen] == [("GET", "/work")]
+    assert monitor.inflight() == []
@@ -0,0 +1,176 @@
+import os
+
+from backend.outline import OutlineCache, mask_code, outline
+
+
+def _flat(symbols, depth=0):
+    for s in symbols:
+        yield depth, s["kind"], s["name"], s["line"], s["end_line"]
+        yield from _flat(s["children"], depth + 1)
+
+
+def test_python_nested_definitions():
+    text = (
+        "import os\n"
+        "try:\n"
+        "    import fast\n"
+        "except ImportError:\n"
+        "    def fast():\n"
+        "        pass\n"
+        "class A:\n"
+        "    @property\n"
+        "    def b(self):\n"
+        "        def inner():\n"
+        "            pass\n"
+        "        return 1\n"
+        "async def c():\n"
+        "    pass\n"
+    )
+    assert list(_flat(outline(text, "python"))) == [
+        (0, "function", "fast", 5, 6),
+        (0, "class", "A", 7, 12),
+        (1, "method", "b", 9, 12),
+        (2, "function", "inner", 10, 11),
+        (0, "function", "c", 13, 14),
+    ]
+
+
+def test_python_syntax_error_falls_back_to_indentation():
+    text = "class A:\n    def b(self):\n        return (\n\ndef c(:\n    pass\n"
+    assert list(_flat(outline(text, "python"))) == [
+        (0, "class", "A", 1, 3),
+        (1, "method", "b", 2, 3),
+        (0, "function", "c", 5, 6),
+    ]
+
+
+def test_mask_keeps_offsets():
+    text = 'a = "{"; // }\nb = `x\n{`; /* {\n*/ c\n'
+    masked = mask_code(text, "js")
+    assert len(masked) == len(text)
+    assert masked.count("\n") == text.count("\n")
+    assert "{" not in masked and "}" not in masked
+    assert masked.endswith(" c\n")
+
+
+def test_typescript_symbols():
+    text = """import x from "y";
+// function fake() {}
+export default class Foo<T> extends Bar {
+  private readonly brace = "{";
+  constructor(a: string) {
+    super();
+  }
+  async load(opts: { a: number }): Promise<void> {
+    if (x) { return; }
+  }
+  handle = (e: Event) => {
+    run();
+  };
+}
+
+export interface Props {
+  a: string;
+}
+type Alias = string | number
+export const add = (a: number, b: number) => a + b;
+const Comp = async ({ a }: Props) => {
+  return `${a} {`;
+};
+call(1);
+export enum Color { Red, Green }
+"""
+    assert list(_flat(outline(text, "typescript"))) == [
+        (0, "class", "Foo", 3, 14),
+        (1, "method", "constructor", 5, 7),
+        (1, "method", "load", 8, 10),
+        (1, "method", "handle", 11, 13),
+        (0, "interface", "Props", 16, 18),
+        (0, "type", "Alias", 19, 19),
+        (0, "function", "add", 20, 20),
+        (0, "function", "Comp", 21, 23),
+        (0, "enum", "Color", 25, 25),
+    ]
+
+
+def test_go_and_rust():
+    go = (
+        "package main\n"
+        "\n"
+        "type Server struct {\n"
+        "\taddr string\n"
+        "}\n"
+        "\n"
+        "func (s *Server) Run() error {\n"
+        '\tx := "}"\n'
+        "\treturn nil\n"
+        "}\n"
+    )
+    assert list(_flat(outline(go, "go"))) == [
+        (0, "struct", "Server", 3, 5),
+        (0, "method", "Run", 7, 10),
+    ]
+    rust = (
+        "pub struct Point<'a> { x: &'a str }\n"
+        "impl<'a> Display for Point<'a> {\n"
+        "    fn fmt(&self, f: &mut Formatter) -> Result {\n"
+        "        write!(f, \"{}\", '{')\n"
+        "    }\n"
+        "}\n"
+        "pub(crate) async fn run() {}\n"
+    )
+    assert list(_flat(outline(rust, "rust"))) == [
+        (0, "struct", "Point", 1, 1),
+        (0, "impl", "Display for Point<'a>", 2, 6),
+        (1, "method", "fmt", 3, 5),
+        (0, "function", "run", 7, 7),
+    ]
+
+
+def test_markdown_headings_skip_code_fences():
+    text = "# Title\ntext\n```\n# not a heading\n```\n## Sub\n## Sub2 ##\n# Two\n"
+    assert list(_flat(outline(text, "markdown"))) == [
+        (0, "heading", "Title", 1, 7),
+        (1, "heading", "Sub", 6, 6),
+        (1, "heading", "Sub2", 7, 7),
+        (0, "heading", "Two", 8, 8),
+    ]
+
+
+def test_unknown_language_is_empty():
+    assert outline("def x(): pass\n", None) == []
+
+
+def test_cache_rebuilds_when_file_changes(tmp_path):
+    path = tmp_path / "m.py"
+    path.write_text("def a():\n    pass\n")
+    cache = OutlineCache()
+    first = cache.get(str(path), os.stat(path))
+    assert first["language"] == "python"
+    assert [s["name"] for s in first["symbols"]] == ["a"]
+    assert cache.get(str(path), os.stat(path)) is first
+    assert cache.stats()["hits"] == 1
+
+    path.write_text("def a():\n    pass\n\n\ndef b():\n    pass\n")
+    assert [s["name"] for s in cache.get(str(path), os.stat(path))["symbols"]] == ["a", "b"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_binary_and_cp949(tmp_path):
+    binary = tmp_path / "x.py"
+    binary.write_bytes(b"\0\1\2def a(): pass\n")
+    cache = OutlineCache()
+    assert cache.get(str(binary), os.stat(binary))["symbols"] == []
+
+    korean = tmp_path / "k.py"
+    korean.write_bytes("# 한글 주석\ndef 함수():\n    pass\n".encode("cp949"))
+    assert cache.get(str(korean), os.stat(korean))["symbols"][0]["name"] == "함수"
+
+
+def test_cache_is_bounded(tmp_path):
+    cache = OutlineCache(max_entries=2)
+    for name in "abc":
+        path = tmp_path / f"{name}.md"
+        path.write_text(f"# {name}\n")
+        cache.get(str(path), os.stat(path))
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,206 @@
+import shutil
+import threading
+import time
+
+import pytest
+
+from backend.fs_events import CREATED, DELETED, MODIFIED, FsEventHub
+from backend.path_index import PathIndex, _PathTable, fuzzy_score
+
+# 무시 규칙이 프로젝트 설정을 읽으므로 실제 data/를 건드리지 않게 한다
+pytestmark = pytest.mark.usefixtures("temp_data_dir")
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    for rel in [
+        "src/components/FileTree.tsx",
+        "src/components/TabBar.tsx",
+        "src/api.ts",
+        "backend/api.py",
+        "backend/tests/test_api.py",
+        "node_modules/pkg/index.js",
+        "build/out.js",
+    ]:
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text("")
+    (root / ".gitignore").write_text("build/\n")
+    return root
+
+
+@pytest.fixture
+def hub():
+    hub = FsEventHub(use_inotify=False)
+    yield hub
+    hub.shutdown()
+
+
+@pytest.fixture
+def index(project, hub):
+    idx = PathIndex(str(project), hub)
+    idx.start()
+    assert idx.wait_ready(5)
+    yield idx
+    idx.close()
+
+
+def _rels(result):
+    return [r["rel"] for r in result["results"]]
+
+
+def _wait_for(cond, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_fuzzy_score_prefers_basename_and_boundaries():
+    assert fuzzy_score("src/api.ts", "xyz") is None
+    score, positions = fuzzy_score("src/components/FileTree.tsx", "ft")
+    assert positions == [15, 19]  # F, T (camelCase 경계)
+    better, _ = fuzzy_score("backend/api.py", "api")
+    worse, _ = fuzzy_score("a/p/i/other.py", "api")
+    assert better > worse
+
+
+def test_table_add_remove_reuses_slots():
+    table = _PathTable()
+    d = table.add_dir(0, "src")
+    table.add_file(d, "a.py")
+    table.add_file(d, "b.py")
+    table.remove_file(d, "a.py")
+    table.add_file(0, "c.py")
+    assert table.file_count == 2
+    assert len(table.file_dir) == 2  # 지운 칸을 다시 쓴다
+    assert table.snapshot().line(0) == "c.py"
+
+    table.remove_dir(d)
+    assert table.file_count == 1
+    assert table.find_dir(["src"]) is None
+
+
+def test_table_remove_dirs_in_one_pass():
+    table = _PathTable()
+    for top in ["a", "b", "c"]:
+        d = table.add_dir(0, top)
+        sub = table.add_dir(d, "sub")
+        table.add_file(d, "x.py")
+        table.add_file(sub, "y.py")
+    table.remove_dirs({table.find_dir(["a"]), table.find_dir(["b", "sub"])})
+    assert table.file_count == 3
+    assert table.find_dir(["a", "sub"]) is None
+    assert table.find_dir(["b"]) is not None and table.find_dir(["b", "sub"]) is None
+    assert table.snapshot().blob.split("\n").count("c/sub/y.py") == 1
+
+
+def test_find_ranks_and_ignores(index):
+    result = index.find("api")
+    assert set(_rels(result)[:2]) == {"src/api.ts", "backend/api.py"}
+    assert "backend/tests/test_api.py" in _rels(result)
+    assert _rels(index.find("filetree")) == ["src/components/FileTree.tsx"]
+    assert index.find("index.js")["results"] == []  # HIDDEN_DIRS
+    assert index.find("out.js")["results"] == []  # .gitignore
+    assert index.stats()["files"] == 6  # .gitignore 포함
+
+
+def test_find_does_not_wait_for_first_build(project, hub, monkeypatch):
+    idx = PathIndex(str(project), hub)
+    monkeypatch.setattr(idx, "_rebuild", lambda: None)  # 빌드가 끝나지 않은 상태
+    idx.start()
+    try:
+        start = time.perf_counter()
+        result = idx.find("api")
+        assert time.perf_counter() - start < 0.5
+        assert result["state"] == "building" and result["results"] == []
+    finally:
+        idx.close()
+
+
+def test_find_limit_and_empty_query(index):
+    assert len(index.find("s", limit=2)["results"]) == 2
+    assert index.find("  ")["results"] == []
+
+
+def test_incremental_updates(index, project):
+    (project / "src" / "hooks").mkdir()
+    (project / "src" / "hooks" / "useThing.ts").write_text("")
+    (project / "src" / "api.ts").unlink()
+    assert _wait_for(lambda: _rels(index.find("usething")) == ["src/hooks/useThing.ts"])
+    assert _wait_for(lambda: "src/api.ts" not in _rels(index.find("api")))
+
+    shutil.rmtree(project / "src" / "components")
+    assert _wait_for(lambda: index.find("tabbar")["results"] == [])
+
+
+def test_deleted_directory_burst_is_removed_in_one_pass(index, project, monkeypatch):
+    calls = []
+    remove_dirs = _PathTable.remove_dirs
+
+    def counting(self, dirs):
+        if dirs:
+            calls.append(len(dirs))
+        remove_dirs(self, dirs)
+
+    monkeypatch.setattr(_PathTable, "remove_dirs", counting)
+    root = str(project)
+    index._apply_changes([
+        [DELETED, f"{root}/backend/tests/test_api.py", False],
+        [DELETED, f"{root}/backend/tests", True],
+        [DELETED, f"{root}/backend/api.py", False],
+        [DELETED, f"{root}/backend", True],
+        [DELETED, f"{root}/src/components", True],
+    ])
+    assert calls == [3]
+    assert _rels(index.find("api")) == ["src/api.ts"]
+
+    # 지웠다 다시 만든 디렉터리는 남는다 (디스크의 src/는 그대로 있다)
+    index._apply_changes([
+        [DELETED, f"{root}/src", True],
+        [CREATED, f"{root}/src", True],
+    ])
+    assert _rels(index.find("api")) == ["src/api.ts"]
+
+
+def test_ignore_change_during_build_rebuilds_again(project, hub, monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+    walk = PathIndex._walk
+
+    def slow_first_walk(self, table, top, top_path, stack):
+        if not entered.is_set():
+            entered.set()
+            release.wait(5)
+        walk(self, table, top, top_path, stack)
+
+    monkeypatch.setattr(PathIndex, "_walk", slow_first_walk)
+    idx = PathIndex(str(project), hub)
+    idx.start()
+    try:
+        assert entered.wait(5)
+        (project / ".gitignore").write_text("build/\nsrc/\n")
+        idx._apply_changes([[MODIFIED, str(project / ".gitignore"), False]])
+        release.set()
+        assert idx.wait_ready(5)
+        assert _rels(idx.find("api")) == ["backend/api.py", "backend/tests/test_api.py"]
+    finally:
+        release.set()
+        idx.close()
+
+
+def test_new_directory_is_walked_outside_the_lock(index, project, monkeypatch):
+    locked = []
+    walk = PathIndex._walk
+
+    def recording(self, *args):
+        locked.append(self._lock.locked())
+        walk(self, *args)
+
+    monkeypatch.setattr(PathIndex, "_walk", recording)
+    (project / "docs" / "guide").mkdir(parents=True)
+    (project / "docs" / "guide" / "intro.md").write_text("")
+    index._apply_changes([[CREATED, str(project / "docs"), True]])
+    assert locked == [False]
+    assert _rels(index.find("intro")) == ["docs/guide/intro.md"]
@@ -0,0 +1,57 @@
+import threading
+import time
+
+import pytest
+
+from backend.profiler import SamplingProfiler, collapse
+
+
+def busy_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_samples_other_threads_in_collapsed_format():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="busy worker")
+    worker.start()
+    try:
+        counts = SamplingProfiler().sample(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    text = collapse(counts)
+    busy = [line for line in text.splitlines() if line.startswith("busy_worker;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert "busy_work (backend/tests/test_profiler.py:" in stack
+    # 샘플링하는 스레드 자신은 빠진다
+    assert "_sample (" not in text
+
+
+def test_idle_threads_are_skipped_by_default():
+    stop = threading.Event()
+    waiter = threading.Thread(target=stop.wait, name="idle-waiter")
+    waiter.start()
+    try:
+        profiler = SamplingProfiler()
+        quiet = collapse(profiler.sample(0.05, interval=0.005))
+        everything = collapse(profiler.sample(0.05, interval=0.005, include_idle=True))
+    finally:
+        stop.set()
+        waiter.join()
+    assert "idle-waiter;" not in quiet
+    assert "idle-waiter;" in everything
+
+
+def test_only_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    profiler.busy = True
+    with pytest.raises(RuntimeError):
+        profiler.sample(0.01)
+    profiler.busy = False
+    start = time.monotonic()
+    profiler.sample(0.01)
+    assert time.monotonic() - start < 1
@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from httpx import ASGITransport, AsyncClient
+
+from backend.route_stats import RouteStats, RouteTimingMiddleware
+
+
+def test_histogram_quantiles():
+    stats = RouteStats()
+    for ms in [0.5] * 90 + [30] * 9 + [20000]:
+        stats.record("GET /x", ms, 200, 10)
+    route = stats.stats()["GET /x"]
+    assert route["count"] == 100
+    assert route["p50_ms"] == 1
+    assert route["p90_ms"] == 1
+    assert route["p99_ms"] == 50
+    assert route["max_ms"] == 20000
+    assert route["buckets"]["1"] == 90 and route["buckets"]["inf"] == 1
+    assert route["bytes_total"] == 1000 and route["bytes_mean"] == 10
+
+
+def test_sorted_by_total_time_and_errors():
+    stats = RouteStats()
+    stats.record("GET /fast", 1, 200, 0)
+    stats.record("GET /slow", 500, 503, 0)
+    assert list(stats.stats()) == ["GET /slow", "GET /fast"]
+    assert stats.stats()["GET /slow"]["errors"] == 1
+    stats.reset()
+    assert stats.stats() == {}
+
+
+async def test_middleware_groups_by_route_template():
+    stats = RouteStats()
+    app = FastAPI()
+    app.add_middleware(RouteTimingMiddleware, stats=stats)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return PlainTextResponse(item_id * 10)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/a")
+        await client.get("/items/bb")
+        await client.get("/nowhere")
+
+    data = stats.stats()
+    assert data["GET /items/{item_id}"]["count"] == 2
+    assert data["GET /items/{item_id}"]["bytes_total"] == 30
+    assert data["GET (other)"]["count"] == 1
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from backend import runtime, ws
+from backend.runtime import PROFILES, RuntimeProfile, resolve
+
+
+def test_default_profile_matches_uvicorn_defaults():
+    options = PROFILES["default"].uvicorn_options()
+    assert options["loop"] == "auto" and options["http"] == "auto"
+    assert options["timeout_keep_alive"] == 5
+    assert "drain_timeout" not in options
+
+
+def test_resolve_falls_back_to_installed_implementations(monkeypatch):
+    installed = {"wsproto"}
+    monkeypatch.setattr(runtime, "_available", lambda module: module in installed)
+    profile, notes = resolve(PROFILES["performance"])
+    assert (profile.loop, profile.http, profile.ws) == ("asyncio", "h11", "wsproto")
+    assert len(notes) == 3
+    assert profile.limit_concurrency == PROFILES["performance"].limit_concurrency
+
+    installed = {"uvloop", "httptools", "websockets"}
+    profile, notes = resolve(PROFILES["performance"])
+    assert (profile.loop, profile.http, profile.ws) == ("uvloop", "httptools", "websockets")
+    assert notes == []
+
+
+def test_resolve_keeps_auto():
+    profile, notes = resolve(RuntimeProfile())
+    assert profile == RuntimeProfile()
+    assert notes == []
+
+
+@pytest.fixture
+def open_queues(monkeypatch):
+    monkeypatch.setattr(ws, "_open_queues", set())
+    monkeypatch.setattr(ws, "_draining", False)
+    return ws._open_queues
+
+
+async def test_drain_flushes_pending_messages_then_closes(open_queues):
+    queue: asyncio.Queue = asyncio.Queue()
+    queue.put_nowait("pending output")
+    open_queues.add(queue)
+    received = []
+
+    async def connection():
+        while (item := await queue.get()) is not None:
+            received.append(item)
+        received.append(ws._close_code())
+        open_queues.discard(queue)
+
+    task = asyncio.create_task(connection())
+    assert await ws.drain_websockets(timeout=1.0) == 0
+    await task
+    assert received == ["pending output", ws.SERVICE_RESTART]
+
+
+async def test_drain_gives_up_after_timeout(open_queues):
+    open_queues.add(asyncio.Queue(maxsize=1))
+    assert await ws.drain_websockets(timeout=0.1) == 1
@@ -0,0 +1,161 @@
+import os
+import time
+
+import pytest
+
+from backend.fs_events import FsEventHub
+from backend.search_index import SearchIndex, SearchManager, iter_project_files, required_literals
+
+# 무시 규칙이 프로젝트 설정을 읽으므로 실제 data/를 건드리지 않게 한다
+pytestmark = pytest.mark.usefixtures("temp_data_dir")
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    (root / "src").mkdir(parents=True)
+    (root / "node_modules").mkdir()
+    (root / "src" / "a.py").write_text("def hello_world():\n    return 42\n")
+    (root / "src" / "b.txt").write_text("Hello World\nsecond line\n")
+    (root / "node_modules" / "x.js").write_text("hello_world")
+    (root / ".gitignore").write_text("*.log\n")
+    (root / "x.log").write_text("hello_world")
+    (root / "data.bin").write_bytes(b"hello_world\0\1\2")
+    return root
+
+
+@pytest.fixture
+def hub():
+    hub = FsEventHub(use_inotify=False)
+    yield hub
+    hub.shutdown()
+
+
+@pytest.fixture
+def index(project, tmp_path, hub):
+    idx = SearchIndex(str(project), str(tmp_path / "index" / "proj.db"), hub)
+    idx.start()
+    assert idx.wait_ready(5)
+    yield idx
+    idx.close()
+
+
+def _paths(results, root):
+    return sorted(os.path.relpath(r["path"], root) for r in results if r["type"] == "file")
+
+
+def _wait_for(cond, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_required_literals():
+    assert required_literals(r"foo\.bar(baz)*qux+") == ["foo.bar", "qux"]
+    assert required_literals("def{2}gh") == ["de", "gh"]
+    assert required_literals("[abc]xyz") == ["xyz"]
+    assert required_literals(r"\bword\d+") == ["word"]
+    assert required_literals("a|b") is None
+    assert required_literals("(a|b)cde") == ["cde"]
+
+
+def test_required_literals_skip_whole_escapes():
+    assert required_literals(r"foo\x41bar") == ["foo", "bar"]
+    assert required_literals(r"foo\u0041bar") == ["foo", "bar"]
+    assert required_literals(r"foo\U00000041bar") == ["foo", "bar"]
+    assert required_literals(r"foo\N{LATIN CAPITAL LETTER A}bar") == ["foo", "bar"]
+    assert required_literals(r"abc\101def") == ["abc", "def"]
+    assert required_literals(r"abc\0def") == ["abc", "def"]
+    assert required_literals(r"abc\012def") == ["abc", "def"]
+    assert required_literals(r"(ab)\1cde") == ["cde"]
+    assert required_literals(r"(a)(b)(c)(d)(e)(f)(g)(h)(i)(j)\10xyz") == ["xyz"]
+
+
+def test_walk_honors_ignores(project):
+    rels = sorted(rel for rel, _ in iter_project_files(str(project)))
+    assert rels == [".gitignore", "data.bin", "src/a.py", "src/b.txt"]
+
+
+def test_literal_search(index, project):
+    results = list(index.search("hello_world"))
+    assert _paths(results, project) == ["src/a.py"]
+    match = results[0]["matches"][0]
+    assert match["line"] == 1 and match["ranges"] == [[4, 15]]
+    assert match["after"] == ["    return 42"]
+    done = results[-1]
+    assert done["type"] == "done" and done["indexed"] and done["files"] == 1
+
+
+def test_case_and_regex(index, project):
+    assert _paths(index.search("hello world"), project) == ["src/b.txt"]
+    assert _paths(index.search("hello world", case_sensitive=True), project) == []
+    assert _paths(index.search(r"hel+o.wor", regex=True), project) == ["src/a.py", "src/b.txt"]
+    # 필수 리터럴이 없는 정규식은 색인된 모든 파일을 확인한다
+    results = list(index.search(r"\d\d", regex=True))
+    assert _paths(results, project) == ["src/a.py"]
+    assert not results[-1]["indexed"]
+    # 이스케이프 뒤의 16진 숫자를 리터럴로 착각하면 후보가 0개가 된다
+    assert _paths(index.search(r"hello\x5fworld", regex=True), project) == ["src/a.py"]
+
+
+def test_glob_and_limit(index, project):
+    assert _paths(index.search("l", glob="*.txt"), project) == ["src/b.txt"]
+    results = list(index.search("l", max_matches=1))
+    assert results[-1]["matches"] == 1 and results[-1]["truncated"]
+
+
+def test_incremental_updates(index, project):
+    (project / "src" / "c.md").write_text("more hello_world\n")
+    (project / "src" / "a.py").unlink()
+    assert _wait_for(lambda: _paths(index.search("hello_world"), project) == ["src/c.md"])
+
+    # 내용이 바뀌면 예전 trigram이 지워지고 새 내용으로 찾아진다
+    (project / "src" / "c.md").write_text("goodbye\n")
+    assert _wait_for(lambda: _paths(index.search("goodbye"), project) == ["src/c.md"])
+    assert list(index.search("hello_world"))[-1]["candidates"] == 0
+
+
+def test_legacy_encodings_are_indexed(project, tmp_path, hub):
+    (project / "src" / "ko.txt").write_bytes("검색 대상 문장\n".encode("cp949"))
+    (project / "src" / "fr.txt").write_bytes("déjà vu café\n".encode("cp1252"))
+    idx = SearchIndex(str(project), str(tmp_path / "index" / "enc.db"), hub)
+    idx.start()
+    try:
+        assert idx.wait_ready(5)
+        results = list(idx.search("대상 문장"))
+        assert _paths(results, project) == ["src/ko.txt"]
+        assert results[0]["matches"][0]["text"] == "검색 대상 문장"
+        assert _paths(idx.search("déjà vu"), project) == ["src/fr.txt"]
+        assert hub.watcher_count() == 1
+    finally:
+        idx.close()
+    assert hub.watcher_count() == 0
+
+
+def test_rebuild_reuses_existing_index(project, tmp_path, hub):
+    db = str(tmp_path / "index" / "proj.db")
+    first = SearchIndex(str(project), db, hub)
+    first.start()
+    assert first.wait_ready(5)
+    first.close()
+
+    (project / "src" / "b.txt").unlink()
+    second = SearchIndex(str(project), db, hub)
+    second.start()
+    assert second.wait_ready(5)
+    assert second.status()["indexed_files"] == 2  # .gitignore, a.py
+    assert _paths(second.search("second"), project) == []
+    second.close()
+
+
+def test_manager_drop_removes_db(project):
+    manager = SearchManager()
+    idx = manager.get("p1", str(project))
+    assert manager.get("p1", str(project)) is idx
+    assert idx.wait_ready(5)
+    manager.drop("p1")
+    assert not os.path.exists(idx.db_path)
+    manager.close()
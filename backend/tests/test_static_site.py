@@ -0,0 +1,98 @@
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from backend.compress import CompressedCache, CompressionMiddleware
+from backend.static_site import IMMUTABLE_CACHE_CONTROL, StaticSite, precompress
+
+INDEX = b"<!doctype html><div id=root></div>" + b" " * 2000
+SCRIPT = b"console.log('hello');\n" * 200
+
+
+@pytest.fixture
+def dist(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_bytes(INDEX)
+    (tmp_path / "assets" / "index-abc123.js").write_bytes(SCRIPT)
+    (tmp_path / "assets" / "logo-def456.png").write_bytes(b"\x89PNG" + b"\0" * 4000)
+    (tmp_path / "favicon.svg").write_bytes(b"<svg/>")
+    return tmp_path
+
+
+@pytest.fixture
+async def client(dist):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, cache=CompressedCache())
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.mount("/", StaticSite(str(dist)))
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def test_precompress_writes_variants_once(dist):
+    assert precompress(str(dist), ("gzip",)) == 2  # index.html, js — png과 작은 svg는 제외
+    js = dist / "assets" / "index-abc123.js"
+    assert gzip.decompress((dist / "assets" / "index-abc123.js.gz").read_bytes()) == SCRIPT
+    assert not (dist / "assets" / "logo-def456.png.gz").exists()
+    assert not (dist / "favicon.svg.gz").exists()
+    assert precompress(str(dist), ("gzip",)) == 0
+
+    st = os.stat(js)
+    os.utime(js, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert precompress(str(dist), ("gzip",)) == 1
+
+
+async def test_serves_precompressed_variant(client, dist):
+    precompress(str(dist), ("gzip",))
+    res = await client.get("/assets/index-abc123.js", headers={"Accept-Encoding": "gzip, br"})
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert res.headers["vary"] == "Accept-Encoding"
+    assert res.headers["content-type"].startswith("text/javascript")
+    assert res.content == SCRIPT  # httpx가 풀어 준다
+
+    res = await client.get("/assets/index-abc123.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in res.headers
+    assert res.content == SCRIPT
+
+
+async def test_index_is_revalidated(client):
+    res = await client.get("/")
+    assert res.status_code == 200
+    assert res.content == INDEX
+    assert res.headers["cache-control"] == "private, no-cache"
+    etag = res.headers["etag"]
+
+    res = await client.get("/", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+    # 미리 압축한 파일이 없으면 미들웨어가 압축한다
+    res = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.headers["vary"] == "Accept-Encoding"
+    assert res.content == INDEX
+
+
+async def test_spa_fallback_and_404s(client):
+    res = await client.get("/projects/abc")
+    assert res.status_code == 200
+    assert res.content == INDEX
+
+    assert (await client.get("/api/ping")).json() == {"ok": True}
+    assert (await client.get("/api/missing")).status_code == 404
+    assert (await client.get("/assets/missing-123.js")).status_code == 404
+    assert (await client.post("/")).status_code == 405
+
+
+def test_path_traversal_is_rejected(dist):
+    site = StaticSite(str(dist / "assets"))
+    assert site._resolve("/../index.html") is None
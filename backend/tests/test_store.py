@@ -1,14 +1,15 @@
+import json
+import threading
+
 import pytest
 
 from backend import store
 
 
-@pytest.fixture(autouse=True)
-def temp_data_dir(tmp_path, monkeypatch):
-    monkeypatch.setattr(store, "DATA_DIR", tmp_path)
-    monkeypatch.setattr(store, "PROJECTS_FILE", tmp_path / "projects.json")
-    monkeypatch.setattr(store, "SETTINGS_FILE", tmp_path / "settings.json")
-    return tmp_path
+@pytest.fixture(autouse=True, params=["sqlite", "json"])
+def storage_backend(request, temp_data_dir, monkeypatch):
+    monkeypatch.setattr(store, "STORAGE_BACKEND", request.param)
+    return request.param
 
 
 def test_load_projects_empty():
@@ -57,3 +58,93 @@ def test_settings():
     assert store.load_settings() == {}
     store.save_settings({"theme": "mocha"})
     assert store.load_settings() == {"theme": "mocha"}
+
+
+def test_settings_replace():
+    store.save_settings({"theme": "mocha", "fontSize": 14})
+    store.save_settings({"theme": "latte"})
+    assert store.load_settings() == {"theme": "latte"}
+
+
+def test_project_settings(tmp_path):
+    project_dir = tmp_path / "p1"
+    project_dir.mkdir()
+    p = store.create_project("P1", str(project_dir))
+    assert store.get_project_setting(p["id"], "ignore_patterns", []) == []
+    assert store.set_project_setting(p["id"], "ignore_patterns", ["*.bak"])
+    assert store.get_project_setting(p["id"], "ignore_patterns") == ["*.bak"]
+    assert not store.set_project_setting("nope", "ignore_patterns", [])
+
+    # 전역 설정을 통째로 바꿔도 프로젝트 설정은 남는다
+    store.save_settings({"theme": "light"})
+    assert store.get_project_setting(p["id"], "ignore_patterns") == ["*.bak"]
+
+    store.delete_project(p["id"])
+    p2 = store.create_project("P1", str(project_dir))
+    assert store.get_project_setting(p2["id"], "ignore_patterns") is None
+
+
+def test_projects_keep_insertion_order(tmp_path):
+    ids = []
+    for name in ("b", "a", "c"):
+        (tmp_path / name).mkdir()
+        ids.append(store.create_project(name, str(tmp_path / name))["id"])
+    assert [p["id"] for p in store.load_projects()] == ids
+
+
+def test_update_user():
+    storage = store.get_storage()
+    storage.save_users([{"username": "admin", "password_hash": "h"}])
+    updated = storage.update_user("admin", lambda u: u.update(failed_attempts=3))
+    assert updated["failed_attempts"] == 3
+    assert storage.get_user("admin")["failed_attempts"] == 3
+    assert storage.update_user("nobody", lambda u: None) is None
+
+
+def test_concurrent_creates_do_not_lose_updates(tmp_path):
+    dirs = []
+    for i in range(20):
+        d = tmp_path / f"p{i}"
+        d.mkdir()
+        dirs.append(d)
+    threads = [
+        threading.Thread(target=store.create_project, args=(d.name, str(d))) for d in dirs
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store.load_projects()) == 20
+
+
+def test_sqlite_migrates_json_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORAGE_BACKEND", "sqlite")
+    project_dir = tmp_path / "legacy"
+    project_dir.mkdir()
+    (tmp_path / "projects.json").write_text(
+        json.dumps([{"id": "proj_legacy", "name": "Legacy", "path": str(project_dir)}]),
+        encoding="utf-8",
+    )
+    (tmp_path / "settings.json").write_text(json.dumps({"theme": "dracula"}), encoding="utf-8")
+    (tmp_path / "users.json").write_text(
+        json.dumps([{"username": "admin", "password_hash": "h", "locked": True}]),
+        encoding="utf-8",
+    )
+
+    assert store.get_project("proj_legacy")["name"] == "Legacy"
+    assert store.load_settings() == {"theme": "dracula"}
+    assert store.get_storage().get_user("admin")["locked"] is True
+
+    # 가져온 뒤에는 JSON을 다시 읽지 않는다
+    store.delete_project("proj_legacy")
+    store.close_storage()
+    assert store.get_project("proj_legacy") is None
+
+
+def test_storage_backend_must_implement_the_interface():
+    class Partial(store.Storage):
+        def load_projects(self) -> list[dict]:
+            return []
+
+    with pytest.raises(TypeError):
+        Partial()
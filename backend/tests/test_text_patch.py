@@ -0,0 +1,42 @@
+import pytest
+
+from backend.text_patch import PatchError, apply_line_edits, content_hash, decode_text
+
+
+def test_replace_insert_delete():
+    text = "a\nb\nc\n"
+    assert apply_line_edits(text, [(1, 2, ["B"])]) == "a\nB\nc\n"
+    assert apply_line_edits(text, [(1, 1, ["x", "y"])]) == "a\nx\ny\nb\nc\n"
+    assert apply_line_edits(text, [(0, 2, [])]) == "c\n"
+
+
+def test_edits_use_base_coordinates():
+    text = "1\n2\n3\n4\n5"
+    edits = [(3, 4, ["four", "FOUR"]), (0, 1, [])]
+    assert apply_line_edits(text, edits) == "2\n3\nfour\nFOUR\n5"
+
+
+def test_edit_final_line_without_newline():
+    assert apply_line_edits("a\nb", [(1, 2, ["b", ""])]) == "a\nb\n"
+
+
+def test_empty_edits_keep_text():
+    assert apply_line_edits("same\n", []) == "same\n"
+
+
+@pytest.mark.parametrize("edits", [
+    [(2, 1, [])],
+    [(0, 9, [])],
+    [(0, 2, ["x"]), (1, 3, ["y"])],
+])
+def test_invalid_edits(edits):
+    with pytest.raises(PatchError):
+        apply_line_edits("a\nb\nc", edits)
+
+
+def test_decode_text_normalizes_newlines():
+    assert decode_text(b"a\r\nb\rc\n") == "a\nb\nc\n"
+
+
+def test_content_hash_is_sha256():
+    assert content_hash(b"") == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
@@ -0,0 +1,56 @@
+import codecs
+import os
+
+from backend.text_sniff import SNIFF_SIZE, SniffCache, detect_encoding
+
+
+def test_utf8_and_ascii():
+    assert detect_encoding(b"print('hi')\n") == "utf-8"
+    assert detect_encoding("안녕하세요\n".encode()) == "utf-8"
+    assert detect_encoding(b"") == "utf-8"
+
+
+def test_truncated_prefix_is_not_an_error():
+    data = ("가" * 10).encode()
+    assert detect_encoding(data[:-1], complete=False) == "utf-8"
+    assert detect_encoding(data[:-1], complete=True) != "utf-8"
+
+
+def test_boms():
+    assert detect_encoding(codecs.BOM_UTF8 + b"x") == "utf-8-sig"
+    assert detect_encoding("hello".encode("utf-16")) == "utf-16"
+    assert detect_encoding("hello".encode("utf-32")) == "utf-32"
+
+
+def test_binary():
+    assert detect_encoding(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR") is None
+    assert detect_encoding(bytes(range(1, 32)) * 10) is None
+
+
+def test_cp949():
+    data = "# 한글 주석\nprint('안녕')\n".encode("cp949")
+    assert detect_encoding(data) == "cp949"
+
+
+def test_latin_text_is_not_taken_for_cp949():
+    data = "Änderung für Café\n".encode("cp1252")
+    assert detect_encoding(data) == "cp1252"
+
+
+def test_cache_reuses_result_until_file_changes(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"plain\n")
+    cache = SniffCache()
+    assert cache.sniff(str(path), os.stat(path)) == "utf-8"
+    assert cache.sniff(str(path), os.stat(path)) == "utf-8"
+    assert cache.stats()["hits"] == 1
+
+    path.write_bytes(b"\0" * 100)
+    assert cache.sniff(str(path), os.stat(path)) is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_reads_only_prefix(tmp_path):
+    path = tmp_path / "big.bin"
+    path.write_bytes(b"a" * SNIFF_SIZE + b"\0")
+    assert SniffCache().sniff(str(path), os.stat(path)) == "utf-8"
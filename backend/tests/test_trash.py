@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend import trash
+
+
+@pytest.fixture
+def root(tmp_path):
+    r = tmp_path / "proj"
+    (r / "pkg" / "sub").mkdir(parents=True)
+    (r / "pkg" / "sub" / "a.txt").write_text("a")
+    (r / "file.txt").write_text("f")
+    return r
+
+
+def test_move_to_trash_and_restore(root):
+    item = trash.move_to_trash(str(root / "pkg"), str(root))
+    assert not (root / "pkg").exists()
+    assert item["name"] == "pkg" and item["is_dir"]
+    assert item["expires_at"] == item["deleted_at"] + trash.TRASH_RETENTION_SECONDS
+    assert (root / trash.TRASH_DIR_NAME / ".gitignore").read_text() == "*\n"
+
+    assert [i["id"] for i in trash.list_items([str(root)])] == [item["id"]]
+
+    item_dir, meta = trash.find_item(item["id"], [str(root)])
+    trash.restore_item(item_dir, meta, str(root / "pkg"))
+    assert (root / "pkg" / "sub" / "a.txt").read_text() == "a"
+    assert trash.list_items([str(root)]) == []
+
+
+def test_move_to_trash_refuses_root_and_trash(root):
+    assert trash.move_to_trash(str(root), str(root)) is None
+    trash.move_to_trash(str(root / "file.txt"), str(root))
+    inner = os.path.join(trash.trash_dir(str(root)), "anything")
+    assert trash.move_to_trash(inner, str(root)) is None
+
+
+def test_move_missing_path(root):
+    with pytest.raises(HTTPException) as exc:
+        trash.move_to_trash(str(root / "nope"), str(root))
+    assert exc.value.status_code == 404
+    assert trash.list_items([str(root)]) == []
+
+
+def test_find_item_rejects_bad_ids(root):
+    with pytest.raises(HTTPException):
+        trash.find_item("../pkg", [str(root)])
+
+
+def test_purge_expired(root):
+    trash.move_to_trash(str(root / "pkg"), str(root))
+    item = trash.move_to_trash(str(root / "file.txt"), str(root))
+    purger = trash.TrashPurger()
+    later = item["deleted_at"] + trash.TRASH_RETENTION_SECONDS + 1
+
+    assert purger.purge_expired([str(root)]) == 0
+    assert purger.purge_expired([str(root)], now=later) == 2
+    assert trash.list_items([str(root)]) == []
+    assert sorted(os.listdir(trash.trash_dir(str(root)))) == [".gitignore"]
+
+
+def test_purge_orphan_directory(root):
+    orphan = os.path.join(trash.trash_dir(str(root)), "0123456789abcdef")
+    os.makedirs(os.path.join(orphan, "x"))
+    os.utime(orphan, (0, 0))
+    assert trash.TrashPurger().purge_expired([str(root)]) == 1
+    assert not os.path.exists(orphan)
+
+
+def test_throttle_sleeps_and_stops(monkeypatch):
+    monkeypatch.setattr(trash, "PURGE_BATCH", 10)
+    monkeypatch.setattr(trash, "PURGE_FILES_PER_SECOND", 100)
+    stop = threading.Event()
+    throttle = trash._Throttle(stop)
+    throttle.advance(files=10)
+    start = time.monotonic()
+    throttle.check_cancelled()
+    assert time.monotonic() - start >= 0.08
+
+    stop.set()
+    with pytest.raises(trash._PurgeStopped):
+        throttle.check_cancelled()
@@ -0,0 +1,83 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from backend.zip_stream import ZIP_READ_SIZE, iter_zip_entries, stream_zip
+
+# 무시 규칙이 프로젝트 설정을 읽으므로 실제 data/를 건드리지 않게 한다
+pytestmark = pytest.mark.usefixtures("temp_data_dir")
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "lib").mkdir(parents=True)
+    (root / "build").mkdir()
+    (root / ".gitignore").write_text("build/\n*.log\n")
+    (root / "README.md").write_text("hello\n")
+    (root / "src" / "main.py").write_text("print('hi')\n" * 100)
+    (root / "src" / "pkg" / "mod.py").write_text("x = 1\n")
+    (root / "src" / "debug.log").write_text("noise")
+    (root / "src" / "logo.png").write_bytes(os.urandom(1000))
+    (root / "node_modules" / "lib" / "index.js").write_text("")
+    (root / "build" / "out.bin").write_bytes(b"\0" * 10)
+    return root
+
+
+def _unzip(chunks) -> zipfile.ZipFile:
+    return zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+
+def test_directory_skips_hidden_and_ignored(project):
+    root = str(project)
+    zf = _unzip(stream_zip(iter_zip_entries(root, [root])))
+    assert zf.testzip() is None
+    assert sorted(zf.namelist()) == [
+        "proj/",
+        "proj/.gitignore",
+        "proj/README.md",
+        "proj/src/",
+        "proj/src/logo.png",
+        "proj/src/main.py",
+        "proj/src/pkg/",
+        "proj/src/pkg/mod.py",
+    ]
+    assert zf.read("proj/src/main.py") == (project / "src" / "main.py").read_bytes()
+
+
+def test_precompressed_files_are_stored(project):
+    root = str(project)
+    zf = _unzip(stream_zip(iter_zip_entries(root, [str(project / "src")])))
+    assert zf.getinfo("src/logo.png").compress_type == zipfile.ZIP_STORED
+    main = zf.getinfo("src/main.py")
+    assert main.compress_type == zipfile.ZIP_DEFLATED
+    assert main.compress_size < main.file_size
+
+
+def test_selection_uses_item_names(project):
+    root = str(project)
+    paths = [str(project / "README.md"), str(project / "src" / "pkg")]
+    zf = _unzip(stream_zip(iter_zip_entries(root, paths)))
+    assert sorted(zf.namelist()) == ["README.md", "pkg/", "pkg/mod.py"]
+
+
+def test_large_file_is_streamed_in_chunks(tmp_path):
+    data = os.urandom(ZIP_READ_SIZE * 4)
+    (tmp_path / "blob.bin").write_bytes(data)
+    chunks = list(stream_zip(iter_zip_entries(str(tmp_path), [str(tmp_path / "blob.bin")])))
+    assert len(chunks) > 4
+    assert max(map(len, chunks)) <= ZIP_READ_SIZE * 2
+    assert _unzip(chunks).read("blob.bin") == data
+
+
+def test_vanished_file_is_skipped(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    entries = [
+        (str(tmp_path / "gone.txt"), "gone.txt", False),
+        (str(tmp_path / "a.txt"), "a.txt", False),
+    ]
+    zf = _unzip(stream_zip(iter(entries)))
+    assert zf.namelist() == ["a.txt"]
@@ -0,0 +1,38 @@
+"""줄 단위 편집(patch) 적용과 내용 해시.
+
+편집은 기준 텍스트를 "\\n"으로 나눈 줄 목록에 대해 {start, end, lines}로 표현한다.
+base_lines[start:end]를 lines로 바꾸며, 모든 편집은 같은 기준 텍스트의 좌표를 쓴다.
+문자 오프셋 대신 줄 번호를 쓰므로 클라이언트(UTF-16)와 서버의 문자열 인덱스 차이가 없다.
+"""
+
+import hashlib
+
+
+class PatchError(ValueError):
+    pass
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def decode_text(raw: bytes, encoding: str = "utf-8") -> str:
+    """open(..., encoding=encoding)으로 읽은 것과 같은 텍스트 (줄바꿈은 \\n으로 통일)."""
+    return raw.decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+
+
+def apply_line_edits(text: str, edits: list[tuple[int, int, list[str]]]) -> str:
+    """(start, end, lines) 편집들을 적용한다. 범위가 벗어나거나 겹치면 PatchError."""
+    lines = text.split("\n")
+    ordered = sorted(edits, key=lambda e: (e[0], e[1]))
+    prev_end = 0
+    for start, end, _ in ordered:
+        if start < 0 or start > end or end > len(lines):
+            raise PatchError(f"Edit range {start}-{end} out of bounds")
+        if start < prev_end:
+            raise PatchError("Overlapping edits")
+        prev_end = end
+    # 뒤에서부터 적용해야 앞쪽 좌표가 바뀌지 않는다
+    for start, end, new_lines in reversed(ordered):
+        lines[start:end] = new_lines
+    return "\n".join(lines)
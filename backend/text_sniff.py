@@ -0,0 +1,128 @@
+"""파일 앞부분만 보고 텍스트/바이너리와 인코딩을 판별한다.
+
+BOM → NUL 바이트 → 제어 문자 비율 → UTF-8 → 대체 인코딩(CP949, CP1252) 순서로 본다.
+대체 인코딩은 디코딩에 성공해도 결과가 그 언어의 글자로 보일 때만 받아들인다 — Latin-1 텍스트도
+CP949로는 "디코딩"되는 경우가 많기 때문이다. 결과는 (mtime, 크기, inode)가 같은 동안 캐시한다.
+"""
+
+import codecs
+import os
+import threading
+from collections import OrderedDict
+
+SNIFF_SIZE = 8192
+SNIFF_CACHE_MAX_ENTRIES = 10_000
+MAX_CONTROL_RATIO = 0.1
+
+# utf-32 LE BOM은 utf-16 LE BOM으로 시작하므로 먼저 본다
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# 텍스트에 흔히 나오는 제어 문자: \b \t \n \f \r ESC
+_TEXT_CONTROLS = b"\b\t\n\f\r\x1b"
+_OTHER_CONTROLS = bytes(b for b in range(32) if b not in _TEXT_CONTROLS) + b"\x7f"
+FALLBACK_ENCODINGS = ("cp949", "cp1252")
+
+
+def _is_korean(ch: str) -> bool:
+    cp = ord(ch)
+    return (
+        0xAC00 <= cp <= 0xD7A3  # 한글 음절
+        or 0x3130 <= cp <= 0x318F  # 호환용 자모
+        or 0x4E00 <= cp <= 0x9FFF  # 한자
+        or 0x3000 <= cp <= 0x303F  # CJK 문장 부호
+        or 0xFF00 <= cp <= 0xFFEF  # 전각 문자
+    )
+
+
+def _plausible(text: str, encoding: str) -> bool:
+    if encoding != "cp949":
+        return True
+    non_ascii = [c for c in text if ord(c) > 0x7F]
+    return sum(map(_is_korean, non_ascii)) >= 0.9 * len(non_ascii)
+
+
+def _decode(data: bytes, encoding: str, complete: bool) -> str | None:
+    # 앞부분만 읽었다면 끝에서 잘린 멀티바이트 문자는 오류가 아니다
+    decoder = codecs.getincrementaldecoder(encoding)("strict")
+    try:
+        return decoder.decode(data, final=complete)
+    except UnicodeDecodeError:
+        return None
+
+
+def detect_encoding(data: bytes, complete: bool = True) -> str | None:
+    """텍스트면 인코딩 이름, 바이너리로 보이면 None.
+
+    complete가 False면 data는 파일의 앞부분이다.
+    """
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    if b"\0" in data:
+        return None
+    if data:
+        controls = len(data) - len(data.translate(None, _OTHER_CONTROLS))
+        if controls > MAX_CONTROL_RATIO * len(data):
+            return None
+    if _decode(data, "utf-8", complete) is not None:
+        return "utf-8"
+    for encoding in FALLBACK_ENCODINGS:
+        text = _decode(data, encoding, complete)
+        if text is not None and _plausible(text, encoding):
+            return encoding
+    return None
+
+
+def _signature(st: os.stat_result) -> tuple[int, int, int]:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class SniffCache:
+    """파일 경로 → 판별 결과 (LRU). stat이 바뀌면 다시 판별한다."""
+
+    def __init__(self, max_entries: int = SNIFF_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[tuple[int, int, int], str | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def sniff(self, path: str, st: os.stat_result) -> str | None:
+        """path의 앞부분 SNIFF_SIZE 바이트로 인코딩을 판별한다. 바이너리면 None."""
+        signature = _signature(st)
+        with self._lock:
+            item = self._items.get(path)
+            if item is not None and item[0] == signature:
+                self._items.move_to_end(path)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+        with open(path, "rb") as f:
+            prefix = f.read(SNIFF_SIZE)
+        encoding = detect_encoding(prefix, complete=st.st_size <= SNIFF_SIZE)
+        self.remember(path, st, encoding)
+        return encoding
+
+    def remember(self, path: str, st: os.stat_result, encoding: str | None):
+        """전체를 읽어 보니 앞부분 판별이 틀렸을 때 고친 결과를 넣는다."""
+        with self._lock:
+            self._items[path] = (_signature(st), encoding)
+            self._items.move_to_end(path)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+sniff_cache = SniffCache()
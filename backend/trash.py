@@ -0,0 +1,235 @@
+"""휴지통 기반 삭제.
+
+삭제는 대상을 프로젝트 루트의 TRASH_DIR_NAME 아래로 rename만 하므로 크기와 상관없이 즉시 끝난다.
+같은 파일시스템 안의 rename이어야 하므로 휴지통은 프로젝트마다 따로 둔다.
+
+    <root>/.keep_vibing_trash/<id>.json   원래 경로, 삭제 시각
+    <root>/.keep_vibing_trash/<id>/<name> 옮겨진 파일 또는 디렉터리
+
+보관 기간(KEEP_VIBING_TRASH_DAYS, 기본 7일)이 지난 항목은 TrashPurger가 초당 파일 수를 제한하며
+천천히 지운다. 그 전까지는 원래 위치로 복원할 수 있다.
+"""
+
+import errno
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from collections.abc import Callable
+
+from fastapi import HTTPException
+
+from backend import file_ops
+
+logger = logging.getLogger(__name__)
+
+TRASH_DIR_NAME = ".keep_vibing_trash"
+TRASH_RETENTION_SECONDS = float(os.environ.get("KEEP_VIBING_TRASH_DAYS", "7")) * 86400
+PURGE_INTERVAL = 60.0
+PURGE_FILES_PER_SECOND = 2000  # 지우는 속도 상한 — 대량 unlink가 다른 I/O를 밀어내지 않도록
+PURGE_BATCH = 200
+
+_ITEM_ID_RE = re.compile(r"[0-9a-f]{16}")
+
+
+def trash_dir(root: str) -> str:
+    return os.path.join(root, TRASH_DIR_NAME)
+
+
+def _ensure_trash_dir(root: str) -> str:
+    d = trash_dir(root)
+    if not os.path.isdir(d):
+        os.makedirs(d, exist_ok=True)
+        # 프로젝트의 git 상태에 휴지통이 나타나지 않게 한다
+        with open(os.path.join(d, ".gitignore"), "w") as f:
+            f.write("*\n")
+    return d
+
+
+def move_to_trash(path: str, root: str) -> dict | None:
+    """path를 root의 휴지통으로 옮기고 항목 정보를 반환한다.
+
+    rename할 수 없으면(루트 자신, 휴지통 안, 다른 파일시스템) None — 호출 측이 바로 지운다.
+    """
+    trash = trash_dir(root)
+    if path == root or path == trash or path.startswith(trash + os.sep):
+        return None
+    if not os.path.lexists(path):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    d = _ensure_trash_dir(root)
+    item_id = secrets.token_hex(8)
+    item_dir = os.path.join(d, item_id)
+    meta = {
+        "id": item_id,
+        "path": path.replace("\\", "/"),
+        "name": os.path.basename(path),
+        "is_dir": os.path.isdir(path) and not os.path.islink(path),
+        "deleted_at": time.time(),
+    }
+    os.mkdir(item_dir)
+    meta_path = item_dir + ".json"
+    try:
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.rename(path, os.path.join(item_dir, meta["name"]))
+    except OSError as e:
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        os.rmdir(item_dir)
+        if e.errno == errno.EXDEV:  # 프로젝트 안에 마운트된 다른 파일시스템
+            return None
+        raise
+    return _with_expiry(meta)
+
+
+def _with_expiry(meta: dict) -> dict:
+    return {**meta, "expires_at": meta["deleted_at"] + TRASH_RETENTION_SECONDS}
+
+
+def _read_meta(meta_path: str) -> dict | None:
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_items(roots: list[str]) -> list[dict]:
+    items = []
+    for root in roots:
+        d = trash_dir(root)
+        try:
+            names = os.listdir(d)
+        except OSError:
+            continue
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext != ".json" or not _ITEM_ID_RE.fullmatch(stem):
+                continue
+            meta = _read_meta(os.path.join(d, name))
+            if meta is not None:
+                items.append(_with_expiry(meta))
+    items.sort(key=lambda m: m["deleted_at"], reverse=True)
+    return items
+
+
+def find_item(item_id: str, roots: list[str]) -> tuple[str, dict]:
+    """(항목 디렉터리, 메타데이터). 없으면 404."""
+    if _ITEM_ID_RE.fullmatch(item_id):
+        for root in roots:
+            item_dir = os.path.join(trash_dir(root), item_id)
+            meta = _read_meta(item_dir + ".json")
+            if meta is not None and os.path.isdir(item_dir):
+                return item_dir, meta
+    raise HTTPException(status_code=404, detail="Trash item not found")
+
+
+def restore_item(item_dir: str, meta: dict, dest: str):
+    """휴지통 항목을 dest로 되돌린다. dest는 호출 측이 겹치지 않게 정한다."""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    os.rename(os.path.join(item_dir, meta["name"]), dest)
+    os.remove(item_dir + ".json")
+    os.rmdir(item_dir)
+
+
+def purge_item(item_dir: str, progress=None):
+    """항목을 실제로 지운다. 메타데이터는 마지막에 지워 중단돼도 다음 purge에서 이어진다."""
+    file_ops.remove_tree(item_dir, progress)
+    try:
+        os.remove(item_dir + ".json")
+    except FileNotFoundError:
+        pass
+
+
+class _PurgeStopped(Exception):
+    pass
+
+
+class _Throttle:
+    """file_ops의 progress 역할. PURGE_BATCH개마다 속도 상한에 맞춰 쉰다."""
+
+    def __init__(self, stop: threading.Event):
+        self._stop = stop
+        self._count = 0
+        self._batch_started = time.monotonic()
+
+    def advance(self, files: int = 0, nbytes: int = 0):
+        self._count += files
+
+    def check_cancelled(self):
+        if self._count >= PURGE_BATCH:
+            budget = self._count / PURGE_FILES_PER_SECOND
+            elapsed = time.monotonic() - self._batch_started
+            if budget > elapsed and self._stop.wait(budget - elapsed):
+                raise _PurgeStopped
+            self._count = 0
+            self._batch_started = time.monotonic()
+        if self._stop.is_set():
+            raise _PurgeStopped
+
+
+class TrashPurger:
+    """보관 기간이 지난 휴지통 항목을 백그라운드 스레드에서 지운다."""
+
+    def __init__(self):
+        self._roots: Callable[[], list[str]] = list
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, roots: Callable[[], list[str]]):
+        if self._thread is not None:
+            return
+        self._roots = roots
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trash-purger", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def purge_expired(self, roots: list[str] | None = None, now: float | None = None) -> int:
+        """만료된 항목(메타데이터 없이 남은 디렉터리 포함)을 지우고 지운 항목 수를 반환한다."""
+        cutoff = (time.time() if now is None else now) - TRASH_RETENTION_SECONDS
+        purged = 0
+        for root in self._roots() if roots is None else roots:
+            d = trash_dir(root)
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                continue
+            for entry in entries:
+                if not _ITEM_ID_RE.fullmatch(entry.name) or not entry.is_dir(follow_symlinks=False):
+                    continue
+                meta = _read_meta(entry.path + ".json")
+                try:
+                    deleted_at = meta["deleted_at"] if meta else entry.stat().st_mtime
+                except OSError:
+                    continue
+                if deleted_at > cutoff:
+                    continue
+                try:
+                    purge_item(entry.path, _Throttle(self._stop))
+                    purged += 1
+                except _PurgeStopped:
+                    return purged
+                except OSError as e:
+                    logger.warning("failed to purge %s: %s", entry.path, e)
+        return purged
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.purge_expired()
+            except Exception:
+                logger.exception("trash purge failed")
+            self._stop.wait(PURGE_INTERVAL)
+
+
+trash_purger = TrashPurger()
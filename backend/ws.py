@@ -1,8 +1,11 @@
 import asyncio
+import time
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 
 from backend.auth import verify_token
+from backend.fs_events import fs_events
+from backend.jobs import job_manager
 from backend.session_manager import (
     get_output_buffer,
     get_session,
@@ -11,11 +14,42 @@ from backend.session_manager import (
     unregister_client,
     write_to_session,
 )
+from backend.store import get_project
 
 RESIZE_PREFIX = "\x01RESIZE:"
+# 서버 재시작으로 닫는다는 표준 종료 코드 — 클라이언트는 다시 연결하면 된다
+SERVICE_RESTART = 1012
 
 router = APIRouter()
 
+# 열려 있는 연결이 읽는 큐. drain_websockets()가 각 큐 끝에 None을 넣어 연결을 닫게 한다
+_open_queues: set[asyncio.Queue] = set()
+_draining = False
+
+
+def _close_code() -> int:
+    return SERVICE_RESTART if _draining else 1000
+
+
+def _end_queue(queue: asyncio.Queue):
+    """쌓인 메시지 뒤에 종료 표시(None)를 넣는다. 큐가 가득 차면 가장 오래된 것을 버린다."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(None)
+
+
+async def drain_websockets(timeout: float) -> int:
+    """서버 종료 전에 호출한다. 각 연결이 큐에 쌓인 출력을 모두 보낸 뒤 1012로 닫게 하고
+    timeout초까지 기다린다. 그때까지 닫히지 않은 연결 수를 반환한다."""
+    global _draining
+    _draining = True
+    for queue in list(_open_queues):
+        _end_queue(queue)
+    deadline = time.monotonic() + timeout
+    while _open_queues and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return len(_open_queues)
+
 
 @router.websocket("/ws/{session_id}")
 async def websocket_terminal(websocket: WebSocket, session_id: str):
@@ -41,6 +75,7 @@ async def websocket_terminal(websocket: WebSocket, session_id: str):
     if not client_queue:
         await websocket.close(code=4004, reason="Session not found")
         return
+    _open_queues.add(client_queue)
 
     # Send buffered history to the new client
     history = get_output_buffer(session_id)
@@ -49,6 +84,7 @@ async def websocket_terminal(websocket: WebSocket, session_id: str):
             await websocket.send_text(history)
         except Exception:
             unregister_client(session_id, client_queue)
+            _open_queues.discard(client_queue)
             return
 
     # If session already dead, notify and close
@@ -58,6 +94,7 @@ async def websocket_terminal(websocket: WebSocket, session_id: str):
         except Exception:
             pass
         unregister_client(session_id, client_queue)
+        _open_queues.discard(client_queue)
         return
 
     async def pty_to_ws():
@@ -107,6 +144,104 @@ async def websocket_terminal(websocket: WebSocket, session_id: str):
 
     # Gracefully close the WebSocket
     try:
-        await websocket.close()
+        await websocket.close(code=_close_code())
+    except Exception:
+        pass
+    _open_queues.discard(client_queue)
+
+
+@router.websocket("/ws/fs/{project_id}")
+async def websocket_fs_events(websocket: WebSocket, project_id: str):
+    """프로젝트의 파일 변경 배치를 JSON으로 전달한다. 클라이언트→서버 메시지는 무시한다."""
+    token = websocket.query_params.get("token")
+    if not token:
+        await websocket.close(code=4001, reason="Token required")
+        return
+    try:
+        verify_token(token)
+    except Exception:
+        await websocket.close(code=4001, reason="Invalid token")
+        return
+
+    project = get_project(project_id)
+    if not project:
+        await websocket.close(code=4004, reason="Project not found")
+        return
+
+    await websocket.accept()
+    queue = fs_events.subscribe(project_id, project["path"])
+    _open_queues.add(queue)
+
+    async def events_to_ws():
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            try:
+                await websocket.send_json(message)
+            except Exception:
+                break
+
+    async def drain_ws():
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        except Exception:
+            pass
+
+    try:
+        done, pending = await asyncio.wait(
+            [asyncio.create_task(events_to_ws()), asyncio.create_task(drain_ws())],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for task in pending:
+            task.cancel()
+    finally:
+        fs_events.unsubscribe(project_id, queue)
+
+    try:
+        await websocket.close(code=_close_code())
+    except Exception:
+        pass
+    _open_queues.discard(queue)
+
+
+@router.websocket("/ws/jobs/{job_id}")
+async def websocket_job_progress(websocket: WebSocket, job_id: str):
+    """작업 상태를 진행될 때마다 JSON으로 보내고, 작업이 끝나면 연결을 닫는다."""
+    token = websocket.query_params.get("token")
+    if not token:
+        await websocket.close(code=4001, reason="Token required")
+        return
+    try:
+        verify_token(token)
+    except Exception:
+        await websocket.close(code=4001, reason="Invalid token")
+        return
+
+    try:
+        queue = job_manager.subscribe(job_id)
+    except HTTPException:
+        await websocket.close(code=4004, reason="Job not found")
+        return
+
+    await websocket.accept()
+    _open_queues.add(queue)
+    try:
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            await websocket.send_json(message)
+    except Exception:
+        pass
+    finally:
+        job_manager.unsubscribe(job_id, queue)
+
+    try:
+        await websocket.close(code=_close_code())
     except Exception:
         pass
+    _open_queues.discard(queue)
@@ -0,0 +1,137 @@
+"""디렉터리·선택 항목을 ZIP으로 만들면서 바로 내보낸다.
+
+아카이브를 디스크나 메모리에 통째로 만들지 않는다. zipfile은 seek할 수 없는 출력에 쓰면
+각 항목 뒤에 데이터 디스크립터를 붙이므로, 쓰인 바이트를 조각 단위로 꺼내 흘려보내면 된다.
+메모리 사용량은 읽기 단위(ZIP_READ_SIZE)와 압축기 버퍼 정도로 일정하다.
+"""
+
+import logging
+import os
+import zipfile
+from collections.abc import Iterator
+
+from backend.ignore import HIDDEN_DIRS, ignore_stack_for
+
+logger = logging.getLogger(__name__)
+
+ZIP_READ_SIZE = 256 * 1024
+
+# 이미 압축된 형식 — 다시 deflate해도 줄지 않고 CPU만 쓴다
+STORED_EXTENSIONS = {
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".rar", ".lz4", ".br",
+    ".jar", ".whl", ".apk", ".docx", ".xlsx", ".pptx", ".odt", ".epub",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".heic",
+    ".mp3", ".m4a", ".aac", ".ogg", ".opus", ".flac",
+    ".mp4", ".m4v", ".mov", ".mkv", ".webm", ".avi",
+    ".woff", ".woff2",
+}
+
+
+def is_precompressed(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in STORED_EXTENSIONS
+
+
+class _ChunkSink:
+    """zipfile이 쓰는 바이트를 모아 두는 seek 불가능한 출력."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip_entries(root: str, paths: list[str]) -> Iterator[tuple[str, str, bool]]:
+    """(절대 경로, 아카이브 안 이름, 디렉터리 여부)를 차례로 낸다.
+
+    선택한 항목은 자기 이름으로 아카이브 최상위에 들어간다. 그 아래는 HIDDEN_DIRS와
+    .gitignore·프로젝트 무시 규칙에 걸리는 경로를 건너뛰고, 심볼릭 링크 디렉터리는 따라가지 않는다.
+    """
+    seen: set[str] = set()
+    for path in paths:
+        name = os.path.basename(path) or os.path.basename(root)
+        if name in seen:
+            continue  # 다른 디렉터리의 같은 이름 — 먼저 고른 쪽만 담는다
+        seen.add(name)
+        if not os.path.isdir(path):
+            yield path, name, False
+            continue
+        yield path, name, True
+        stack = [(path, name, ignore_stack_for(root, path))]
+        while stack:
+            dir_path, arc_dir, ignore = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                logger.warning("zip: cannot list %s: %s", dir_path, e)
+                continue
+            subdirs = []
+            for entry in entries:
+                if entry.name in HIDDEN_DIRS:
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if not is_dir and not entry.is_file():
+                        continue  # 디렉터리 링크, 소켓, FIFO 등
+                except OSError:
+                    continue
+                if ignore.is_ignored(entry.path, is_dir):
+                    continue
+                arcname = f"{arc_dir}/{entry.name}"
+                if is_dir:
+                    subdirs.append((entry.path, arcname))
+                else:
+                    yield entry.path, arcname, False
+            # 이름순으로 나오도록 거꾸로 쌓는다
+            for sub_path, sub_arc in reversed(subdirs):
+                yield sub_path, sub_arc, True
+                stack.append((sub_path, sub_arc, ignore.child(sub_path)))
+
+
+def stream_zip(entries: Iterator[tuple[str, str, bool]]) -> Iterator[bytes]:
+    """entries를 ZIP으로 묶으며 만들어지는 바이트 조각을 낸다.
+
+    도중에 사라지거나 읽을 수 없는 파일은 건너뛴다. 이미 쓰기 시작한 파일이 실패하면
+    읽은 데까지만 담긴다 — 헤더가 이미 나갔으므로 되돌릴 수 없다.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path, arcname, is_dir in entries:
+            if is_dir:
+                zf.mkdir(arcname)
+            else:
+                try:
+                    info = zipfile.ZipInfo.from_file(path, arcname)
+                    src = open(path, "rb")
+                except OSError as e:
+                    logger.warning("zip: skipping %s: %s", path, e)
+                    continue
+                # 압축 수준을 따로 주지 않으면 zlib 기본값(6)이다
+                stored = is_precompressed(arcname)
+                info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                with src, zf.open(info, "w") as dst:
+                    while True:
+                        try:
+                            block = src.read(ZIP_READ_SIZE)
+                        except OSError as e:
+                            logger.warning("zip: read failed for %s: %s", path, e)
+                            break
+                        if not block:
+                            break
+                        dst.write(block)
+                        if data := sink.drain():
+                            yield data
+            if data := sink.drain():
+                yield data
+    if data := sink.drain():
+        yield data  # 중앙 디렉터리
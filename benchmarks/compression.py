@@ -0,0 +1,81 @@
+"""응답 압축·JSON 직렬화 벤치마크: 대표 페이로드별 크기와 응답 하나당 CPU 시간을 잰다.
+
+    python benchmarks/compression.py --entries 2000 --file backend/api.py
+
+페이로드는 디렉터리 목록(/api/files), 파일 내용(/api/files/content), 트리(/api/files/tree)
+모양을 흉내 낸다. brotli·zstd는 모듈이 설치돼 있을 때만 나온다.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import fast_json
+from backend.compress import AVAILABLE, CACHED_LEVELS, LEVELS, compress_bytes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def listing(n: int, prefix: str = "/home/user/project/src") -> list[dict]:
+    return [
+        {"name": f"module_{i:05d}.py", "path": f"{prefix}/module_{i:05d}.py", "is_dir": i % 7 == 0}
+        for i in range(n)
+    ]
+
+
+def payloads(entries: int, file_path: str) -> dict:
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    content = {"type": "text", "content": raw.decode("utf-8", "replace"), "hash": "0" * 64}
+    tree = {
+        "dirs": {f"/home/user/project/d{d}": listing(entries // 10, f"/d{d}") for d in range(10)},
+        "truncated": False,
+    }
+    return {"listing": listing(entries), "content": content, "tree": tree}
+
+
+def per_call_ms(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--file", default=os.path.join(ROOT, "backend", "api.py"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = payloads(args.entries, args.file)
+
+    print(f"{'payload':<10}{'encoder':<10}{'ms':>8}{'bytes':>10}")
+    for name, obj in data.items():
+        std_ms = per_call_ms(lambda obj=obj: fast_json._dumps_std(obj), args.repeat)
+        fast_ms = per_call_ms(lambda obj=obj: fast_json.dumps(obj), args.repeat)
+        size = len(fast_json.dumps(obj))
+        print(f"{name:<10}{'json':<10}{std_ms:>8.2f}{size:>10}")
+        encoder = "orjson" if fast_json.orjson is not None else "json"
+        print(f"{name:<10}{encoder:<10}{fast_ms:>8.2f}{size:>10}")
+
+    print()
+    print(f"{'payload':<10}{'encoding':<10}{'level':>6}{'ms':>8}{'bytes':>10}{'ratio':>8}")
+    for name, obj in data.items():
+        body = fast_json.dumps(obj)
+        print(f"{name:<10}{'identity':<10}{'':>6}{0:>8.2f}{len(body):>10}{1:>8.2f}")
+        for encoding in AVAILABLE:
+            for level in sorted({LEVELS[encoding], CACHED_LEVELS[encoding]}):
+                ms = per_call_ms(
+                    lambda b=body, e=encoding, lv=level: compress_bytes(b, e, lv), args.repeat
+                )
+                size = len(compress_bytes(body, encoding, level))
+                ratio = len(body) / size
+                print(f"{name:<10}{encoding:<10}{level:>6}{ms:>8.2f}{size:>10}{ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""런타임 프로필 벤치마크: 같은 앱을 프로필별로 띄워 처리량·지연·종료 시간을 비교한다.
+
+    uv run python benchmarks/runtime.py --concurrency 64 --duration 10
+
+프로필마다 `python -m backend.runtime`을 빈 포트에 띄우고, keep-alive 연결 여러 개로 인증이
+필요한 JSON 엔드포인트(기본 /api/projects)를 두드린다. 부하 생성기도 같은 기계의 파이썬이라
+절대값보다 프로필 간 비율을 보면 된다. 마지막 열은 SIGINT를 보낸 뒤 프로세스가 끝날 때까지의
+시간이다.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.auth import create_token
+from backend.runtime import PROFILES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(profile: str, port: int) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "backend.runtime", "--profile", profile, "--port", str(port)]
+    return subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_ready(base: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/api/projects")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"server at {base} did not start")
+
+
+async def load(base: str, path: str, token: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+    async with httpx.AsyncClient(base_url=base, limits=limits, headers=headers) as client:
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    res = await client.get(path)
+                    ok = res.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    latencies.sort()
+    return {
+        "rps": len(latencies) / duration,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def stop_server(proc: subprocess.Popen) -> float:
+    start = time.perf_counter()
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=sorted(PROFILES), choices=PROFILES)
+    parser.add_argument("--path", default="/api/projects")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    token = create_token("benchmark")
+    print(f"{'profile':<13}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'stop s':>8}")
+    for profile in args.profiles:
+        port = free_port()
+        base = f"http://127.0.0.1:{port}"
+        proc = start_server(profile, port)
+        try:
+            await wait_ready(base)
+            result = await load(base, args.path, token, args.concurrency, args.duration)
+        finally:
+            stopped = stop_server(proc)
+        print(
+            f"{profile:<13}{result['rps']:>10.0f}{result['p50']:>9.2f}{result['p99']:>9.2f}"
+            f"{result['errors']:>8}{stopped:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
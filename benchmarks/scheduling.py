@@ -0,0 +1,144 @@
+"""혼합 부하 벤치마크: 대량 전송이 도는 동안 타이핑·목록 조회 지연을 잰다.
+
+    python benchmarks/scheduling.py --bulk-clients 3 --duration 10
+
+한 프로세스 안에서 run_fs를 직접 부른다. 기기(클라이언트)마다 업로드 여러 개를 동시에 흘려보내며
+1 MiB씩 임시 파일에 쓰는 동안, 다른 기기가 키 입력(파이프에 몇 바이트 쓰기, "pty")과 디렉터리
+목록("list")을 주기적으로 보낸다. 같은 부하를 두 가지 배치로 돌린다:
+
+- classes: 현재 설정 (등급별 풀과 클라이언트별 상한)
+- shared: 예전처럼 모든 작업이 워커 4개짜리 풀 하나를 나눠 쓰고 상한도 없음
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import fs_executor
+from backend.fs_executor import PriorityClass, current_client, run_fs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHUNK = b"\0" * (1024 * 1024)
+KEY_INTERVAL = 0.02
+LIST_INTERVAL = 0.1
+
+DEFAULT_CLASSES = dict(fs_executor.PRIORITY_CLASSES)
+DEFAULT_OPS = dict(fs_executor.OP_CLASSES)
+DEFAULT_DEFAULT = fs_executor.DEFAULT_CLASS
+
+
+def configure(layout: str):
+    fs_executor.shutdown_fs_executor()
+    fs_executor._slots = fs_executor._ClientSlots()
+    if layout == "shared":
+        fs_executor.PRIORITY_CLASSES = {"shared": PriorityClass(workers=4, per_client=None)}
+        fs_executor.OP_CLASSES = {}
+        fs_executor.DEFAULT_CLASS = "shared"
+    else:
+        fs_executor.PRIORITY_CLASSES = dict(DEFAULT_CLASSES)
+        fs_executor.OP_CLASSES = dict(DEFAULT_OPS)
+        fs_executor.DEFAULT_CLASS = DEFAULT_DEFAULT
+
+
+def write_chunks(path: str, n: int):
+    # 업로드 조각 하나: 쓰고 fsync까지 — 디스크를 실제로 붙잡는다
+    with open(path, "ab") as f:
+        for _ in range(n):
+            f.write(CHUNK)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def bulk_client(client: str, workdir: str, streams: int, deadline: float) -> int:
+    current_client.set(client)
+    written = 0
+
+    async def stream(i: int):
+        nonlocal written
+        path = os.path.join(workdir, f"{client}-{i}.bin")
+        while time.monotonic() < deadline:
+            await run_fs("upload", write_chunks, path, 4)
+            written += 4 * len(CHUNK)
+            if os.path.getsize(path) > 256 * len(CHUNK):
+                os.remove(path)
+
+    await asyncio.gather(*(stream(i) for i in range(streams)))
+    return written
+
+
+async def interactive_client(deadline: float) -> tuple[list[float], list[float]]:
+    current_client.set("typist")
+    read_fd, write_fd = os.pipe()
+    keys: list[float] = []
+    lists: list[float] = []
+
+    async def typing():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            await run_fs("pty", os.write, write_fd, b"k")
+            await run_fs("pty", os.read, read_fd, 16)
+            keys.append(time.perf_counter() - start)
+            await asyncio.sleep(KEY_INTERVAL)
+
+    async def listing():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            await run_fs("list", lambda: [e.name for e in os.scandir(ROOT)])
+            lists.append(time.perf_counter() - start)
+            await asyncio.sleep(LIST_INTERVAL)
+
+    try:
+        await asyncio.gather(typing(), listing())
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    return keys, lists
+
+
+def summary(samples: list[float]) -> str:
+    if not samples:
+        return f"{'-':>9}{'-':>9}{'-':>9}"
+    ordered = sorted(samples)
+    p99 = ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)]
+    return f"{statistics.median(ordered) * 1000:>9.2f}{p99 * 1000:>9.2f}{ordered[-1] * 1000:>9.1f}"
+
+
+async def run(layout: str, bulk_clients: int, streams: int, duration: float, workdir: str):
+    configure(layout)
+    deadline = time.monotonic() + duration
+    bulk = [
+        bulk_client(f"device{i}", workdir, streams, deadline) for i in range(bulk_clients)
+    ]
+    *written, (keys, lists) = await asyncio.gather(*bulk, interactive_client(deadline))
+    mb_s = sum(written) / duration / (1024 * 1024)
+    print(f"{layout:<9}{summary(keys)}{summary(lists)}{mb_s:>10.0f}")
+    fs_executor.shutdown_fs_executor()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--layouts", nargs="+", default=["shared", "classes"])
+    parser.add_argument("--bulk-clients", type=int, default=3)
+    parser.add_argument("--streams", type=int, default=4, help="uploads per bulk client")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--dir", help="where bulk data is written (default: temp dir)")
+    args = parser.parse_args()
+
+    print(
+        f"{'layout':<9}{'key p50':>9}{'key p99':>9}{'key max':>9}"
+        f"{'ls p50':>9}{'ls p99':>9}{'ls max':>9}{'bulk MB/s':>10}"
+    )
+    with tempfile.TemporaryDirectory(dir=args.dir) as workdir:
+        for layout in args.layouts:
+            await run(layout, args.bulk_clients, args.streams, args.duration, workdir)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
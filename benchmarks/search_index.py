@@ -0,0 +1,99 @@
+"""검색 색인 벤치마크: 합성 저장소에서 색인 검색과 전체 스캔(brute force)을 비교한다.
+
+    python benchmarks/search_index.py --files 100000
+
+첫 실행은 저장소 생성과 색인 빌드까지 하므로 오래 걸린다. --dir을 주면 같은 저장소와
+색인(<dir>.index.db)을 다시 써서 재빌드(변경 없음) 시간도 볼 수 있다.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.fs_events import FsEventHub
+from backend.search_index import SearchIndex, iter_project_files
+
+WORDS = (
+    "alpha beta gamma delta epsilon request response handler session project file "
+    "buffer index query result error value config router socket stream token cache"
+).split()
+QUERIES = [
+    ("literal, rare", "needle_000042", False),
+    ("literal, common", "handler", False),
+    ("regex with literal", r"def needle_\d+\(", True),
+    ("regex without literal", r"\d{3}-\d{4}", True),
+]
+
+
+def generate(root: str, n_files: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(n_files):
+        d = os.path.join(root, f"pkg{i % 100:02d}", f"mod{i // 100 % 50:02d}")
+        os.makedirs(d, exist_ok=True)
+        lines = []
+        for _ in range(rng.randint(20, 80)):
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10))))
+        if i % 1000 == 42:
+            lines.append(f"def needle_{i:06d}(x):")
+        with open(os.path.join(d, f"f{i}.py"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def brute_force(root: str, pattern: re.Pattern) -> int:
+    hits = 0
+    for rel, _ in iter_project_files(root):
+        try:
+            with open(os.path.join(root, rel), encoding="utf-8", errors="replace") as f:
+                if pattern.search(f.read()):
+                    hits += 1
+        except OSError:
+            pass
+    return hits
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--dir", help="reuse this directory instead of a temp one")
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix="search_bench_")
+    os.makedirs(root, exist_ok=True)
+    if not os.listdir(root):
+        _, ms = timed(lambda: generate(root, args.files))
+        print(f"generated {args.files} files in {ms / 1000:.1f}s under {root}")
+
+    hub = FsEventHub(use_inotify=False)
+    index = SearchIndex(root, root.rstrip("/") + ".index.db", hub)
+    _, ms = timed(lambda: (index.start(), index.wait_ready()))
+    status = index.status()
+    print(f"index build: {ms / 1000:.1f}s, {status['indexed_files']} files indexed")
+
+    print(f"{'query':<24}{'index ms':>10}{'brute ms':>10}{'files':>8}{'cands':>8}")
+    for label, q, regex in QUERIES:
+        results, index_ms = timed(
+            lambda q=q, regex=regex: list(index.search(q, regex=regex, max_matches=10**6))
+        )
+        done = results[-1]
+        pattern = re.compile(q if regex else re.escape(q), re.IGNORECASE)
+        hits, brute_ms = timed(lambda pattern=pattern: brute_force(root, pattern))
+        assert hits == done["files"], (label, hits, done["files"])
+        print(f"{label:<24}{index_ms:>10.0f}{brute_ms:>10.0f}{hits:>8}{done['candidates']:>8}")
+    index.close()
+    hub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import SessionHeader from "./components/SessionHeader";
 import ResizeHandle from "./components/ResizeHandle";
 import LoginPage from "./components/LoginPage";
 import BottomTabBar from "./components/BottomTabBar";
+import QuickOpen from "./components/QuickOpen";
 
 type MobilePanel = "files" | "editor" | "terminal";
 
@@ -49,6 +50,7 @@ function App() {
   const [prevSidebarWidth, setPrevSidebarWidth] = useState(DEFAULT_SIDEBAR_WIDTH);
   const [activePanel, setActivePanel] = useState<MobilePanel>("terminal");
   const [tabletSidebarOpen, setTabletSidebarOpen] = useState(false);
+  const [showQuickOpen, setShowQuickOpen] = useState(false);
   const { isMobile, isTablet } = useBreakpoint();
 
   const activeProject = projects.find((p) => p.id === activeProjectId) ?? null;
@@ -95,6 +97,18 @@ function App() {
     return () => { cancelled = true; };
   }, [isLoggedIn]);
 
+  // Ctrl/Cmd+P: quick open
+  useEffect(() => {
+    function handleKeyDown(e: KeyboardEvent) {
+      if ((e.ctrlKey || e.metaKey) && e.key.toLowerCase() === "p" && activeProjectId) {
+        e.preventDefault();
+        setShowQuickOpen(true);
+      }
+    }
+    window.addEventListener("keydown", handleKeyDown);
+    return () => window.removeEventListener("keydown", handleKeyDown);
+  }, [activeProjectId]);
+
   // Apply theme on change
   useEffect(() => {
     applyTheme(currentTheme);
@@ -190,12 +204,22 @@ function App() {
       onRefreshProjects={refreshProjects}
       onSelectProject={handleSelectProject}
       onSelectFile={handleSelectFile}
+      onQuickOpen={() => setShowQuickOpen(true)}
       onChangeTheme={handleChangeTheme}
     />
   );
 
+  const quickOpenElement = showQuickOpen && activeProjectId && (
+    <QuickOpen
+      projectId={activeProjectId}
+      onSelectFile={handleSelectFile}
+      onClose={() => setShowQuickOpen(false)}
+    />
+  );
+
   const editorElement = (
     <EditorPanel
+      projectId={activeProjectId}
       openFiles={openFiles}
       activeFilePath={activeFilePath}
       monacoTheme={currentTheme.monacoTheme}
@@ -250,6 +274,7 @@ function App() {
           </div>
           <BottomTabBar activePanel={activePanel} onChangePanel={setActivePanel} />
         </div>
+        {quickOpenElement}
       </div>
     );
   }
@@ -277,6 +302,7 @@ function App() {
             {terminalElement}
           </div>
         </div>
+        {quickOpenElement}
       </div>
     );
   }
@@ -295,6 +321,7 @@ function App() {
             onRefreshProjects={refreshProjects}
             onSelectProject={handleSelectProject}
             onSelectFile={handleSelectFile}
+            onQuickOpen={() => setShowQuickOpen(true)}
             onChangeTheme={handleChangeTheme}
           />
         </div>
@@ -315,6 +342,7 @@ function App() {
           </div>
         </div>
       </div>
+      {quickOpenElement}
     </div>
   );
 }
@@ -61,8 +61,10 @@ export default function Terminal({ sessionId, theme, onSessionEnd }: Props) {
       sendResize();
     };
 
-    ws.onclose = () => {
-      term.writeln("\r\n\x1b[31m[Session ended]\x1b[0m");
+    ws.onclose = (e) => {
+      // 1012: the server is restarting and flushed all pending output before closing
+      const reason = e.code === 1012 ? "Server restarting" : "Session ended";
+      term.writeln(`\r\n\x1b[31m[${reason}]\x1b[0m`);
       onSessionEndRef.current?.();
     };
 
@@ -6,6 +6,64 @@ export interface Project {
   session_id: string | null;
 }
 
+export type BatchOp =
+  | { op: "copy" | "move"; source: string; destination: string }
+  | { op: "delete"; path: string }
+  | { op: "create"; path: string; type: "file" | "directory" };
+
+export type BatchResult =
+  | { ok: true; path: string; trash_id?: string | null }
+  | { ok: false; status: number; error: string };
+
+export interface FoundFile {
+  path: string;
+  rel: string;
+  score: number;
+  positions: number[];
+}
+
+// M modified, A added, D deleted, R renamed, U conflict, ? untracked
+export type GitFlag = "M" | "A" | "D" | "R" | "U" | "?";
+
+export interface GitStatus {
+  state: string;
+  version: number;
+  branch: string | null;
+  files: Record<string, GitFlag>;
+  dirs: Record<string, GitFlag>;
+}
+
+export interface GitHunk {
+  old_start: number;
+  old_lines: number;
+  new_start: number;
+  new_lines: number;
+  header: string;
+  lines: string[];
+}
+
+export interface GitDiff {
+  path: string;
+  status: GitFlag | null;
+  binary: boolean;
+  truncated: boolean;
+  hunks: GitHunk[];
+}
+
+// Lines are 1-based and end_line is inclusive
+export interface OutlineSymbol {
+  name: string;
+  kind: string;
+  line: number;
+  end_line: number;
+  children: OutlineSymbol[];
+}
+
+export interface FileOutline {
+  language: string | null;
+  symbols: OutlineSymbol[];
+}
+
 const TOKEN_KEY = "kv_token";
 
 export function getToken(): string | null {
@@ -47,6 +105,32 @@ async function request<T>(url: string, options?: RequestInit): Promise<T> {
   return res.json();
 }
 
+/** 서버가 만드는 대로 내려보내는 ZIP을 받아 브라우저 다운로드로 저장한다. */
+export async function downloadZip(paths: string[]) {
+  const token = getToken();
+  const res = await fetch("/api/files/zip", {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify({ paths }),
+  });
+  if (!res.ok) {
+    const data = await res.json().catch(() => ({}));
+    throw new Error(data.detail || `Download failed: ${res.status}`);
+  }
+  const disposition = res.headers.get("Content-Disposition") ?? "";
+  const match = disposition.match(/filename\*=UTF-8''([^;]+)/);
+  const filename = match ? decodeURIComponent(match[1]) : "download.zip";
+  const url = URL.createObjectURL(await res.blob());
+  const a = document.createElement("a");
+  a.href = url;
+  a.download = filename;
+  a.click();
+  setTimeout(() => URL.revokeObjectURL(url), 1000);
+}
+
 export const api = {
   login: (username: string, password: string) =>
     request<{ token: string; username: string }>("/api/login", {
@@ -77,4 +161,33 @@ export const api = {
     request<{ status: string }>(`/api/projects/${projectId}/session`, {
       method: "DELETE",
     }),
+
+  getIgnorePatterns: (projectId: string) =>
+    request<{ patterns: string[] }>(`/api/projects/${projectId}/ignore`),
+
+  setIgnorePatterns: (projectId: string, patterns: string[]) =>
+    request<{ patterns: string[] }>(`/api/projects/${projectId}/ignore`, {
+      method: "PUT",
+      body: JSON.stringify({ patterns }),
+    }),
+
+  findFiles: (projectId: string, q: string, limit = 50) =>
+    request<{ results: FoundFile[]; state: string }>(
+      `/api/files/find?project_id=${projectId}&q=${encodeURIComponent(q)}&limit=${limit}`,
+    ),
+
+  gitStatus: (projectId: string) =>
+    request<GitStatus>(`/api/git/status?project_id=${projectId}`),
+
+  gitDiff: (path: string) =>
+    request<GitDiff>(`/api/git/diff?path=${encodeURIComponent(path)}`),
+
+  fileOutline: (path: string) =>
+    request<FileOutline>(`/api/files/outline?path=${encodeURIComponent(path)}`),
+
+  batchFiles: (ops: BatchOp[]) =>
+    request<{ results: BatchResult[] }>("/api/files/batch", {
+      method: "POST",
+      body: JSON.stringify({ ops }),
+    }),
 };
@@ -1,10 +1,13 @@
-import { useState, useEffect, useCallback } from "react";
+import { useState, useEffect, useCallback, useRef } from "react";
 import type { OpenFile } from "../App";
 import { getToken } from "../api";
+import { subscribeFsEvents } from "../fsEvents";
+import { lineEdits } from "../textPatch";
 import TabBar from "./TabBar";
 import CodeEditor from "./CodeEditor";
 import MarkdownViewer from "./MarkdownViewer";
 import ImageViewer from "./ImageViewer";
+import LargeFileViewer from "./LargeFileViewer";
 
 const IMAGE_EXTENSIONS = new Set([".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".bmp"]);
 
@@ -13,6 +16,7 @@ function getExtension(path: string): string {
 }
 
 interface Props {
+  projectId: string | null;
   openFiles: OpenFile[];
   activeFilePath: string | null;
   monacoTheme?: string;
@@ -21,6 +25,7 @@ interface Props {
 }
 
 export default function EditorPanel({
+  projectId,
   openFiles,
   activeFilePath,
   monacoTheme = "vs-dark",
@@ -30,24 +35,55 @@ export default function EditorPanel({
   const [fileContents, setFileContents] = useState<Record<string, string>>({});
   const [dirtyPaths, setDirtyPaths] = useState<Set<string>>(new Set());
   const [loadingPath, setLoadingPath] = useState<string | null>(null);
+  const [largePaths, setLargePaths] = useState<Set<string>>(new Set());
+  // Last content known to be on disk and its hash — the base for patch saves
+  const savedRef = useRef<Record<string, { content: string; hash: string }>>({});
+
+  const fetchContent = useCallback(async (path: string) => {
+    const token = getToken();
+    const res = await fetch(`/api/files/content?path=${encodeURIComponent(path)}`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+    });
+    if (res.status === 413) {
+      setLargePaths((prev) => new Set(prev).add(path));
+      return;
+    }
+    if (!res.ok) return;
+    const data = await res.json();
+    if (data.type === "text") {
+      savedRef.current[path] = { content: data.content, hash: data.hash };
+      setFileContents((prev) => ({ ...prev, [path]: data.content }));
+    }
+  }, []);
 
   const loadFile = useCallback(async (path: string) => {
-    if (fileContents[path] !== undefined) return;
+    if (fileContents[path] !== undefined || largePaths.has(path)) return;
     setLoadingPath(path);
     try {
-      const token = getToken();
-      const res = await fetch(`/api/files/content?path=${encodeURIComponent(path)}`, {
-        headers: token ? { Authorization: `Bearer ${token}` } : {},
-      });
-      if (!res.ok) return;
-      const data = await res.json();
-      if (data.type === "text") {
-        setFileContents((prev) => ({ ...prev, [path]: data.content }));
-      }
+      await fetchContent(path);
     } finally {
       setLoadingPath(null);
     }
-  }, [fileContents]);
+  }, [fileContents, largePaths, fetchContent]);
+
+  // Reload open files changed on disk (e.g. by Claude) unless they have unsaved edits
+  const openStateRef = useRef({ fileContents, dirtyPaths });
+  useEffect(() => {
+    openStateRef.current = { fileContents, dirtyPaths };
+  }, [fileContents, dirtyPaths]);
+  useEffect(() => {
+    if (!projectId) return;
+    return subscribeFsEvents(projectId, (msg) => {
+      const { fileContents: loaded, dirtyPaths: dirty } = openStateRef.current;
+      const changed =
+        msg.type === "overflow"
+          ? Object.keys(loaded)
+          : msg.changes.filter(([kind]) => kind !== "d").map(([, path]) => path);
+      for (const path of changed) {
+        if (loaded[path] !== undefined && !dirty.has(path)) fetchContent(path);
+      }
+    });
+  }, [projectId, fetchContent]);
 
   useEffect(() => {
     if (activeFilePath && !IMAGE_EXTENSIONS.has(getExtension(activeFilePath))) {
@@ -64,15 +100,38 @@ export default function EditorPanel({
     const content = fileContents[path];
     if (content === undefined) return;
     const token = getToken();
-    const res = await fetch("/api/files/content", {
-      method: "PUT",
-      headers: {
-        "Content-Type": "application/json",
-        ...(token ? { Authorization: `Bearer ${token}` } : {}),
-      },
-      body: JSON.stringify({ path, content }),
-    });
+    const headers = {
+      "Content-Type": "application/json",
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    };
+    const saved = savedRef.current[path];
+    // Send only the changed lines; the server rejects them if the file moved on
+    let res = saved
+      ? await fetch("/api/files/content", {
+          method: "PATCH",
+          headers,
+          body: JSON.stringify({
+            path,
+            base_hash: saved.hash,
+            edits: lineEdits(saved.content, content),
+          }),
+        })
+      : await fetch("/api/files/content", {
+          method: "PUT",
+          headers,
+          body: JSON.stringify({ path, content }),
+        });
+    if (res.status === 409) {
+      if (!window.confirm(`${path} changed on disk since it was opened. Overwrite it?`)) return;
+      res = await fetch("/api/files/content", {
+        method: "PUT",
+        headers,
+        body: JSON.stringify({ path, content }),
+      });
+    }
     if (res.ok) {
+      const data = await res.json();
+      savedRef.current[path] = { content, hash: data.hash };
       setDirtyPaths((prev) => {
         const next = new Set(prev);
         next.delete(path);
@@ -120,6 +179,10 @@ export default function EditorPanel({
       return <ImageViewer filePath={activeFilePath} />;
     }
 
+    if (largePaths.has(activeFilePath)) {
+      return <LargeFileViewer key={activeFilePath} filePath={activeFilePath} />;
+    }
+
     if (loadingPath === activeFilePath) {
       return <div className="editor-placeholder">Loading...</div>;
     }
@@ -1,15 +1,21 @@
 import { useState, useCallback, useRef, useEffect } from "react";
 import ContextMenu, { type MenuItem } from "./ContextMenu";
-import { getToken } from "../api";
+import GitDiffModal from "./GitDiffModal";
+import { api, downloadZip, getToken, type GitFlag, type GitStatus } from "../api";
 import { copyText } from "../clipboard";
+import { subscribeFsEvents, parentDir } from "../fsEvents";
+import { MULTIPART_MAX_SIZE, resumableUpload } from "../uploads";
+import { cancelJob, runJob, type Job } from "../jobs";
 
 interface FileEntry {
   name: string;
   path: string;
   is_dir: boolean;
+  git?: GitFlag;
 }
 
 interface Props {
+  projectId: string;
   rootPath: string;
   onSelectFile: (path: string) => void;
 }
@@ -20,6 +26,26 @@ interface TreeNode {
   isOpen: boolean;
 }
 
+interface TreeResponse {
+  dirs: Record<string, FileEntry[]>;
+  next_cursor: string | null;
+}
+
+// Directories are prefetched this many levels deep in a single request
+const PREFETCH_DEPTH = 2;
+const UNDO_TIMEOUT = 8000;
+// The server answers 304 until the git status version changes, so polling is cheap
+const GIT_POLL_INTERVAL = 4000;
+
+const GIT_FLAG_CLASS: Record<GitFlag, string> = {
+  M: "git-modified",
+  A: "git-added",
+  D: "git-deleted",
+  R: "git-renamed",
+  U: "git-conflict",
+  "?": "git-untracked",
+};
+
 function authHeaders(): Record<string, string> {
   const token = getToken();
   return token ? { Authorization: `Bearer ${token}` } : {};
@@ -31,13 +57,48 @@ function persistClipboard(v: ClipboardEntry | null) {
   _persistedClipboard = v;
 }
 
-export default function FileTree({ rootPath, onSelectFile }: Props) {
+// Keep expanded state and loaded children of entries that still exist after a refresh
+function mergeChildren(prev: TreeNode[] | null, fresh: TreeNode[]): TreeNode[] {
+  if (!prev) return fresh;
+  const byPath = new Map(prev.map((n) => [n.entry.path, n]));
+  return fresh.map((n) => {
+    const old = byPath.get(n.entry.path);
+    return old && old.entry.is_dir === n.entry.is_dir
+      ? { ...n, children: old.children, isOpen: old.isOpen }
+      : n;
+  });
+}
+
+function findNode(nodes: TreeNode[], path: string): TreeNode | null {
+  for (const node of nodes) {
+    if (node.entry.path === path) return node;
+    if (node.children) {
+      const found = findNode(node.children, path);
+      if (found) return found;
+    }
+  }
+  return null;
+}
+
+function collectLoadedDirs(nodes: TreeNode[], out: string[]) {
+  for (const node of nodes) {
+    if (node.children) {
+      out.push(node.entry.path);
+      collectLoadedDirs(node.children, out);
+    }
+  }
+}
+
+export default function FileTree({ projectId, rootPath, onSelectFile }: Props) {
   const [nodes, setNodes] = useState<TreeNode[]>([]);
+  const nodesRef = useRef<TreeNode[]>([]);
   const [loaded, setLoaded] = useState(false);
   const [clipboard, setClipboardState] = useState<ClipboardEntry | null>(
     () => _persistedClipboard,
   );
   const [isDragOver, setIsDragOver] = useState(false);
+  const [activeJob, setActiveJob] = useState<Job | null>(null);
+  const [trashed, setTrashed] = useState<{ id: string; name: string; parent: string } | null>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
   const uploadTargetRef = useRef<string>("");
 
@@ -59,6 +120,43 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
     originalPath?: string;
   } | null>(null);
 
+  const [diffPath, setDiffPath] = useState<string | null>(null);
+  // Latest git status for the project; null until the first answer (listing flags are used then)
+  const [gitStatus, setGitStatus] = useState<Pick<GitStatus, "files" | "dirs"> | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    let version = -1;
+    async function poll() {
+      try {
+        const status = await api.gitStatus(projectId);
+        if (cancelled || status.version === version) return;
+        version = status.version;
+        setGitStatus(status.state === "ready" ? status : null);
+      } catch {
+        // keep the last known flags
+      }
+    }
+    poll();
+    const timer = setInterval(poll, GIT_POLL_INTERVAL);
+    return () => {
+      cancelled = true;
+      clearInterval(timer);
+    };
+  }, [projectId]);
+
+  function gitFlag(entry: FileEntry): GitFlag | undefined {
+    if (!gitStatus) return entry.git;
+    const { files, dirs } = gitStatus;
+    const flag = files[entry.path] ?? (entry.is_dir ? dirs[entry.path] : undefined);
+    if (flag) return flag;
+    // Untracked directories are reported as a whole; everything below them is untracked too
+    for (let dir = parentDir(entry.path); dir.length > rootPath.length; dir = parentDir(dir)) {
+      if (files[dir] === "?") return "?";
+    }
+    return undefined;
+  }
+
   const fetchChildren = useCallback(async (dirPath: string): Promise<TreeNode[]> => {
     const res = await fetch(`/api/files?path=${encodeURIComponent(dirPath)}`, {
       headers: authHeaders(),
@@ -72,10 +170,32 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
     }));
   }, []);
 
+  const fetchTree = useCallback(async (dirPath: string): Promise<TreeNode[]> => {
+    const res = await fetch("/api/files/tree", {
+      method: "POST",
+      headers: { "Content-Type": "application/json", ...authHeaders() },
+      body: JSON.stringify({ path: dirPath, depth: PREFETCH_DEPTH }),
+    });
+    if (!res.ok) return [];
+    const data: TreeResponse = await res.json();
+    function build(path: string): TreeNode[] | null {
+      const entries = data.dirs[path];
+      if (!entries) return null;
+      return entries.map((entry) => ({
+        entry,
+        children: entry.is_dir ? build(entry.path) : null,
+        isOpen: false,
+      }));
+    }
+    // The requested directory is always the first key of the response
+    const rootKey = Object.keys(data.dirs)[0];
+    return (rootKey && build(rootKey)) || [];
+  }, []);
+
   // Load root on first render
   if (!loaded) {
     setLoaded(true);
-    fetchChildren(rootPath).then(setNodes);
+    fetchTree(rootPath).then(setNodes);
   }
 
   function updateNodeAtPath(
@@ -92,17 +212,52 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
     });
   }
 
-  async function refreshDir(dirPath: string) {
+  async function refreshDir(dirPath: string, keepOpenState = false) {
     const children = await fetchChildren(dirPath);
     if (dirPath === rootPath) {
-      setNodes(children);
+      setNodes((prev) => mergeChildren(prev, children));
     } else {
       setNodes((prev) =>
-        updateNodeAtPath(prev, dirPath, (n) => ({ ...n, children, isOpen: true })),
+        updateNodeAtPath(prev, dirPath, (n) => ({
+          ...n,
+          children: mergeChildren(n.children, children),
+          isOpen: keepOpenState ? n.isOpen : true,
+        })),
       );
     }
   }
 
+  useEffect(() => {
+    nodesRef.current = nodes;
+  }, [nodes]);
+
+  // Server-pushed file changes: refresh only the directories that are already loaded
+  const refreshDirRef = useRef(refreshDir);
+  useEffect(() => {
+    refreshDirRef.current = refreshDir;
+  });
+  useEffect(() => {
+    const root = rootPath.replace(/\\/g, "/").replace(/\/$/, "");
+    return subscribeFsEvents(projectId, (msg) => {
+      const dirs = new Set<string>();
+      if (msg.type === "overflow") {
+        dirs.add(root);
+        const loaded: string[] = [];
+        collectLoadedDirs(nodesRef.current, loaded);
+        loaded.forEach((d) => dirs.add(d));
+      } else {
+        for (const [, path] of msg.changes) dirs.add(parentDir(path));
+      }
+      for (const dir of dirs) {
+        if (dir === root) {
+          refreshDirRef.current(rootPath, true);
+        } else if (findNode(nodesRef.current, dir)?.children) {
+          refreshDirRef.current(dir, true);
+        }
+      }
+    });
+  }, [projectId, rootPath]);
+
   async function handleToggle(node: TreeNode) {
     if (!node.entry.is_dir) {
       onSelectFile(node.entry.path);
@@ -114,7 +269,7 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
         updateNodeAtPath(prev, node.entry.path, (n) => ({ ...n, isOpen: false })),
       );
     } else {
-      const children = node.children ?? (await fetchChildren(node.entry.path));
+      const children = node.children ?? (await fetchTree(node.entry.path));
       setNodes((prev) =>
         updateNodeAtPath(prev, node.entry.path, (n) => ({
           ...n,
@@ -156,16 +311,62 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
     }
   }
 
+  async function handleDownloadZip(path: string) {
+    try {
+      await downloadZip([path]);
+    } catch (e) {
+      alert(e instanceof Error ? e.message : "Download failed");
+    }
+  }
+
   async function handleDelete(path: string) {
     const name = path.split("/").pop() ?? path;
     if (!window.confirm(`Delete "${name}"?`)) return;
+    const parent = path.substring(0, path.replace(/\\/g, "/").lastIndexOf("/")) || rootPath;
+    if (await moveToTrash(path, parent)) await refreshDir(parent);
+  }
+
+  // Deletes go to the project trash instantly; offer an undo for a few seconds
+  async function moveToTrash(path: string, parent: string) {
     const res = await fetch(`/api/files?path=${encodeURIComponent(path)}`, {
       method: "DELETE",
       headers: authHeaders(),
     });
-    if (res.ok) {
-      const parent = path.substring(0, path.replace(/\\/g, "/").lastIndexOf("/"));
-      await refreshDir(parent || rootPath);
+    if (!res.ok) return false;
+    const data = await res.json();
+    if (data.trash_id) {
+      setTrashed({ id: data.trash_id, name: path.split("/").pop() ?? path, parent });
+    }
+    return true;
+  }
+
+  useEffect(() => {
+    if (!trashed) return;
+    const timer = setTimeout(() => setTrashed(null), UNDO_TIMEOUT);
+    return () => clearTimeout(timer);
+  }, [trashed]);
+
+  async function handleUndoDelete() {
+    if (!trashed) return;
+    setTrashed(null);
+    const res = await fetch(`/api/trash/${trashed.id}/restore`, {
+      method: "POST",
+      headers: authHeaders(),
+    });
+    if (res.ok) await refreshDir(trashed.parent);
+  }
+
+  // Runs a copy/delete job, showing progress until it finishes. Returns the job or null on failure.
+  async function trackJob(kind: "copy" | "delete", body: Record<string, string>) {
+    try {
+      const job = await runJob(kind, body, setActiveJob);
+      if (job.status === "failed") alert(job.error || "Operation failed");
+      return job.status === "completed" ? job : null;
+    } catch (e) {
+      alert(e instanceof Error ? e.message : "Operation failed");
+      return null;
+    } finally {
+      setActiveJob(null);
     }
   }
 
@@ -189,46 +390,59 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
 
   async function handlePaste(destDir: string) {
     if (!clipboard) return;
-    const res = await fetch("/api/files/copy", {
-      method: "POST",
-      headers: { "Content-Type": "application/json", ...authHeaders() },
-      body: JSON.stringify({ source: clipboard.path, destination: destDir }),
-    });
-    if (!res.ok) return;
-
     if (clipboard.isCut) {
+      // A cut is a single move (rename) rather than copy + delete
       const srcParent = clipboard.path.substring(
         0,
         clipboard.path.replace(/\\/g, "/").lastIndexOf("/"),
       );
-      const delRes = await fetch(
-        `/api/files?path=${encodeURIComponent(clipboard.path)}`,
-        { method: "DELETE", headers: authHeaders() },
-      );
-      if (delRes.ok) {
+      try {
+        const { results } = await api.batchFiles([
+          { op: "move", source: clipboard.path, destination: destDir },
+        ]);
+        const [result] = results;
+        if (!result.ok) {
+          alert(result.error);
+          return;
+        }
         setClipboard(null);
         await refreshDir(srcParent || rootPath);
+      } catch (e) {
+        alert(e instanceof Error ? e.message : "Move failed");
+        return;
       }
+    } else {
+      await trackJob("copy", { source: clipboard.path, destination: destDir });
     }
     await refreshDir(destDir);
   }
 
   async function handleUploadFiles(targetDir: string, files: FileList | File[]) {
-    const formData = new FormData();
-    for (const file of files) {
-      formData.append("files", file);
-    }
-    const res = await fetch(`/api/files/upload?path=${encodeURIComponent(targetDir)}`, {
-      method: "POST",
-      headers: authHeaders(),
-      body: formData,
-    });
-    if (res.ok) {
-      await refreshDir(targetDir);
-    } else {
-      const data = await res.json().catch(() => ({}));
-      alert(data.detail || "Upload failed");
+    const small = Array.from(files).filter((f) => f.size <= MULTIPART_MAX_SIZE);
+    const large = Array.from(files).filter((f) => f.size > MULTIPART_MAX_SIZE);
+    try {
+      if (small.length > 0) {
+        const formData = new FormData();
+        for (const file of small) {
+          formData.append("files", file);
+        }
+        const res = await fetch(`/api/files/upload?path=${encodeURIComponent(targetDir)}`, {
+          method: "POST",
+          headers: authHeaders(),
+          body: formData,
+        });
+        if (!res.ok) {
+          const data = await res.json().catch(() => ({}));
+          throw new Error(data.detail || "Upload failed");
+        }
+      }
+      for (const file of large) {
+        await resumableUpload(targetDir, file);
+      }
+    } catch (e) {
+      alert(e instanceof Error ? e.message : "Upload failed");
     }
+    await refreshDir(targetDir);
   }
 
   function handleFileInputChange(e: React.ChangeEvent<HTMLInputElement>) {
@@ -296,9 +510,23 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
           onClick: () => handlePaste(path),
         });
       }
+      if (isEmptyArea) {
+        items.push({
+          label: "Download Project as ZIP",
+          onClick: () => handleDownloadZip(path),
+        });
+      }
       if (!isEmptyArea) items.push({ separator: true });
     }
 
+    if (!isEmptyArea && !isDir && gitFlag({ name: "", path, is_dir: false })) {
+      items.push({
+        label: "Show Changes",
+        onClick: () => setDiffPath(path),
+      });
+      items.push({ separator: true });
+    }
+
     if (!isEmptyArea) {
       items.push({
         label: "Copy",
@@ -321,6 +549,10 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
           });
         },
       });
+      items.push({
+        label: "Download as ZIP",
+        onClick: () => handleDownloadZip(path),
+      });
       items.push({
         label: "Delete",
         onClick: () => handleDelete(path),
@@ -358,7 +590,7 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
               onCancel={() => setInlineInput(null)}
             />
           ) : (
-            <span className="file-tree-name">{node.entry.name}</span>
+            <GitName entry={node.entry} flag={gitFlag(node.entry)} />
           )}
         </div>
         {node.isOpen && node.children && (
@@ -427,6 +659,21 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
           </div>
         )}
       {renderNodes(nodes, 0)}
+      {activeJob && (
+        <div className="file-tree-job">
+          <span>
+            {activeJob.kind === "copy" ? "Copying" : "Deleting"} {activeJob.files_done}
+            {activeJob.files_total ? ` / ${activeJob.files_total}` : ""} files
+          </span>
+          <button onClick={() => cancelJob(activeJob.id)}>Cancel</button>
+        </div>
+      )}
+      {trashed && !activeJob && (
+        <div className="file-tree-job">
+          <span>Deleted "{trashed.name}"</span>
+          <button onClick={handleUndoDelete}>Undo</button>
+        </div>
+      )}
       {contextMenu && (
         <ContextMenu
           x={contextMenu.x}
@@ -435,10 +682,22 @@ export default function FileTree({ rootPath, onSelectFile }: Props) {
           onClose={() => setContextMenu(null)}
         />
       )}
+      {diffPath && <GitDiffModal path={diffPath} onClose={() => setDiffPath(null)} />}
     </div>
   );
 }
 
+function GitName({ entry, flag }: { entry: FileEntry; flag?: GitFlag }) {
+  if (!flag) return <span className="file-tree-name">{entry.name}</span>;
+  const cls = GIT_FLAG_CLASS[flag];
+  return (
+    <>
+      <span className={`file-tree-name ${cls}`}>{entry.name}</span>
+      <span className={`file-tree-git ${cls}`}>{entry.is_dir ? "\u2022" : flag}</span>
+    </>
+  );
+}
+
 function InlineInput({
   defaultValue,
   onConfirm,
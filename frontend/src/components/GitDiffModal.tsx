@@ -0,0 +1,72 @@
+import { useEffect, useState } from "react";
+import { api, type GitDiff } from "../api";
+
+interface Props {
+  path: string;
+  onClose: () => void;
+}
+
+function lineClass(line: string): string {
+  if (line.startsWith("+")) return "git-diff-line git-diff-add";
+  if (line.startsWith("-")) return "git-diff-line git-diff-del";
+  return "git-diff-line";
+}
+
+export default function GitDiffModal({ path, onClose }: Props) {
+  const [diff, setDiff] = useState<GitDiff | null>(null);
+  const [error, setError] = useState("");
+
+  useEffect(() => {
+    let cancelled = false;
+    api
+      .gitDiff(path)
+      .then((d) => !cancelled && setDiff(d))
+      .catch((e) => !cancelled && setError(e instanceof Error ? e.message : "Failed to load diff"));
+    return () => {
+      cancelled = true;
+    };
+  }, [path]);
+
+  useEffect(() => {
+    function handleKeyDown(e: KeyboardEvent) {
+      if (e.key === "Escape") onClose();
+    }
+    window.addEventListener("keydown", handleKeyDown);
+    return () => window.removeEventListener("keydown", handleKeyDown);
+  }, [onClose]);
+
+  const name = path.split("/").pop() ?? path;
+
+  return (
+    <div className="modal-backdrop" onClick={onClose}>
+      <div className="modal git-diff-modal" onClick={(e) => e.stopPropagation()}>
+        <div className="modal-header">
+          <span className="modal-title">Changes in {name}</span>
+          <button className="modal-close" onClick={onClose}>{"\u00D7"}</button>
+        </div>
+        <div className="modal-body git-diff-body">
+          {error && <p className="error">{error}</p>}
+          {!diff && !error && <p className="git-diff-empty">Loading...</p>}
+          {diff && diff.binary && <p className="git-diff-empty">Binary file changed</p>}
+          {diff && !diff.binary && diff.hunks.length === 0 && (
+            <p className="git-diff-empty">No changes</p>
+          )}
+          {diff?.hunks.map((hunk, i) => (
+            <div key={i} className="git-diff-hunk">
+              <div className="git-diff-hunk-header">
+                @@ -{hunk.old_start},{hunk.old_lines} +{hunk.new_start},{hunk.new_lines} @@{" "}
+                {hunk.header}
+              </div>
+              {hunk.lines.map((line, j) => (
+                <div key={j} className={lineClass(line)}>
+                  {line || " "}
+                </div>
+              ))}
+            </div>
+          ))}
+          {diff?.truncated && <p className="git-diff-empty">Diff truncated</p>}
+        </div>
+      </div>
+    </div>
+  );
+}
@@ -0,0 +1,138 @@
+import { useState, useEffect, useCallback } from "react";
+import { api, getToken, type OutlineSymbol } from "../api";
+
+interface Props {
+  filePath: string;
+}
+
+const PAGE_LINES = 500;
+const FOLLOW_INTERVAL = 2000;
+
+interface LinesResponse {
+  start: number;
+  lines: string[];
+  total_lines: number | null;
+}
+
+interface TailResponse {
+  lines: string[];
+  offset: number;
+  reset?: boolean;
+}
+
+function flattenOutline(symbols: OutlineSymbol[], depth = 0): [OutlineSymbol, number][] {
+  return symbols.flatMap((s) => [
+    [s, depth] as [OutlineSymbol, number],
+    ...flattenOutline(s.children, depth + 1),
+  ]);
+}
+
+async function getJson<T>(url: string): Promise<T | null> {
+  const token = getToken();
+  const res = await fetch(url, { headers: token ? { Authorization: `Bearer ${token}` } : {} });
+  return res.ok ? res.json() : null;
+}
+
+/** Read-only pager for files above the editor size limit, with tail -f style following. */
+export default function LargeFileViewer({ filePath }: Props) {
+  const [lines, setLines] = useState<string[]>([]);
+  // 0-based line number of lines[0]; non-zero after jumping to a symbol
+  const [firstLine, setFirstLine] = useState(0);
+  const [symbols, setSymbols] = useState<[OutlineSymbol, number][]>([]);
+  const [totalLines, setTotalLines] = useState<number | null>(null);
+  const [following, setFollowing] = useState(false);
+  const [followOffset, setFollowOffset] = useState<number | null>(null);
+  const encoded = encodeURIComponent(filePath);
+
+  const loadMore = useCallback(async (start: number, replace = start === 0) => {
+    const data = await getJson<LinesResponse>(
+      `/api/files/lines?path=${encoded}&start=${start}&count=${PAGE_LINES}`,
+    );
+    if (!data) return;
+    setLines((prev) => (replace ? data.lines : [...prev, ...data.lines]));
+    if (replace) setFirstLine(start);
+    if (data.total_lines !== null) setTotalLines(data.total_lines);
+  }, [encoded]);
+
+  useEffect(() => {
+    loadMore(0);
+  }, [loadMore]);
+
+  useEffect(() => {
+    api.fileOutline(filePath)
+      .then((data) => setSymbols(flattenOutline(data.symbols)))
+      .catch(() => setSymbols([]));
+  }, [filePath]);
+
+  async function startFollow() {
+    const data = await getJson<TailResponse>(`/api/files/tail?path=${encoded}&lines=${PAGE_LINES}`);
+    if (!data) return;
+    setLines(data.lines);
+    setFirstLine(0);
+    setFollowOffset(data.offset);
+    setFollowing(true);
+  }
+
+  useEffect(() => {
+    if (!following || followOffset === null) return;
+    const timer = window.setTimeout(async () => {
+      const data = await getJson<TailResponse>(
+        `/api/files/tail?path=${encoded}&since=${followOffset}`,
+      );
+      if (!data) return;
+      if (data.lines.length > 0 || data.reset) {
+        setLines((prev) => (data.reset ? data.lines : [...prev, ...data.lines]).slice(-PAGE_LINES * 4));
+      }
+      setFollowOffset(data.offset);
+    }, FOLLOW_INTERVAL);
+    return () => window.clearTimeout(timer);
+  }, [following, followOffset, encoded]);
+
+  return (
+    <div className="markdown-viewer">
+      <div className="markdown-toolbar">
+        <button
+          className={`markdown-toggle${!following ? " active" : ""}`}
+          onClick={() => {
+            setFollowing(false);
+            loadMore(0);
+          }}
+        >
+          From start
+        </button>
+        <button
+          className={`markdown-toggle${following ? " active" : ""}`}
+          onClick={startFollow}
+        >
+          Follow
+        </button>
+        {symbols.length > 0 && (
+          <select
+            className="large-file-outline"
+            value=""
+            onChange={(e) => {
+              const [symbol] = symbols[Number(e.target.value)];
+              setFollowing(false);
+              loadMore(symbol.line - 1, true);
+            }}
+          >
+            <option value="" disabled>Outline</option>
+            {symbols.map(([symbol, depth], i) => (
+              <option key={i} value={i}>
+                {"\u00a0\u00a0".repeat(depth)}{symbol.name} ({symbol.kind}, {symbol.line})
+              </option>
+            ))}
+          </select>
+        )}
+      </div>
+      <div className="markdown-content">
+        <pre className="large-file-lines">{lines.join("\n")}</pre>
+        {!following && (totalLines === null || firstLine + lines.length < totalLines) && lines.length > 0 && (
+          <button className="markdown-toggle" onClick={() => loadMore(firstLine + lines.length, false)}>
+            Load more
+          </button>
+        )}
+      </div>
+    </div>
+  );
+}
@@ -0,0 +1,101 @@
+import { useEffect, useRef, useState } from "react";
+import { api, type FoundFile } from "../api";
+
+interface Props {
+  projectId: string;
+  onSelectFile: (path: string) => void;
+  onClose: () => void;
+}
+
+// The server answers right away while the path index is still building; ask again shortly
+const BUILDING_RETRY_MS = 300;
+
+function highlight(file: FoundFile) {
+  const marked = new Set(file.positions);
+  return Array.from(file.rel).map((ch, i) =>
+    marked.has(i) ? <mark key={i}>{ch}</mark> : ch,
+  );
+}
+
+export default function QuickOpen({ projectId, onSelectFile, onClose }: Props) {
+  const [query, setQuery] = useState("");
+  const [results, setResults] = useState<FoundFile[]>([]);
+  const [selected, setSelected] = useState(0);
+  const [building, setBuilding] = useState(false);
+  const [retry, setRetry] = useState(0);
+  const inputRef = useRef<HTMLInputElement>(null);
+
+  useEffect(() => {
+    inputRef.current?.focus();
+  }, []);
+
+  useEffect(() => {
+    if (!query.trim()) {
+      setResults([]);
+      return;
+    }
+    let cancelled = false;
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    api.findFiles(projectId, query).then((data) => {
+      if (cancelled) return;
+      setResults(data.results);
+      setSelected(0);
+      setBuilding(data.state === "building");
+      if (data.state === "building") {
+        timer = setTimeout(() => setRetry((n) => n + 1), BUILDING_RETRY_MS);
+      }
+    }).catch(() => {});
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [projectId, query, retry]);
+
+  function open(file: FoundFile | undefined) {
+    if (!file) return;
+    onSelectFile(file.path);
+    onClose();
+  }
+
+  function handleKeyDown(e: React.KeyboardEvent) {
+    if (e.key === "Escape") onClose();
+    else if (e.key === "Enter") open(results[selected]);
+    else if (e.key === "ArrowDown") {
+      e.preventDefault();
+      setSelected((i) => Math.min(i + 1, results.length - 1));
+    } else if (e.key === "ArrowUp") {
+      e.preventDefault();
+      setSelected((i) => Math.max(i - 1, 0));
+    }
+  }
+
+  return (
+    <div className="modal-backdrop" onClick={onClose}>
+      <div className="modal quick-open" onClick={(e) => e.stopPropagation()}>
+        <input
+          ref={inputRef}
+          className="sidebar-input"
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+          onKeyDown={handleKeyDown}
+          placeholder="Go to file"
+        />
+        <div className="quick-open-results">
+          {building && results.length === 0 && (
+            <div className="quick-open-item">Indexing files…</div>
+          )}
+          {results.map((file, i) => (
+            <div
+              key={file.path}
+              className={`quick-open-item${i === selected ? " selected" : ""}`}
+              onMouseEnter={() => setSelected(i)}
+              onClick={() => open(file)}
+            >
+              {highlight(file)}
+            </div>
+          ))}
+        </div>
+      </div>
+    </div>
+  );
+}
@@ -0,0 +1,171 @@
+import { useEffect, useRef, useState, type ReactNode } from "react";
+import { getToken } from "../api";
+
+interface SearchMatch {
+  line: number;
+  text: string;
+  ranges: [number, number][];
+}
+
+interface SearchFile {
+  type: "file";
+  path: string;
+  matches: SearchMatch[];
+}
+
+interface SearchDone {
+  type: "done";
+  files: number;
+  matches: number;
+  truncated: boolean;
+  state: string;
+  elapsed_ms: number;
+}
+
+interface Props {
+  projectId: string;
+  rootPath: string;
+  onSelectFile: (path: string) => void;
+}
+
+const SEARCH_DEBOUNCE = 300;
+
+function highlight(match: SearchMatch) {
+  const parts: ReactNode[] = [];
+  let pos = 0;
+  match.ranges.forEach(([start, end], i) => {
+    if (start >= match.text.length) return;
+    parts.push(match.text.slice(pos, start));
+    parts.push(<mark key={i}>{match.text.slice(start, end)}</mark>);
+    pos = end;
+  });
+  parts.push(match.text.slice(pos));
+  return parts;
+}
+
+/** Stream NDJSON results from /api/search, calling onItem for each line. */
+async function streamSearch(
+  params: URLSearchParams,
+  signal: AbortSignal,
+  onItem: (item: SearchFile | SearchDone) => void,
+) {
+  const token = getToken();
+  const res = await fetch(`/api/search?${params}`, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+    signal,
+  });
+  if (!res.ok || !res.body) {
+    const data = await res.json().catch(() => ({}));
+    throw new Error(data.detail || `Search failed: ${res.status}`);
+  }
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split("\n");
+    buffered = lines.pop()!;
+    for (const line of lines) if (line) onItem(JSON.parse(line));
+  }
+}
+
+export default function SearchPanel({ projectId, rootPath, onSelectFile }: Props) {
+  const [query, setQuery] = useState("");
+  const [regex, setRegex] = useState(false);
+  const [caseSensitive, setCaseSensitive] = useState(false);
+  const [files, setFiles] = useState<SearchFile[]>([]);
+  const [summary, setSummary] = useState<SearchDone | null>(null);
+  const [error, setError] = useState("");
+  const abortRef = useRef<AbortController | null>(null);
+
+  useEffect(() => {
+    abortRef.current?.abort();
+    setFiles([]);
+    setSummary(null);
+    setError("");
+    if (!query) return;
+
+    const controller = new AbortController();
+    abortRef.current = controller;
+    const timer = setTimeout(() => {
+      const params = new URLSearchParams({
+        project_id: projectId,
+        q: query,
+        regex: String(regex),
+        case: String(caseSensitive),
+        context: "0",
+      });
+      streamSearch(params, controller.signal, (item) => {
+        if (item.type === "file") setFiles((prev) => [...prev, item]);
+        else setSummary(item);
+      }).catch((e) => {
+        if (!controller.signal.aborted) setError(e.message);
+      });
+    }, SEARCH_DEBOUNCE);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [projectId, query, regex, caseSensitive]);
+
+  const relative = (path: string) =>
+    path.startsWith(rootPath) ? path.slice(rootPath.length).replace(/^\//, "") : path;
+
+  return (
+    <div className="search-panel">
+      <div className="search-panel-row">
+        <input
+          className="sidebar-input"
+          placeholder="Search in files"
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+        />
+        <button
+          className={`search-panel-toggle${caseSensitive ? " active" : ""}`}
+          onClick={() => setCaseSensitive((v) => !v)}
+          title="Match case"
+        >
+          Aa
+        </button>
+        <button
+          className={`search-panel-toggle${regex ? " active" : ""}`}
+          onClick={() => setRegex((v) => !v)}
+          title="Use regular expression"
+        >
+          .*
+        </button>
+      </div>
+      {error && <div className="search-panel-status error">{error}</div>}
+      {summary && (
+        <div className="search-panel-status">
+          {summary.matches} matches in {summary.files} files
+          {summary.truncated && " (truncated)"}
+          {summary.state !== "ready" && " — indexing…"}
+        </div>
+      )}
+      {files.length > 0 && (
+        <div className="search-panel-results">
+          {files.map((file) => (
+            <div key={file.path} className="search-panel-file">
+              <div className="search-panel-path" onClick={() => onSelectFile(file.path)}>
+                {relative(file.path)}
+              </div>
+              {file.matches.map((m) => (
+                <div
+                  key={m.line}
+                  className="search-panel-match"
+                  onClick={() => onSelectFile(file.path)}
+                >
+                  <span className="search-panel-line">{m.line}</span>
+                  <span>{highlight(m)}</span>
+                </div>
+              ))}
+            </div>
+          ))}
+        </div>
+      )}
+    </div>
+  );
+}
@@ -1,14 +1,22 @@
 import { useState, useEffect } from "react";
 import { themes } from "../themes";
-import { getToken } from "../api";
+import { api, getToken, type Project } from "../api";
 
 interface Props {
+  activeProject?: Project;
   currentThemeId: string;
   onChangeTheme: (themeId: string) => void;
   onClose: () => void;
 }
 
-export default function SettingsPanel({ currentThemeId, onChangeTheme, onClose }: Props) {
+export default function SettingsPanel({
+  activeProject,
+  currentThemeId,
+  onChangeTheme,
+  onClose,
+}: Props) {
+  const [ignoreText, setIgnoreText] = useState("");
+  const [ignoreMsg, setIgnoreMsg] = useState("");
   const [oldPw, setOldPw] = useState("");
   const [newPw, setNewPw] = useState("");
   const [pwMsg, setPwMsg] = useState("");
@@ -22,6 +30,24 @@ export default function SettingsPanel({ currentThemeId, onChangeTheme, onClose }
     return () => window.removeEventListener("keydown", handleKeyDown);
   }, [onClose]);
 
+  useEffect(() => {
+    if (!activeProject) return;
+    api.getIgnorePatterns(activeProject.id)
+      .then((data) => setIgnoreText(data.patterns.join("\n")))
+      .catch(() => {});
+  }, [activeProject]);
+
+  async function handleSaveIgnore() {
+    if (!activeProject) return;
+    const patterns = ignoreText.split("\n").map((l) => l.trimEnd()).filter(Boolean);
+    try {
+      await api.setIgnorePatterns(activeProject.id, patterns);
+      setIgnoreMsg("Saved");
+    } catch (e: unknown) {
+      setIgnoreMsg(e instanceof Error ? e.message : "Failed");
+    }
+  }
+
   async function handleChangePassword() {
     if (!oldPw || !newPw) return;
     setPwMsg("");
@@ -73,6 +99,33 @@ export default function SettingsPanel({ currentThemeId, onChangeTheme, onClose }
             </select>
           </div>
 
+          {activeProject && (
+            <>
+              <div className="settings-divider" />
+              <div className="settings-section">
+                <span className="settings-label">Hidden files ({activeProject.name})</span>
+                <textarea
+                  className="settings-input settings-textarea"
+                  placeholder={"One .gitignore pattern per line, e.g.\ndata/\n!.env"}
+                  value={ignoreText}
+                  onChange={(e) => {
+                    setIgnoreText(e.target.value);
+                    setIgnoreMsg("");
+                  }}
+                  rows={4}
+                />
+                <button className="sidebar-button settings-pw-btn" onClick={handleSaveIgnore}>
+                  Save
+                </button>
+                {ignoreMsg && (
+                  <span className={`settings-pw-msg ${ignoreMsg === "Saved" ? "success" : ""}`}>
+                    {ignoreMsg}
+                  </span>
+                )}
+              </div>
+            </>
+          )}
+
           <div className="settings-divider" />
 
           <div className="settings-section">
@@ -2,6 +2,7 @@ import { useState } from "react";
 import type { Project } from "../api";
 import ProjectList from "./ProjectList";
 import FileTree from "./FileTree";
+import SearchPanel from "./SearchPanel";
 import SettingsPanel from "./SettingsPanel";
 import AddProjectModal from "./AddProjectModal";
 
@@ -14,6 +15,7 @@ interface Props {
   onRefreshProjects: () => void;
   onSelectProject: (project: Project) => void;
   onSelectFile: (path: string) => void;
+  onQuickOpen: () => void;
   onChangeTheme: (themeId: string) => void;
 }
 
@@ -26,6 +28,7 @@ export default function Sidebar({
   onRefreshProjects,
   onSelectProject,
   onSelectFile,
+  onQuickOpen,
   onChangeTheme,
 }: Props) {
   const [showAddModal, setShowAddModal] = useState(false);
@@ -63,11 +66,28 @@ export default function Sidebar({
             onRefresh={onRefreshProjects}
             onSelectProject={onSelectProject}
           />
+          {activeProject && (
+            <div className="sidebar-section">
+              <label className="sidebar-label">Search</label>
+              <SearchPanel
+                key={activeProject.id}
+                projectId={activeProject.id}
+                rootPath={activeProject.path}
+                onSelectFile={onSelectFile}
+              />
+            </div>
+          )}
           {activeProject && (
             <div className="sidebar-section file-tree-section">
-              <label className="sidebar-label">Files</label>
+              <div className="sidebar-label-row">
+                <label className="sidebar-label">Files</label>
+                <button className="sidebar-label-btn" onClick={onQuickOpen} title="Go to file (Ctrl+P)">
+                  Go to file
+                </button>
+              </div>
               <FileTree
                 key={activeProject.id}
+                projectId={activeProject.id}
                 rootPath={activeProject.path}
                 onSelectFile={onSelectFile}
               />
@@ -93,6 +113,7 @@ export default function Sidebar({
       )}
       {showSettings && (
         <SettingsPanel
+          activeProject={activeProject}
           currentThemeId={currentThemeId}
           onChangeTheme={onChangeTheme}
           onClose={() => setShowSettings(false)}
@@ -0,0 +1,75 @@
+import { getToken } from "./api";
+
+// [kind, path, isDir] — kind: "c" created, "m" modified, "d" deleted
+export type FsChange = ["c" | "m" | "d", string, boolean];
+
+export type FsEventMessage =
+  | { type: "changes"; project_id: string; changes: FsChange[] }
+  | { type: "overflow"; project_id: string };
+
+type Listener = (msg: FsEventMessage) => void;
+
+interface Channel {
+  ws: WebSocket | null;
+  listeners: Set<Listener>;
+  retry?: number;
+  reconnecting: boolean;
+}
+
+const RECONNECT_DELAY = 3000;
+const channels = new Map<string, Channel>();
+
+function connect(projectId: string, channel: Channel) {
+  const token = getToken();
+  const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+  const ws = new WebSocket(`${protocol}//${window.location.host}/ws/fs/${projectId}?token=${token}`);
+  channel.ws = ws;
+
+  ws.onopen = () => {
+    // Events may have been missed while disconnected
+    if (channel.reconnecting) {
+      channel.listeners.forEach((l) => l({ type: "overflow", project_id: projectId }));
+    }
+  };
+  ws.onmessage = (e) => {
+    let msg: FsEventMessage;
+    try {
+      msg = JSON.parse(e.data);
+    } catch {
+      return;
+    }
+    channel.listeners.forEach((l) => l(msg));
+  };
+  ws.onclose = () => {
+    if (channels.get(projectId) !== channel) return;
+    channel.reconnecting = true;
+    channel.retry = window.setTimeout(() => connect(projectId, channel), RECONNECT_DELAY);
+  };
+}
+
+/** Subscribe to file change batches of a project. One WebSocket is shared per project. */
+export function subscribeFsEvents(projectId: string, listener: Listener): () => void {
+  let channel = channels.get(projectId);
+  if (!channel) {
+    channel = { ws: null, listeners: new Set(), reconnecting: false };
+    channels.set(projectId, channel);
+    connect(projectId, channel);
+  }
+  channel.listeners.add(listener);
+
+  return () => {
+    const ch = channels.get(projectId);
+    if (!ch) return;
+    ch.listeners.delete(listener);
+    if (ch.listeners.size === 0) {
+      channels.delete(projectId);
+      window.clearTimeout(ch.retry);
+      ch.ws?.close();
+    }
+  };
+}
+
+export function parentDir(path: string): string {
+  const normalized = path.replace(/\\/g, "/");
+  return normalized.substring(0, normalized.lastIndexOf("/"));
+}
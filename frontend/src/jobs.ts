@@ -0,0 +1,73 @@
+import { getToken } from "./api";
+
+export interface Job {
+  id: string;
+  kind: "copy" | "delete";
+  status: "queued" | "running" | "completed" | "failed" | "cancelled";
+  files_total: number;
+  bytes_total: number;
+  files_done: number;
+  bytes_done: number;
+  result: { path?: string } | null;
+  error: string | null;
+}
+
+const POLL_INTERVAL = 1000;
+
+function isFinished(job: Job) {
+  return job.status === "completed" || job.status === "failed" || job.status === "cancelled";
+}
+
+function authHeaders(): Record<string, string> {
+  const token = getToken();
+  return token ? { Authorization: `Bearer ${token}` } : {};
+}
+
+async function poll(id: string, onProgress?: (job: Job) => void): Promise<Job> {
+  for (;;) {
+    const res = await fetch(`/api/jobs/${id}`, { headers: authHeaders() });
+    if (!res.ok) throw new Error(`Job lookup failed: ${res.status}`);
+    const job: Job = await res.json();
+    onProgress?.(job);
+    if (isFinished(job)) return job;
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL));
+  }
+}
+
+function watch(id: string, onProgress?: (job: Job) => void): Promise<Job> {
+  return new Promise((resolve) => {
+    const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+    const ws = new WebSocket(`${protocol}//${window.location.host}/ws/jobs/${id}?token=${getToken()}`);
+    let last: Job | null = null;
+    ws.onmessage = (e) => {
+      last = JSON.parse(e.data);
+      onProgress?.(last!);
+    };
+    // Closed early (proxy dropped the socket, etc.) — fall back to polling
+    ws.onclose = () => resolve(last && isFinished(last) ? last : poll(id, onProgress));
+  });
+}
+
+/** Submit a copy/delete job and resolve once it finishes, reporting progress along the way. */
+export async function runJob(
+  kind: "copy" | "delete",
+  body: Record<string, string>,
+  onProgress?: (job: Job) => void,
+): Promise<Job> {
+  const res = await fetch(`/api/jobs/${kind}`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", ...authHeaders() },
+    body: JSON.stringify(body),
+  });
+  if (!res.ok) {
+    const data = await res.json().catch(() => ({}));
+    throw new Error(data.detail || `Request failed: ${res.status}`);
+  }
+  const job: Job = await res.json();
+  onProgress?.(job);
+  return watch(job.id, onProgress);
+}
+
+export function cancelJob(id: string) {
+  return fetch(`/api/jobs/${id}`, { method: "DELETE", headers: authHeaders() });
+}
@@ -0,0 +1,24 @@
+// Line edits for PATCH /api/files/content: replace base lines [start, end) with `lines`
+export interface LineEdit {
+  start: number;
+  end: number;
+  lines: string[];
+}
+
+/** Single edit covering everything between the common prefix and suffix. */
+export function lineEdits(base: string, current: string): LineEdit[] {
+  if (base === current) return [];
+  const a = base.split("\n");
+  const b = current.split("\n");
+  let prefix = 0;
+  while (prefix < a.length && prefix < b.length && a[prefix] === b[prefix]) prefix++;
+  let suffix = 0;
+  while (
+    suffix < a.length - prefix &&
+    suffix < b.length - prefix &&
+    a[a.length - 1 - suffix] === b[b.length - 1 - suffix]
+  ) {
+    suffix++;
+  }
+  return [{ start: prefix, end: a.length - suffix, lines: b.slice(prefix, b.length - suffix) }];
+}
@@ -0,0 +1,73 @@
+import { getToken } from "./api";
+
+// Files above this go through the resumable protocol instead of multipart
+export const MULTIPART_MAX_SIZE = 5 * 1024 * 1024;
+
+const PART_SIZE = 4 * 1024 * 1024;
+const MAX_RETRIES = 5;
+const RETRY_DELAY = 2000;
+
+interface UploadState {
+  id: string;
+  offset: number;
+  size: number;
+  status: "pending" | "completed";
+  path?: string;
+}
+
+function headers(extra?: Record<string, string>): Record<string, string> {
+  const token = getToken();
+  return { ...(token ? { Authorization: `Bearer ${token}` } : {}), ...extra };
+}
+
+async function detail(res: Response): Promise<string> {
+  const data = await res.json().catch(() => ({}));
+  return data.detail || `Upload failed: ${res.status}`;
+}
+
+function sleep(ms: number) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+/** Upload one file in parts. A dropped connection resumes from the server's offset. */
+export async function resumableUpload(
+  targetDir: string,
+  file: File,
+  onProgress?: (sent: number, total: number) => void,
+): Promise<string> {
+  const created = await fetch("/api/uploads", {
+    method: "POST",
+    headers: headers({ "Content-Type": "application/json" }),
+    body: JSON.stringify({ path: targetDir, filename: file.name, size: file.size }),
+  });
+  if (!created.ok) throw new Error(await detail(created));
+  let state: UploadState = await created.json();
+
+  let failures = 0;
+  while (state.status !== "completed") {
+    onProgress?.(state.offset, file.size);
+    const part = file.slice(state.offset, state.offset + PART_SIZE);
+    try {
+      const res = await fetch(`/api/uploads/${state.id}?offset=${state.offset}`, {
+        method: "PUT",
+        headers: headers({ "Content-Type": "application/octet-stream" }),
+        body: part,
+      });
+      if (res.ok) {
+        state = await res.json();
+        failures = 0;
+        continue;
+      }
+      if (res.status !== 409 && res.status < 500) throw new Error(await detail(res));
+    } catch (e) {
+      if (!(e instanceof TypeError)) throw e; // TypeError: network failure
+    }
+    if (++failures > MAX_RETRIES) throw new Error("Upload interrupted");
+    await sleep(RETRY_DELAY);
+    const res = await fetch(`/api/uploads/${state.id}`, { headers: headers() });
+    if (!res.ok) throw new Error(await detail(res));
+    state = await res.json();
+  }
+  onProgress?.(file.size, file.size);
+  return state.path!;
+}
@@ -1,13 +1,25 @@
-"""keep_vibing 개발 서버 기동 스크립트. backend + frontend 동시 실행."""
+"""keep_vibing 기동 스크립트.
 
+    python start.py                # 개발: uvicorn(8500) + Vite 개발 서버(11000)
+    python start.py --prod         # 운영: 프런트엔드를 한 번 빌드하고 백엔드만 11000에서 실행
+    python start.py --prod --no-build   # 이미 빌드된 frontend/dist를 그대로 쓴다
+    python start.py --profile default   # uvicorn 기본 설정으로 (backend/runtime.py 참고)
+"""
+
+import argparse
+import os
+import signal
 import subprocess
 import sys
-import signal
-import os
 import time
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(ROOT, "frontend")
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+DEV_BACKEND_PORT = 8500  # vite.config.ts의 프록시 대상
+PROD_PORT = 11000
+# 백엔드는 종료 신호를 받으면 웹소켓을 비우고 요청을 마무리한다 (backend/runtime.py)
+SHUTDOWN_WAIT = 20
 
 procs: list[subprocess.Popen] = []
 
@@ -20,7 +32,7 @@ def cleanup(*_):
             pass
     for p in procs:
         try:
-            p.wait(timeout=5)
+            p.wait(timeout=SHUTDOWN_WAIT)
         except subprocess.TimeoutExpired:
             p.kill()
     sys.exit(0)
@@ -29,12 +41,30 @@ def cleanup(*_):
 signal.signal(signal.SIGINT, cleanup)
 signal.signal(signal.SIGTERM, cleanup)
 
-if __name__ == "__main__":
+
+def build_frontend():
+    """npm run build 후 정적 파일을 미리 압축한다. 실패하면 종료."""
+    shell = sys.platform == "win32"
+    for cmd, cwd in (
+        (["npm", "run", "build"], FRONTEND_DIR),
+        (["uv", "run", "python", "-m", "backend.static_site", DIST_DIR], ROOT),
+    ):
+        ret = subprocess.call(cmd, cwd=cwd, shell=shell)
+        if ret != 0:
+            print(f"{' '.join(cmd)} failed with code {ret}")
+            sys.exit(ret)
+
+
+def backend_command(profile: str, host: str, port: int) -> list[str]:
+    return [
+        "uv", "run", "python", "-m", "backend.runtime",
+        "--profile", profile, "--host", host, "--port", str(port),
+    ]
+
+
+def start_dev(profile: str):
     procs.append(
-        subprocess.Popen(
-            ["uv", "run", "uvicorn", "backend.app:app", "--port", "8500"],
-            cwd=ROOT,
-        )
+        subprocess.Popen(backend_command(profile, "127.0.0.1", DEV_BACKEND_PORT), cwd=ROOT)
     )
     procs.append(
         subprocess.Popen(
@@ -44,6 +74,46 @@ if __name__ == "__main__":
         )
     )
 
+
+def start_prod(build: bool, profile: str, port: int):
+    if build:
+        build_frontend()
+    elif not os.path.isfile(os.path.join(DIST_DIR, "index.html")):
+        print("frontend/dist is missing; run without --no-build first")
+        sys.exit(1)
+    procs.append(
+        subprocess.Popen(
+            backend_command(profile, "0.0.0.0", port),
+            cwd=ROOT,
+            env={**os.environ, "KEEP_VIBING_SERVE_FRONTEND": "1"},
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start keep_vibing")
+    parser.add_argument(
+        "--prod", action="store_true", help="serve the built frontend from the backend only"
+    )
+    parser.add_argument(
+        "--no-build", action="store_true", help="with --prod, reuse the existing frontend/dist"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["default", "performance"],
+        default="performance",
+        help="uvicorn runtime profile (see backend/runtime.py)",
+    )
+    parser.add_argument(
+        "--port", type=int, default=PROD_PORT, help="with --prod, the port to listen on"
+    )
+    args = parser.parse_args()
+
+    if args.prod:
+        start_prod(build=not args.no_build, profile=args.profile, port=args.port)
+    else:
+        start_dev(args.profile)
+
     try:
         while True:
             for p in procs: